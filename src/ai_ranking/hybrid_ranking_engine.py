@@ -10,18 +10,34 @@ This module implements a hybrid approach that:
 """
 
 import logging
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 from datetime import datetime
 import time
 import json
-from dataclasses import dataclass
+import threading
+import hashlib
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass, field, asdict
+import pandas as pd
 
 from .scoring_models import MultiFactorScorer
 from .openai_integration import OpenAIStockAnalyzer
-from .openai_storage import OpenAIAnalysisStorage
+from .openai_storage import OpenAIAnalysisStorage, canonical_bytes
+from .ranking_index import RankingIndex, IndexedScore
 
 logger = logging.getLogger(__name__)
 
+# Symbols scored at once, and how long one symbol or a whole ranking may take (seconds)
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_SYMBOL_TIMEOUT = 120.0
+DEFAULT_RANKING_TIMEOUT = 900.0
+
+# Longest wait between checks for cancellation (seconds)
+CANCEL_POLL_INTERVAL = 0.25
+
+# Share of the ranking deadline the batched OpenAI prefetch may use; the rest is kept for scoring
+PREFETCH_TIMEOUT_FRACTION = 0.5
+
 @dataclass
 class DualScore:
     """Represents dual scoring results from OpenAI and local algorithms."""
@@ -33,6 +49,14 @@ class DualScore:
     explanation: str
     recommendations: List[str]
 
+@dataclass
+class SymbolContext:
+    """A symbol's indicator history and derived inputs, loaded once per ranking run."""
+    symbol: str
+    stock_data: pd.DataFrame
+    technical_data: Dict
+    openai_analysis: Optional[Dict] = None  # This run's analysis, batched or stored
+
 @dataclass
 class HybridRankingResult:
     """Represents hybrid ranking results with dual scoring."""
@@ -41,34 +65,55 @@ class HybridRankingResult:
     timestamp: datetime
     algorithm_performance: Dict
     improvement_insights: List[str]
+    skipped_symbols: List[str] = field(default_factory=list)
+    partial: bool = False
+    rescored_symbols: Optional[List[str]] = None  # Set by incremental rankings
 
 class HybridRankingEngine:
     """
     Hybrid ranking engine that compares OpenAI vs local algorithms.
     """
     
-    def __init__(self, data_manager):
+    def __init__(self, data_manager, max_workers: int = DEFAULT_MAX_WORKERS,
+                 symbol_timeout: float = DEFAULT_SYMBOL_TIMEOUT,
+                 ranking_timeout: float = DEFAULT_RANKING_TIMEOUT):
         self.data_manager = data_manager
+        self.max_workers = max(1, int(max_workers))
+        self.symbol_timeout = symbol_timeout
+        self.ranking_timeout = ranking_timeout
+        # Cancel event of the current (or next) run; cancel() before a run starts still stops it
+        self._cancel_event = threading.Event()
         self.local_scorer = MultiFactorScorer()
         self.openai_analyzer = OpenAIStockAnalyzer()
         self.openai_storage = OpenAIAnalysisStorage()
+        self.ranking_index = RankingIndex()
         self.logger = logging.getLogger(__name__)
         
         # Performance tracking
         self.algorithm_comparisons = []
         self.improvement_suggestions = []
         
-    def rank_collection_hybrid(self, collection_id: str, max_stocks: int = 50) -> HybridRankingResult:
+    def rank_collection_hybrid(self, collection_id: str, max_stocks: int = 50,
+                               timeout: Optional[float] = None,
+                               on_score: Optional[Callable[[DualScore], None]] = None) -> HybridRankingResult:
         """
         Rank stocks using both OpenAI and local algorithms with incremental updates.
         
+        Symbols are scored concurrently, at most max_workers at a time. A symbol
+        running longer than symbol_timeout is abandoned, and when the overall
+        deadline passes or cancel() is called the symbols finished so far are
+        returned as a partial result.
+        
         Args:
             collection_id: ID of the data collection
             max_stocks: Maximum number of stocks to rank
+            timeout: Seconds the whole ranking may take (default: ranking_timeout)
+            on_score: Called with each DualScore as soon as it is produced
             
         Returns:
             HybridRankingResult with dual scoring and insights
         """
+        cancel_event = self._cancel_event
         try:
             self.logger.info(f"Starting incremental hybrid ranking for collection: {collection_id}")
             start_time = time.time()
@@ -83,78 +128,10 @@ class HybridRankingEngine:
             symbols = symbols[:max_stocks]
             self.logger.info(f"Processing {len(symbols)} symbols for hybrid ranking")
             
-            # Get technical data for all symbols to check for changes
-            technical_data_dict = {}
-            market_context = self._get_market_context()
-            
-            for symbol in symbols:
-                stock_data = self.data_manager.get_symbol_indicators(collection_id, symbol)
-                if stock_data is not None and not stock_data.empty:
-                    technical_data_dict[symbol] = self._prepare_technical_data_for_openai(stock_data)
-            
-            # Determine which symbols need fresh analysis
-            symbols_needing_analysis = self.openai_storage.get_symbols_needing_analysis(
-                collection_id, symbols, technical_data_dict, market_context
-            )
-            
-            self.logger.info(f"Found {len(symbols_needing_analysis)} symbols needing fresh analysis")
-            
-            # Process stocks with parallel processing for better performance
-            dual_scores = []
-            batch_size = 5  # Smaller batch size for parallel processing
-            
-            # Use threading for parallel processing
-            import threading
-            import queue
-            
-            # Create a queue for results
-            result_queue = queue.Queue()
-            
-            def process_batch(batch_symbols, batch_id):
-                """Process a batch of symbols in parallel."""
-                try:
-                    batch_scores = self._process_hybrid_batch_incremental(collection_id, batch_symbols, symbols_needing_analysis)
-                    result_queue.put((batch_id, batch_scores))
-                    self.logger.info(f"Completed batch {batch_id} with {len(batch_scores)} symbols")
-                except Exception as e:
-                    self.logger.error(f"Error in batch {batch_id}: {e}")
-                    result_queue.put((batch_id, []))
-            
-            # Start parallel processing
-            threads = []
-            for i in range(0, len(symbols), batch_size):
-                batch = symbols[i:i + batch_size]
-                batch_id = i // batch_size + 1
-                
-                thread = threading.Thread(target=process_batch, args=(batch, batch_id))
-                thread.start()
-                threads.append(thread)
-                
-                # Small delay to prevent overwhelming the system
-                time.sleep(0.1)
-            
-            # Wait for all threads to complete with increased timeout
-            timeout = 900  # 15 minutes timeout for comprehensive analysis with 112 symbols
-            start_time = time.time()
-            
-            for thread in threads:
-                thread.join(timeout=timeout)
-                if thread.is_alive():
-                    self.logger.warning("Thread timeout reached")
-                    break
-            
-            # Collect results
-            batch_results = {}
-            while not result_queue.empty():
-                batch_id, batch_scores = result_queue.get_nowait()
-                batch_results[batch_id] = batch_scores
-            
-            # Combine results in order
-            for batch_id in sorted(batch_results.keys()):
-                dual_scores.extend(batch_results[batch_id])
+            dual_scores, skipped_symbols = self._score_collection(collection_id, symbols, cancel_event, timeout, on_score)
             
             # Sort by combined score (average of OpenAI and local)
-            dual_scores.sort(key=lambda x: (x.openai_score + x.local_score) / 2, reverse=True)
+            dual_scores.sort(key=self._combined_score, reverse=True)
             
             # Generate algorithm performance insights
             algorithm_performance = self._analyze_algorithm_performance(dual_scores)
@@ -165,18 +142,285 @@ class HybridRankingEngine:
                 total_stocks=len(dual_scores),
                 timestamp=datetime.now(),
                 algorithm_performance=algorithm_performance,
-                improvement_insights=improvement_insights
+                improvement_insights=improvement_insights,
+                skipped_symbols=skipped_symbols,
+                partial=bool(skipped_symbols)
             )
             
             elapsed_time = time.time() - start_time
             self.logger.info(f"Hybrid ranking completed in {elapsed_time:.2f}s")
             self.logger.info(f"Ranked {len(dual_scores)} stocks with dual scoring")
+            if self.openai_analyzer.response_cache is not None:
+                cache_stats = self.openai_analyzer.response_cache.stats()
+                self.logger.info(f"LLM response cache: {cache_stats['hit_rate']:.0%} hit rate, "
+                                 f"${cache_stats['cost_avoided_usd']:.4f} avoided")
             
             return result
             
         except Exception as e:
             self.logger.error(f"Error in hybrid ranking: {e}")
             return self._create_empty_hybrid_result()
+        finally:
+            self._finish_run(cancel_event)
+    
+    def rank_collection_incremental(self, collection_id: str, max_stocks: int = 50,
+                                    timeout: Optional[float] = None,
+                                    on_score: Optional[Callable[[DualScore], None]] = None) -> HybridRankingResult:
+        """
+        Bring the collection's ranking index up to date and rank from it.
+        
+        Only symbols whose bars, indicators or market context changed since
+        they were indexed are rescored; their scores are patched into the
+        indexed order. With nothing changed the ranking comes straight from
+        the index. Symbols left unscored stay stale and are retried next time.
+        
+        Args:
+            collection_id: ID of the data collection
+            max_stocks: Maximum number of stocks to rank
+            timeout: Seconds the rescoring may take (default: ranking_timeout)
+            on_score: Called with each DualScore; up-to-date indexed scores
+                come first, then rescored ones as they are produced
+            
+        Returns:
+            HybridRankingResult with dual scoring and insights
+        """
+        cancel_event = self._cancel_event
+        try:
+            start_time = time.time()
+            all_symbols = self.data_manager.get_collection_symbols(collection_id)
+            if not all_symbols:
+                self.logger.warning(f"No symbols found for collection {collection_id}")
+                return self._create_empty_hybrid_result()
+            symbols = all_symbols[:max_stocks]
+            
+            # Symbols that left the collection leave the index
+            self.ranking_index.retain(collection_id, all_symbols)
+            
+            versions = self._symbol_versions(collection_id, symbols)
+            stale = self.ranking_index.stale_symbols(collection_id, versions)
+            skipped_symbols = []
+            if on_score is not None:
+                current = set(versions).difference(stale)
+                for entry in self.ranking_index.ranked(collection_id, current):
+                    self._notify(on_score, DualScore(**entry.payload))
+            if stale:
+                self.logger.info(f"Rescoring {len(stale)} of {len(symbols)} symbols for collection {collection_id}")
+                dual_scores, skipped_symbols = self._score_collection(collection_id, stale, cancel_event,
+                                                                      timeout, on_score)
+                self.ranking_index.update(collection_id, [
+                    IndexedScore(score.symbol, self._combined_score(score), versions[score.symbol], asdict(score))
+                    for score in dual_scores
+                ])
+            
+            dual_scores = [DualScore(**entry.payload) for entry in self.ranking_index.ranked(collection_id, symbols)]
+            result = HybridRankingResult(
+                dual_scores=dual_scores,
+                total_stocks=len(dual_scores),
+                timestamp=datetime.now(),
+                algorithm_performance=self._analyze_algorithm_performance(dual_scores),
+                improvement_insights=self._generate_improvement_insights(dual_scores),
+                skipped_symbols=skipped_symbols,
+                partial=bool(skipped_symbols),
+                rescored_symbols=[symbol for symbol in stale if symbol not in skipped_symbols]
+            )
+            
+            self.logger.info(f"Incremental hybrid ranking of {len(dual_scores)} stocks "
+                             f"({len(result.rescored_symbols)} rescored) in {time.time() - start_time:.2f}s")
+            return result
+            
+        except Exception as e:
+            self.logger.error(f"Error in incremental hybrid ranking: {e}")
+            return self._create_empty_hybrid_result()
+        finally:
+            self._finish_run(cancel_event)
+    
+    def _symbol_versions(self, collection_id: str, symbols: List[str]) -> Dict[str, str]:
+        """Current input version of each symbol: its data version plus the market context."""
+        context_hash = hashlib.blake2b(canonical_bytes(self._get_market_context()), digest_size=8).hexdigest()
+        get_versions = getattr(self.data_manager, 'get_symbol_versions', None)
+        if get_versions is None:
+            # Without per-symbol versions every ranking rescores everything
+            return {symbol: f"{time.time()}#{context_hash}" for symbol in symbols}
+        
+        # Symbols without stored data have nothing to score
+        data_versions = get_versions(collection_id)
+        return {symbol: f"{data_versions[symbol]}#{context_hash}" for symbol in symbols if symbol in data_versions}
+    
+    def _notify(self, on_score: Callable[[DualScore], None], score: DualScore):
+        """Report a score; a failing listener does not stop the ranking."""
+        try:
+            on_score(score)
+        except Exception as e:
+            self.logger.warning(f"Error reporting score of {score.symbol}: {e}")
+    
+    @staticmethod
+    def _combined_score(score: DualScore) -> float:
+        """Score a ranking sorts by: average of OpenAI and local."""
+        return (score.openai_score + score.local_score) / 2
+    
+    def _score_collection(self, collection_id: str, symbols: List[str], cancel_event: threading.Event,
+                          timeout: Optional[float] = None,
+                          on_score: Optional[Callable[[DualScore], None]] = None) -> Tuple[List[DualScore], List[str]]:
+        """
+        Dual-score symbols of a collection.
+        
+        Returns:
+            (dual_scores, skipped): scores in collection order, and the symbols
+            not scored before the deadline or cancellation
+        """
+        if cancel_event.is_set():
+            self.logger.info("Hybrid ranking cancelled before scoring started")
+            return [], list(symbols)
+        
+        # Load every symbol once; change checks, scoring and explanations share the contexts
+        market_context = self._get_market_context()
+        contexts = self._load_symbol_contexts(collection_id, symbols)
+        technical_data_dict = {symbol: context.technical_data for symbol, context in contexts.items()}
+        
+        # Determine which symbols need fresh analysis
+        symbols_needing_analysis = self.openai_storage.get_symbols_needing_analysis(
+            collection_id, symbols, technical_data_dict, market_context
+        )
+        
+        self.logger.info(f"Found {len(symbols_needing_analysis)} symbols needing fresh analysis")
+        
+        # Stored analyses of the unchanged symbols, read in one query
+        needing = set(symbols_needing_analysis)
+        stored = self.openai_storage.get_latest_analyses(
+            collection_id, [symbol for symbol in contexts if symbol not in needing]
+        )
+        for symbol, analysis in stored.items():
+            contexts[symbol].openai_analysis = analysis
+        
+        deadline = time.monotonic() + (self.ranking_timeout if timeout is None else timeout)
+        
+        # Fresh OpenAI analyses go out as one concurrent, rate limited batch. A slow API
+        # must not use up the deadline: symbols with stored analyses still need scoring.
+        self._prefetch_openai_analyses(symbols_needing_analysis, contexts, market_context,
+                                       (deadline - time.monotonic()) * PREFETCH_TIMEOUT_FRACTION, cancel_event)
+        
+        # Score symbols on a bounded pool; stuck symbols are abandoned at their deadline
+        scores_by_symbol, skipped_symbols = self._score_symbols(
+            collection_id, symbols, symbols_needing_analysis, cancel_event,
+            max(0.0, deadline - time.monotonic()), contexts, market_context, on_score
+        )
+        
+        # Combine results in collection order
+        dual_scores = []
+        for symbol in symbols:
+            dual_scores.extend(scores_by_symbol.get(symbol, []))
+        return dual_scores, skipped_symbols
+    
+    def cancel(self):
+        """Stop the running ranking, or the next one if none has started; symbols already scored are returned."""
+        self._cancel_event.set()
+    
+    def _finish_run(self, cancel_event: threading.Event):
+        """Give the next run a fresh cancel event (scoring sets the run's own when it stops)."""
+        if self._cancel_event is cancel_event:
+            self._cancel_event = threading.Event()
+    
+    def _score_symbols(self, collection_id: str, symbols: List[str], symbols_needing_analysis: List[str],
+                       cancel_event: threading.Event, timeout: float,
+                       contexts: Optional[Dict[str, SymbolContext]] = None,
+                       market_context: Optional[Dict] = None,
+                       on_score: Optional[Callable[[DualScore], None]] = None) -> Tuple[Dict[str, List[DualScore]], List[str]]:
+        """
+        Score symbols on a bounded thread pool.
+        
+        Returns:
+            (scores, skipped): dual scores by symbol, and the symbols that timed
+            out or were not reached before the deadline or cancellation
+        """
+        started = {}
+        scores = {}
+        timed_out = []
+        deadline = time.monotonic() + timeout
+        
+        def score_symbol(symbol):
+            if cancel_event.is_set():
+                return []
+            started[symbol] = time.monotonic()
+            return self._process_hybrid_batch_incremental(collection_id, [symbol], symbols_needing_analysis,
+                                                          cancel_event, contexts, market_context)
+        
+        pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='hybrid-rank')
+        futures = {pool.submit(score_symbol, symbol): symbol for symbol in symbols}
+        pending = set(futures)
+        try:
+            while pending and not cancel_event.is_set():
+                now = time.monotonic()
+                
+                # Abandon symbols running past their own deadline
+                for future in list(pending):
+                    symbol = futures[future]
+                    if symbol in started and now - started[symbol] > self.symbol_timeout:
+                        pending.discard(future)
+                        timed_out.append(symbol)
+                        self.logger.warning(f"Scoring {symbol} exceeded {self.symbol_timeout}s, skipping it")
+                
+                if now >= deadline:
+                    self.logger.warning(f"Hybrid ranking deadline reached with {len(pending)} symbols unscored")
+                    break
+                if not pending:
+                    break
+                
+                expiries = [started[futures[f]] + self.symbol_timeout for f in pending if futures[f] in started]
+                wake_at = min(expiries + [deadline, now + CANCEL_POLL_INTERVAL])
+                done, pending = wait(pending, timeout=max(0.0, wake_at - now), return_when=FIRST_COMPLETED)
+                
+                for future in done:
+                    symbol = futures[future]
+                    try:
+                        scores[symbol] = future.result()
+                    except Exception as e:
+                        self.logger.error(f"Error scoring {symbol}: {e}")
+                        continue
+                    if on_score is not None:
+                        for score in scores[symbol]:
+                            self._notify(on_score, score)
+        finally:
+            # Queued symbols never start; running ones stop at their next check
+            cancel_event.set()
+            pool.shutdown(wait=False, cancel_futures=True)
+        
+        skipped = [symbol for symbol in symbols if symbol not in scores]
+        if skipped:
+            self.logger.info(f"Returning partial hybrid ranking: {len(scores)} scored, {len(skipped)} skipped")
+        return scores, skipped
+    
+    def _load_symbol_contexts(self, collection_id: str, symbols: List[str]) -> Dict[str, SymbolContext]:
+        """Read each symbol's indicators once and derive the data every later step needs."""
+        contexts = {}
+        for symbol in symbols:
+            stock_data = self.data_manager.get_symbol_indicators(collection_id, symbol)
+            if stock_data is not None and not stock_data.empty:
+                contexts[symbol] = SymbolContext(symbol, stock_data, self._prepare_technical_data_for_openai(stock_data))
+        self.logger.info(f"Loaded indicators for {len(contexts)} of {len(symbols)} symbols")
+        return contexts
+    
+    def _prefetch_openai_analyses(self, symbols: List[str], contexts: Dict[str, SymbolContext],
+                                  market_context: Dict, timeout: float, cancel_event: threading.Event):
+        """
+        Run the fresh OpenAI analyses of a ranking as one batch.
+        
+        Each analysis is kept on its symbol's context; symbols the batch did
+        not finish fall back to a per-symbol call while scoring.
+        """
+        if not self.openai_analyzer.is_available():
+            return
+        
+        items = {symbol: (contexts[symbol].technical_data, market_context)
+                 for symbol in symbols if symbol in contexts}
+        if not items:
+            return
+        
+        start = time.time()
+        analyses = self.openai_analyzer.analyze_stocks_comprehensive(items, timeout=timeout,
+                                                                      cancel_event=cancel_event)
+        for symbol, analysis in analyses.items():
+            contexts[symbol].openai_analysis = analysis
+        self.logger.info(f"Prefetched {len(analyses)} of {len(items)} OpenAI analyses in {time.time() - start:.2f}s")
     
     def _process_hybrid_batch(self, collection_id: str, symbols: List[str]) -> List[DualScore]:
         """Process a batch of stocks with dual scoring."""
@@ -239,18 +483,32 @@ class HybridRankingEngine:
         return scores
     
     def _process_hybrid_batch_incremental(self, collection_id: str, symbols: List[str], 
-                                        symbols_needing_analysis: List[str]) -> List[DualScore]:
-        """Process a batch of symbols with incremental hybrid scoring."""
+                                        symbols_needing_analysis: List[str],
+                                        cancel_event: Optional[threading.Event] = None,
+                                        contexts: Optional[Dict[str, SymbolContext]] = None,
+                                        market_context: Optional[Dict] = None) -> List[DualScore]:
+        """
+        Process a batch of symbols with incremental hybrid scoring.
+        
+        contexts and market_context come from the ranking run's load stage;
+        when omitted the batch loads its own.
+        """
         dual_scores = []
+        if contexts is None:
+            contexts = self._load_symbol_contexts(collection_id, symbols)
+        if market_context is None:
+            market_context = self._get_market_context()
         
         for symbol in symbols:
+            if cancel_event is not None and cancel_event.is_set():
+                break
             try:
                 # Get stock data
-                stock_data = self.data_manager.get_symbol_indicators(collection_id, symbol)
-                
-                if stock_data is None or stock_data.empty:
+                context = contexts.get(symbol)
+                if context is None:
                     self.logger.warning(f"No data available for {symbol}")
                     continue
+                stock_data = context.stock_data
                 
                 # Calculate local score
                 try:
@@ -263,17 +521,18 @@ class HybridRankingEngine:
                 if symbol in symbols_needing_analysis:
                     self.logger.info(f"Performing fresh OpenAI analysis for {symbol}")
                     
-                    # Calculate OpenAI score with comprehensive analysis
+                    # Calculate OpenAI score with comprehensive analysis, unless the batch already did
                     try:
-                        openai_score = self._calculate_openai_score(symbol, stock_data)
+                        if context.openai_analysis is not None:
+                            openai_score = float(context.openai_analysis['score'])
+                        else:
+                            openai_score = self._calculate_openai_score(symbol, stock_data, context.technical_data,
+                                                                        market_context)
                     except Exception as openai_error:
                         self.logger.warning(f"Error calculating OpenAI score for {symbol}: {openai_error}")
                         openai_score = 50.0
                     
                     # Store the analysis result
-                    technical_data = self._prepare_technical_data_for_openai(stock_data)
-                    market_context = self._get_market_context()
-                    
                     analysis_data = {
                         'score': openai_score,
                         'analysis': f'Comprehensive analysis for {symbol}',
@@ -283,19 +542,21 @@ class HybridRankingEngine:
                     }
                     
                     self.openai_storage.store_analysis_result(
-                        symbol, collection_id, analysis_data, technical_data, market_context
+                        symbol, collection_id, analysis_data, context.technical_data, market_context
                     )
                     
                 else:
                     # Use cached OpenAI analysis
-                    cached_analysis = self.openai_storage.get_latest_analysis(symbol, collection_id)
+                    cached_analysis = context.openai_analysis or self.openai_storage.get_latest_analysis(
+                        symbol, collection_id)
                     if cached_analysis:
                         self.logger.info(f"Using cached OpenAI analysis for {symbol}")
                         openai_score = cached_analysis['score']
                     else:
                         self.logger.warning(f"No cached analysis for {symbol}, performing fresh analysis")
                         try:
-                            openai_score = self._calculate_openai_score(symbol, stock_data)
+                            openai_score = self._calculate_openai_score(symbol, stock_data, context.technical_data,
+                                                                        market_context)
                         except Exception as openai_error:
                             self.logger.warning(f"Error calculating OpenAI score for {symbol}: {openai_error}")
                             openai_score = 50.0
@@ -433,17 +694,21 @@ class HybridRankingEngine:
             self.logger.error(f"Error calculating local score: {e}")
             return 50.0
     
-    def _calculate_openai_score(self, symbol: str, stock_data) -> float:
+    def _calculate_openai_score(self, symbol: str, stock_data, technical_data: Optional[Dict] = None,
+                                market_context: Optional[Dict] = None) -> float:
         """Calculate score using OpenAI analysis."""
         try:
-            # Prepare data for OpenAI
-            technical_data = self._prepare_technical_data_for_openai(stock_data)
+            # Prepare data for OpenAI unless the ranking run already has it
+            if technical_data is None:
+                technical_data = self._prepare_technical_data_for_openai(stock_data)
+            if market_context is None:
+                market_context = self._get_market_context()
             
             # Get OpenAI analysis
             openai_analysis = self.openai_analyzer.analyze_stock_comprehensive(
                 symbol=symbol,
                 technical_data=technical_data,
-                market_context=self._get_market_context()
+                market_context=market_context
             )
             
             # Extract score from OpenAI response
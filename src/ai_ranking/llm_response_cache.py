@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+LLM Response Cache
+
+Memoizes chat completions under a hash of the model, prompt messages and
+sampling parameters, so an identical prompt is answered once however many
+collections, rankings or processes ask for it within the TTL. Lookups are
+single-flight: while a response is being fetched, identical requests wait
+for that call instead of sending their own, whether they come from other
+threads (dashboard and scheduler) or other tasks of the same batch.
+
+The cache counts hits, shared in-flight calls and the tokens and dollars
+they saved.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Maximum age of a cached response (seconds) and entries kept before LRU eviction
+DEFAULT_TTL_SECONDS = 12 * 3600
+DEFAULT_MAX_ENTRIES = 4096
+
+# How often async waiters check an in-flight call (seconds)
+FLIGHT_POLL_INTERVAL = 0.02
+
+# USD per 1K (prompt, completion) tokens, for the cost avoided by hits
+MODEL_PRICES = {
+    'gpt-4o-mini': (0.00015, 0.0006),
+    'gpt-4o': (0.0025, 0.01),
+    'gpt-4-turbo': (0.01, 0.03),
+    'gpt-3.5-turbo': (0.0005, 0.0015)
+}
+
+
+def prompt_key(model: str, messages: List[Dict[str, Any]], **params) -> str:
+    """
+    Hash of everything that determines a completion
+
+    Args:
+        model: Model name
+        messages: Chat messages, in order
+        **params: Sampling parameters (max_tokens, temperature, ...)
+
+    Returns:
+        SHA-256 hex digest
+    """
+    payload = {'model': model, 'messages': messages, 'params': params}
+    encoded = json.dumps(payload, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+@dataclass
+class CachedResponse:
+    """A completion and the tokens it cost."""
+    value: Any
+    model: str = ''
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    created: float = 0.0
+
+    def cost(self) -> float:
+        """Price of the call in USD (0 for models without a known price)."""
+        prompt_price, completion_price = MODEL_PRICES.get(self.model, (0.0, 0.0))
+        return (self.prompt_tokens * prompt_price + self.completion_tokens * completion_price) / 1000
+
+
+class _Flight:
+    """A call in progress that identical requests wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.response: Optional[CachedResponse] = None
+        self.error: Optional[BaseException] = None
+
+
+class LLMResponseCache:
+    """Thread-safe LRU cache of LLM responses with TTL and single-flight calls"""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, ttl_seconds: Optional[float] = DEFAULT_TTL_SECONDS):
+        """
+        Args:
+            max_entries: Entries kept before the least recently used is evicted
+            ttl_seconds: Maximum age of an entry (None keeps entries until evicted)
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._flights: Dict[str, _Flight] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.shared = 0
+        self.tokens_saved = 0
+        self.cost_avoided = 0.0
+        self.logger = logging.getLogger(__name__)
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """Cached response for key, or None"""
+        with self._lock:
+            response = self._lookup(key)
+            if response is None:
+                self.misses += 1
+            else:
+                self._count_saved(response, 'hits')
+            return response
+
+    def put(self, key: str, value: Any, model: str = '', prompt_tokens: int = 0, completion_tokens: int = 0):
+        """Store a response and what it cost"""
+        with self._lock:
+            self._store(key, CachedResponse(value, model, prompt_tokens, completion_tokens, time.time()))
+
+    def get_or_call(self, key: str, call: Callable[[], Tuple[Any, int, int]], model: str = '',
+                    cacheable: Callable[[Any], bool] = lambda value: True) -> Any:
+        """
+        Cached value for key, calling at most once across threads on a miss
+
+        Args:
+            key: Key from prompt_key
+            call: Makes the request; returns (value, prompt_tokens, completion_tokens)
+            model: Model name, for the cost of the call
+            cacheable: Whether a value may be stored (e.g. not an error reply)
+
+        Returns:
+            The value; waiting callers get the leader's value or its exception
+        """
+        while True:
+            flight, leader, cached = self._join(key)
+            if cached is not None:
+                return cached.value
+            if leader:
+                return self._lead(key, flight, call, model, cacheable)
+            flight.done.wait()
+            if flight.response is not None or flight.error is not None:
+                return self._follow(flight)
+
+    async def aget_or_call(self, key: str, call: Callable[[], Awaitable[Tuple[Any, int, int]]], model: str = '',
+                           cacheable: Callable[[Any], bool] = lambda value: True) -> Any:
+        """
+        Async form of get_or_call
+
+        Waiting tasks poll the call rather than block their event loop, so
+        they can be cancelled while a call led by another thread runs on.
+        """
+        while True:
+            flight, leader, cached = self._join(key)
+            if cached is not None:
+                return cached.value
+            if leader:
+                try:
+                    value, prompt_tokens, completion_tokens = await call()
+                except BaseException as e:
+                    self._land(key, flight, error=e)
+                    raise
+                return self._land(key, flight, value, model, prompt_tokens, completion_tokens, cacheable)
+            while not flight.done.is_set():
+                await asyncio.sleep(FLIGHT_POLL_INTERVAL)
+            if flight.response is not None or flight.error is not None:
+                return self._follow(flight)
+
+    def _join(self, key: str) -> Tuple[_Flight, bool, Optional[CachedResponse]]:
+        """A cached response, or the flight to wait on, or a new flight to lead."""
+        with self._lock:
+            response = self._lookup(key)
+            if response is not None:
+                self._count_saved(response, 'hits')
+                return None, False, response
+            flight = self._flights.get(key)
+            if flight is not None:
+                return flight, False, None
+            self.misses += 1
+            flight = self._flights[key] = _Flight()
+            return flight, True, None
+
+    def _lead(self, key: str, flight: _Flight, call, model: str, cacheable) -> Any:
+        try:
+            value, prompt_tokens, completion_tokens = call()
+        except BaseException as e:
+            self._land(key, flight, error=e)
+            raise
+        return self._land(key, flight, value, model, prompt_tokens, completion_tokens, cacheable)
+
+    def _land(self, key: str, flight: _Flight, value: Any = None, model: str = '', prompt_tokens: int = 0,
+              completion_tokens: int = 0, cacheable: Callable[[Any], bool] = lambda value: True,
+              error: Optional[BaseException] = None) -> Any:
+        """Finish a flight: store the response and release the waiters."""
+        with self._lock:
+            if error is None:
+                flight.response = CachedResponse(value, model, prompt_tokens, completion_tokens, time.time())
+                if cacheable(value):
+                    self._store(key, flight.response)
+            elif not isinstance(error, (asyncio.CancelledError, KeyboardInterrupt)):
+                # Waiters share a failed call; a cancelled leader lets one of them retry instead
+                flight.error = error
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+        flight.done.set()
+        return value
+
+    def _follow(self, flight: _Flight) -> Any:
+        """Value of a call another caller made."""
+        if flight.error is not None:
+            raise flight.error
+        with self._lock:
+            self._count_saved(flight.response, 'shared')
+        return flight.response.value
+
+    def _lookup(self, key: str) -> Optional[CachedResponse]:
+        response = self._entries.get(key)
+        if response is None:
+            return None
+        if self.ttl_seconds is not None and time.time() - response.created > self.ttl_seconds:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return response
+
+    def _store(self, key: str, response: CachedResponse):
+        self._entries[key] = response
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _count_saved(self, response: CachedResponse, counter: str):
+        setattr(self, counter, getattr(self, counter) + 1)
+        self.tokens_saved += response.prompt_tokens + response.completion_tokens
+        self.cost_avoided += response.cost()
+
+    def invalidate(self, key: Optional[str] = None):
+        """Drop one entry, or everything"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Entry count, hit rate, and the tokens and cost saved"""
+        with self._lock:
+            lookups = self.hits + self.shared + self.misses
+            return {
+                'entries': len(self._entries),
+                'in_flight': len(self._flights),
+                'hits': self.hits,
+                'shared_in_flight': self.shared,
+                'misses': self.misses,
+                'hit_rate': (self.hits + self.shared) / lookups if lookups else 0.0,
+                'tokens_saved': self.tokens_saved,
+                'cost_avoided_usd': round(self.cost_avoided, 6)
+            }
+
+
+# Process-wide cache shared by every analyzer and batch client
+shared_response_cache = LLMResponseCache()
@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+"""
+Async Batched OpenAI Client
+
+Sends many chat completion requests concurrently from one asyncio event
+loop instead of one blocking call per symbol:
+
+1. A concurrency cap bounds the requests in flight
+2. A requests/tokens per minute limiter keeps the batch under the account's
+   rate limits instead of discovering them through 429s
+3. 429, 5xx and connection failures are retried with full-jitter
+   exponential backoff, honouring Retry-After
+4. Identical requests in flight are coalesced into one API call, and with
+   an LLMResponseCache answered from (and shared with) the cache
+
+run_batch() is the synchronous entry point for ranking threads; it runs
+the batch on its own event loop and so must not be called from inside a
+running loop.
+"""
+
+import asyncio
+import logging
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass, field, asdict
+from typing import Callable, Dict, List, Optional
+
+try:
+    import openai
+    OPENAI_AVAILABLE = True
+except ImportError:
+    OPENAI_AVAILABLE = False
+    openai = None
+
+from .llm_response_cache import LLMResponseCache, prompt_key
+
+logger = logging.getLogger(__name__)
+
+# Requests in flight at once, and the account limits the limiter keeps under
+DEFAULT_MAX_CONCURRENCY = 8
+DEFAULT_REQUESTS_PER_MINUTE = 500
+DEFAULT_TOKENS_PER_MINUTE = 200000
+
+# Retry policy: attempts after the first, backoff base and ceiling (seconds)
+DEFAULT_MAX_RETRIES = 5
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 30.0
+RETRY_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+# Per-request timeout (seconds) and rough characters per token for estimates
+DEFAULT_REQUEST_TIMEOUT = 60.0
+CHARS_PER_TOKEN = 4
+
+# Longest wait between checks for cancellation (seconds)
+CANCEL_POLL_INTERVAL = 0.25
+
+
+@dataclass
+class ChatRequest:
+    """One chat completion request."""
+    messages: List[Dict[str, str]]
+    model: str = 'gpt-4o-mini'
+    max_tokens: int = 500
+    temperature: float = 0.3
+
+    def key(self) -> str:
+        """Hash identifying identical requests (the response cache key)."""
+        return prompt_key(self.model, self.messages, max_tokens=self.max_tokens, temperature=self.temperature)
+
+    def estimated_tokens(self) -> int:
+        """Upper estimate of the tokens the request will use, for the limiter."""
+        prompt_chars = sum(len(str(message.get('content', ''))) for message in self.messages)
+        return prompt_chars // CHARS_PER_TOKEN + self.max_tokens
+
+
+@dataclass
+class ChatResult:
+    """Outcome of a chat request; content is None when it failed, attempts 0 when it was not sent."""
+    content: Optional[str] = None
+    error: Optional[str] = None
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    attempts: int = 0
+    latency: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.content is not None
+
+
+class RequestFailed(Exception):
+    """A request that failed after its retries, shared with identical waiting requests."""
+
+    def __init__(self, result: ChatResult):
+        super().__init__(result.error)
+        self.result = result
+
+
+@dataclass
+class BatchClientStats:
+    """Counters accumulated over the client's lifetime."""
+    requests: int = 0
+    api_calls: int = 0
+    coalesced: int = 0
+    retries: int = 0
+    rate_limited: int = 0
+    failures: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    limiter_wait: float = 0.0
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+class RateLimiter:
+    """
+    Token buckets for requests and tokens per minute.
+
+    Each bucket holds at most one minute of budget and refills continuously.
+    A request waits until both buckets cover it. Token use is estimated up
+    front and corrected with settle() once the real usage is known.
+    """
+
+    def __init__(self, requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE,
+                 tokens_per_minute: float = DEFAULT_TOKENS_PER_MINUTE,
+                 clock: Callable[[], float] = time.monotonic):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._clock = clock
+        self._requests = float(requests_per_minute)
+        self._tokens = float(tokens_per_minute)
+        self._updated = clock()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        elapsed = max(0.0, now - self._updated)
+        self._requests = min(self.requests_per_minute, self._requests + elapsed * self.requests_per_minute / 60)
+        self._tokens = min(self.tokens_per_minute, self._tokens + elapsed * self.tokens_per_minute / 60)
+        self._updated = now
+
+    def try_acquire(self, tokens: int) -> float:
+        """
+        Take budget for one request if it is available.
+
+        Returns:
+            0.0 when acquired, otherwise the seconds to wait before trying again
+        """
+        # A request larger than the whole bucket only has to wait for a full one
+        tokens = min(tokens, self.tokens_per_minute)
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            if now < self._paused_until:
+                return self._paused_until - now
+            if self._requests >= 1 and self._tokens >= tokens:
+                self._requests -= 1
+                self._tokens -= tokens
+                return 0.0
+            request_wait = (1 - self._requests) * 60 / self.requests_per_minute
+            token_wait = (tokens - self._tokens) * 60 / self.tokens_per_minute
+            return max(request_wait, token_wait, 0.001)
+
+    async def acquire(self, tokens: int) -> float:
+        """Wait for budget for one request; returns the seconds waited."""
+        waited = 0.0
+        while True:
+            delay = self.try_acquire(tokens)
+            if delay <= 0:
+                return waited
+            await asyncio.sleep(delay)
+            waited += delay
+
+    def settle(self, estimated: int, actual: int):
+        """Refund or charge the difference between estimated and actual tokens."""
+        with self._lock:
+            self._tokens = min(self.tokens_per_minute, self._tokens + estimated - actual)
+
+    def pause(self, seconds: float):
+        """Hold every request for a while, e.g. after the server answered 429."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, self._clock() + seconds)
+
+
+class AsyncOpenAIBatchClient:
+    """
+    Concurrent, rate limited chat completions against the OpenAI API.
+
+    The limiter, statistics and optional response cache live on the client
+    and carry over between batches; connections, the concurrency cap and
+    coalescing are per batch.
+    """
+
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None,
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE,
+                 tokens_per_minute: float = DEFAULT_TOKENS_PER_MINUTE,
+                 max_retries: int = DEFAULT_MAX_RETRIES,
+                 request_timeout: float = DEFAULT_REQUEST_TIMEOUT,
+                 cache: Optional[LLMResponseCache] = None):
+        self.api_key = api_key or os.getenv('OPENAI_API_KEY')
+        self.base_url = base_url or os.getenv('OPENAI_BASE_URL')
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.max_retries = max(0, int(max_retries))
+        self.request_timeout = request_timeout
+        self.cache = cache
+        self.limiter = RateLimiter(requests_per_minute, tokens_per_minute)
+        self.stats = BatchClientStats()
+        self.logger = logging.getLogger(__name__)
+
+    def is_available(self) -> bool:
+        """Check if requests can be sent."""
+        return OPENAI_AVAILABLE and bool(self.api_key)
+
+    def run_batch(self, requests: List[ChatRequest], timeout: Optional[float] = None,
+                  cancel_event: Optional[threading.Event] = None) -> List[Optional[ChatResult]]:
+        """
+        Send a batch of requests and wait for them.
+
+        Args:
+            requests: Chat requests; identical ones share one API call
+            timeout: Seconds the whole batch may take
+            cancel_event: Set to stop the batch early
+
+        Returns:
+            Results in request order; None for requests that had not finished
+            when the timeout passed or the batch was cancelled
+        """
+        if not requests:
+            return []
+        return asyncio.run(self.complete_many(requests, timeout, cancel_event))
+
+    async def complete_many(self, requests: List[ChatRequest], timeout: Optional[float] = None,
+                            cancel_event: Optional[threading.Event] = None) -> List[Optional[ChatResult]]:
+        """Async form of run_batch."""
+        if not self.is_available():
+            raise RuntimeError("OpenAI client not available (package missing or no API key)")
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        inflight: Dict[str, asyncio.Task] = {}
+        self.stats.requests += len(requests)
+
+        async with openai.AsyncOpenAI(api_key=self.api_key, base_url=self.base_url, max_retries=0,
+                                      timeout=self.request_timeout) as client:
+            tasks = []
+            for request in requests:
+                key = request.key()
+                if key in inflight:
+                    self.stats.coalesced += 1
+                else:
+                    inflight[key] = asyncio.ensure_future(self._complete(client, semaphore, request))
+                tasks.append(inflight[key])
+
+            pending = set(inflight.values())
+            deadline = None if timeout is None else time.monotonic() + timeout
+            try:
+                while pending:
+                    if cancel_event is not None and cancel_event.is_set():
+                        self.logger.info(f"OpenAI batch cancelled with {len(pending)} requests unfinished")
+                        break
+                    wait_for = CANCEL_POLL_INTERVAL if cancel_event is not None else None
+                    if deadline is not None:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            self.logger.warning(f"OpenAI batch timed out with {len(pending)} requests unfinished")
+                            break
+                        wait_for = remaining if wait_for is None else min(wait_for, remaining)
+                    _, pending = await asyncio.wait(pending, timeout=wait_for)
+            finally:
+                for task in pending:
+                    task.cancel()
+                if pending:
+                    await asyncio.gather(*pending, return_exceptions=True)
+
+        return [task.result() if task.done() and not task.cancelled() else None for task in tasks]
+
+    async def _complete(self, client, semaphore: asyncio.Semaphore, request: ChatRequest) -> ChatResult:
+        """Result from the response cache, or from the API on a miss."""
+        if self.cache is None:
+            return await self._send(client, semaphore, request)
+
+        # The cache holds completion text; failures reach waiters as RequestFailed
+        sent = []
+
+        async def call():
+            result = await self._send(client, semaphore, request)
+            sent.append(result)
+            if not result.ok:
+                raise RequestFailed(result)
+            return result.content, result.prompt_tokens, result.completion_tokens
+
+        try:
+            content = await self.cache.aget_or_call(request.key(), call, request.model)
+        except RequestFailed as e:
+            return e.result
+        return sent[0] if sent else ChatResult(content=content)
+
+    async def _send(self, client, semaphore: asyncio.Semaphore, request: ChatRequest) -> ChatResult:
+        """Send one request, retrying rate limits and transient failures."""
+        estimated = request.estimated_tokens()
+        start = time.monotonic()
+        error = None
+
+        for attempt in range(self.max_retries + 1):
+            self.stats.limiter_wait += await self.limiter.acquire(estimated)
+            retry_after = None
+            async with semaphore:
+                self.stats.api_calls += 1
+                try:
+                    response = await client.chat.completions.create(
+                        model=request.model,
+                        messages=request.messages,
+                        max_tokens=request.max_tokens,
+                        temperature=request.temperature
+                    )
+                except openai.APIStatusError as e:
+                    self.limiter.settle(estimated, 0)
+                    error = f"HTTP {e.status_code}: {e}"
+                    if e.status_code not in RETRY_STATUS_CODES:
+                        break
+                    if e.status_code == 429:
+                        self.stats.rate_limited += 1
+                    retry_after = self._retry_after(e.response)
+                except openai.APIConnectionError as e:
+                    self.limiter.settle(estimated, 0)
+                    error = f"Connection error: {e}"
+                else:
+                    usage = getattr(response, 'usage', None)
+                    prompt_tokens = getattr(usage, 'prompt_tokens', 0) or 0
+                    completion_tokens = getattr(usage, 'completion_tokens', 0) or 0
+                    self.limiter.settle(estimated, prompt_tokens + completion_tokens)
+                    self.stats.prompt_tokens += prompt_tokens
+                    self.stats.completion_tokens += completion_tokens
+                    return ChatResult(content=response.choices[0].message.content,
+                                      prompt_tokens=prompt_tokens, completion_tokens=completion_tokens,
+                                      attempts=attempt + 1, latency=time.monotonic() - start)
+
+            if attempt == self.max_retries:
+                break
+
+            # Full jitter spreads retries out so they do not arrive together
+            delay = random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+            if retry_after is not None:
+                delay = max(delay, retry_after)
+                self.limiter.pause(retry_after)
+            self.stats.retries += 1
+            self.logger.debug(f"Retrying OpenAI request in {delay:.2f}s after {error}")
+            await asyncio.sleep(delay)
+
+        self.stats.failures += 1
+        self.logger.warning(f"OpenAI request failed after {attempt + 1} attempts: {error}")
+        return ChatResult(error=error, attempts=attempt + 1, latency=time.monotonic() - start)
+
+    @staticmethod
+    def _retry_after(response) -> Optional[float]:
+        """Seconds from a Retry-After (or retry-after-ms) header, if any."""
+        headers = getattr(response, 'headers', None) or {}
+        try:
+            if headers.get('retry-after-ms'):
+                return float(headers['retry-after-ms']) / 1000
+            if headers.get('retry-after'):
+                return float(headers['retry-after'])
+        except (TypeError, ValueError):
+            pass
+        return None
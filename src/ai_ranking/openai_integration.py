@@ -11,6 +11,7 @@ This module provides OpenAI/GPT integration for:
 
 import logging
 import os
+import threading
 from typing import Dict, List, Optional, Tuple
 import json
 from datetime import datetime
@@ -26,6 +27,9 @@ except ImportError:
     OPENAI_AVAILABLE = False
     openai = None
 
+from .openai_batch_client import AsyncOpenAIBatchClient, ChatRequest
+from .llm_response_cache import LLMResponseCache, shared_response_cache
+
 class OpenAIStockAnalyzer:
     """
     OpenAI-powered stock analysis for enhanced explanations and insights.
@@ -37,11 +41,16 @@ class OpenAIStockAnalyzer:
     - Professional investment recommendations
     """
     
-    def __init__(self):
+    def __init__(self, batch_client: Optional[AsyncOpenAIBatchClient] = None,
+                 response_cache: Optional[LLMResponseCache] = shared_response_cache):
         self.logger = logging.getLogger(__name__)
         self.client = None
         self.api_key = os.getenv('OPENAI_API_KEY')
         
+        # Comprehensive analyses are cached by prompt across analyzers (None disables)
+        self.response_cache = response_cache
+        self.batch_client = batch_client or AsyncOpenAIBatchClient(api_key=self.api_key, cache=response_cache)
+        
         if not self.api_key:
             self.logger.warning("OpenAI API key not found in environment variables")
             return
@@ -109,34 +118,91 @@ class OpenAIStockAnalyzer:
                 return {'score': 50.0, 'analysis': 'OpenAI not available'}
             
             # Prepare prompt for comprehensive analysis
-            prompt = self._build_comprehensive_analysis_prompt(symbol, technical_data, market_context)
-            
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": "You are an expert stock analyst. Provide comprehensive analysis with numerical scores (0-100) and detailed insights."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=500,
-                temperature=0.3
-            )
-            
-            analysis_text = response.choices[0].message.content
-            
-            # Extract score from response
-            score = self._extract_score_from_analysis(analysis_text)
+            request = self._build_comprehensive_request(symbol, technical_data, market_context)
+            
+            def call():
+                response = self.client.chat.completions.create(
+                    model=request.model,
+                    messages=request.messages,
+                    max_tokens=request.max_tokens,
+                    temperature=request.temperature
+                )
+                usage = getattr(response, 'usage', None)
+                return (response.choices[0].message.content, getattr(usage, 'prompt_tokens', 0) or 0,
+                        getattr(usage, 'completion_tokens', 0) or 0)
+            
+            if self.response_cache is None:
+                analysis_text = call()[0]
+            else:
+                analysis_text = self.response_cache.get_or_call(request.key(), call, request.model)
             
-            return {
-                'score': score,
-                'analysis': analysis_text,
-                'technical_insights': self._extract_technical_insights(analysis_text),
-                'recommendation': self._extract_recommendation(analysis_text)
-            }
+            return self._parse_comprehensive_analysis(analysis_text)
             
         except Exception as e:
             self.logger.error(f"Error in comprehensive stock analysis: {e}")
             return {'score': 50.0, 'analysis': f'Analysis failed: {str(e)}'}
     
+    def analyze_stocks_comprehensive(self, items: Dict[str, Tuple[Optional[Dict], Optional[Dict]]],
+                                     timeout: Optional[float] = None,
+                                     cancel_event: Optional[threading.Event] = None) -> Dict[str, Dict]:
+        """
+        Comprehensive analysis of many stocks in one concurrent, rate limited batch.
+        
+        Args:
+            items: (technical_data, market_context) by symbol
+            timeout: Seconds the whole batch may take
+            cancel_event: Set to stop the batch early
+            
+        Returns:
+            Analysis by symbol, as from analyze_stock_comprehensive; symbols
+            not finished before the timeout or cancellation are left out
+        """
+        if not items:
+            return {}
+        if not self.is_available() or not self.batch_client.is_available():
+            self.logger.warning("OpenAI client not available")
+            return {symbol: {'score': 50.0, 'analysis': 'OpenAI not available'} for symbol in items}
+        
+        symbols = list(items)
+        requests = [self._build_comprehensive_request(symbol, *items[symbol]) for symbol in symbols]
+        results = self.batch_client.run_batch(requests, timeout=timeout, cancel_event=cancel_event)
+        
+        analyses = {}
+        for symbol, result in zip(symbols, results):
+            if result is None:
+                continue
+            if result.ok:
+                analyses[symbol] = self._parse_comprehensive_analysis(result.content)
+            else:
+                self.logger.error(f"Error in comprehensive stock analysis for {symbol}: {result.error}")
+                analyses[symbol] = {'score': 50.0, 'analysis': f'Analysis failed: {result.error}'}
+        
+        self.logger.info(f"Batch analysed {len(analyses)} of {len(symbols)} stocks "
+                         f"({self.batch_client.stats.retries} retries, {self.batch_client.stats.coalesced} coalesced so far)")
+        return analyses
+    
+    def _build_comprehensive_request(self, symbol: str, technical_data: Dict, market_context: Dict) -> ChatRequest:
+        """Chat request for a comprehensive analysis."""
+        prompt = self._build_comprehensive_analysis_prompt(symbol, technical_data, market_context)
+        return ChatRequest(
+            messages=[
+                {"role": "system", "content": "You are an expert stock analyst. Provide comprehensive analysis with numerical scores (0-100) and detailed insights."},
+                {"role": "user", "content": prompt}
+            ],
+            model="gpt-4o-mini",
+            max_tokens=500,
+            temperature=0.3
+        )
+    
+    def _parse_comprehensive_analysis(self, analysis_text: str) -> Dict:
+        """Score, insights and recommendation from a comprehensive analysis response."""
+        return {
+            'score': self._extract_score_from_analysis(analysis_text),
+            'analysis': analysis_text,
+            'technical_insights': self._extract_technical_insights(analysis_text),
+            'recommendation': self._extract_recommendation(analysis_text)
+        }
+    
     def _build_comprehensive_analysis_prompt(self, symbol: str, technical_data: Dict, market_context: Dict) -> str:
         """Build comprehensive analysis prompt for OpenAI."""
         prompt = f"""
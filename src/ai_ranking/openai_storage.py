@@ -9,13 +9,69 @@ enabling incremental updates and delta processing to avoid redundant calculation
 import sqlite3
 import json
 import hashlib
+import struct
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Tuple
 from pathlib import Path
+import numpy as np
 import pandas as pd
 
 from src.utils.logger import get_logger
 
+# Symbols per bulk query, below SQLite's bound-parameter limit
+BULK_QUERY_CHUNK = 500
+
+_pack_double = struct.Struct('<d').pack
+_pack_length = struct.Struct('<q').pack
+
+
+def _encode_canonical(value: Any, out: List[bytes]):
+    """Append a type-tagged, key-ordered binary encoding of value to out."""
+    if isinstance(value, dict):
+        keys = sorted(value, key=str)
+        values = [value[key] for key in keys]
+        # Flat dicts of floats (technical indicators) pack in one call
+        if all(isinstance(v, (float, np.floating)) for v in values):
+            out.append(b'D' + '\0'.join(map(str, keys)).encode() + b'\0' + struct.pack(f'<{len(values)}d', *values))
+            return
+        out.append(b'd' + _pack_length(len(keys)))
+        for key, v in zip(keys, values):
+            encoded_key = str(key).encode()
+            out.append(_pack_length(len(encoded_key)) + encoded_key)
+            _encode_canonical(v, out)
+    elif isinstance(value, (float, np.floating)):
+        out.append(b'f' + _pack_double(value))
+    elif isinstance(value, str):
+        encoded = value.encode()
+        out.append(b's' + _pack_length(len(encoded)) + encoded)
+    elif isinstance(value, (bool, np.bool_)):
+        out.append(b'T' if value else b'F')
+    elif isinstance(value, (int, np.integer)):
+        out.append(b'i' + str(int(value)).encode() + b';')
+    elif value is None:
+        out.append(b'n')
+    elif isinstance(value, (list, tuple, np.ndarray)):
+        out.append(b'l' + _pack_length(len(value)))
+        for item in value:
+            _encode_canonical(item, out)
+    else:
+        encoded = repr(value).encode()
+        out.append(b'r' + _pack_length(len(encoded)) + encoded)
+
+
+def canonical_bytes(value: Any) -> bytes:
+    """
+    Canonical binary encoding of technical data or market context.
+
+    Dict keys are sorted and every value carries a type tag, so equal data
+    always encodes the same and NumPy scalars encode like Python ones.
+    Several times cheaper than json.dumps(sort_keys=True) on indicator rows.
+    """
+    out = []
+    _encode_canonical(value, out)
+    return b''.join(out)
+
+
 class OpenAIAnalysisStorage:
     """Persistent storage for OpenAI analysis results with incremental updates."""
     
@@ -86,6 +142,8 @@ class OpenAIAnalysisStorage:
             # Create indexes for better performance
             conn.execute('CREATE INDEX IF NOT EXISTS idx_openai_symbol_date ON openai_analysis(symbol, analysis_date)')
             conn.execute('CREATE INDEX IF NOT EXISTS idx_openai_collection ON openai_analysis(collection_id)')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_openai_collection_symbol_latest '
+                         'ON openai_analysis(collection_id, symbol, analysis_date DESC, updated_at DESC)')
             conn.execute('CREATE INDEX IF NOT EXISTS idx_metadata_collection ON analysis_metadata(collection_id)')
             conn.execute('CREATE INDEX IF NOT EXISTS idx_deltas_symbol ON analysis_deltas(symbol)')
             
@@ -164,6 +222,59 @@ class OpenAIAnalysisStorage:
             self.logger.error(f"Error getting analysis for {symbol}: {e}")
             return None
     
+    def get_latest_analyses(self, collection_id: str, symbols: List[str]) -> Dict[str, Dict]:
+        """
+        Get the latest OpenAI analysis of many symbols at once.
+        
+        Returns:
+            Analysis by symbol, as from get_latest_analysis; symbols never
+            analysed in the collection are left out
+        """
+        try:
+            rows = self._latest_rows(collection_id, symbols,
+                                     'openai_score, analysis_text, technical_insights, '
+                                     'recommendation, confidence_level, analysis_date, data_hash')
+            return {
+                row[0]: {
+                    'score': row[1],
+                    'analysis': row[2],
+                    'technical_insights': row[3],
+                    'recommendation': row[4],
+                    'confidence_level': row[5],
+                    'analysis_date': row[6],
+                    'data_hash': row[7]
+                }
+                for row in rows
+            }
+        
+        except Exception as e:
+            self.logger.error(f"Error getting analyses for collection {collection_id}: {e}")
+            return {}
+    
+    def get_latest_data_hashes(self, collection_id: str, symbols: List[str]) -> Dict[str, str]:
+        """Data hash of each symbol's latest analysis; symbols never analysed are left out."""
+        return {row[0]: row[1] for row in self._latest_rows(collection_id, symbols, 'data_hash')}
+    
+    def _latest_rows(self, collection_id: str, symbols: List[str], columns: str) -> List[tuple]:
+        """(symbol, *columns) of each symbol's latest analysis, one indexed query per chunk of symbols."""
+        rows = []
+        symbols = list(dict.fromkeys(symbols))
+        with sqlite3.connect(self.db_path) as conn:
+            for i in range(0, len(symbols), BULK_QUERY_CHUNK):
+                chunk = symbols[i:i + BULK_QUERY_CHUNK]
+                placeholders = ','.join('?' * len(chunk))
+                rows.extend(conn.execute(f'''
+                    SELECT symbol, {columns} FROM (
+                        SELECT *, ROW_NUMBER() OVER (
+                            PARTITION BY symbol ORDER BY analysis_date DESC, updated_at DESC
+                        ) AS latest
+                        FROM openai_analysis
+                        WHERE collection_id = ? AND symbol IN ({placeholders})
+                    )
+                    WHERE latest = 1
+                ''', (collection_id, *chunk)).fetchall())
+        return rows
+    
     def check_data_changed(self, symbol: str, collection_id: str, technical_data: Optional[Dict] = None, 
                           market_context: Optional[Dict] = None) -> bool:
         """Check if data has changed since last analysis."""
@@ -183,14 +294,25 @@ class OpenAIAnalysisStorage:
     def get_symbols_needing_analysis(self, collection_id: str, symbols: List[str], 
                                    technical_data_dict: Dict[str, Dict] = None,
                                    market_context: Optional[Dict] = None) -> List[str]:
-        """Get list of symbols that need fresh analysis."""
+        """
+        Get list of symbols that need fresh analysis.
+        
+        The stored hashes of all symbols are read in one query and the market
+        context is encoded once, then each symbol's data hash is compared.
+        """
         try:
+            stored_hashes = self.get_latest_data_hashes(collection_id, symbols)
+            context_bytes = canonical_bytes(market_context) if market_context else b''
             symbols_needing_analysis = []
             
             for symbol in symbols:
-                technical_data = technical_data_dict.get(symbol) if technical_data_dict else None
+                stored_hash = stored_hashes.get(symbol)
+                if stored_hash is None:
+                    symbols_needing_analysis.append(symbol)  # No previous analysis
+                    continue
                 
-                if self.check_data_changed(symbol, collection_id, technical_data, market_context):
+                technical_data = technical_data_dict.get(symbol) if technical_data_dict else None
+                if self._create_data_hash(technical_data, context_bytes=context_bytes) != stored_hash:
                     symbols_needing_analysis.append(symbol)
             
             self.logger.info(f"Found {len(symbols_needing_analysis)} symbols needing analysis out of {len(symbols)}")
@@ -347,25 +469,21 @@ class OpenAIAnalysisStorage:
             return {}
     
     def _create_data_hash(self, technical_data: Optional[Dict] = None, 
-                         market_context: Optional[Dict] = None) -> str:
-        """Create hash of data for change detection."""
+                         market_context: Optional[Dict] = None, context_bytes: Optional[bytes] = None) -> str:
+        """
+        Create hash of data for change detection.
+        
+        context_bytes is the already encoded market context, for callers
+        hashing many symbols against the same context.
+        """
         try:
-            data_string = ""
-            
-            if technical_data:
-                # Convert numpy types to native Python types for JSON serialization
-                converted_data = self._convert_numpy_types(technical_data)
-                # Sort keys for consistent hashing
-                sorted_data = json.dumps(converted_data, sort_keys=True)
-                data_string += sorted_data
+            data = canonical_bytes(technical_data) if technical_data else b''
             
-            if market_context:
-                # Convert numpy types to native Python types for JSON serialization
-                converted_context = self._convert_numpy_types(market_context)
-                sorted_context = json.dumps(converted_context, sort_keys=True)
-                data_string += sorted_context
+            if context_bytes is None:
+                context_bytes = canonical_bytes(market_context) if market_context else b''
             
-            return hashlib.md5(data_string.encode()).hexdigest()
+            # Separate the technical data from the market context
+            return hashlib.blake2b(data + b'|' + context_bytes, digest_size=16).hexdigest()
             
         except Exception as e:
             self.logger.error(f"Error creating data hash: {e}")
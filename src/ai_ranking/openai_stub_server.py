@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Local OpenAI API Stub Server
+
+A small HTTP server that answers /v1/chat/completions the way the OpenAI
+API does, with configurable latency, rate limiting and server errors. Point
+the batch client (or the OpenAI SDK) at it with base_url to benchmark
+analysis throughput offline, without an API key or spending tokens.
+
+Usage:
+    python -m src.ai_ranking.openai_stub_server --port 8808 --latency 0.3
+    python -m src.ai_ranking.openai_stub_server --benchmark 200 --error-rate 0.05
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Rough characters per token, used for the usage block of stub responses
+CHARS_PER_TOKEN = 4
+
+
+class StubOpenAIServer:
+    """
+    Threaded stand-in for the OpenAI chat completions endpoint.
+
+    Every response carries a score derived from the prompt, so the same
+    prompt always gets the same answer. Failures are drawn at random:
+    rate_limit_rate of requests get a 429 with a Retry-After header and
+    error_rate of requests get a 500.
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, latency: float = 0.05,
+                 jitter: float = 0.0, error_rate: float = 0.0, rate_limit_rate: float = 0.0,
+                 retry_after: float = 0.1, seed: Optional[int] = None):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+        self.reset_stats()
+
+    @property
+    def base_url(self) -> str:
+        """API root to pass to a client as base_url."""
+        return f"http://{self.host}:{self.port}/v1"
+
+    def reset_stats(self):
+        """Zero the request counters."""
+        with self._lock:
+            self.stats = {'requests': 0, 'completions': 0, 'rate_limited': 0, 'errors': 0,
+                          'in_flight': 0, 'max_in_flight': 0, 'prompts': {}}
+
+    def start(self) -> str:
+        """Serve on a background thread; returns the base URL."""
+        self._server = ThreadingHTTPServer((self.host, self.port), self._handler_class())
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name='openai-stub', daemon=True)
+        self._thread.start()
+        logger.info(f"OpenAI stub server listening on {self.base_url}")
+        return self.base_url
+
+    def stop(self):
+        """Stop serving."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _draw_outcome(self) -> int:
+        """HTTP status for the next request."""
+        with self._lock:
+            draw = self._random.random()
+        if draw < self.rate_limit_rate:
+            return 429
+        if draw < self.rate_limit_rate + self.error_rate:
+            return 500
+        return 200
+
+    def _count(self, name: str, delta: int = 1):
+        with self._lock:
+            self.stats[name] += delta
+            if name == 'in_flight':
+                self.stats['max_in_flight'] = max(self.stats['max_in_flight'], self.stats['in_flight'])
+
+    def _completion(self, body: Dict) -> Dict:
+        """Chat completion whose score is a stable function of the prompt."""
+        messages = body.get('messages', [])
+        prompt = '\n'.join(str(message.get('content', '')) for message in messages)
+        with self._lock:
+            self.stats['prompts'][prompt] = self.stats['prompts'].get(prompt, 0) + 1
+
+        score = 30 + int(hashlib.sha256(prompt.encode()).hexdigest(), 16) % 61
+        recommendation = 'Buy' if score >= 65 else 'Hold' if score >= 45 else 'Sell'
+        content = (f"Score: {score}/100\n\nTechnical analysis: RSI and MACD reviewed against the "
+                   f"moving averages and volume.\n\nRecommendation: {recommendation}")
+        prompt_tokens = max(1, len(prompt) // CHARS_PER_TOKEN)
+        completion_tokens = max(1, len(content) // CHARS_PER_TOKEN)
+        return {
+            'id': f"chatcmpl-{uuid.uuid4().hex[:24]}",
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': body.get('model', 'gpt-4o-mini'),
+            'choices': [{'index': 0, 'finish_reason': 'stop',
+                         'message': {'role': 'assistant', 'content': content}}],
+            'usage': {'prompt_tokens': prompt_tokens, 'completion_tokens': completion_tokens,
+                      'total_tokens': prompt_tokens + completion_tokens}
+        }
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                raw = self.rfile.read(length) if length else b''
+                if not self.path.rstrip('/').endswith('/chat/completions'):
+                    self._reply(404, {'error': {'message': f"Unknown path {self.path}", 'type': 'invalid_request_error'}})
+                    return
+
+                stub._count('requests')
+                stub._count('in_flight')
+                try:
+                    with stub._lock:
+                        delay = stub.latency + stub._random.uniform(0, stub.jitter)
+                    time.sleep(delay)
+
+                    status = stub._draw_outcome()
+                    if status == 429:
+                        stub._count('rate_limited')
+                        self._reply(429, {'error': {'message': 'Rate limit reached', 'type': 'requests',
+                                                    'code': 'rate_limit_exceeded'}},
+                                    {'Retry-After': str(stub.retry_after)})
+                    elif status == 500:
+                        stub._count('errors')
+                        self._reply(500, {'error': {'message': 'The server had an error', 'type': 'server_error'}})
+                    else:
+                        stub._count('completions')
+                        self._reply(200, stub._completion(json.loads(raw or b'{}')))
+                finally:
+                    stub._count('in_flight', -1)
+
+            def _reply(self, status: int, payload: Dict, headers: Optional[Dict[str, str]] = None):
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                logger.debug(format % args)
+
+        return Handler
+
+
+def run_benchmark(server: StubOpenAIServer, requests: int, **client_options) -> Dict:
+    """Send distinct analysis prompts through the batch client and report throughput."""
+    from .openai_batch_client import AsyncOpenAIBatchClient, ChatRequest
+
+    client = AsyncOpenAIBatchClient(api_key='stub', base_url=server.base_url, **client_options)
+    batch = [ChatRequest(messages=[{'role': 'user', 'content': f"Analyze SYM{i:04d} and score it (0-100)."}])
+             for i in range(requests)]
+
+    start = time.perf_counter()
+    results = client.run_batch(batch)
+    elapsed = time.perf_counter() - start
+
+    completed = sum(1 for result in results if result is not None and result.ok)
+    return {
+        'requests': requests,
+        'completed': completed,
+        'elapsed_seconds': round(elapsed, 3),
+        'requests_per_second': round(completed / elapsed, 1) if elapsed > 0 else 0.0,
+        'client': client.stats.to_dict(),
+        'server': {name: value for name, value in server.stats.items() if name != 'prompts'}
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local OpenAI chat completions stub')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8808)
+    parser.add_argument('--latency', type=float, default=0.3, help='Seconds per response')
+    parser.add_argument('--jitter', type=float, default=0.1, help='Extra random latency, up to this many seconds')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests answered with 500')
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help='Fraction of requests answered with 429')
+    parser.add_argument('--retry-after', type=float, default=0.5, help='Retry-After seconds sent with 429s')
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--benchmark', type=int, default=0, metavar='N',
+                        help='Send N requests through the batch client, print throughput and exit')
+    parser.add_argument('--concurrency', type=int, default=8, help='Batch client concurrency for --benchmark')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    server = StubOpenAIServer(args.host, 0 if args.benchmark else args.port, args.latency, args.jitter,
+                              args.error_rate, args.rate_limit_rate, args.retry_after, args.seed)
+    with server:
+        if args.benchmark:
+            print(json.dumps(run_benchmark(server, args.benchmark, max_concurrency=args.concurrency), indent=2))
+            return
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == '__main__':
+    main()
@@ -10,15 +10,29 @@ This module provides a fast, efficient stock ranking system that:
 """
 
 import logging
-from typing import List, Dict, Optional
+import warnings
+from typing import Callable, List, Dict, Optional
 from datetime import datetime
 import time
 from dataclasses import dataclass
+import numpy as np
+import pandas as pd
 
-from .scoring_models import MultiFactorScorer
+from .scoring_models import MultiFactorScorer, build_factor_panel, panel_pct_change
 
 logger = logging.getLogger(__name__)
 
+# Panel name -> columns read by the lightweight scores (first one present is used)
+LIGHTWEIGHT_COLUMNS = {
+    'rsi': ('rsi',),
+    'macd': ('macd',),
+    'macd_signal': ('macd_signal',),
+    'close': ('Close',),
+    'sma_20': ('sma_20',),
+    'sma_50': ('sma_50',),
+    'risk_close': ('Close', 'close', 'CLOSE')
+}
+
 @dataclass
 class StockScore:
     """Represents a stock's ranking score."""
@@ -50,13 +64,16 @@ class LightweightStockRankingEngine:
         self.scorer = MultiFactorScorer()
         self.logger = logging.getLogger(__name__)
         
-    def rank_collection(self, collection_id: str, max_stocks: int = 50) -> RankingResult:
+    def rank_collection(self, collection_id: str, max_stocks: int = 50,
+                        on_scores: Optional[Callable[[List[StockScore]], None]] = None) -> RankingResult:
         """
         Rank stocks in a collection with performance optimizations.
         
         Args:
             collection_id: ID of the data collection
             max_stocks: Maximum number of stocks to rank
+            on_scores: Called with each load batch's scores as soon as they are
+                ready; the batches are then scored separately, not in one pass
             
         Returns:
             RankingResult with ranked stocks
@@ -75,22 +92,30 @@ class LightweightStockRankingEngine:
             symbols = symbols[:min(max_stocks, 50)]
             self.logger.info(f"Processing {len(symbols)} symbols for ranking")
             
-            # Process stocks in small batches
-            ranked_stocks = []
+            # Load stocks in small batches, then score them all at once (batch by batch when streaming)
+            stock_data = {}
+            streamed = []
             batch_size = 10
             
             for i in range(0, len(symbols), batch_size):
                 batch = symbols[i:i + batch_size]
-                self.logger.info(f"Processing batch {i//batch_size + 1}: {batch}")
+                self.logger.info(f"Loading batch {i//batch_size + 1}: {batch}")
                 
-                batch_scores = self._process_stock_batch(collection_id, batch)
-                ranked_stocks.extend(batch_scores)
+                batch_data = self._load_stock_batch(collection_id, batch)
+                stock_data.update(batch_data)
+                if on_scores is not None:
+                    # Scores are per stock, so scoring by batch gives the same values sooner
+                    batch_scores = self._score_stocks(batch_data)
+                    streamed.extend(batch_scores)
+                    on_scores(batch_scores)
                 
                 # Check for timeout
                 if time.time() - start_time > 30:  # 30 second timeout
                     self.logger.warning("Ranking timeout reached, returning partial results")
                     break
             
+            ranked_stocks = streamed if on_scores is not None else self._score_stocks(stock_data)
+            
             # Sort by total score
             ranked_stocks.sort(key=lambda x: x.total_score, reverse=True)
             
@@ -120,27 +145,55 @@ class LightweightStockRankingEngine:
     
     def _process_stock_batch(self, collection_id: str, symbols: List[str]) -> List[StockScore]:
         """Process a batch of stocks for ranking."""
-        scores = []
-        
+        return self._score_stocks(self._load_stock_batch(collection_id, symbols))
+    
+    def _load_stock_batch(self, collection_id: str, symbols: List[str]) -> Dict[str, pd.DataFrame]:
+        """Indicator data of the symbols that have any."""
+        stock_data = {}
         for symbol in symbols:
             try:
-                # Get stock data with indicators
-                stock_data = self.data_manager.get_symbol_indicators(collection_id, symbol)
-                
-                if stock_data is None or stock_data.empty:
-                    continue
-                
-                # Calculate scores using the scorer
-                technical_score = self._calculate_technical_score(stock_data)
-                fundamental_score = self._calculate_fundamental_score(stock_data)
-                risk_score = self._calculate_risk_score(stock_data)
-                market_score = self._calculate_market_score(stock_data)
-                
-                # Calculate total score
-                total_score = (technical_score * 0.4 + 
-                             fundamental_score * 0.3 + 
-                             risk_score * 0.2 + 
-                             market_score * 0.1)
+                data = self.data_manager.get_symbol_indicators(collection_id, symbol)
+            except Exception as e:
+                self.logger.error(f"Error loading {symbol}: {e}")
+                continue
+            if data is not None and not data.empty:
+                stock_data[symbol] = data
+        return stock_data
+    
+    def _score_stocks(self, stock_data: Dict[str, pd.DataFrame]) -> List[StockScore]:
+        """
+        Score every loaded stock in one pass.
+        
+        The factor scores are computed as array operations across symbols and
+        match the per-symbol _calculate_* methods (the risk score to float
+        rounding, as volatility is summed in a different order).
+        """
+        if not stock_data:
+            return []
+        
+        symbols, lengths, panel, present = build_factor_panel(stock_data, LIGHTWEIGHT_COLUMNS)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            technical_scores = self._batch_technical_scores(panel, present)
+            risk_scores = self._batch_risk_scores(lengths, panel, present)
+        
+        # Simplified constant scores, as in _calculate_fundamental_score and _calculate_market_score
+        fundamental_scores = np.full(len(symbols), 60.0)
+        market_scores = np.full(len(symbols), 70.0)
+        
+        total_scores = (technical_scores * 0.4 + 
+                        fundamental_scores * 0.3 + 
+                        risk_scores * 0.2 + 
+                        market_scores * 0.1)
+        
+        scores = []
+        for i, symbol in enumerate(symbols):
+            try:
+                technical_score = float(technical_scores[i])
+                fundamental_score = float(fundamental_scores[i])
+                risk_score = float(risk_scores[i])
+                market_score = float(market_scores[i])
+                total_score = float(total_scores[i])
                 
                 # Generate explanation
                 explanation = self.scorer._generate_enhanced_template_explanation(
@@ -176,6 +229,37 @@ class LightweightStockRankingEngine:
         
         return scores
     
+    def _batch_technical_scores(self, panel: Dict[str, np.ndarray], present: Dict[str, np.ndarray]) -> np.ndarray:
+        """Technical score of every symbol (see _calculate_technical_score)."""
+        def latest(name, default):
+            return np.where(present[name], panel[name][:, -1], default)
+        
+        rsi = latest('rsi', 50)
+        rsi_score = np.where((rsi >= 30) & (rsi <= 70), 100, 50)
+        
+        macd_score = np.where(latest('macd', 0) > latest('macd_signal', 0), 100, 50)
+        
+        close = latest('close', 0)
+        sma_20 = latest('sma_20', close)
+        sma_50 = latest('sma_50', close)
+        ma_score = np.where((close > sma_20) & (sma_20 > sma_50), 100, 50)
+        
+        return np.clip((rsi_score + macd_score + ma_score) / 3, 0, 100)
+    
+    def _batch_risk_scores(self, lengths: np.ndarray, panel: Dict[str, np.ndarray],
+                           present: Dict[str, np.ndarray]) -> np.ndarray:
+        """Risk score of every symbol (see _calculate_risk_score)."""
+        returns = panel_pct_change(panel['risk_close'])
+        volatility = np.nanstd(returns, axis=1, ddof=1) * (252 ** 0.5) * 100
+        
+        # Lower volatility = higher score (less risk); undefined volatility scores 0
+        risk_scores = 100 - volatility * 2
+        risk_scores = np.where(risk_scores > 0, risk_scores, 0.0)
+        risk_scores = np.minimum(risk_scores, 100)
+        
+        has_returns = np.count_nonzero(~np.isnan(returns), axis=1) > 0
+        return np.where(present['risk_close'] & (lengths > 0) & has_returns, risk_scores, 50.0)
+    
     def _calculate_technical_score(self, stock_data) -> float:
         """Calculate technical score based on indicators."""
         try:
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Persistent Ranking Index
+
+Keeps each collection's latest per-symbol scores together with the data
+version every score was computed from, in ranked order. A ranking update
+then only rescores the symbols whose version changed and patches them into
+the order, instead of rescoring and re-sorting the whole collection.
+
+The index lives in SQLite so it survives restarts and is shared by the
+dashboard and the scheduler. Each instance keeps the ranked order in
+memory and reloads it when another instance has written to the collection.
+"""
+
+import bisect
+import json
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Iterable, Tuple
+
+from src.utils.logger import get_logger
+
+
+@dataclass
+class IndexedScore:
+    """A symbol's indexed score and the data version it was computed from."""
+    symbol: str
+    score: float
+    data_version: str
+    payload: Dict
+    updated_at: str = ''
+
+
+class RankingIndex:
+    """Per-collection ranked scores with data-version stamps."""
+
+    def __init__(self, db_path: str = "data/ranking_index.db"):
+        self.db_path = db_path
+        self.logger = get_logger(__name__)
+        self._lock = threading.RLock()
+        self._entries: Dict[str, Dict[str, IndexedScore]] = {}
+        self._order: Dict[str, List[Tuple[float, str]]] = {}
+        self._revisions: Dict[str, int] = {}
+        self._init_database()
+
+    def _init_database(self):
+        """Initialize database with the index tables."""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS ranking_index (
+                    collection_id TEXT NOT NULL,
+                    symbol TEXT NOT NULL,
+                    score REAL NOT NULL,
+                    data_version TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    updated_at TEXT NOT NULL,
+                    PRIMARY KEY (collection_id, symbol)
+                )
+            ''')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS ranking_index_revision (
+                    collection_id TEXT PRIMARY KEY,
+                    revision INTEGER NOT NULL
+                )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_ranking_index_score '
+                         'ON ranking_index(collection_id, score DESC, symbol)')
+            conn.commit()
+
+    def stale_symbols(self, collection_id: str, versions: Dict[str, str]) -> List[str]:
+        """
+        Symbols whose current data version differs from the indexed one.
+
+        Args:
+            collection_id: Collection ID
+            versions: Current data version by symbol
+
+        Returns:
+            Symbols not in the index or indexed from other data, in the given order
+        """
+        with self._lock:
+            entries = self._load(collection_id)
+            return [symbol for symbol, version in versions.items()
+                    if symbol not in entries or entries[symbol].data_version != version]
+
+    def update(self, collection_id: str, scores: Iterable[IndexedScore]):
+        """Insert or replace scores and move them to their place in the order."""
+        scores = list(scores)
+        if not scores:
+            return
+        now = datetime.now().isoformat()
+        with self._lock:
+            self._load(collection_id)
+            with sqlite3.connect(self.db_path) as conn:
+                conn.executemany('''
+                    INSERT OR REPLACE INTO ranking_index
+                    (collection_id, symbol, score, data_version, payload, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                ''', [(collection_id, s.symbol, float(s.score), s.data_version, json.dumps(s.payload, default=str), now)
+                      for s in scores])
+                self._bump_revision(conn, collection_id)
+            for score in scores:
+                score.updated_at = now
+                self._unlink(collection_id, score.symbol)
+                self._entries[collection_id][score.symbol] = score
+                bisect.insort(self._order[collection_id], (-float(score.score), score.symbol))
+
+    def retain(self, collection_id: str, symbols: Iterable[str]) -> List[str]:
+        """Drop indexed symbols that are no longer in the collection; returns the dropped ones."""
+        keep = set(symbols)
+        with self._lock:
+            dropped = [symbol for symbol in self._load(collection_id) if symbol not in keep]
+            if dropped:
+                with sqlite3.connect(self.db_path) as conn:
+                    conn.executemany('DELETE FROM ranking_index WHERE collection_id = ? AND symbol = ?',
+                                     [(collection_id, symbol) for symbol in dropped])
+                    self._bump_revision(conn, collection_id)
+                for symbol in dropped:
+                    self._unlink(collection_id, symbol)
+                self.logger.info(f"Dropped {len(dropped)} symbols from the {collection_id} ranking index")
+            return dropped
+
+    def ranked(self, collection_id: str, symbols: Optional[Iterable[str]] = None,
+               limit: Optional[int] = None) -> List[IndexedScore]:
+        """
+        Indexed scores from best to worst.
+
+        Args:
+            collection_id: Collection ID
+            symbols: Only these symbols (default: all indexed)
+            limit: Return the top limit scores only
+        """
+        wanted = None if symbols is None else set(symbols)
+        result = []
+        with self._lock:
+            entries = self._load(collection_id)
+            for _, symbol in self._order[collection_id]:
+                if wanted is None or symbol in wanted:
+                    result.append(entries[symbol])
+                    if limit is not None and len(result) >= limit:
+                        break
+        return result
+
+    def top(self, collection_id: str, k: int) -> List[IndexedScore]:
+        """The k best indexed scores."""
+        return self.ranked(collection_id, limit=k)
+
+    def clear(self, collection_id: Optional[str] = None):
+        """Forget one collection's index, or all of them"""
+        with self._lock:
+            with sqlite3.connect(self.db_path) as conn:
+                if collection_id is None:
+                    conn.execute('DELETE FROM ranking_index')
+                    conn.execute('DELETE FROM ranking_index_revision')
+                else:
+                    conn.execute('DELETE FROM ranking_index WHERE collection_id = ?', (collection_id,))
+                    self._bump_revision(conn, collection_id)
+            for cid in ([collection_id] if collection_id else list(self._entries)):
+                self._entries.pop(cid, None)
+                self._order.pop(cid, None)
+                self._revisions.pop(cid, None)
+
+    def _load(self, collection_id: str) -> Dict[str, IndexedScore]:
+        """Entries of a collection, reloaded if another instance wrote to it."""
+        with sqlite3.connect(self.db_path) as conn:
+            row = conn.execute('SELECT revision FROM ranking_index_revision WHERE collection_id = ?',
+                               (collection_id,)).fetchone()
+            revision = row[0] if row else 0
+            if collection_id in self._entries and self._revisions.get(collection_id) == revision:
+                return self._entries[collection_id]
+
+            rows = conn.execute('''
+                SELECT symbol, score, data_version, payload, updated_at FROM ranking_index
+                WHERE collection_id = ? ORDER BY score DESC, symbol
+            ''', (collection_id,)).fetchall()
+
+        self._entries[collection_id] = {
+            row[0]: IndexedScore(row[0], row[1], row[2], json.loads(row[3]), row[4]) for row in rows
+        }
+        self._order[collection_id] = [(-row[1], row[0]) for row in rows]
+        self._revisions[collection_id] = revision
+        return self._entries[collection_id]
+
+    def _unlink(self, collection_id: str, symbol: str):
+        """Remove a symbol from the in-memory entries and order."""
+        entry = self._entries[collection_id].pop(symbol, None)
+        if entry is not None:
+            order = self._order[collection_id]
+            position = bisect.bisect_left(order, (-float(entry.score), symbol))
+            if position < len(order) and order[position][1] == symbol:
+                del order[position]
+
+    def _bump_revision(self, conn: sqlite3.Connection, collection_id: str):
+        """Record a write, so other instances reload the collection; this one stays current."""
+        conn.execute('''
+            INSERT INTO ranking_index_revision (collection_id, revision) VALUES (?, 1)
+            ON CONFLICT(collection_id) DO UPDATE SET revision = revision + 1
+        ''', (collection_id,))
+        conn.commit()
+        revision = conn.execute('SELECT revision FROM ranking_index_revision WHERE collection_id = ?',
+                                (collection_id,)).fetchone()[0]
+        if self._revisions.get(collection_id) == revision - 1:
+            self._revisions[collection_id] = revision
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Progressive Ranking Streams
+
+Carries scores from a ranking running in a worker thread to a client as
+they are produced, each with the running top-N, so the first results show
+within seconds instead of after the slowest symbol. Events are rendered as
+Server-Sent Events by the dashboard.
+"""
+
+import bisect
+import json
+import queue
+import threading
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+# Scores listed in every event's running top-N
+DEFAULT_TOP_N = 10
+
+# Seconds without a score before a keep-alive event is sent
+HEARTBEAT_INTERVAL = 15.0
+
+
+class RunningTopN:
+    """The n best items seen so far, kept sorted by score."""
+
+    def __init__(self, n: int, key: Callable[[Any], float]):
+        self.n = max(1, int(n))
+        self.key = key
+        self._ranked: List[Tuple[float, int, Any]] = []
+        self._count = 0
+
+    def add(self, item: Any) -> Optional[int]:
+        """Add an item; returns its 1-based position if it entered the top-N."""
+        self._count += 1
+        entry = (-float(self.key(item)), self._count, item)
+        position = bisect.bisect_left(self._ranked, entry[:2])
+        if position >= self.n:
+            return None
+        self._ranked.insert(position, entry)
+        del self._ranked[self.n:]
+        return position + 1
+
+    def items(self) -> List[Any]:
+        """Items from best to worst."""
+        return [item for _, _, item in self._ranked]
+
+
+class RankingStream:
+    """
+    Thread-safe bridge between a ranking and the events sent to a client.
+
+    The ranking calls push() for every score and finish() or fail() at the
+    end; events() yields (event, data) pairs until then.
+    """
+
+    def __init__(self, key: Callable[[Any], float], to_dict: Callable[[Any], Dict],
+                 top_n: int = DEFAULT_TOP_N, total: Optional[int] = None):
+        self.to_dict = to_dict
+        self.total = total
+        self._top = RunningTopN(top_n, key)
+        self._scored = 0
+        self._lock = threading.Lock()
+        self._events: 'queue.Queue[Tuple[str, Dict]]' = queue.Queue()
+
+    def push(self, item: Any):
+        """
+        Report one score, with the top-N as it now stands.
+
+        Final ranks are only known once the ranking finishes, so each streamed
+        entry carries its rank in the running top-N (None outside it).
+        """
+        with self._lock:
+            self._scored += 1
+            position = self._top.add(item)
+            self._events.put(('score', {
+                'score': self._serialize(item, position),
+                'scored': self._scored,
+                'total': self.total,
+                'top_position': position,
+                'top': [self._serialize(top, rank) for rank, top in enumerate(self._top.items(), 1)]
+            }))
+
+    def _serialize(self, item: Any, rank: Optional[int]) -> Dict:
+        """to_dict(item) with its running rank."""
+        data = self.to_dict(item)
+        data['rank'] = rank
+        return data
+
+    def push_many(self, items):
+        """Report several scores."""
+        for item in items:
+            self.push(item)
+
+    def finish(self, result: Dict):
+        """End the stream with the complete ranking."""
+        self._events.put(('done', result))
+
+    def fail(self, error: str):
+        """End the stream with an error."""
+        self._events.put(('error', {'success': False, 'error': error}))
+
+    def events(self, heartbeat: float = HEARTBEAT_INTERVAL) -> Iterator[Tuple[str, Dict]]:
+        """Yield events as they arrive, ending after done or error."""
+        while True:
+            try:
+                event, data = self._events.get(timeout=heartbeat)
+            except queue.Empty:
+                yield 'heartbeat', {'scored': self._scored, 'total': self.total}
+                continue
+            yield event, data
+            if event in ('done', 'error'):
+                return
+
+    def run(self, ranking: Callable[[], Dict]) -> threading.Thread:
+        """Run ranking() in a daemon thread and finish the stream with its result."""
+        def target():
+            try:
+                self.finish(ranking())
+            except Exception as e:
+                self.fail(str(e))
+
+        thread = threading.Thread(target=target, name='ranking-stream', daemon=True)
+        thread.start()
+        return thread
+
+
+def format_sse(event: str, data: Dict) -> str:
+    """Render one Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
@@ -13,10 +13,100 @@ import numpy as np
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
 import logging
+import warnings
 from .openai_integration import OpenAIStockAnalyzer
 
 logger = logging.getLogger(__name__)
 
+# Panel name -> indicator columns read by the batch scorer (first one present is used)
+FACTOR_COLUMNS = {
+    'close': ('close',),
+    'risk_close': ('close', 'Close', 'CLOSE'),
+    'volume': ('volume',),
+    'macd': ('macd_line_12_26',),
+    'ema': ('ema_20',),
+    'rsi': ('rsi_14',),
+    'stoch_k': ('stoch_k_14',),
+    'atr': ('atr_14',),
+    'bb_upper': ('bb_upper_20_2.0',),
+    'bb_lower': ('bb_lower_20_2.0',)
+}
+
+
+def build_factor_panel(stock_data: Dict[str, pd.DataFrame], columns: Dict[str, Tuple[str, ...]],
+                       lookback: Optional[int] = None) -> Tuple[List[str], np.ndarray, Dict[str, np.ndarray],
+                                                                 Dict[str, np.ndarray]]:
+    """
+    Align the latest rows of every symbol into (symbols x rows) arrays.
+    
+    Rows are right-aligned so the last column is every symbol's latest row;
+    shorter histories are padded with NaN on the left.
+    
+    Args:
+        stock_data: Symbol -> data with indicators
+        columns: Panel name -> candidate column names, first present wins
+        lookback: Keep only the latest N rows of each symbol
+        
+    Returns:
+        (symbols, lengths, panel, present): rows per symbol, the value arrays
+        by panel name, and whether each symbol has the column at all
+    """
+    symbols = list(stock_data.keys())
+    frames = [data.iloc[-lookback:] if lookback else data for data in stock_data.values()]
+    lengths = np.array([len(frame) for frame in frames], dtype=int)
+    width = max(int(lengths.max()) if len(lengths) else 0, 1)
+    
+    panel, present = {}, {}
+    for name, candidates in columns.items():
+        values = np.full((len(frames), width), np.nan)
+        has_column = np.zeros(len(frames), dtype=bool)
+        for i, frame in enumerate(frames):
+            column = next((c for c in candidates if c in frame.columns), None)
+            if column is None:
+                continue
+            has_column[i] = True
+            if lengths[i]:
+                values[i, width - lengths[i]:] = frame[column].to_numpy(dtype=float)
+        panel[name] = values
+        present[name] = has_column
+    return symbols, lengths, panel, present
+
+
+def _previous_row(values: np.ndarray) -> np.ndarray:
+    """Second-latest value of every symbol, NaN if there is none."""
+    if values.shape[1] < 2:
+        return np.full(values.shape[0], np.nan)
+    return values[:, -2]
+
+
+def panel_pct_change(values: np.ndarray) -> np.ndarray:
+    """Row-wise pct_change with gaps padded forward, as pandas does."""
+    filled = pd.DataFrame(values).ffill(axis=1).to_numpy()
+    return filled[:, 1:] / filled[:, :-1] - 1
+
+
+def _max_drawdown(returns: np.ndarray) -> np.ndarray:
+    """Row-wise maximum drawdown of the compounded returns."""
+    growth = 1 + returns
+    cumulative = np.where(np.isnan(growth), np.nan, np.nancumprod(growth, axis=1))
+    peak = np.fmax.accumulate(cumulative, axis=1) if cumulative.shape[1] else cumulative
+    return np.nanmin(cumulative / peak - 1, axis=1) if cumulative.shape[1] else np.full(len(returns), np.nan)
+
+
+def _mean_of_available(scores: List[np.ndarray], available: List[np.ndarray]) -> np.ndarray:
+    """Mean of the sub-scores each symbol has, 50 where it has none."""
+    count = np.sum(available, axis=0)
+    total = np.sum([np.where(mask, score, 0) for score, mask in zip(scores, available)], axis=0)
+    return np.where(count > 0, total / np.maximum(count, 1), 50.0)
+
+
+def _with_random_default(scores: np.ndarray, valid: np.ndarray, spread: float) -> np.ndarray:
+    """Replace scores of symbols without enough data by 50 plus noise."""
+    scores = scores.astype(float)
+    scores[~valid] = 50.0 + np.random.normal(0, spread, np.count_nonzero(~valid))
+    return scores
+
+
 @dataclass
 class ScoringWeights:
     """Configuration for scoring weights"""
@@ -129,6 +219,146 @@ class MultiFactorScorer:
             self.logger.error(f"    ✗ Error scoring {symbol}: {e}")
             return self._create_default_score(symbol)
     
+    def score_batch(self, stock_data: Dict[str, pd.DataFrame], lookback: Optional[int] = None,
+                    explain: bool = True) -> List[StockScore]:
+        """
+        Score and rank many stocks at once.
+        
+        Builds a (symbols x rows) panel of every indicator column and computes
+        each factor score as array operations across symbols. Scores match
+        score_stock for each symbol, except for the random fallback scores
+        given to histories too short to measure.
+        
+        Args:
+            stock_data: Symbol -> historical price data with indicators
+            lookback: Use only the latest N rows of each symbol (default: all rows)
+            explain: Generate explanations like score_stock; otherwise use the
+                template explanation without calling OpenAI
+            
+        Returns:
+            StockScore objects sorted by total score, with ranks assigned
+        """
+        if not stock_data:
+            return []
+        
+        symbols, lengths, panel, present = build_factor_panel(stock_data, FACTOR_COLUMNS, lookback)
+        
+        # Missing values and empty rows are expected; they fall through to the default scores
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            technical = self._batch_technical_scores(lengths, panel, present)
+            fundamental = self._batch_fundamental_scores(lengths, panel, present)
+            risk = self._batch_risk_scores(lengths, panel, present)
+            market = self._batch_market_scores(lengths, panel, present)
+        
+        total = (
+            technical * self.weights.technical +
+            fundamental * self.weights.fundamental +
+            risk * self.weights.risk +
+            market * self.weights.market_context
+        )
+        
+        scores = []
+        for i in np.argsort(-total, kind='stable'):
+            symbol = symbols[i]
+            factors = [float(technical[i]), float(fundamental[i]), float(risk[i]), float(market[i]), float(total[i])]
+            if explain:
+                explanation = self._generate_explanation(symbol, *factors)
+            else:
+                explanation = self._generate_enhanced_template_explanation(
+                    symbol, dict(zip(['technical', 'fundamental', 'risk', 'market', 'total'], factors))
+                )
+            scores.append(StockScore(
+                symbol=symbol,
+                total_score=factors[4],
+                technical_score=factors[0],
+                fundamental_score=factors[1],
+                risk_score=factors[2],
+                market_score=factors[3],
+                rank=len(scores) + 1,
+                explanation=explanation,
+                recommendations=self._generate_recommendations(symbol, *factors)
+            ))
+        
+        self.logger.info(f"Batch scored {len(scores)} stocks")
+        return scores
+    
+    def _batch_technical_scores(self, lengths: np.ndarray, panel: Dict[str, np.ndarray],
+                                present: Dict[str, np.ndarray]) -> np.ndarray:
+        """Technical score of every symbol (see _calculate_technical_score)."""
+        close = panel['close'][:, -1]
+        
+        # Trend strength: MACD direction and price against EMA
+        macd, prev_macd = panel['macd'][:, -1], _previous_row(panel['macd'])
+        macd_trend = np.select([(macd > prev_macd) & (macd > 0), macd > prev_macd, (macd < prev_macd) & (macd < 0)],
+                               [80, 60, 20], 40)
+        macd_trend = np.where(lengths >= 2, macd_trend, 0)
+        ema_trend = np.where(present['close'], np.where(close > panel['ema'][:, -1], 70, 30), 0)
+        trend = np.where(present['macd'] & present['ema'], (macd_trend + ema_trend) / 2, 50.0)
+        
+        # Momentum: RSI and stochastic zones
+        rsi, stoch = panel['rsi'][:, -1], panel['stoch_k'][:, -1]
+        rsi_score = np.select([(rsi >= 30) & (rsi <= 70), rsi < 30], [70, 80], 30)
+        stoch_score = np.select([(stoch >= 20) & (stoch <= 80), stoch < 20], [70, 80], 30)
+        momentum = _mean_of_available([rsi_score, stoch_score],
+                                      [present['rsi'] & ~np.isnan(rsi), present['stoch_k'] & ~np.isnan(stoch)])
+        
+        # Volatility: ATR against its average, and position within the Bollinger Bands
+        atr = panel['atr'][:, -1]
+        avg_atr = np.nanmean(panel['atr'], axis=1)
+        atr_score = np.select([atr < avg_atr * 0.8, atr > avg_atr * 1.2], [60, 40], 50)
+        upper, lower = panel['bb_upper'][:, -1], panel['bb_lower'][:, -1]
+        bb_position = (close - lower) / (upper - lower)
+        bb_score = np.select([(bb_position >= 0.2) & (bb_position <= 0.8), bb_position < 0.2], [70, 80], 30)
+        has_bb = (present['bb_upper'] & present['bb_lower'] & present['close'] &
+                  ~np.isnan(close) & ~np.isnan(upper) & ~np.isnan(lower))
+        volatility = _mean_of_available([atr_score, bb_score], [present['atr'] & ~np.isnan(atr), has_bb])
+        
+        technical = np.minimum(100.0, np.maximum(0.0, trend * 0.30 + momentum * 0.40 + volatility * 0.30))
+        return np.where(lengths > 0, technical, 0.0)
+    
+    def _batch_fundamental_scores(self, lengths: np.ndarray, panel: Dict[str, np.ndarray],
+                                  present: Dict[str, np.ndarray]) -> np.ndarray:
+        """Fundamental score of every symbol (see _calculate_fundamental_score)."""
+        close = panel['close']
+        recent = close[:, -1]
+        month_ago = close[:, -30] if close.shape[1] >= 30 else np.full(len(lengths), np.nan)
+        price_change = (recent - month_ago) / month_ago
+        
+        scores = np.select([price_change > 0.1, price_change > 0.05, price_change > -0.05, price_change > -0.1],
+                           [75.0, 65.0, 55.0, 45.0], 35.0)
+        valid = present['close'] & (lengths >= 30) & ~np.isnan(recent) & ~np.isnan(month_ago)
+        return _with_random_default(scores, valid, 5)
+    
+    def _batch_risk_scores(self, lengths: np.ndarray, panel: Dict[str, np.ndarray],
+                           present: Dict[str, np.ndarray]) -> np.ndarray:
+        """Risk score of every symbol (see _calculate_risk_score)."""
+        returns = panel_pct_change(panel['risk_close'])
+        
+        volatility = np.nanstd(returns, axis=1, ddof=1)
+        vol_score = np.select([volatility < 0.02, volatility < 0.04], [80, 60], 40)
+        
+        max_drawdown = _max_drawdown(returns)
+        dd_score = np.select([max_drawdown > -0.1, max_drawdown > -0.2], [80, 60], 40)
+        
+        has_returns = np.count_nonzero(~np.isnan(returns), axis=1) > 0
+        risk = _mean_of_available([vol_score, dd_score], [has_returns, lengths > 1])
+        return np.where(present['risk_close'] & (lengths > 0), risk, 50.0)
+    
+    def _batch_market_scores(self, lengths: np.ndarray, panel: Dict[str, np.ndarray],
+                             present: Dict[str, np.ndarray]) -> np.ndarray:
+        """Market context score of every symbol (see _calculate_market_score)."""
+        volume = panel['volume']
+        recent_volume = np.nanmean(volume[:, -5:], axis=1)
+        older_volume = np.nanmean(volume[:, -20:-5], axis=1)
+        volume_change = (recent_volume - older_volume) / older_volume
+        
+        scores = np.select([volume_change > 0.5, volume_change > 0.2, volume_change > -0.2, volume_change > -0.5],
+                           [70.0, 60.0, 50.0, 40.0], 30.0)
+        valid = (present['volume'] & present['close'] & (lengths >= 20) &
+                 ~np.isnan(recent_volume) & ~np.isnan(older_volume) & (older_volume > 0))
+        return _with_random_default(scores, valid, 3)
+    
     def _calculate_technical_score(self, data: pd.DataFrame) -> float:
         """
         Calculate technical analysis score (0-100).
@@ -11,6 +11,11 @@ from .ai_backtesting_engine import (
     StrategyType,
     RiskLevel
 )
+from .profile_runner import ProfileComparisonRunner
+from .walk_forward import WalkForwardOptimizer, WalkForwardWindow
+from .monte_carlo import MonteCarloAnalyzer, MonteCarloResults
+from .streaming_metrics import StreamingMetrics, QuantileSketch
+from .checkpoint import Checkpoint, save_checkpoint, load_checkpoint, clear_checkpoint
 
 __all__ = [
     'AIBacktestingEngine',
@@ -18,5 +23,16 @@ __all__ = [
     'StrategyResult',
     'BacktestSummary',
     'StrategyType',
-    'RiskLevel'
+    'RiskLevel',
+    'ProfileComparisonRunner',
+    'WalkForwardOptimizer',
+    'WalkForwardWindow',
+    'MonteCarloAnalyzer',
+    'MonteCarloResults',
+    'StreamingMetrics',
+    'QuantileSketch',
+    'Checkpoint',
+    'save_checkpoint',
+    'load_checkpoint',
+    'clear_checkpoint'
 ] 
\ No newline at end of file
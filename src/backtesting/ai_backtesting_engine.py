@@ -7,11 +7,16 @@ Core engine for testing multiple strategies and combinations on historical data.
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple, Optional, Any
-from dataclasses import dataclass
+from typing import Dict, List, Tuple, Optional, Any, Callable, Iterator
+from dataclasses import dataclass, asdict
 from enum import Enum
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+import threading
 import logging
 
+from .checkpoint import Checkpoint, fingerprint, save_checkpoint, load_checkpoint, clear_checkpoint
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -78,6 +83,183 @@ class BacktestSummary:
     total_execution_time: float
 
 
+# Indicator columns used by the combination signals
+INDICATOR_COLUMNS = ('macd_line', 'macd_signal', 'rsi', 'bb_upper', 'bb_lower',
+                     'sma_fast', 'sma_slow', 'vwap', 'momentum')
+
+# Rows per symbol skipped while indicators settle
+WARMUP_PERIODS = 50
+
+# Average vote needed for a combination to buy (or, negated, to sell)
+SIGNAL_THRESHOLD = 0.5
+
+
+def _compute_indicators(close: pd.Series, volume: pd.Series) -> Dict[str, pd.Series]:
+    """Compute signal indicators for one symbol's price history."""
+    macd_line = close.ewm(span=12, adjust=False).mean() - close.ewm(span=26, adjust=False).mean()
+    
+    delta = close.diff()
+    gain = delta.clip(lower=0).rolling(window=14).mean()
+    loss = (-delta.clip(upper=0)).rolling(window=14).mean()
+    
+    bb_middle = close.rolling(window=20).mean()
+    bb_std = close.rolling(window=20).std()
+    
+    return {
+        'macd_line': macd_line,
+        'macd_signal': macd_line.ewm(span=9, adjust=False).mean(),
+        'rsi': 100 - (100 / (1 + gain / loss)),
+        'bb_upper': bb_middle + 2 * bb_std,
+        'bb_lower': bb_middle - 2 * bb_std,
+        'sma_fast': bb_middle,
+        'sma_slow': close.rolling(window=50).mean(),
+        'vwap': (close * volume).rolling(window=20).sum() / volume.rolling(window=20).sum(),
+        'momentum': close.pct_change(periods=10)
+    }
+
+
+def _sign_vote(values: pd.Series) -> np.ndarray:
+    return np.sign(values.to_numpy(dtype=float))
+
+
+def _band_vote(values: pd.Series, lower: pd.Series, upper: pd.Series) -> np.ndarray:
+    values = values.to_numpy(dtype=float)
+    return np.where(values < lower.to_numpy(dtype=float), 1.0,
+                    np.where(values > upper.to_numpy(dtype=float), -1.0, 0.0))
+
+
+# Per-row vote of each strategy: trend followers vote with the trend,
+# oscillators vote only at their extremes
+STRATEGY_VOTES: Dict[str, Callable[[pd.DataFrame], np.ndarray]] = {
+    StrategyType.MACD.value: lambda d: _sign_vote(d['macd_line'] - d['macd_signal']),
+    StrategyType.RSI.value: lambda d: _band_vote(d['rsi'], pd.Series(30.0, index=d.index), pd.Series(70.0, index=d.index)),
+    StrategyType.BOLLINGER_BANDS.value: lambda d: _band_vote(d['close'], d['bb_lower'], d['bb_upper']),
+    StrategyType.MOVING_AVERAGE.value: lambda d: _sign_vote(d['sma_fast'] - d['sma_slow']),
+    StrategyType.VOLUME_WEIGHTED.value: lambda d: _sign_vote(d['close'] - d['vwap']),
+    StrategyType.MOMENTUM.value: lambda d: _sign_vote(d['momentum'])
+}
+
+
+class SharedFrame:
+    """
+    DataFrame packed into shared memory so worker processes can rebuild it
+    without the data being pickled per task.
+    
+    Floats and booleans go into one float64 block; integers, datetimes and
+    factorized object columns go into one int64 block. Only the column
+    layout and the (small) category labels travel as regular arguments.
+    """
+    
+    INDEX_COLUMN = '__index__'
+    
+    def __init__(self, data: pd.DataFrame):
+        self.index_name = data.index.name
+        frame = data if isinstance(data.index, pd.RangeIndex) else data.reset_index(names=self.INDEX_COLUMN)
+        
+        self.columns = []
+        float_columns, int_columns = [], []
+        for column in frame.columns:
+            values = frame[column]
+            if pd.api.types.is_bool_dtype(values) or pd.api.types.is_float_dtype(values):
+                self.columns.append((column, 'bool' if pd.api.types.is_bool_dtype(values) else 'float', len(float_columns), None))
+                float_columns.append(values.to_numpy(dtype=float))
+            elif pd.api.types.is_integer_dtype(values):
+                self.columns.append((column, 'int', len(int_columns), None))
+                int_columns.append(values.to_numpy(dtype=np.int64))
+            elif pd.api.types.is_datetime64_any_dtype(values):
+                self.columns.append((column, 'datetime', len(int_columns), str(values.dt.tz) if values.dt.tz else None))
+                int_columns.append(values.dt.tz_localize(None).to_numpy(dtype='datetime64[ns]').view(np.int64)
+                                   if values.dt.tz else values.to_numpy(dtype='datetime64[ns]').view(np.int64))
+            else:
+                codes, labels = pd.factorize(values)
+                self.columns.append((column, 'category', len(int_columns), list(labels)))
+                int_columns.append(codes.astype(np.int64))
+        
+        self.rows = len(frame)
+        self.float_block = self._share(np.column_stack(float_columns) if float_columns else np.empty((self.rows, 0)))
+        self.int_block = self._share(np.column_stack(int_columns) if int_columns else np.empty((self.rows, 0), dtype=np.int64))
+    
+    @staticmethod
+    def _share(array: np.ndarray) -> Tuple[shared_memory.SharedMemory, Tuple[int, int], str]:
+        """Copy an array into a new shared memory block."""
+        block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[:] = array
+        return block, array.shape, array.dtype.str
+    
+    def spec(self) -> Dict[str, Any]:
+        """Picklable description used by workers to attach."""
+        return {
+            'columns': self.columns,
+            'index_name': self.index_name,
+            'float_block': (self.float_block[0].name, self.float_block[1], self.float_block[2]),
+            'int_block': (self.int_block[0].name, self.int_block[1], self.int_block[2])
+        }
+    
+    @classmethod
+    def attach(cls, spec: Dict[str, Any]) -> pd.DataFrame:
+        """
+        Rebuild the DataFrame from shared memory.
+        
+        Args:
+            spec: Result of spec() in the creating process
+            
+        Returns:
+            DataFrame with its own copy of the data
+        """
+        blocks, arrays = [], {}
+        for key in ('float_block', 'int_block'):
+            name, shape, dtype = spec[key]
+            block = shared_memory.SharedMemory(name=name)
+            blocks.append(block)
+            arrays[key] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+        
+        columns = {}
+        for column, kind, position, extra in spec['columns']:
+            if kind in ('float', 'bool'):
+                values = arrays['float_block'][:, position]
+                columns[column] = values.astype(bool) if kind == 'bool' else values.copy()
+            elif kind == 'int':
+                columns[column] = arrays['int_block'][:, position].copy()
+            elif kind == 'datetime':
+                values = pd.to_datetime(arrays['int_block'][:, position].copy())
+                columns[column] = values.tz_localize(extra) if extra else values
+            else:
+                codes = arrays['int_block'][:, position]
+                labels = np.array(extra + [None], dtype=object)
+                columns[column] = labels[codes]
+        
+        frame = pd.DataFrame(columns)
+        if cls.INDEX_COLUMN in frame.columns:
+            frame = frame.set_index(cls.INDEX_COLUMN)
+            frame.index.name = spec['index_name']
+        
+        for block in blocks:
+            block.close()
+        return frame
+    
+    def release(self):
+        """Free the shared memory blocks."""
+        for block, _, _ in (self.float_block, self.int_block):
+            block.close()
+            block.unlink()
+
+
+# Per-process state of backtesting workers
+_worker_state: Dict[str, Any] = {}
+
+
+def _init_backtest_worker(spec: Dict[str, Any], parameters: 'BacktestParameters'):
+    """Attach the shared historical data once per worker process."""
+    engine = AIBacktestingEngine()
+    engine.parameters = parameters
+    _worker_state.update({'data': SharedFrame.attach(spec), 'engine': engine})
+
+
+def _run_backtest_combination(strategy_combo: List[str]) -> 'StrategyResult':
+    """Test one strategy combination in a worker process."""
+    return _worker_state['engine']._test_strategy_combination(_worker_state['data'], strategy_combo)
+
+
 class AIBacktestingEngine:
     """
     Core engine for AI strategy backtesting.
@@ -90,6 +272,16 @@ class AIBacktestingEngine:
         self.parameters = BacktestParameters()
         self.results: List[StrategyResult] = []
         self.summary: Optional[BacktestSummary] = None
+        self._progress_lock = threading.Lock()
+        self.progress: Dict[str, Any] = {
+            'state': 'idle',
+            'mode': None,
+            'total': 0,
+            'completed': 0,
+            'failed': 0,
+            'started_at': None,
+            'finished_at': None
+        }
         
     def set_parameters(self, parameters: BacktestParameters):
         """Set backtesting parameters."""
@@ -171,120 +363,313 @@ class AIBacktestingEngine:
         return False
     
     def run_backtest(self, historical_data: pd.DataFrame, 
-                    strategy_combinations: Optional[List[List[str]]] = None) -> BacktestSummary:
+                    strategy_combinations: Optional[List[List[str]]] = None,
+                    parallel: bool = False,
+                    max_workers: Optional[int] = None,
+                    on_result: Optional[Callable[[StrategyResult], None]] = None,
+                    checkpoint_path: Optional[str] = None,
+                    checkpoint_every: int = 10) -> BacktestSummary:
         """
         Run comprehensive backtesting on historical data.
         
         Args:
             historical_data: DataFrame with OHLCV data and indicators
             strategy_combinations: List of strategy combinations to test
+            parallel: Test combinations in a process pool
+            max_workers: Worker processes for parallel mode (default: CPU count)
+            on_result: Called with each StrategyResult as soon as it completes
+            checkpoint_path: File the finished combinations are checkpointed to;
+                a run over the same data, parameters and combinations resumes
+                from it, and it is removed once the run completes
+            checkpoint_every: Combinations finished between checkpoints
             
         Returns:
             BacktestSummary with results and recommendations
         """
         start_time = datetime.now()
-        logger.info("Starting AI backtesting...")
-        
-        if strategy_combinations is None:
-            strategy_combinations = self.generate_strategy_combinations()
+        logger.info(f"Starting AI backtesting ({'parallel' if parallel else 'sequential'})...")
         
+        key = None
         self.results = []
+        try:
+            if strategy_combinations is None:
+                strategy_combinations = self.generate_strategy_combinations()
+            
+            if checkpoint_path:
+                key = self._checkpoint_key(historical_data, strategy_combinations)
+                self.results = self._load_checkpointed_results(checkpoint_path, key)
+            done = {tuple(result.strategy_combination) for result in self.results}
+            pending = [combo for combo in strategy_combinations if tuple(combo) not in done]
+            self._start_progress('parallel' if parallel else 'sequential', len(strategy_combinations),
+                                 completed=len(self.results))
+            
+            # Indicators are shared by every combination, so compute them once
+            historical_data = self.prepare_indicators(historical_data)
+            
+            if parallel:
+                results = self.iter_backtest_parallel(historical_data, pending, max_workers)
+            else:
+                results = self._iter_backtest_sequential(historical_data, pending)
+            
+            for result in results:
+                self.results.append(result)
+                logger.info(f"Strategy {result.strategy_combination} completed: {result.total_return_pct:.2f}% return")
+                if key is not None and len(self.results) % max(1, int(checkpoint_every)) == 0:
+                    save_checkpoint(checkpoint_path, Checkpoint(
+                        fingerprint=key,
+                        cursor=len(self.results),
+                        state={'results': [asdict(r) for r in self.results]}
+                    ))
+                if on_result:
+                    on_result(result)
+            
+            # Generate summary and recommendations
+            self.summary = self._generate_summary(start_time)
+            self._finish_progress('completed')
+            clear_checkpoint(checkpoint_path)
+        except Exception:
+            self._finish_progress('failed')
+            raise
         
+        logger.info(f"Backtesting completed. Tested {len(self.results)} strategies.")
+        return self.summary
+    
+    def _iter_backtest_sequential(self, historical_data: pd.DataFrame,
+                                  strategy_combinations: List[List[str]]) -> Iterator[StrategyResult]:
+        """Test combinations one after another in this thread."""
         for combo in strategy_combinations:
             try:
                 result = self._test_strategy_combination(historical_data, combo)
-                self.results.append(result)
-                logger.info(f"Strategy {combo} completed: {result.total_return_pct:.2f}% return")
             except Exception as e:
                 logger.error(f"Error testing strategy {combo}: {e}")
+                self._advance_progress(failed=True)
                 continue
+            self._advance_progress()
+            yield result
+    
+    def iter_backtest_parallel(self, historical_data: pd.DataFrame,
+                               strategy_combinations: List[List[str]],
+                               max_workers: Optional[int] = None) -> Iterator[StrategyResult]:
+        """
+        Test combinations in a process pool, yielding results as they complete.
         
-        # Generate summary and recommendations
-        self.summary = self._generate_summary(start_time)
+        The historical data is copied into shared memory once; each worker
+        attaches to it on start-up, so tasks only carry the combination.
         
-        logger.info(f"Backtesting completed. Tested {len(self.results)} strategies.")
-        return self.summary
+        Args:
+            historical_data: DataFrame with OHLCV data and indicators
+            strategy_combinations: List of strategy combinations to test
+            max_workers: Worker processes (default: CPU count)
+            
+        Yields:
+            StrategyResult in completion order
+        """
+        shared = SharedFrame(historical_data)
+        try:
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_backtest_worker,
+                                     initargs=(shared.spec(), self.parameters)) as pool:
+                futures = {pool.submit(_run_backtest_combination, combo): combo for combo in strategy_combinations}
+                for future in as_completed(futures):
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        logger.error(f"Error testing strategy {futures[future]}: {e}")
+                        self._advance_progress(failed=True)
+                        continue
+                    self._advance_progress()
+                    yield result
+        finally:
+            shared.release()
+    
+    def _checkpoint_key(self, historical_data: pd.DataFrame, strategy_combinations: List[List[str]]) -> str:
+        """Fingerprint of the inputs that decide every combination's result."""
+        data_hash = pd.util.hash_pandas_object(historical_data, index=True).to_numpy()
+        return fingerprint(data_hash, list(historical_data.columns), asdict(self.parameters), strategy_combinations)
+    
+    def _load_checkpointed_results(self, checkpoint_path: str, key: str) -> List[StrategyResult]:
+        """Results of the combinations finished before the run was interrupted."""
+        checkpoint = load_checkpoint(checkpoint_path, key)
+        if checkpoint is None:
+            return []
+        results = [StrategyResult(**fields) for fields in checkpoint.state.get('results', [])]
+        logger.info(f"Resuming AI backtesting with {len(results)} combinations already tested")
+        return results
+    
+    def try_start(self) -> bool:
+        """
+        Reserve the engine for a run.
+        
+        Marks progress as running at once, so a second caller is turned
+        away even before the first run has started working.
+        
+        Returns:
+            False if a run is already in progress
+        """
+        with self._progress_lock:
+            if self.progress['state'] == 'running':
+                return False
+            self.progress.update({
+                'state': 'running',
+                'mode': None,
+                'total': 0,
+                'completed': 0,
+                'failed': 0,
+                'started_at': datetime.now(),
+                'finished_at': None
+            })
+            return True
+    
+    def _start_progress(self, mode: str, total: int, completed: int = 0):
+        """Reset progress for a new run."""
+        with self._progress_lock:
+            self.progress.update({
+                'state': 'running',
+                'mode': mode,
+                'total': total,
+                'completed': completed,
+                'failed': 0,
+                'started_at': datetime.now(),
+                'finished_at': None
+            })
+    
+    def _advance_progress(self, failed: bool = False):
+        """Count one finished combination."""
+        with self._progress_lock:
+            self.progress['failed' if failed else 'completed'] += 1
+    
+    def _finish_progress(self, state: str):
+        """Mark the run as finished."""
+        with self._progress_lock:
+            self.progress['state'] = state
+            self.progress['finished_at'] = datetime.now()
+    
+    def get_progress(self) -> Dict[str, Any]:
+        """Get progress of the current or last run."""
+        with self._progress_lock:
+            progress = dict(self.progress)
+        
+        done = progress['completed'] + progress['failed']
+        progress['percent_complete'] = (done / progress['total'] * 100) if progress['total'] else 0.0
+        for key in ('started_at', 'finished_at'):
+            if progress[key] is not None:
+                progress[key] = progress[key].isoformat()
+        return progress
+    
+    def prepare_indicators(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Order rows by date and add the indicator columns used for signals.
+        
+        Columns already present (e.g. from TechnicalIndicators) are kept;
+        missing ones are computed per symbol from close and volume. Data
+        that is already prepared is returned unchanged, so run_backtest
+        pays for this once rather than once per combination.
+        
+        Args:
+            data: DataFrame with 'close' and optionally 'date', 'symbol', 'volume'
+            
+        Returns:
+            DataFrame with all INDICATOR_COLUMNS
+        """
+        ordered = 'date' not in data.columns or data['date'].is_monotonic_increasing
+        if ordered and all(column in data.columns for column in INDICATOR_COLUMNS):
+            return data
+        
+        data = data.sort_values('date', kind='stable') if not ordered else data.copy()
+        data = data.reset_index(drop=True)
+        
+        groups = data.groupby('symbol', sort=False).indices.values() if 'symbol' in data.columns else [np.arange(len(data))]
+        columns = {column: np.full(len(data), np.nan) for column in INDICATOR_COLUMNS if column not in data.columns}
+        for rows in groups:
+            close = data['close'].iloc[rows].reset_index(drop=True)
+            volume = data['volume'].iloc[rows].reset_index(drop=True) if 'volume' in data.columns else pd.Series(1.0, index=close.index)
+            for column, values in _compute_indicators(close, volume).items():
+                if column in columns:
+                    columns[column][rows] = values.to_numpy(dtype=float)
+        
+        for column, values in columns.items():
+            data[column] = values
+        return data
     
     def _test_strategy_combination(self, data: pd.DataFrame, 
                                  strategy_combo: List[str]) -> StrategyResult:
-        """Test a single strategy combination."""
-        start_time = datetime.now()
+        """
+        Test a single strategy combination.
         
-        # Simulate trading based on strategy combination
-        portfolio_value = self.parameters.available_cash
-        positions = {}
-        trades = []
+        Signals for the whole history are computed at once; the trade walk
+        then touches each row once, keeping an equity curve marked at the
+        close of every date.
+        """
+        start_time = datetime.now()
         
-        # Simple strategy simulation (placeholder for actual strategy logic)
-        for i in range(len(data)):
-            if i < 50:  # Skip first 50 periods for indicator calculation
+        data = self.prepare_indicators(data)
+        signals = self._generate_signal(data, strategy_combo)
+        
+        if 'symbol' in data.columns:
+            symbol_codes, symbols = pd.factorize(data['symbol'])
+        else:
+            symbol_codes, symbols = np.zeros(len(data), dtype=np.int64), [None]
+        if 'date' in data.columns:
+            dates = data['date'].to_numpy()
+            date_ends = np.append(dates[1:] != dates[:-1], True) if len(dates) else np.zeros(0, dtype=bool)
+        else:
+            date_ends = np.ones(len(data), dtype=bool)
+        
+        # Simulate trading on plain lists: one pass, O(1) work per row
+        cash = self.parameters.available_cash
+        holdings_value = 0.0
+        shares = [0] * len(symbols)
+        entry_prices = [0.0] * len(symbols)
+        last_prices = [0.0] * len(symbols)
+        trade_pnls = []
+        equity_curve = []
+        
+        for code, price, signal, date_end in zip(symbol_codes.tolist(), data['close'].tolist(),
+                                                 signals.tolist(), date_ends.tolist()):
+            if code < 0 or not price > 0:
+                if date_end:
+                    equity_curve.append(cash + holdings_value)
                 continue
-                
-            # Generate signals based on strategy combination
-            signal = self._generate_signal(data.iloc[i], strategy_combo, data.iloc[:i+1])
             
-            if signal == 'buy' and portfolio_value > self.parameters.safe_net:
-                # Calculate position size based on transaction limit
-                max_position_value = portfolio_value * self.parameters.transaction_limit_pct
-                current_price = data.iloc[i]['close']
-                shares = int(max_position_value / current_price)
-                
-                if shares > 0:
-                    cost = shares * current_price
-                    portfolio_value -= cost
-                    positions[data.iloc[i]['symbol']] = {
-                        'shares': shares,
-                        'entry_price': current_price,
-                        'entry_date': data.iloc[i]['date']
-                    }
-                    trades.append({
-                        'type': 'buy',
-                        'symbol': data.iloc[i]['symbol'],
-                        'shares': shares,
-                        'price': current_price,
-                        'date': data.iloc[i]['date']
-                    })
-                    
-            elif signal == 'sell' and data.iloc[i]['symbol'] in positions:
-                position = positions[data.iloc[i]['symbol']]
-                current_price = data.iloc[i]['close']
-                proceeds = position['shares'] * current_price
-                portfolio_value += proceeds
-                
-                # Calculate P&L
-                pnl = proceeds - (position['shares'] * position['entry_price'])
-                
-                trades.append({
-                    'type': 'sell',
-                    'symbol': data.iloc[i]['symbol'],
-                    'shares': position['shares'],
-                    'price': current_price,
-                    'date': data.iloc[i]['date'],
-                    'pnl': pnl
-                })
-                
-                del positions[data.iloc[i]['symbol']]
+            held = shares[code]
+            if held:
+                holdings_value += held * (price - last_prices[code])
+                change = price / entry_prices[code] - 1
+                if signal < 0 or change <= -self.parameters.stop_loss_pct or change >= self.parameters.stop_gain_pct:
+                    cash += held * price
+                    holdings_value -= held * price
+                    trade_pnls.append(held * (price - entry_prices[code]))
+                    shares[code] = 0
+            elif signal > 0:
+                # Size on current equity, keeping the safe net in cash
+                position_shares = int((cash + holdings_value) * self.parameters.transaction_limit_pct / price)
+                cost = position_shares * price
+                if position_shares > 0 and cash - cost >= self.parameters.safe_net:
+                    cash -= cost
+                    holdings_value += cost
+                    shares[code] = position_shares
+                    entry_prices[code] = price
+            
+            last_prices[code] = price
+            if date_end:
+                equity_curve.append(cash + holdings_value)
         
-        # Close remaining positions at end
-        final_portfolio_value = portfolio_value
-        for symbol, position in positions.items():
-            final_price = data.iloc[-1]['close']
-            final_portfolio_value += position['shares'] * final_price
+        equity_curve = np.array(equity_curve) if equity_curve else np.array([self.parameters.available_cash])
+        
+        # Open positions are valued at their last close
+        final_portfolio_value = float(equity_curve[-1])
         
         # Calculate metrics
         total_return = final_portfolio_value - self.parameters.available_cash
         total_return_pct = (total_return / self.parameters.available_cash) * 100
         
-        # Calculate Sharpe ratio (simplified)
-        returns = self._calculate_returns(data, trades)
+        returns = self._calculate_returns(equity_curve)
         sharpe_ratio = self._calculate_sharpe_ratio(returns) if len(returns) > 1 else 0
         
-        # Calculate max drawdown
-        max_drawdown, max_drawdown_pct = self._calculate_max_drawdown(data, trades)
+        max_drawdown, max_drawdown_pct = self._calculate_max_drawdown(equity_curve)
         
-        # Calculate win rate
-        winning_trades = len([t for t in trades if t.get('pnl', 0) > 0])
-        total_trades = len([t for t in trades if t['type'] == 'sell'])
+        # Calculate win rate over closed trades
+        winning_trades = len([pnl for pnl in trade_pnls if pnl > 0])
+        total_trades = len(trade_pnls)
         win_rate = (winning_trades / total_trades) if total_trades > 0 else 0
         
         # Calculate risk score
@@ -309,25 +694,42 @@ class AIBacktestingEngine:
             execution_time=execution_time
         )
     
-    def _generate_signal(self, current_data: pd.Series, 
-                        strategies: List[str], 
-                        historical_data: pd.DataFrame) -> str:
-        """Generate buy/sell signal based on strategy combination."""
-        # Placeholder for actual strategy logic
-        # In real implementation, this would use actual technical indicators
+    def _generate_signal(self, data: pd.DataFrame, strategies: List[str]) -> np.ndarray:
+        """
+        Generate buy/sell signals for every row based on strategy combination.
+        
+        Each strategy votes +1 (bullish), -1 (bearish) or 0 per row; the
+        combination buys when the average vote reaches SIGNAL_THRESHOLD and
+        sells when it falls to -SIGNAL_THRESHOLD. The first WARMUP_PERIODS
+        rows of each symbol are held out while indicators settle.
+        
+        Args:
+            data: DataFrame prepared by prepare_indicators
+            strategies: Strategy names from StrategyType
+            
+        Returns:
+            int8 array with 1 for buy, -1 for sell and 0 for hold
+        """
+        unknown = [strategy for strategy in strategies if strategy not in STRATEGY_VOTES]
+        if unknown:
+            raise ValueError(f"Unknown strategies: {unknown}")
+        
+        score = np.mean([np.nan_to_num(STRATEGY_VOTES[strategy](data)) for strategy in strategies], axis=0)
+        signals = np.where(score >= SIGNAL_THRESHOLD, 1, np.where(score <= -SIGNAL_THRESHOLD, -1, 0)).astype(np.int8)
         
-        # Simple random signal for demonstration
-        import random
-        return random.choice(['buy', 'sell', 'hold'])
+        periods = data.groupby('symbol', sort=False).cumcount().to_numpy() if 'symbol' in data.columns else np.arange(len(data))
+        signals[periods < WARMUP_PERIODS] = 0
+        return signals
     
-    def _calculate_returns(self, data: pd.DataFrame, trades: List[Dict]) -> List[float]:
-        """Calculate returns from trades."""
-        # Placeholder for return calculation
-        return [0.01, -0.02, 0.03, -0.01, 0.02]  # Sample returns
+    def _calculate_returns(self, equity_curve: np.ndarray) -> np.ndarray:
+        """Calculate period returns of an equity curve."""
+        if len(equity_curve) < 2:
+            return np.array([])
+        return np.diff(equity_curve) / equity_curve[:-1]
     
-    def _calculate_sharpe_ratio(self, returns: List[float], risk_free_rate: float = 0.02) -> float:
+    def _calculate_sharpe_ratio(self, returns: np.ndarray, risk_free_rate: float = 0.02) -> float:
         """Calculate Sharpe ratio."""
-        if not returns:
+        if len(returns) == 0:
             return 0.0
         
         returns_array = np.array(returns)
@@ -336,12 +738,17 @@ class AIBacktestingEngine:
         if len(excess_returns) < 2:
             return 0.0
         
-        return np.mean(excess_returns) / np.std(excess_returns) if np.std(excess_returns) > 0 else 0
+        # Annualized from daily returns
+        return np.mean(excess_returns) / np.std(excess_returns) * np.sqrt(252) if np.std(excess_returns) > 0 else 0
     
-    def _calculate_max_drawdown(self, data: pd.DataFrame, trades: List[Dict]) -> Tuple[float, float]:
-        """Calculate maximum drawdown."""
-        # Placeholder for drawdown calculation
-        return 50000.0, 5.0  # $50K, 5%
+    def _calculate_max_drawdown(self, equity_curve: np.ndarray) -> Tuple[float, float]:
+        """Calculate maximum drawdown of an equity curve in dollars and percent."""
+        if len(equity_curve) == 0:
+            return 0.0, 0.0
+        
+        peaks = np.maximum.accumulate(equity_curve)
+        drawdowns = peaks - equity_curve
+        return float(drawdowns.max()), float((drawdowns / peaks).max() * 100)
     
     def _calculate_risk_score(self, sharpe_ratio: float, 
                              max_drawdown_pct: float, 
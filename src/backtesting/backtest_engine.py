@@ -11,7 +11,10 @@ from datetime import datetime
 import time
 
 from .performance_analytics import PerformanceAnalytics, PerformanceMetrics
+from .monte_carlo import MonteCarloAnalyzer, BLOCK_BOOTSTRAP
 from .risk_management import RiskManager, RiskParameters, PositionSizingMethod, StopLossType
+from ..utils.decision_trace import decision_tracer
+from ..strategies.base_strategy import BaseStrategy
 
 @dataclass
 class PositionType:
@@ -26,7 +29,7 @@ class OrderType:
     LIMIT = "limit"
     STOP = "stop"
 
-@dataclass
+@dataclass(slots=True)
 class Trade:
     """Trade information"""
     symbol: str
@@ -82,6 +85,39 @@ class Strategy:
     def get_position_size(self, data: pd.DataFrame, index: int, capital: float) -> float:
         """Calculate position size"""
         return capital * self.parameters.get('position_size', 0.1)
+    
+    def entry_mask(self, data: pd.DataFrame, position_type: str = 'long') -> Optional[np.ndarray]:
+        """Vectorized entry conditions for every row, or None if not supported"""
+        return None
+    
+    def exit_mask(self, data: pd.DataFrame, entries: np.ndarray, position_type: str = 'long') -> Optional[np.ndarray]:
+        """Vectorized exit conditions for every row, or None if not supported"""
+        return None
+    
+    # Column as a float array, filled with default if the column is missing
+    _column_values = staticmethod(BaseStrategy._column_values)
+    
+    @staticmethod
+    def _previous(values: np.ndarray) -> np.ndarray:
+        """Values shifted forward by one row"""
+        return np.concatenate(([np.nan], values[:-1])) if len(values) else values
+    
+    @staticmethod
+    def _volume_confirmation_mask(data: pd.DataFrame, factor: float) -> np.ndarray:
+        """Volume above factor x the mean of the previous 10 bars"""
+        if 'volume' not in data.columns:
+            return np.ones(len(data), dtype=bool)
+        volume = pd.to_numeric(data['volume'], errors='coerce')
+        avg_volume = volume.rolling(window=10, min_periods=1).mean().shift(1).to_numpy()
+        volume = volume.to_numpy(dtype=float)
+        avg_volume[:10] = volume[:10]
+        return volume > avg_volume * factor
+    
+    @staticmethod
+    def _warmup(mask: np.ndarray, periods: int) -> np.ndarray:
+        """Clear the first periods rows of a mask"""
+        mask[:periods] = False
+        return mask
 
 class BacktestEngine:
     """Enhanced backtesting engine with performance analytics and risk management"""
@@ -91,8 +127,9 @@ class BacktestEngine:
         self.capital = initial_capital
         self.positions: Dict[str, Position] = {}
         self.trades: List[Trade] = []
-        self.equity_curve: List[float] = []
-        self.timestamps: List[datetime] = []
+        self.equity_curve = np.empty(0)
+        self.timestamps = np.empty(0, dtype='datetime64[ns]')
+        self._equity_length = 0
         
         # Performance analytics
         self.performance_analytics = PerformanceAnalytics()
@@ -148,7 +185,10 @@ class BacktestEngine:
                     collection_id: str,
                     symbol: str,
                     start_date: Optional[str] = None,
-                    end_date: Optional[str] = None) -> Dict[str, Any]:
+                    end_date: Optional[str] = None,
+                    monte_carlo_simulations: int = 0,
+                    monte_carlo_seed: Optional[int] = None,
+                    monte_carlo_method: str = BLOCK_BOOTSTRAP) -> Dict[str, Any]:
         """
         Run backtest with enhanced performance analytics and risk management
         
@@ -158,6 +198,9 @@ class BacktestEngine:
             symbol: Symbol to trade
             start_date: Start date for backtest
             end_date: End date for backtest
+            monte_carlo_simulations: Add a Monte Carlo analysis with this many paths (0 to skip)
+            monte_carlo_seed: Random seed for the Monte Carlo analysis
+            monte_carlo_method: 'block_bootstrap' (daily returns) or 'trade_bootstrap' (trade P&L)
             
         Returns:
             Dictionary with backtest results and performance metrics
@@ -179,83 +222,133 @@ class BacktestEngine:
             
             self.logger.info(f"Running backtest on {len(data)} data points")
             
-            # Reset state
-            self.capital = self.initial_capital
-            self.positions = {}
-            self.trades = []
-            self.equity_curve = [self.initial_capital]
-            self.timestamps = [data.iloc[0]['Date']]
-            
-            # Run simulation
-            for i in range(len(data)):
-                current_row = data.iloc[i]
-                current_time = current_row['Date']
-                current_price = current_row['close']
-                
-                # Update equity curve
-                self._update_equity_curve(current_price, current_time)
-                
-                # Check for exit signals (risk management)
-                self._check_exit_signals(strategy, data, i, current_row)
-                
-                # Check for entry signals
-                self._check_entry_signals(strategy, data, i, current_row)
-                
-                # Update position values
-                self._update_positions(current_price, current_time)
-            
-            # Close any remaining positions
-            self._close_all_positions(data.iloc[-1]['close'], data.iloc[-1]['Date'])
-            
-            # Calculate performance metrics
-            equity_series = pd.Series(self.equity_curve, index=self.timestamps)
-            performance_metrics = self.performance_analytics.calculate_performance_metrics(
-                equity_series, self.trades
-            )
-            
-            # Generate results
-            results = {
-                "strategy": strategy.name,
-                "symbol": symbol,
-                "initial_capital": self.initial_capital,
-                "final_capital": self.capital,
-                "total_return": performance_metrics.total_return,
-                "trades": len(self.trades),
-                "performance": {
-                    "sharpe_ratio": performance_metrics.sharpe_ratio,
-                    "sortino_ratio": performance_metrics.sortino_ratio,
-                    "calmar_ratio": performance_metrics.calmar_ratio,
-                    "max_drawdown": performance_metrics.max_drawdown,
-                    "win_rate": performance_metrics.win_rate,
-                    "profit_factor": performance_metrics.profit_factor,
-                    "volatility": performance_metrics.volatility,
-                    "information_ratio": performance_metrics.information_ratio,
-                    "omega_ratio": performance_metrics.omega_ratio,
-                    "treynor_ratio": performance_metrics.treynor_ratio,
-                    "var_95": performance_metrics.var_95,
-                    "cvar_95": performance_metrics.cvar_95,
-                    "winning_trades": performance_metrics.winning_trades,
-                    "losing_trades": performance_metrics.losing_trades,
-                    "average_win": performance_metrics.average_win,
-                    "average_loss": performance_metrics.average_loss,
-                    "largest_win": performance_metrics.largest_win,
-                    "largest_loss": performance_metrics.largest_loss,
-                    "best_month": performance_metrics.best_month,
-                    "worst_month": performance_metrics.worst_month,
-                    "positive_months": performance_metrics.positive_months,
-                    "negative_months": performance_metrics.negative_months
-                },
-                "equity_curve": self.equity_curve,
-                "trades": self.trades,
-                "risk_summary": self.risk_manager.get_risk_summary()
-            }
+            self._simulate(strategy, data)
             
+            results = self._build_results(strategy, symbol)
+            if monte_carlo_simulations > 0:
+                # A failed robustness analysis does not void the backtest
+                try:
+                    results["monte_carlo"] = self.run_monte_carlo(results, monte_carlo_simulations, monte_carlo_seed,
+                                                                   monte_carlo_method)
+                except ValueError as e:
+                    self.logger.warning(f"Monte Carlo analysis skipped: {e}")
+                    results["monte_carlo"] = {"error": str(e)}
             return results
             
         except Exception as e:
             self.logger.error(f"Error in backtest: {e}")
             return {"error": str(e)}
     
+    def _simulate(self, strategy: Strategy, data: pd.DataFrame):
+        """Run the bar-by-bar simulation, filling trades, equity curve and capital"""
+        # Reset state
+        self.capital = self.initial_capital
+        self.positions = {}
+        self.trades = []
+        self._allocate_equity_curve(data)
+        
+        # Run simulation
+        for i in range(len(data)):
+            current_row = data.iloc[i]
+            current_time = current_row['Date']
+            current_price = current_row['close']
+            
+            # Update equity curve
+            self._update_equity_curve(current_price, current_time)
+            
+            # Check for exit signals (risk management)
+            self._check_exit_signals(strategy, data, i, current_row)
+            
+            # Check for entry signals
+            self._check_entry_signals(strategy, data, i, current_row)
+            
+            # Update position values
+            self._update_positions(current_price, current_time)
+        
+        # Close any remaining positions
+        self._close_all_positions(data.iloc[-1]['close'], data.iloc[-1]['Date'])
+    
+    def _allocate_equity_curve(self, data: pd.DataFrame):
+        """
+        Preallocate the equity curve and fill in its timestamps
+        
+        The curve starts with the initial capital at the first bar's time,
+        followed by one point per bar.
+        """
+        dates = pd.to_datetime(data['Date']).to_numpy(dtype='datetime64[ns]')
+        self.timestamps = np.concatenate([dates[:1], dates])
+        self.equity_curve = np.empty(len(dates) + 1)
+        self.equity_curve[0] = self.initial_capital
+        self._equity_length = 1
+    
+    def _build_results(self, strategy: Strategy, symbol: str) -> Dict[str, Any]:
+        """Calculate performance metrics and assemble the results dictionary"""
+        # Calculate performance metrics
+        equity_series = pd.Series(self.equity_curve, index=self.timestamps)
+        performance_metrics = self.performance_analytics.calculate_performance_metrics(
+            equity_series, self.trades
+        )
+        
+        # Generate results
+        results = {
+            "strategy": strategy.name,
+            "symbol": symbol,
+            "initial_capital": self.initial_capital,
+            "final_capital": self.capital,
+            "total_return": performance_metrics.total_return,
+            "trades": len(self.trades),
+            "performance": {
+                "sharpe_ratio": performance_metrics.sharpe_ratio,
+                "sortino_ratio": performance_metrics.sortino_ratio,
+                "calmar_ratio": performance_metrics.calmar_ratio,
+                "max_drawdown": performance_metrics.max_drawdown,
+                "win_rate": performance_metrics.win_rate,
+                "profit_factor": performance_metrics.profit_factor,
+                "volatility": performance_metrics.volatility,
+                "information_ratio": performance_metrics.information_ratio,
+                "omega_ratio": performance_metrics.omega_ratio,
+                "treynor_ratio": performance_metrics.treynor_ratio,
+                "var_95": performance_metrics.var_95,
+                "cvar_95": performance_metrics.cvar_95,
+                "winning_trades": performance_metrics.winning_trades,
+                "losing_trades": performance_metrics.losing_trades,
+                "average_win": performance_metrics.average_win,
+                "average_loss": performance_metrics.average_loss,
+                "largest_win": performance_metrics.largest_win,
+                "largest_loss": performance_metrics.largest_loss,
+                "best_month": performance_metrics.best_month,
+                "worst_month": performance_metrics.worst_month,
+                "positive_months": performance_metrics.positive_months,
+                "negative_months": performance_metrics.negative_months
+            },
+            "equity_curve": self.equity_curve,
+            "timestamps": self.timestamps,
+            "trades": self.trades,
+            "risk_summary": self.risk_manager.get_risk_summary()
+        }
+        
+        return results
+    
+    def run_monte_carlo(self, results: Dict[str, Any], n_simulations: int = 1000, seed: Optional[int] = None,
+                        method: str = BLOCK_BOOTSTRAP, block_size: int = 20) -> Dict[str, Any]:
+        """
+        Monte Carlo distributions of final equity, drawdown, Sharpe and risk of ruin
+        
+        Args:
+            results: Results returned by run_backtest
+            n_simulations: Number of resampled paths
+            seed: Random seed for reproducible runs
+            method: 'block_bootstrap' (daily returns) or 'trade_bootstrap' (trade P&L)
+            block_size: Days per block for block_bootstrap
+            
+        Returns:
+            Summary of the simulated distributions
+        """
+        analyzer = MonteCarloAnalyzer(n_simulations, seed, block_size,
+                                      risk_free_rate=self.performance_analytics.risk_free_rate)
+        return analyzer.analyze(results["equity_curve"], results.get("trades"), method,
+                                results.get("timestamps", self.timestamps)).to_dict()
+    
     def _check_entry_signals(self, strategy: Strategy, data: pd.DataFrame, index: int, current_row: pd.Series):
         """Check for entry signals with risk management"""
         symbol = current_row.get('symbol', 'UNKNOWN')
@@ -268,7 +361,7 @@ class BacktestEngine:
         )
         
         if not portfolio_ok:
-            self.logger.info(f"Portfolio limits exceeded: {reason}")
+            self.logger.debug("Portfolio limits exceeded: %s", reason)
             return
         
         # Check for long entry
@@ -356,7 +449,10 @@ class BacktestEngine:
         self.positions[symbol] = position
         self.capital -= shares * price
         
-        self.logger.info(f"Entered {position_type.upper()} position: {shares:.2f} shares at ${price:.2f}")
+        self.logger.debug("Entered %s position: %.2f shares at $%.2f", position_type.upper(), shares, price)
+        if decision_tracer.enabled:
+            decision_tracer.record('BacktestEngine', 'trade', True, {'action': 'enter', 'position_type': position_type},
+                                   symbol=symbol, timestamp=time, shares=shares, price=price)
     
     def _close_position(self, symbol: str, price: float, time: datetime, reason: str):
         """Close an existing position"""
@@ -395,7 +491,11 @@ class BacktestEngine:
         self.trades.append(trade)
         del self.positions[symbol]
         
-        self.logger.info(f"Closed {position.position_type} position: P&L = ${pnl:.2f} ({pnl_percentage:.2%})")
+        self.logger.debug("Closed %s position: P&L = $%.2f (%.2f%%)", position.position_type, pnl, pnl_percentage * 100)
+        if decision_tracer.enabled:
+            decision_tracer.record('BacktestEngine', 'trade', True, {'action': 'exit', 'position_type': position.position_type},
+                                   symbol=symbol, timestamp=time, shares=position.shares, price=price,
+                                   pnl=pnl, exit_reason=reason)
     
     def _close_all_positions(self, price: float, time: datetime):
         """Close all remaining positions"""
@@ -430,15 +530,15 @@ class BacktestEngine:
                 position.unrealized_pnl = (position.entry_price - price) * position.shares
     
     def _update_equity_curve(self, price: float, time: datetime):
-        """Update equity curve"""
+        """Write the current portfolio value into the next equity curve slot"""
         # Calculate current portfolio value
         portfolio_value = self.capital
         
         for position in self.positions.values():
             portfolio_value += position.shares * price
         
-        self.equity_curve.append(portfolio_value)
-        self.timestamps.append(time)
+        self.equity_curve[self._equity_length] = portfolio_value
+        self._equity_length += 1
     
     def get_performance_report(self, results: Dict[str, Any]) -> str:
         """Generate comprehensive performance report"""
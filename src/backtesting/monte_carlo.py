@@ -0,0 +1,220 @@
+"""
+Monte Carlo Robustness Analysis for Backtesting
+
+Resamples a backtest's trade P&L sequence or its daily returns thousands of
+times and reports the resulting distributions of final equity, max drawdown,
+Sharpe ratio and risk of ruin. All paths of a batch are simulated together as
+one (simulations x steps) matrix.
+"""
+
+import pandas as pd
+import numpy as np
+from typing import Dict, Any, List, Optional, Sequence
+import logging
+from dataclasses import dataclass
+
+# Resampling methods
+TRADE_BOOTSTRAP = "trade_bootstrap"
+BLOCK_BOOTSTRAP = "block_bootstrap"
+METHODS = (TRADE_BOOTSTRAP, BLOCK_BOOTSTRAP)
+
+# Upper bound on matrix cells simulated at once (simulations x steps)
+MAX_BATCH_CELLS = 4_000_000
+
+PERCENTILES = (5, 25, 50, 75, 95)
+
+
+@dataclass
+class MonteCarloResults:
+    """Per-simulation outcomes of a Monte Carlo run"""
+    method: str
+    n_simulations: int
+    seed: Optional[int]
+    initial_capital: float
+    ruin_threshold: float
+    final_equity: np.ndarray
+    max_drawdown: np.ndarray
+    sharpe_ratio: np.ndarray
+    ruined: np.ndarray
+
+    @property
+    def risk_of_ruin(self) -> float:
+        """Share of paths that lost ruin_threshold of the initial capital at some point"""
+        return float(self.ruined.mean())
+
+    @property
+    def probability_of_loss(self) -> float:
+        """Share of paths ending below the initial capital"""
+        return float((self.final_equity < self.initial_capital).mean())
+
+    @staticmethod
+    def _distribution(values: np.ndarray) -> Dict[str, float]:
+        summary = {'mean': float(values.mean()), 'std': float(values.std())}
+        for p, value in zip(PERCENTILES, np.percentile(values, PERCENTILES)):
+            summary[f'p{p}'] = float(value)
+        return summary
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-friendly summary of the distributions"""
+        return {
+            'method': self.method,
+            'n_simulations': self.n_simulations,
+            'seed': self.seed,
+            'initial_capital': self.initial_capital,
+            'ruin_threshold': self.ruin_threshold,
+            'risk_of_ruin': self.risk_of_ruin,
+            'probability_of_loss': self.probability_of_loss,
+            'final_equity': self._distribution(self.final_equity),
+            'max_drawdown': self._distribution(self.max_drawdown),
+            'sharpe_ratio': self._distribution(self.sharpe_ratio)
+        }
+
+
+class MonteCarloAnalyzer:
+    """Bootstrap trade sequences or block-resample daily returns of a backtest"""
+
+    def __init__(self,
+                 n_simulations: int = 1000,
+                 seed: Optional[int] = None,
+                 block_size: int = 20,
+                 ruin_threshold: float = 0.5,
+                 risk_free_rate: float = 0.02):
+        """
+        Args:
+            n_simulations: Number of resampled paths
+            seed: Random seed for reproducible runs
+            block_size: Days per block when resampling returns
+            ruin_threshold: Loss of initial capital (0.5 = 50%) counted as ruin
+            risk_free_rate: Annual risk-free rate used for Sharpe ratios
+        """
+        if n_simulations < 1:
+            raise ValueError("n_simulations must be at least 1")
+
+        self.n_simulations = n_simulations
+        self.seed = seed
+        self.block_size = block_size
+        self.ruin_threshold = ruin_threshold
+        self.risk_free_rate = risk_free_rate
+        self.logger = logging.getLogger(__name__)
+
+    def analyze(self,
+                equity_curve: Sequence[float],
+                trades: Optional[List[Any]] = None,
+                method: str = BLOCK_BOOTSTRAP,
+                timestamps: Optional[Sequence[Any]] = None) -> MonteCarloResults:
+        """
+        Run a Monte Carlo analysis of backtest output
+
+        Args:
+            equity_curve: Portfolio values over time (its first value is the initial capital)
+            trades: Closed trades (Trade objects or dicts with 'pnl'), for trade bootstrap
+            method: TRADE_BOOTSTRAP or BLOCK_BOOTSTRAP
+            timestamps: Equity curve timestamps, used to annualize trade-level Sharpe ratios
+
+        Returns:
+            MonteCarloResults
+        """
+        equity = np.asarray(equity_curve, dtype=float)
+        if len(equity) < 2:
+            raise ValueError("Equity curve needs at least two points")
+
+        if method == TRADE_BOOTSTRAP:
+            pnls = np.array([t['pnl'] if isinstance(t, dict) else t.pnl for t in trades or []], dtype=float)
+            years = self._years(timestamps, len(equity))
+            return self.bootstrap_trades(pnls, equity[0], periods_per_year=len(pnls) / years if years else 252)
+
+        if method == BLOCK_BOOTSTRAP:
+            return self.block_bootstrap_returns(np.diff(equity) / equity[:-1], equity[0])
+
+        raise ValueError(f"Unknown Monte Carlo method: {method}")
+
+    def bootstrap_trades(self, pnls: np.ndarray, initial_capital: float,
+                         periods_per_year: float = 252) -> MonteCarloResults:
+        """
+        Resample trade P&L with replacement into new trade sequences
+
+        Args:
+            pnls: Dollar P&L of each closed trade
+            initial_capital: Starting equity of every path
+            periods_per_year: Trades per year, for annualizing Sharpe ratios
+        """
+        if len(pnls) == 0:
+            raise ValueError("Trade bootstrap needs at least one closed trade")
+
+        def paths(rng: np.random.Generator, n: int) -> np.ndarray:
+            return initial_capital + np.cumsum(pnls[rng.integers(0, len(pnls), size=(n, len(pnls)))], axis=1)
+
+        return self._simulate(TRADE_BOOTSTRAP, paths, len(pnls), initial_capital, periods_per_year)
+
+    def block_bootstrap_returns(self, returns: np.ndarray, initial_capital: float) -> MonteCarloResults:
+        """
+        Rebuild return series from randomly placed blocks of consecutive days
+
+        Blocks keep short-range autocorrelation and volatility clustering that
+        resampling single days would destroy.
+
+        Args:
+            returns: Daily returns of the backtest
+            initial_capital: Starting equity of every path
+        """
+        returns = np.asarray(returns, dtype=float)
+        n_steps = len(returns)
+        block = max(1, min(self.block_size, n_steps))
+        n_blocks = -(-n_steps // block)
+        offsets = np.arange(block)
+
+        def paths(rng: np.random.Generator, n: int) -> np.ndarray:
+            starts = rng.integers(0, n_steps - block + 1, size=(n, n_blocks))
+            index = (starts[:, :, None] + offsets).reshape(n, -1)[:, :n_steps]
+            return initial_capital * np.cumprod(1 + returns[index], axis=1)
+
+        return self._simulate(BLOCK_BOOTSTRAP, paths, n_steps, initial_capital, 252)
+
+    def _simulate(self, method: str, paths, n_steps: int, initial_capital: float,
+                  periods_per_year: float) -> MonteCarloResults:
+        """Generate paths in batches and reduce each batch to per-path metrics"""
+        rng = np.random.default_rng(self.seed)
+        batch = max(1, MAX_BATCH_CELLS // max(n_steps, 1))
+        ruin_level = initial_capital * (1 - self.ruin_threshold)
+
+        final_equity, max_drawdown, sharpe_ratio, ruined = [], [], [], []
+        for start in range(0, self.n_simulations, batch):
+            n = min(batch, self.n_simulations - start)
+            equity = np.hstack([np.full((n, 1), initial_capital), paths(rng, n)])
+
+            peaks = np.maximum.accumulate(equity, axis=1)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                returns = np.diff(equity, axis=1) / equity[:, :-1]
+                drawdown = np.where(peaks > 0, (equity - peaks) / peaks, -1.0)
+            returns = np.nan_to_num(returns, nan=0.0, posinf=0.0, neginf=-1.0)
+
+            std = returns.std(axis=1, ddof=1) if n_steps > 1 else np.zeros(n)
+            excess = returns.mean(axis=1) - self.risk_free_rate / periods_per_year
+            with np.errstate(divide='ignore', invalid='ignore'):
+                sharpe = np.where(std > 0, excess / std * np.sqrt(periods_per_year), 0.0)
+
+            final_equity.append(equity[:, -1])
+            max_drawdown.append(drawdown.min(axis=1))
+            sharpe_ratio.append(sharpe)
+            ruined.append((equity <= ruin_level).any(axis=1))
+
+        self.logger.info(f"Monte Carlo ({method}): {self.n_simulations} simulations x {n_steps} steps")
+        return MonteCarloResults(
+            method=method,
+            n_simulations=self.n_simulations,
+            seed=self.seed,
+            initial_capital=float(initial_capital),
+            ruin_threshold=self.ruin_threshold,
+            final_equity=np.concatenate(final_equity),
+            max_drawdown=np.concatenate(max_drawdown),
+            sharpe_ratio=np.concatenate(sharpe_ratio),
+            ruined=np.concatenate(ruined)
+        )
+
+    @staticmethod
+    def _years(timestamps: Optional[Sequence[Any]], n_points: int) -> float:
+        """Length of the backtest in years, from timestamps or assuming daily bars"""
+        if timestamps is not None and len(timestamps) > 1:
+            span = pd.Timestamp(timestamps[-1]) - pd.Timestamp(timestamps[0])
+            return span.days / 365.25
+        return n_points / 252
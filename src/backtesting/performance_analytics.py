@@ -9,6 +9,9 @@ import logging
 from dataclasses import dataclass
 from datetime import datetime
 
+# Upper bound on matrix cells (time x curves) processed at once by the batch metrics
+MAX_BATCH_CELLS = 4_000_000
+
 @dataclass
 class PerformanceMetrics:
     """Container for all performance metrics"""
@@ -123,6 +126,151 @@ class PerformanceAnalytics:
             self.logger.error(f"Error calculating performance metrics: {e}")
             raise
     
+    def calculate_performance_metrics_batch(self,
+                                            equity_matrix,
+                                            labels: Optional[List[Any]] = None,
+                                            timestamps: Optional[Any] = None,
+                                            benchmark_returns: Optional[Any] = None) -> pd.DataFrame:
+        """
+        Calculate return and risk metrics for many equity curves at once
+        
+        Every metric is computed column-wise over the whole matrix, with the
+        same definitions as calculate_performance_metrics. Trade metrics are
+        not included; monthly metrics are added when timestamps are known.
+        
+        Args:
+            equity_matrix: (time x curves) array, or DataFrame with one column per curve
+            labels: Curve names (defaults to the DataFrame columns or 0..n-1)
+            timestamps: Time of each row (defaults to a DataFrame's DatetimeIndex)
+            benchmark_returns: Benchmark returns, one per return row, for the information ratio
+            
+        Returns:
+            DataFrame with one row per curve and one column per metric
+        """
+        try:
+            if isinstance(equity_matrix, pd.DataFrame):
+                if labels is None:
+                    labels = list(equity_matrix.columns)
+                if timestamps is None and isinstance(equity_matrix.index, pd.DatetimeIndex):
+                    timestamps = equity_matrix.index
+                equity_matrix = equity_matrix.to_numpy(dtype=float)
+            
+            equity = np.asarray(equity_matrix, dtype=float)
+            if equity.ndim == 1:
+                equity = equity[:, None]
+            if len(equity) < 3:
+                raise ValueError("Equity curves need at least three points")
+            
+            n_curves = equity.shape[1]
+            labels = list(range(n_curves)) if labels is None else list(labels)
+            benchmark = None if benchmark_returns is None else np.asarray(benchmark_returns, dtype=float)
+            months = None
+            if timestamps is not None:
+                # Month of each return row (returns start at the second timestamp)
+                months = pd.DatetimeIndex(timestamps)[1:].to_period('M').asi8
+            
+            batch = max(1, MAX_BATCH_CELLS // len(equity))
+            frames = [
+                self._batch_metrics(equity[:, start:start + batch], benchmark, months)
+                for start in range(0, n_curves, batch)
+            ]
+            
+            metrics = pd.concat(frames, ignore_index=True)
+            metrics.index = pd.Index(labels, name='curve')
+            return metrics
+            
+        except Exception as e:
+            self.logger.error(f"Error calculating batch performance metrics: {e}")
+            raise
+    
+    def _batch_metrics(self, equity: np.ndarray, benchmark: Optional[np.ndarray],
+                       months: Optional[np.ndarray]) -> pd.DataFrame:
+        """Metrics of one (time x curves) block of equity curves"""
+        n_points = len(equity)
+        returns = equity[1:] / equity[:-1] - 1
+        n_returns = len(returns)
+        rf_daily = self.risk_free_rate / 252
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            total_return = equity[-1] / equity[0] - 1
+            annualized_return = (1 + total_return) ** (252 / n_returns) - 1
+            
+            std = returns.std(axis=0, ddof=1)
+            excess_mean = returns.mean(axis=0) - rf_daily
+            sharpe_ratio = np.where(std == 0, 0.0, excess_mean / std * np.sqrt(252))
+            
+            # Moments of the negative returns only
+            downside = returns < 0
+            n_down = downside.sum(axis=0)
+            down_mean = np.where(downside, returns, 0.0).sum(axis=0) / n_down
+            down_var = np.where(downside, (returns - down_mean) ** 2, 0.0).sum(axis=0) / (n_down - 1)
+            downside_deviation = np.where(n_down > 1, np.sqrt(down_var), 0.0)
+            sortino_ratio = np.where(downside_deviation > 0, excess_mean / downside_deviation * np.sqrt(252), 0.0)
+            
+            # Calmar uses the compounded returns, whose first point is after the first return
+            growth = equity[1:] / equity[0]
+            return_drawdown = (growth / np.maximum.accumulate(growth, axis=0) - 1).min(axis=0)
+            calmar_ratio = np.where(return_drawdown == 0, 0.0, total_return / np.abs(return_drawdown))
+            
+            information_ratio = np.zeros(equity.shape[1])
+            if benchmark is not None:
+                active = returns - benchmark[:, None]
+                tracking_error = active.std(axis=0, ddof=1)
+                information_ratio = np.where(tracking_error == 0, 0.0,
+                                             active.mean(axis=0) / tracking_error * np.sqrt(252))
+            
+            gains = returns > 0
+            n_gains = gains.sum(axis=0)
+            n_losses = n_returns - n_gains
+            expected_gain = np.where(n_gains > 0, np.where(gains, returns, 0.0).sum(axis=0) / n_gains, 0.0)
+            expected_loss = np.abs(np.where(gains, 0.0, returns).sum(axis=0) / n_losses)
+            omega_ratio = np.where(n_losses == 0, np.inf,
+                                   np.where(expected_loss == 0, 0.0, expected_gain / expected_loss))
+            
+            # Max drawdown, and bars from its trough to the following high
+            peak = np.maximum.accumulate(equity, axis=0)
+            drawdown = (equity - peak) / peak
+            trough = drawdown.argmin(axis=0)
+            after_trough = np.arange(n_points)[:, None] >= trough
+            recovery = np.where(after_trough, equity, -np.inf).argmax(axis=0)
+            max_drawdown_duration = np.where(recovery <= trough, n_points - trough, recovery - trough)
+            
+            var_95 = np.percentile(returns, 5, axis=0)
+            in_tail = returns <= var_95
+            cvar_95 = np.where(in_tail, returns, 0.0).sum(axis=0) / in_tail.sum(axis=0)
+        
+        metrics = {
+            'total_return': total_return,
+            'annualized_return': annualized_return,
+            'volatility': std * np.sqrt(252),
+            'sharpe_ratio': sharpe_ratio,
+            'sortino_ratio': sortino_ratio,
+            'calmar_ratio': calmar_ratio,
+            'information_ratio': information_ratio,
+            'omega_ratio': omega_ratio,
+            'treynor_ratio': total_return - self.risk_free_rate,
+            'max_drawdown': drawdown.min(axis=0),
+            'max_drawdown_duration': max_drawdown_duration,
+            'var_95': var_95,
+            'cvar_95': cvar_95,
+            'downside_deviation': downside_deviation
+        }
+        
+        if months is not None:
+            # Compounded return of each calendar month: equity after its last return
+            # over equity before its first return
+            starts = np.flatnonzero(np.r_[True, months[1:] != months[:-1]])
+            ends = np.r_[starts[1:], n_returns]
+            monthly_returns = equity[ends] / equity[starts] - 1
+            metrics.update({
+                'best_month': monthly_returns.max(axis=0),
+                'worst_month': monthly_returns.min(axis=0),
+                'positive_months': (monthly_returns > 0).sum(axis=0),
+                'negative_months': (monthly_returns < 0).sum(axis=0)
+            })
+        
+        return pd.DataFrame(metrics)
+    
     def _calculate_annualized_return(self, returns: pd.Series) -> float:
         """Calculate annualized return"""
         total_days = len(returns)
@@ -0,0 +1,249 @@
+"""
+Multi-profile comparison runner.
+
+Loads each symbol once, computes the indicator set once and evaluates every
+strategy profile (or strategy instance) against the same frame, instead of
+running one backtest per profile that reloads data and recomputes indicators.
+"""
+
+import pandas as pd
+import numpy as np
+from typing import Dict, Any, List, Optional, Union
+import logging
+import time
+
+from ..indicators.indicators import TechnicalIndicators
+from ..strategies.base_strategy import BaseStrategy
+from ..strategies.profile_compiler import CompiledProfile, compile_profiles, evaluate_profiles
+
+Variant = Union[CompiledProfile, BaseStrategy]
+
+
+class ProfileComparisonRunner:
+    """Evaluate N strategy variants against shared per-symbol indicator data."""
+
+    def __init__(self, variants: Optional[Dict[str, Variant]] = None, data_manager=None):
+        """
+        Args:
+            variants: Variant name -> CompiledProfile or BaseStrategy.
+                Defaults to every MACD profile in settings.yaml.
+            data_manager: DataCollectionManager used to load collection data
+        """
+        self.variants = variants if variants is not None else compile_profiles()
+        self._data_manager = data_manager
+        self.indicators = TechnicalIndicators()
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def data_manager(self):
+        if self._data_manager is None:
+            from ..data_collection.data_manager import DataCollectionManager
+            self._data_manager = DataCollectionManager()
+        return self._data_manager
+
+    def prepare_data(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Index price data by date and compute all indicators once.
+
+        Args:
+            data: OHLCV data, with a 'Date' column or a date index
+
+        Returns:
+            DataFrame with indicators
+        """
+        df = data.copy()
+        if 'Date' in df.columns:
+            df = df.set_index(pd.to_datetime(df['Date'])).drop(columns=['Date'])
+        df = df.sort_index()
+        return self.indicators.calculate_all_indicators(df)
+
+    def evaluate_symbol(self, symbol: str, data: pd.DataFrame) -> List[Dict[str, Any]]:
+        """
+        Evaluate all variants on one symbol's prepared data.
+
+        Args:
+            symbol: Symbol name
+            data: DataFrame returned by prepare_data
+
+        Returns:
+            List of per-variant result rows
+        """
+        profiles = {name: v for name, v in self.variants.items() if isinstance(v, CompiledProfile)}
+        profile_entries = evaluate_profiles(data, profiles)['entries'] if profiles else None
+
+        rows = []
+        for name, variant in self.variants.items():
+            if isinstance(variant, CompiledProfile):
+                trades = self._simulate_profile(data, profile_entries[name].to_numpy(), variant)
+            else:
+                variant.reset()
+                signals = variant.generate_signals(data)
+                trades = self._simulate_signals(data, signals['signal'].to_numpy())
+            rows.append(self._summarize_trades(name, symbol, trades))
+
+        return rows
+
+    def run(self, symbol_data: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+        """
+        Evaluate all variants on every symbol.
+
+        Args:
+            symbol_data: Symbol -> raw OHLCV data
+
+        Returns:
+            DataFrame with one row per (variant, symbol)
+        """
+        rows = []
+        for symbol, data in symbol_data.items():
+            try:
+                if data is None or data.empty:
+                    continue
+                rows.extend(self.evaluate_symbol(symbol, self.prepare_data(data)))
+            except Exception as e:
+                self.logger.error(f"Error evaluating variants for {symbol}: {e}")
+
+        return pd.DataFrame(rows)
+
+    def run_collection(self, collection_id: str, symbols: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Compare all variants across a collection.
+
+        Args:
+            collection_id: Data collection ID
+            symbols: Restrict to these symbols (default: all symbols in the collection)
+
+        Returns:
+            Dict with per-symbol 'details', the 'comparison' table and timing
+        """
+        start_time = time.time()
+        symbols = symbols or self.data_manager.get_collection_symbols(collection_id)
+
+        rows = []
+        for symbol in symbols:
+            try:
+                data = self.data_manager.get_symbol_data(collection_id, symbol)
+                if data is None or data.empty:
+                    self.logger.warning(f"No data found for {symbol} in collection {collection_id}")
+                    continue
+                rows.extend(self.evaluate_symbol(symbol, self.prepare_data(data)))
+            except Exception as e:
+                self.logger.error(f"Error evaluating variants for {symbol}: {e}")
+
+        details = pd.DataFrame(rows)
+        elapsed = time.time() - start_time
+        self.logger.info(f"Compared {len(self.variants)} variants on {len(symbols)} symbols in {elapsed:.2f}s")
+
+        return {
+            'collection_id': collection_id,
+            'details': details,
+            'comparison': self.compare(details),
+            'execution_time': elapsed
+        }
+
+    @staticmethod
+    def compare(details: pd.DataFrame) -> pd.DataFrame:
+        """
+        Aggregate per-symbol results into one row per variant.
+
+        Args:
+            details: DataFrame returned by run
+
+        Returns:
+            Comparison table sorted by average total return
+        """
+        if details.empty:
+            return pd.DataFrame()
+
+        grouped = details.groupby('variant')
+        comparison = pd.DataFrame({
+            'symbols': grouped['symbol'].nunique(),
+            'total_trades': grouped['trades'].sum(),
+            'win_rate': grouped['wins'].sum() / grouped['trades'].sum().replace(0, np.nan),
+            'avg_total_return_pct': grouped['total_return_pct'].mean(),
+            'median_total_return_pct': grouped['total_return_pct'].median(),
+            'avg_trade_return_pct': grouped['avg_trade_return_pct'].mean(),
+            'worst_trade_pct': grouped['worst_trade_pct'].min(),
+            'avg_bars_held': grouped['avg_bars_held'].mean()
+        })
+
+        return comparison.fillna(0.0).sort_values('avg_total_return_pct', ascending=False)
+
+    def _simulate_profile(self, data: pd.DataFrame, entries: np.ndarray, profile: CompiledProfile) -> List[Dict[str, Any]]:
+        """Single long position per symbol: enter on the profile score, exit on its thresholds or a MACD cross down."""
+        close = data['close'].to_numpy(dtype=float)
+        crossover_down = BaseStrategy._column_mask(data, 'macd_crossover_down')
+        days = self._day_numbers(data)
+
+        take_profit = profile.exit_conditions.get('take_profit_pct', np.inf)
+        stop_loss = profile.exit_conditions.get('stop_loss_pct', np.inf)
+        max_hold = profile.exit_conditions.get('max_hold_days', np.inf)
+        max_drawdown = profile.exit_conditions.get('max_drawdown_pct', np.inf)
+
+        def exit_after(entry: int) -> int:
+            # Only bars within the holding period can be reached
+            end = int(np.searchsorted(days, days[entry] + max_hold, side='right')) if np.isfinite(max_hold) else len(close)
+            window = close[entry + 1:end + 1]
+            pnl_pct = (window - close[entry]) / close[entry] * 100
+            peak = np.maximum.accumulate(np.concatenate(([close[entry]], window)))[1:]
+            drawdown_pct = (window - peak) / peak * 100
+            held = days[entry + 1:end + 1] - days[entry]
+
+            hit = ((pnl_pct >= take_profit) | (pnl_pct <= -stop_loss) | (held >= max_hold) |
+                   (drawdown_pct <= -max_drawdown) | crossover_down[entry + 1:end + 1])
+            return entry + 1 + int(np.argmax(hit)) if hit.any() else entry + len(window)
+
+        return self._walk_positions(close, entries, exit_after)
+
+    def _simulate_signals(self, data: pd.DataFrame, signal: np.ndarray) -> List[Dict[str, Any]]:
+        """Single long position per symbol: enter on signal 1, exit on the next signal -1."""
+        close = data['close'].to_numpy(dtype=float)
+        exit_index = np.flatnonzero(signal == -1)
+
+        def exit_after(entry: int) -> int:
+            position = int(np.searchsorted(exit_index, entry, side='right'))
+            return int(exit_index[position]) if position < len(exit_index) else len(close) - 1
+
+        return self._walk_positions(close, signal == 1, exit_after)
+
+    @staticmethod
+    def _walk_positions(close: np.ndarray, entries: np.ndarray, exit_after) -> List[Dict[str, Any]]:
+        """Jump from entry to exit to the next entry; open positions close on the last bar."""
+        entry_index = np.flatnonzero(entries)
+        trades = []
+        position = 0
+        while position < len(entry_index) and entry_index[position] < len(close) - 1:
+            entry = int(entry_index[position])
+            exit_ = exit_after(entry)
+            trades.append({
+                'entry_index': entry,
+                'exit_index': exit_,
+                'return_pct': (close[exit_] - close[entry]) / close[entry] * 100
+            })
+            position = int(np.searchsorted(entry_index, exit_, side='right'))
+        return trades
+
+    @staticmethod
+    def _day_numbers(data: pd.DataFrame) -> np.ndarray:
+        """Calendar day numbers for a DatetimeIndex, bar numbers otherwise."""
+        if isinstance(data.index, pd.DatetimeIndex):
+            return data.index.normalize().asi8 // (86400 * 10**9)
+        return np.arange(len(data))
+
+    @staticmethod
+    def _summarize_trades(variant: str, symbol: str, trades: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Result row for one variant on one symbol."""
+        returns = np.array([t['return_pct'] for t in trades], dtype=float)
+        bars = np.array([t['exit_index'] - t['entry_index'] for t in trades], dtype=float)
+
+        return {
+            'variant': variant,
+            'symbol': symbol,
+            'trades': len(trades),
+            'wins': int((returns > 0).sum()),
+            'win_rate': float((returns > 0).mean()) if len(returns) else 0.0,
+            'total_return_pct': float((np.prod(1 + returns / 100) - 1) * 100) if len(returns) else 0.0,
+            'avg_trade_return_pct': float(returns.mean()) if len(returns) else 0.0,
+            'best_trade_pct': float(returns.max()) if len(returns) else 0.0,
+            'worst_trade_pct': float(returns.min()) if len(returns) else 0.0,
+            'avg_bars_held': float(bars.mean()) if len(bars) else 0.0
+        }
@@ -0,0 +1,161 @@
+"""
+Backtest Result Cache
+
+Memoizes backtest responses under a canonical hash of everything that
+determines the result: strategy, profile parameters, symbol set, date range
+and a data-version stamp of the collection store. New bars change the stamp,
+so requests after a collection update miss and recompute, and the entries
+built on the old data are dropped.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Callable, Iterable, Tuple
+import logging
+
+
+def canonical_key(strategy: str,
+                  parameters: Optional[Dict[str, Any]] = None,
+                  symbols: Iterable[str] = (),
+                  start_date: Optional[str] = None,
+                  end_date: Optional[str] = None,
+                  data_version: str = '',
+                  **options) -> str:
+    """
+    Hash of a backtest request that ignores ordering and formatting details
+
+    Symbols are upper-cased, de-duplicated and sorted; dict keys are sorted.
+
+    Args:
+        strategy: Strategy name
+        parameters: Profile name and strategy/risk parameters
+        symbols: Traded (and benchmark) symbols
+        start_date: Backtest start date
+        end_date: Backtest end date
+        data_version: Version stamp of the underlying data
+        **options: Any other inputs that change the result
+
+    Returns:
+        SHA-256 hex digest
+    """
+    payload = {
+        'strategy': str(strategy).upper(),
+        'parameters': parameters or {},
+        'symbols': sorted({str(s).upper() for s in symbols if s}),
+        'start_date': start_date,
+        'end_date': end_date,
+        'data_version': data_version,
+        'options': options
+    }
+    encoded = json.dumps(payload, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def cache_scope(collection_id: Optional[str], symbols: Iterable[str] = ()) -> str:
+    """
+    Scope of a result computed from these symbols of a collection
+
+    A scope holds one data version at a time, so it must match the data the
+    version stamp was computed from.
+
+    Args:
+        collection_id: Data collection ID (None for the whole store)
+        symbols: Symbols the data version covers
+
+    Returns:
+        Scope string for BacktestResultCache.put
+    """
+    return f"{collection_id or '*'}:{','.join(sorted({str(s).upper() for s in symbols if s}))}"
+
+
+class BacktestResultCache:
+    """Thread-safe LRU cache of backtest results, scoped by data version"""
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: Optional[float] = None):
+        """
+        Args:
+            max_entries: Entries kept before the least recently used is evicted
+            ttl_seconds: Optional maximum age of an entry
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, str, str, Any]]" = OrderedDict()
+        self._scope_versions: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.logger = logging.getLogger(__name__)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Cached value for key, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or (self.ttl_seconds is not None and time.time() - entry[0] > self.ttl_seconds):
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[3]
+
+    def put(self, key: str, value: Any, scope: str = '*', data_version: str = ''):
+        """
+        Store a value
+
+        Args:
+            key: Key from canonical_key
+            value: Result to cache (typically the encoded JSON response)
+            scope: Data the result depends on (from cache_scope, or '*' for the whole store)
+            data_version: Version stamp the result was computed from
+        """
+        with self._lock:
+            if self._scope_versions.get(scope, data_version) != data_version:
+                self._drop_scope(scope)
+            self._scope_versions[scope] = data_version
+
+            self._entries[key] = (time.time(), scope, data_version, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any], scope: str = '*',
+                       data_version: str = '', cacheable: Callable[[Any], bool] = lambda value: True) -> Any:
+        """Cached value for key, computing and storing it on a miss"""
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            if cacheable(value):
+                self.put(key, value, scope, data_version)
+        return value
+
+    def invalidate(self, scope: Optional[str] = None):
+        """Drop the entries of one scope, or everything"""
+        with self._lock:
+            if scope is None:
+                self._entries.clear()
+                self._scope_versions.clear()
+            else:
+                self._drop_scope(scope)
+                self._scope_versions.pop(scope, None)
+
+    def _drop_scope(self, scope: str):
+        stale = [key for key, entry in self._entries.items() if entry[1] == scope]
+        for key in stale:
+            del self._entries[key]
+        if stale:
+            self.logger.info(f"Dropped {len(stale)} cached backtests for {scope} after a data update")
+
+    def stats(self) -> Dict[str, Any]:
+        """Entry count and hit rate"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
@@ -36,6 +36,7 @@ class RiskParameters:
     stop_loss_percentage: float = 0.02  # 2%
     atr_multiplier: float = 2.0
     trailing_stop_percentage: float = 0.01  # 1%
+    max_hold_days: int = 30  # Holding limit for time-based stops
     
     # Take-profit
     take_profit_percentage: float = 0.06  # 6%
@@ -409,7 +410,7 @@ class RiskManager:
             # Check time-based exit
             if entry_time and self.params.stop_loss_type == StopLossType.TIME_BASED:
                 time_held = current_time - pd.to_datetime(entry_time)
-                if time_held.days > 30:  # 30-day time limit
+                if time_held.days > self.params.max_hold_days:
                     return True, "Time-based exit"
             
             return False, "No exit signal"
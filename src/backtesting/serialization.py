@@ -0,0 +1,97 @@
+"""
+Backtest Results Serialization
+
+Converts backtest results (NumPy equity and timestamp arrays, Trade records,
+nested metric dicts) into JSON-ready Python objects. The large parts of a
+result are converted column-wise instead of element by element: equity and
+timestamp arrays in one call each, and trades through a structured array.
+"""
+
+import json
+import numpy as np
+import pandas as pd
+from dataclasses import fields
+from datetime import datetime, date
+from typing import Dict, Any, List
+
+from .backtest_engine import Trade
+
+TRADE_DTYPE = np.dtype([
+    ('symbol', object),
+    ('entry_time', 'datetime64[ns]'),
+    ('exit_time', 'datetime64[ns]'),
+    ('entry_price', 'f8'),
+    ('exit_price', 'f8'),
+    ('position_type', object),
+    ('shares', 'f8'),
+    ('pnl', 'f8'),
+    ('pnl_percentage', 'f8'),
+    ('stop_loss', 'f8'),
+    ('take_profit', 'f8'),
+    ('exit_reason', object)
+])
+
+TRADE_FIELDS = tuple(f.name for f in fields(Trade))
+
+
+def trades_to_array(trades: List[Trade]) -> np.ndarray:
+    """Trade records as a structured array with one column per Trade field"""
+    array = np.empty(len(trades), dtype=TRADE_DTYPE)
+    for name in TRADE_FIELDS:
+        values = [getattr(trade, name) for trade in trades]
+        if array.dtype[name].kind == 'M':
+            array[name] = pd.to_datetime(values).to_numpy(dtype='datetime64[ns]')
+        else:
+            array[name] = values
+    return array
+
+
+def _column_to_list(column: np.ndarray) -> list:
+    if column.dtype.kind == 'M':
+        strings = np.datetime_as_string(column, unit='s')
+        return [None if s == 'NaT' else s for s in strings.tolist()]
+    return column.tolist()
+
+
+def serialize_trades(trades) -> List[Dict[str, Any]]:
+    """Trades (Trade records or a TRADE_DTYPE array) as a list of JSON-ready dicts"""
+    array = trades if isinstance(trades, np.ndarray) else trades_to_array(trades)
+    columns = [_column_to_list(array[name]) for name in array.dtype.names]
+    return [dict(zip(array.dtype.names, row)) for row in zip(*columns)]
+
+
+def _to_native(obj: Any) -> Any:
+    """Recursively convert NumPy, pandas and datetime values to JSON-ready types"""
+    if isinstance(obj, dict):
+        return {key: _to_native(value) for key, value in obj.items()}
+    if isinstance(obj, np.ndarray):
+        if obj.dtype == TRADE_DTYPE:
+            return serialize_trades(obj)
+        return _column_to_list(obj)
+    if isinstance(obj, (list, tuple)):
+        if obj and isinstance(obj[0], Trade):
+            return serialize_trades(obj)
+        return [_to_native(item) for item in obj]
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    return obj
+
+
+def serialize_results(results: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert a backtest results dict into JSON-ready Python objects
+
+    Args:
+        results: Results returned by a backtest engine
+
+    Returns:
+        Results with arrays as lists, timestamps as ISO strings and trades as dicts
+    """
+    return _to_native(results)
+
+
+def dumps_results(results: Dict[str, Any]) -> str:
+    """Backtest results encoded as a JSON string"""
+    return json.dumps(serialize_results(results))
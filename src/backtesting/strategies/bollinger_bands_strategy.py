@@ -174,6 +174,58 @@ class BollingerBandsStrategy(Strategy):
             self.logger.error(f"Error in should_exit_short: {e}")
             return False
     
+    def entry_mask(self, data: pd.DataFrame, position_type: str = 'long') -> np.ndarray:
+        """Vectorized should_enter_long / should_enter_short over all rows"""
+        bands = self._band_values(data)
+        if bands is None or (position_type == 'short' and not self.enable_short):
+            return np.zeros(len(data), dtype=bool)
+        
+        bb_lower, bb_middle, bb_upper, close = bands
+        rsi = self._column_values(data, 'rsi_14', 50.0)
+        
+        volume_confirmed = np.ones(len(data), dtype=bool)
+        if self.use_volume_confirmation:
+            volume_confirmed = self._volume_confirmation_mask(data, 1.1)
+        
+        if position_type == 'long':
+            signal = (close <= bb_lower * 1.01) & (close < bb_middle)
+            if self.use_rsi_confirmation:
+                signal &= rsi < 70
+        else:
+            signal = (close >= bb_upper * 0.99) & (close > bb_middle)
+            if self.use_rsi_confirmation:
+                signal &= rsi > 30
+        
+        return self._warmup(signal & volume_confirmed, self.bb_period)
+    
+    def exit_mask(self, data: pd.DataFrame, entries: np.ndarray, position_type: str = 'long') -> np.ndarray:
+        """Vectorized should_exit_long / should_exit_short over all rows"""
+        bands = self._band_values(data)
+        if bands is None or (position_type == 'short' and not self.enable_short):
+            return np.zeros(len(data), dtype=bool)
+        
+        bb_lower, bb_middle, bb_upper, close = bands
+        rsi = self._column_values(data, 'rsi_14', 50.0)
+        
+        if position_type == 'long':
+            signal = (close >= bb_upper * 0.99) | (close > bb_middle)
+            if self.use_rsi_confirmation:
+                signal |= rsi > 70
+        else:
+            signal = (close <= bb_lower * 1.01) | (close < bb_middle)
+            if self.use_rsi_confirmation:
+                signal |= rsi < 30
+        
+        return self._warmup(signal, self.bb_period)
+    
+    def _band_values(self, data: pd.DataFrame):
+        """Lower, middle and upper band plus close arrays, or None if any column is missing"""
+        suffix = f'{self.bb_period}_{self.bb_std_dev}'
+        columns = [f'bb_lower_{suffix}', f'bb_middle_{suffix}', f'bb_upper_{suffix}', 'close']
+        if any(column not in data.columns for column in columns):
+            return None
+        return tuple(self._column_values(data, column) for column in columns)
+    
     def get_position_size(self, data: pd.DataFrame, index: int, capital: float) -> float:
         """Calculate position size based on Bollinger Bands width"""
         try:
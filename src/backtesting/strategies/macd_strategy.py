@@ -17,6 +17,7 @@ class MACDStrategy(Strategy):
             'fast_period': 12,
             'slow_period': 26,
             'signal_period': 9,
+            'entry_threshold': 0.0,  # Minimum MACD/signal spread on the crossover bar
             'position_size': 0.1,  # 10% of capital
             'enable_short': False
         }
@@ -29,9 +30,14 @@ class MACDStrategy(Strategy):
         self.fast_period = self.parameters['fast_period']
         self.slow_period = self.parameters['slow_period']
         self.signal_period = self.parameters['signal_period']
+        self.entry_threshold = self.parameters['entry_threshold']
         self.position_size = self.parameters['position_size']
         self.enable_short = self.parameters['enable_short']
         
+        # Column names written by the MACD indicator for these periods
+        self.macd_line_column = f'macd_line_{self.fast_period}_{self.slow_period}'
+        self.macd_signal_column = f'macd_signal_{self.fast_period}_{self.slow_period}_{self.signal_period}'
+        
         self.logger.info(f"MACD Strategy initialized with parameters: {self.parameters}")
     
     def should_enter_long(self, data: pd.DataFrame, index: int) -> bool:
@@ -41,10 +47,10 @@ class MACDStrategy(Strategy):
         
         try:
             # Get MACD values
-            macd_line = data.iloc[index].get('macd_line_12_26', None)
-            macd_signal = data.iloc[index].get('macd_signal_12_26_9', None)
-            prev_macd_line = data.iloc[index-1].get('macd_line_12_26', None)
-            prev_macd_signal = data.iloc[index-1].get('macd_signal_12_26_9', None)
+            macd_line = data.iloc[index].get(self.macd_line_column, None)
+            macd_signal = data.iloc[index].get(self.macd_signal_column, None)
+            prev_macd_line = data.iloc[index-1].get(self.macd_line_column, None)
+            prev_macd_signal = data.iloc[index-1].get(self.macd_signal_column, None)
             
             if (macd_line is None or macd_signal is None or 
                 prev_macd_line is None or prev_macd_signal is None):
@@ -52,7 +58,7 @@ class MACDStrategy(Strategy):
             
             # Check for bullish crossover (MACD line crosses above signal line)
             bullish_crossover = (prev_macd_line <= prev_macd_signal and 
-                               macd_line > macd_signal)
+                               macd_line - macd_signal > self.entry_threshold)
             
             # Additional conditions
             price_above_ema = self._check_price_above_ema(data, index)
@@ -71,10 +77,10 @@ class MACDStrategy(Strategy):
         
         try:
             # Get MACD values
-            macd_line = data.iloc[index].get('macd_line_12_26', None)
-            macd_signal = data.iloc[index].get('macd_signal_12_26_9', None)
-            prev_macd_line = data.iloc[index-1].get('macd_line_12_26', None)
-            prev_macd_signal = data.iloc[index-1].get('macd_signal_12_26_9', None)
+            macd_line = data.iloc[index].get(self.macd_line_column, None)
+            macd_signal = data.iloc[index].get(self.macd_signal_column, None)
+            prev_macd_line = data.iloc[index-1].get(self.macd_line_column, None)
+            prev_macd_signal = data.iloc[index-1].get(self.macd_signal_column, None)
             
             if (macd_line is None or macd_signal is None or 
                 prev_macd_line is None or prev_macd_signal is None):
@@ -100,10 +106,10 @@ class MACDStrategy(Strategy):
         
         try:
             # Get MACD values
-            macd_line = data.iloc[index].get('macd_line_12_26', None)
-            macd_signal = data.iloc[index].get('macd_signal_12_26_9', None)
-            prev_macd_line = data.iloc[index-1].get('macd_line_12_26', None)
-            prev_macd_signal = data.iloc[index-1].get('macd_signal_12_26_9', None)
+            macd_line = data.iloc[index].get(self.macd_line_column, None)
+            macd_signal = data.iloc[index].get(self.macd_signal_column, None)
+            prev_macd_line = data.iloc[index-1].get(self.macd_line_column, None)
+            prev_macd_signal = data.iloc[index-1].get(self.macd_signal_column, None)
             
             if (macd_line is None or macd_signal is None or 
                 prev_macd_line is None or prev_macd_signal is None):
@@ -111,7 +117,7 @@ class MACDStrategy(Strategy):
             
             # Check for bearish crossover (MACD line crosses below signal line)
             bearish_crossover = (prev_macd_line >= prev_macd_signal and 
-                               macd_line < macd_signal)
+                               macd_signal - macd_line > self.entry_threshold)
             
             # Additional conditions
             price_below_ema = self._check_price_below_ema(data, index)
@@ -130,10 +136,10 @@ class MACDStrategy(Strategy):
         
         try:
             # Get MACD values
-            macd_line = data.iloc[index].get('macd_line_12_26', None)
-            macd_signal = data.iloc[index].get('macd_signal_12_26_9', None)
-            prev_macd_line = data.iloc[index-1].get('macd_line_12_26', None)
-            prev_macd_signal = data.iloc[index-1].get('macd_signal_12_26_9', None)
+            macd_line = data.iloc[index].get(self.macd_line_column, None)
+            macd_signal = data.iloc[index].get(self.macd_signal_column, None)
+            prev_macd_line = data.iloc[index-1].get(self.macd_line_column, None)
+            prev_macd_signal = data.iloc[index-1].get(self.macd_signal_column, None)
             
             if (macd_line is None or macd_signal is None or 
                 prev_macd_line is None or prev_macd_signal is None):
@@ -152,6 +158,51 @@ class MACDStrategy(Strategy):
             self.logger.error(f"Error in should_exit_short: {e}")
             return False
     
+    def entry_mask(self, data: pd.DataFrame, position_type: str = 'long') -> np.ndarray:
+        """Vectorized should_enter_long / should_enter_short over all rows"""
+        lines = self._macd_values(data)
+        if lines is None or (position_type == 'short' and not self.enable_short):
+            return np.zeros(len(data), dtype=bool)
+        
+        macd_line, macd_signal, prev_macd_line, prev_macd_signal = lines
+        close = self._column_values(data, 'close', 0.0)
+        ema = self._column_values(data, 'ema_20', 0.0)
+        rsi = self._column_values(data, 'rsi_14', 50.0)
+        
+        if position_type == 'long':
+            signal = ((prev_macd_line <= prev_macd_signal) & (macd_line - macd_signal > self.entry_threshold) &
+                      np.where(ema == 0, True, close > ema) & (rsi < 70))
+        else:
+            signal = ((prev_macd_line >= prev_macd_signal) & (macd_signal - macd_line > self.entry_threshold) &
+                      np.where(ema == 0, True, close < ema) & (rsi > 30))
+        
+        return self._warmup(signal, self.slow_period)
+    
+    def exit_mask(self, data: pd.DataFrame, entries: np.ndarray, position_type: str = 'long') -> np.ndarray:
+        """Vectorized should_exit_long / should_exit_short over all rows"""
+        lines = self._macd_values(data)
+        if lines is None or (position_type == 'short' and not self.enable_short):
+            return np.zeros(len(data), dtype=bool)
+        
+        macd_line, macd_signal, prev_macd_line, prev_macd_signal = lines
+        rsi = self._column_values(data, 'rsi_14', 50.0)
+        
+        if position_type == 'long':
+            signal = ((prev_macd_line >= prev_macd_signal) & (macd_line < macd_signal)) | (rsi > 70)
+        else:
+            signal = ((prev_macd_line <= prev_macd_signal) & (macd_line > macd_signal)) | (rsi < 30)
+        
+        return self._warmup(signal, self.slow_period)
+    
+    def _macd_values(self, data: pd.DataFrame):
+        """MACD and signal line arrays with their previous-bar values, or None if missing"""
+        if self.macd_line_column not in data.columns or self.macd_signal_column not in data.columns:
+            return None
+        
+        macd_line = self._column_values(data, self.macd_line_column)
+        macd_signal = self._column_values(data, self.macd_signal_column)
+        return macd_line, macd_signal, self._previous(macd_line), self._previous(macd_signal)
+    
     def get_position_size(self, data: pd.DataFrame, index: int, capital: float) -> float:
         """Calculate position size based on volatility"""
         try:
@@ -186,6 +186,67 @@ class MovingAverageStrategy(Strategy):
             self.logger.error(f"Error in should_exit_short: {e}")
             return False
     
+    def entry_mask(self, data: pd.DataFrame, position_type: str = 'long') -> np.ndarray:
+        """Vectorized should_enter_long / should_enter_short over all rows"""
+        averages = self._ma_values(data)
+        if averages is None or (position_type == 'short' and not self.enable_short):
+            return np.zeros(len(data), dtype=bool)
+        
+        fast_ma, slow_ma, prev_fast_ma, prev_slow_ma = averages
+        close = self._column_values(data, 'close', 0.0)
+        rsi = self._column_values(data, 'rsi_14', 50.0)
+        
+        volume_confirmed = np.ones(len(data), dtype=bool)
+        if self.use_volume_confirmation:
+            volume_confirmed = self._volume_confirmation_mask(data, 1.15)
+        
+        if position_type == 'long':
+            signal = ((prev_fast_ma <= prev_slow_ma) & (fast_ma > slow_ma) &
+                      (close > fast_ma) & (close > slow_ma))
+            if self.use_rsi_filter:
+                signal &= rsi < 70
+        else:
+            signal = ((prev_fast_ma >= prev_slow_ma) & (fast_ma < slow_ma) &
+                      (close < fast_ma) & (close < slow_ma))
+            if self.use_rsi_filter:
+                signal &= rsi > 30
+        
+        return self._warmup(signal & volume_confirmed, self.slow_ma_period)
+    
+    def exit_mask(self, data: pd.DataFrame, entries: np.ndarray, position_type: str = 'long') -> np.ndarray:
+        """Vectorized should_exit_long / should_exit_short over all rows"""
+        averages = self._ma_values(data)
+        if averages is None or (position_type == 'short' and not self.enable_short):
+            return np.zeros(len(data), dtype=bool)
+        
+        fast_ma, slow_ma, prev_fast_ma, prev_slow_ma = averages
+        close = self._column_values(data, 'close', 0.0)
+        rsi = self._column_values(data, 'rsi_14', 50.0)
+        
+        if position_type == 'long':
+            signal = (((prev_fast_ma >= prev_slow_ma) & (fast_ma < slow_ma)) |
+                      ((close < fast_ma) & (close < slow_ma)))
+            if self.use_rsi_filter:
+                signal |= rsi > 70
+        else:
+            signal = (((prev_fast_ma <= prev_slow_ma) & (fast_ma > slow_ma)) |
+                      ((close > fast_ma) & (close > slow_ma)))
+            if self.use_rsi_filter:
+                signal |= rsi < 30
+        
+        return self._warmup(signal, self.slow_ma_period)
+    
+    def _ma_values(self, data: pd.DataFrame):
+        """Fast, slow and previous-bar MA arrays, or None if a column is missing"""
+        fast_column = f'sma_{self.fast_ma_period}'
+        slow_column = f'sma_{self.slow_ma_period}'
+        if fast_column not in data.columns or slow_column not in data.columns:
+            return None
+        
+        fast_ma = self._column_values(data, fast_column)
+        slow_ma = self._column_values(data, slow_column)
+        return fast_ma, slow_ma, self._previous(fast_ma), self._previous(slow_ma)
+    
     def get_position_size(self, data: pd.DataFrame, index: int, capital: float) -> float:
         """Calculate position size based on MA trend strength"""
         try:
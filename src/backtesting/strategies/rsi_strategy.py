@@ -138,6 +138,60 @@ class RSIStrategy(Strategy):
             self.logger.error(f"Error in should_exit_short: {e}")
             return False
     
+    def entry_mask(self, data: pd.DataFrame, position_type: str = 'long') -> np.ndarray:
+        """Vectorized should_enter_long / should_enter_short over all rows"""
+        if 'rsi_14' not in data.columns or (position_type == 'short' and not self.enable_short):
+            return np.zeros(len(data), dtype=bool)
+        
+        rsi = self._column_values(data, 'rsi_14')
+        close = self._column_values(data, 'close', 0.0)
+        ma = self._column_values(data, 'sma_20', 0.0)
+        
+        volume_confirmed = np.ones(len(data), dtype=bool)
+        if self.use_volume_confirmation:
+            volume_confirmed = self._volume_confirmation_mask(data, 1.2)
+        
+        if position_type == 'long':
+            signal = (rsi < self.oversold_threshold) & np.where(ma == 0, True, close > ma)
+        else:
+            signal = (rsi > self.overbought_threshold) & np.where(ma == 0, True, close < ma)
+        
+        return self._warmup(signal & volume_confirmed, self.rsi_period)
+    
+    def exit_mask(self, data: pd.DataFrame, entries: np.ndarray, position_type: str = 'long') -> np.ndarray:
+        """Vectorized should_exit_long / should_exit_short over all rows"""
+        if 'rsi_14' not in data.columns or (position_type == 'short' and not self.enable_short):
+            return np.zeros(len(data), dtype=bool)
+        
+        rsi = self._column_values(data, 'rsi_14')
+        
+        if position_type == 'long':
+            signal = (rsi > self.overbought_threshold) | self._divergence_mask(data, bearish=True)
+        else:
+            signal = (rsi < self.oversold_threshold) | self._divergence_mask(data, bearish=False)
+        
+        return self._warmup(signal, self.rsi_period)
+    
+    def _divergence_mask(self, data: pd.DataFrame, bearish: bool) -> np.ndarray:
+        """Vectorized _check_bearish_divergence / _check_bullish_divergence"""
+        if 'close' not in data.columns:
+            return np.zeros(len(data), dtype=bool)
+        
+        close = pd.to_numeric(data['close'], errors='coerce').reset_index(drop=True)
+        rsi = pd.to_numeric(data['rsi_14'], errors='coerce').reset_index(drop=True)
+        
+        # A 21-bar window with any NaN yields NaN and compares False
+        if bearish:
+            price_extreme = close.rolling(window=21).max().to_numpy()
+            rsi_extreme = rsi.rolling(window=21).max().to_numpy()
+            signal = (close.to_numpy() >= price_extreme * 0.99) & (rsi.to_numpy() < rsi_extreme * 0.95)
+        else:
+            price_extreme = close.rolling(window=21).min().to_numpy()
+            rsi_extreme = rsi.rolling(window=21).min().to_numpy()
+            signal = (close.to_numpy() <= price_extreme * 1.01) & (rsi.to_numpy() > rsi_extreme * 1.05)
+        
+        return self._warmup(signal, 20)
+    
     def get_position_size(self, data: pd.DataFrame, index: int, capital: float) -> float:
         """Calculate position size based on RSI extremes"""
         try:
@@ -0,0 +1,240 @@
+"""
+Streaming Performance Metrics
+
+Online counterpart of PerformanceAnalytics for equity curves that grow one
+point at a time (live automation, portfolio snapshots). Each update is O(1):
+return moments use Welford's algorithm, drawdown tracks a running peak and
+VaR/CVaR come from a log-bucketed quantile sketch. The full state serializes
+to a JSON-friendly dict, so a consumer can persist it and resume later.
+"""
+
+import math
+import numpy as np
+from typing import Dict, Any, Optional
+
+
+class QuantileSketch:
+    """
+    Relative-error quantile sketch over real values (DDSketch-style)
+
+    Values are counted in logarithmic buckets per sign, so every quantile is
+    returned within relative_accuracy of a true sample value. The number of
+    buckets grows with the log of the value range, not with the count.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, min_value: float = 1e-9):
+        self.relative_accuracy = relative_accuracy
+        self.min_value = min_value
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.positive: Dict[int, int] = {}
+        self.negative: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def add(self, value: float):
+        """Count one value"""
+        self.count += 1
+        if abs(value) < self.min_value:
+            self.zero_count += 1
+            return
+        store = self.positive if value > 0 else self.negative
+        key = math.ceil(math.log(abs(value)) / self._log_gamma)
+        store[key] = store.get(key, 0) + 1
+
+    def _bucket_value(self, key: int) -> float:
+        return 2 * self.gamma ** key / (self.gamma + 1)
+
+    def _ascending(self):
+        """(value, count) buckets from the most negative to the most positive"""
+        for key in sorted(self.negative, reverse=True):
+            yield -self._bucket_value(key), self.negative[key]
+        if self.zero_count:
+            yield 0.0, self.zero_count
+        for key in sorted(self.positive):
+            yield self._bucket_value(key), self.positive[key]
+
+    def quantile(self, q: float) -> float:
+        """Value at quantile q (0..1), nan when empty"""
+        if self.count == 0:
+            return float('nan')
+        rank = q * (self.count - 1)
+        seen = 0
+        for value, count in self._ascending():
+            seen += count
+            if seen > rank:
+                return value
+        return value
+
+    def tail_mean(self, q: float) -> float:
+        """Mean of the values at or below quantile q, nan when empty"""
+        if self.count == 0:
+            return float('nan')
+        threshold = self.quantile(q)
+        total, n = 0.0, 0
+        for value, count in self._ascending():
+            if value > threshold:
+                break
+            total += value * count
+            n += count
+        return total / n
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'relative_accuracy': self.relative_accuracy,
+            'min_value': self.min_value,
+            'positive': {str(k): v for k, v in self.positive.items()},
+            'negative': {str(k): v for k, v in self.negative.items()},
+            'zero_count': self.zero_count,
+            'count': self.count
+        }
+
+    @classmethod
+    def from_dict(cls, state: Dict[str, Any]) -> 'QuantileSketch':
+        sketch = cls(state['relative_accuracy'], state['min_value'])
+        sketch.positive = {int(k): v for k, v in state['positive'].items()}
+        sketch.negative = {int(k): v for k, v in state['negative'].items()}
+        sketch.zero_count = state['zero_count']
+        sketch.count = state['count']
+        return sketch
+
+
+class StreamingMetrics:
+    """O(1)-per-point accumulator of equity-curve performance metrics"""
+
+    def __init__(self, risk_free_rate: float = 0.02, periods_per_year: int = 252,
+                 var_confidence: float = 0.95, relative_accuracy: float = 0.01):
+        self.risk_free_rate = risk_free_rate
+        self.periods_per_year = periods_per_year
+        self.var_confidence = var_confidence
+
+        self.points = 0
+        self.initial_equity: Optional[float] = None
+        self.last_equity: Optional[float] = None
+        self.first_timestamp: Optional[str] = None
+        self.last_timestamp: Optional[str] = None
+
+        # Welford moments of all returns and of negative returns
+        self.n_returns = 0
+        self.mean_return = 0.0
+        self.m2 = 0.0
+        self.n_downside = 0
+        self.mean_downside = 0.0
+        self.m2_downside = 0.0
+
+        # Running peak and drawdown (fractions, <= 0 like PerformanceAnalytics)
+        self.peak = float('-inf')
+        self.current_drawdown = 0.0
+        self.max_drawdown = 0.0
+        self.drawdown_duration = 0
+        self.max_drawdown_duration = 0
+
+        self.sketch = QuantileSketch(relative_accuracy)
+
+    def update(self, equity: float, timestamp: Any = None):
+        """
+        Add one equity point
+
+        Args:
+            equity: Portfolio value
+            timestamp: Time of the point (stored as an ISO string)
+        """
+        equity = float(equity)
+        if timestamp is not None:
+            self.last_timestamp = timestamp.isoformat() if hasattr(timestamp, 'isoformat') else str(timestamp)
+            if self.first_timestamp is None:
+                self.first_timestamp = self.last_timestamp
+
+        if self.points == 0:
+            self.initial_equity = equity
+        elif self.last_equity:
+            r = equity / self.last_equity - 1
+            self.n_returns += 1
+            delta = r - self.mean_return
+            self.mean_return += delta / self.n_returns
+            self.m2 += delta * (r - self.mean_return)
+            if r < 0:
+                self.n_downside += 1
+                delta = r - self.mean_downside
+                self.mean_downside += delta / self.n_downside
+                self.m2_downside += delta * (r - self.mean_downside)
+            self.sketch.add(r)
+
+        self.points += 1
+        self.last_equity = equity
+
+        if equity >= self.peak:
+            self.peak = equity
+            self.drawdown_duration = 0
+        else:
+            self.drawdown_duration += 1
+        self.current_drawdown = (equity - self.peak) / self.peak if self.peak > 0 else 0.0
+        self.max_drawdown = min(self.max_drawdown, self.current_drawdown)
+        self.max_drawdown_duration = max(self.max_drawdown_duration, self.drawdown_duration)
+
+    @property
+    def volatility(self) -> float:
+        """Sample standard deviation of returns"""
+        return math.sqrt(self.m2 / (self.n_returns - 1)) if self.n_returns > 1 else 0.0
+
+    @property
+    def downside_deviation(self) -> float:
+        """Sample standard deviation of negative returns"""
+        return math.sqrt(self.m2_downside / (self.n_downside - 1)) if self.n_downside > 1 else 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        """Current metrics, defined as in PerformanceAnalytics"""
+        total_return = self.last_equity / self.initial_equity - 1 if self.initial_equity else 0.0
+        annualized_return = ((1 + total_return) ** (self.periods_per_year / self.n_returns) - 1
+                             if self.n_returns and total_return > -1 else 0.0)
+        excess = self.mean_return - self.risk_free_rate / self.periods_per_year
+        scale = math.sqrt(self.periods_per_year)
+        tail = 1 - self.var_confidence
+
+        return {
+            'points': self.points,
+            'first_timestamp': self.first_timestamp,
+            'last_timestamp': self.last_timestamp,
+            'current_equity': self.last_equity,
+            'peak_equity': self.peak if self.points else None,
+            'total_return': total_return,
+            'annualized_return': annualized_return,
+            'volatility': self.volatility * scale,
+            'sharpe_ratio': excess / self.volatility * scale if self.volatility > 0 else 0.0,
+            'sortino_ratio': excess / self.downside_deviation * scale if self.downside_deviation > 0 else 0.0,
+            'calmar_ratio': total_return / abs(self.max_drawdown) if self.max_drawdown else 0.0,
+            'max_drawdown': self.max_drawdown,
+            'current_drawdown': self.current_drawdown,
+            'max_drawdown_duration': self.max_drawdown_duration,
+            'downside_deviation': self.downside_deviation,
+            'var_95': self.sketch.quantile(tail) if self.n_returns else 0.0,
+            'cvar_95': self.sketch.tail_mean(tail) if self.n_returns else 0.0
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializable state"""
+        state = {key: value for key, value in self.__dict__.items() if key != 'sketch'}
+        state['peak'] = None if self.peak == float('-inf') else self.peak
+        state['sketch'] = self.sketch.to_dict()
+        return state
+
+    @classmethod
+    def from_dict(cls, state: Dict[str, Any]) -> 'StreamingMetrics':
+        """Resume from a state produced by to_dict"""
+        metrics = cls(state['risk_free_rate'], state['periods_per_year'], state['var_confidence'])
+        for key, value in state.items():
+            if key != 'sketch':
+                setattr(metrics, key, value)
+        if metrics.peak is None:
+            metrics.peak = float('-inf')
+        metrics.sketch = QuantileSketch.from_dict(state['sketch'])
+        return metrics
+
+    @classmethod
+    def from_equity_curve(cls, equity_curve, **kwargs) -> 'StreamingMetrics':
+        """Build an accumulator by replaying an existing equity curve"""
+        metrics = cls(**kwargs)
+        timestamps = getattr(equity_curve, 'index', None)
+        for i, value in enumerate(np.asarray(equity_curve, dtype=float)):
+            metrics.update(value, timestamps[i] if timestamps is not None else None)
+        return metrics
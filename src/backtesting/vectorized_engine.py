@@ -0,0 +1,242 @@
+"""
+Vectorized Backtesting Engine
+
+Array-based alternative to the bar-by-bar BacktestEngine simulation for
+single-position long-only and long/short strategies. Entry and exit masks are
+computed once for the whole history; the engine then jumps from entry to exit,
+locating each exit (stop-loss, take-profit, time limit or strategy exit) with
+NumPy searches over the bars after the entry. Accounting, trailing stops and
+the equity curve follow BacktestEngine, so results match the event loop.
+"""
+
+import pandas as pd
+import numpy as np
+from typing import Optional, Tuple
+
+from .backtest_engine import BacktestEngine, Strategy, Trade
+from .risk_management import RiskParameters, StopLossType
+
+# Bars searched for an exit before the window is doubled
+EXIT_SEARCH_WINDOW = 128
+
+NANOSECONDS_PER_DAY = 86400 * 10**9
+
+
+class VectorizedBacktestEngine(BacktestEngine):
+    """BacktestEngine that simulates from precomputed entry/exit masks"""
+
+    def __init__(self, initial_capital: float = 100000.0, risk_params: Optional[RiskParameters] = None):
+        super().__init__(initial_capital, risk_params)
+        self.last_run_vectorized = False
+
+    def _simulate(self, strategy: Strategy, data: pd.DataFrame):
+        """Simulate from strategy masks, falling back to the event loop if the strategy has none"""
+        masks = self._strategy_masks(strategy, data)
+        self.last_run_vectorized = masks is not None
+
+        if masks is None:
+            self.logger.info(f"{strategy.name} has no vectorized masks, using event loop")
+            super()._simulate(strategy, data)
+            return
+
+        self.simulate_masks(data, *masks)
+
+    def _strategy_masks(self, strategy: Strategy, data: pd.DataFrame) -> Optional[Tuple[np.ndarray, ...]]:
+        """Long/short entry and exit masks, or None if the strategy does not provide them"""
+        long_entries = strategy.entry_mask(data, 'long')
+        short_entries = strategy.entry_mask(data, 'short')
+        if long_entries is None or short_entries is None:
+            return None
+
+        long_exits = strategy.exit_mask(data, long_entries, 'long')
+        short_exits = strategy.exit_mask(data, short_entries, 'short')
+        if long_exits is None or short_exits is None:
+            return None
+
+        return long_entries, long_exits, short_entries, short_exits
+
+    def simulate_masks(self, data: pd.DataFrame, long_entries: np.ndarray, long_exits: np.ndarray,
+                       short_entries: Optional[np.ndarray] = None, short_exits: Optional[np.ndarray] = None):
+        """
+        Simulate one position at a time from entry/exit masks
+
+        Args:
+            data: DataFrame with 'Date' and 'close' columns
+            long_entries: Boolean long entry array
+            long_exits: Boolean long exit array
+            short_entries: Boolean short entry array (None for long-only)
+            short_exits: Boolean short exit array (None for long-only)
+        """
+        n = len(data)
+        close = data['close'].to_numpy(dtype=float)
+        times = pd.to_datetime(data['Date']).to_numpy(dtype='datetime64[ns]').astype(np.int64)
+        timestamps = data['Date'].tolist()
+        symbol = data['symbol'].iloc[0] if 'symbol' in data.columns else 'UNKNOWN'
+
+        long_entries = np.asarray(long_entries, dtype=bool)
+        short_entries = np.zeros(n, dtype=bool) if short_entries is None else np.asarray(short_entries, dtype=bool)
+        exits = {
+            'long': np.asarray(long_exits, dtype=bool),
+            'short': np.zeros(n, dtype=bool) if short_exits is None else np.asarray(short_exits, dtype=bool)
+        }
+        entry_index = np.flatnonzero(long_entries | short_entries)
+
+        self.capital = self.initial_capital
+        self.positions = {}
+        self.trades = []
+
+        # Cash and shares held at the start of each bar, set where they change
+        cash_changes = np.full(n + 1, np.nan)
+        shares_changes = np.full(n + 1, np.nan)
+        cash_changes[0] = self.capital
+        shares_changes[0] = 0.0
+
+        peak_cash = max(self.risk_manager.peak_portfolio_value, self.capital)
+        position = 0
+
+        while position < len(entry_index):
+            entry = int(entry_index[position])
+
+            # Portfolio drawdown limit, checked on cash as in the event loop
+            if (peak_cash - self.capital) / peak_cash > self.risk_manager.params.max_portfolio_drawdown:
+                break
+
+            position_type = 'long' if long_entries[entry] else 'short'
+            entry_price = close[entry]
+            position_size = self.risk_manager.calculate_position_size(self.capital, entry_price)
+            if position_size <= 0:
+                position += 1
+                continue
+
+            shares = position_size / entry_price
+            stop_loss = self.risk_manager.calculate_stop_loss(entry_price, position_type)
+            take_profit = self.risk_manager.calculate_take_profit(entry_price, position_type)
+
+            self.capital -= shares * entry_price
+            cash_changes[entry + 1] = self.capital
+            shares_changes[entry + 1] = shares
+
+            exit_, reason, stop_loss, take_profit = self._find_exit(
+                close, times, exits[position_type], entry, position_type, stop_loss, take_profit
+            )
+            if exit_ is None:
+                exit_, reason = n - 1, "End of backtest"
+                stop_loss, take_profit = self._trail_levels(close[entry:], position_type, stop_loss, take_profit)
+
+            exit_price = close[exit_]
+            if position_type == 'long':
+                pnl = (exit_price - entry_price) * shares
+            else:  # short
+                pnl = (entry_price - exit_price) * shares
+
+            self.capital += shares * exit_price + pnl
+            self.trades.append(Trade(
+                symbol=symbol,
+                entry_time=timestamps[entry],
+                exit_time=timestamps[exit_],
+                entry_price=entry_price,
+                exit_price=exit_price,
+                position_type=position_type,
+                shares=shares,
+                pnl=pnl,
+                pnl_percentage=pnl / (entry_price * shares),
+                stop_loss=stop_loss,
+                take_profit=take_profit,
+                exit_reason=reason
+            ))
+
+            if reason == "End of backtest":
+                break
+
+            cash_changes[exit_ + 1] = self.capital
+            shares_changes[exit_ + 1] = 0.0
+            peak_cash = max(peak_cash, self.capital)
+
+            # The exit bar can open the next position
+            position = int(np.searchsorted(entry_index, exit_, side='left'))
+
+        self.risk_manager.peak_portfolio_value = peak_cash
+
+        # Equity before each bar's actions: cash plus shares marked at the bar's close
+        cash = pd.Series(cash_changes[:n]).ffill().to_numpy()
+        held = pd.Series(shares_changes[:n]).ffill().to_numpy()
+
+        self.equity_curve = np.concatenate([[self.initial_capital], cash + held * close])
+        self.timestamps = np.concatenate([times[:1], times]).astype('datetime64[ns]')
+        self._equity_length = n + 1
+
+    def _find_exit(self, close: np.ndarray, times: np.ndarray, strategy_exits: np.ndarray, entry: int,
+                   position_type: str, stop_loss: float, take_profit: float) -> Tuple[Optional[int], str, float, float]:
+        """
+        First bar after entry that closes the position
+
+        Stops and take-profits trail the closes up to the previous bar, as
+        _update_positions moves them after each bar of the event loop.
+
+        Returns:
+            (exit index or None, exit reason, stop-loss and take-profit at exit)
+        """
+        params = self.risk_manager.params
+        time_based = params.stop_loss_type == StopLossType.TIME_BASED
+        n = len(close)
+        window = EXIT_SEARCH_WINDOW
+
+        while True:
+            end = min(entry + 1 + window, n)
+            prices = close[entry + 1:end]
+
+            stops, targets = self._trail_levels(close[entry:end - 1], position_type, stop_loss, take_profit, running=True)
+            if position_type == 'long':
+                stop_hit = prices <= stops
+                target_hit = prices >= targets
+            else:  # short
+                stop_hit = prices >= stops
+                target_hit = prices <= targets
+
+            time_hit = np.zeros(len(prices), dtype=bool)
+            if time_based:
+                days_held = (times[entry + 1:end] - times[entry]) // NANOSECONDS_PER_DAY
+                time_hit = days_held > params.max_hold_days
+
+            hit = stop_hit | target_hit | time_hit | strategy_exits[entry + 1:end]
+            if hit.any():
+                k = int(np.argmax(hit))
+                if stop_hit[k]:
+                    reason = "Stop-loss triggered"
+                elif target_hit[k]:
+                    reason = "Take-profit triggered"
+                elif time_hit[k]:
+                    reason = "Time-based exit"
+                else:
+                    reason = "Strategy exit"
+                return entry + 1 + k, reason, stops[k], targets[k]
+
+            if end == n:
+                return None, "", stop_loss, take_profit
+            window *= 2
+
+    def _trail_levels(self, closes: np.ndarray, position_type: str, stop_loss: float, take_profit: float,
+                      running: bool = False):
+        """
+        Stop-loss and take-profit after trailing through closes
+
+        Args:
+            closes: Closes from the entry bar on
+            position_type: 'long' or 'short'
+            stop_loss: Initial stop-loss
+            take_profit: Initial take-profit
+            running: Return the levels after each close instead of after the last one
+
+        Returns:
+            (stop-loss, take-profit) as floats, or arrays if running
+        """
+        params = self.risk_manager.params
+        if position_type == 'long':
+            extreme = np.maximum.accumulate(closes) if running else closes.max()
+            stops = np.maximum(stop_loss, extreme * (1 - params.trailing_stop_percentage))
+            targets = np.maximum(take_profit, extreme * (1 + params.trailing_profit_percentage))
+        else:  # short
+            extreme = np.minimum.accumulate(closes) if running else closes.min()
+            stops = np.minimum(stop_loss, extreme * (1 + params.trailing_stop_percentage))
+            targets = np.minimum(take_profit, extreme * (1 - params.trailing_profit_percentage))
+        return stops, targets
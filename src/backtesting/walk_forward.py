@@ -0,0 +1,405 @@
+"""
+Walk-Forward Optimization
+
+Searches MACD strategy and risk parameters on rolling train/test windows of a
+symbol's history. For each window every trial is scored on the train slice;
+the best trial is then judged on the following, unseen test slice.
+
+Indicators are causal, so each MACD period set is computed once over the full
+history and every window slices the shared columns; entry/exit masks are
+likewise built once per strategy setting. Overlapping windows therefore reuse
+all indicator work and only the (vectorized) simulation runs per window.
+Trials are grouped by MACD periods and the groups run in a process pool.
+"""
+
+import pandas as pd
+import numpy as np
+from typing import Dict, List, Optional, Any, Tuple
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import itertools
+import logging
+import json
+import time
+import os
+
+from .ai_backtesting_engine import SharedFrame
+from .vectorized_engine import VectorizedBacktestEngine
+from .risk_management import RiskManager, RiskParameters, PositionSizingMethod, StopLossType
+from .strategies.macd_strategy import MACDStrategy
+from ..indicators import MACDIndicator, EMAIndicator, RSIIndicator
+
+# Parameters that change indicator columns, strategy masks and risk exits
+INDICATOR_PARAMETERS = ('fast_period', 'slow_period', 'signal_period')
+STRATEGY_PARAMETERS = ('entry_threshold',)
+RISK_PARAMETERS = {
+    'take_profit_pct': 'take_profit_percentage',
+    'stop_loss_pct': 'stop_loss_percentage',
+    'max_hold_days': 'max_hold_days'
+}
+
+DEFAULT_PARAMETER_SPACE = {
+    'fast_period': [8, 12],
+    'slow_period': [21, 26],
+    'signal_period': [9],
+    'entry_threshold': [0.0],
+    'take_profit_pct': [0.04, 0.06, 0.10],
+    'stop_loss_pct': [0.02, 0.03, 0.05],
+    'max_hold_days': [30]
+}
+
+OBJECTIVES = ('sharpe_ratio', 'total_return', 'max_drawdown', 'win_rate')
+
+
+@dataclass
+class WalkForwardWindow:
+    """Row positions of one train/test split (end positions are exclusive)"""
+    index: int
+    train_start: int
+    train_end: int
+    test_start: int
+    test_end: int
+
+
+def _window_metrics(equity_curve: List[float], trades: List[Any], risk_free_rate: float = 0.02) -> Dict[str, float]:
+    """Objective metrics of one simulated window, as defined by PerformanceAnalytics"""
+    equity = np.asarray(equity_curve, dtype=float)
+    returns = np.diff(equity) / equity[:-1] if len(equity) > 1 else np.array([])
+    std = returns.std(ddof=1) if len(returns) > 1 else 0.0
+    peaks = np.maximum.accumulate(equity)
+    wins = sum(1 for trade in trades if trade.pnl > 0)
+
+    return {
+        'total_return': float(equity[-1] / equity[0] - 1),
+        'sharpe_ratio': float((returns.mean() - risk_free_rate / 252) / std * np.sqrt(252)) if std > 0 else 0.0,
+        'max_drawdown': float(((equity - peaks) / peaks).min()),
+        'win_rate': wins / len(trades) if trades else 0.0,
+        'trades': len(trades)
+    }
+
+
+def _evaluate_trial_group(engine: VectorizedBacktestEngine, data: pd.DataFrame, windows: List[WalkForwardWindow],
+                          periods: Dict[str, int], trials: List[Tuple[int, Dict[str, Any]]],
+                          base_risk: RiskParameters) -> List[Dict[str, Any]]:
+    """
+    Score trials sharing one set of MACD periods on every window.
+
+    The MACD columns are added once for the group and masks are built once
+    per strategy setting over the full history; each window then simulates
+    from slices of them.
+    """
+    # Collection data may carry the line but not this group's signal period
+    line = f"macd_line_{periods['fast_period']}_{periods['slow_period']}"
+    signal = f"macd_signal_{periods['fast_period']}_{periods['slow_period']}_{periods['signal_period']}"
+    if line not in data.columns or signal not in data.columns:
+        data = MACDIndicator(**periods).calculate(data.copy())
+
+    masks = {}
+    rows = []
+    for trial_id, params in trials:
+        strategy_params = {key: params[key] for key in STRATEGY_PARAMETERS if key in params}
+        mask_key = tuple(sorted(strategy_params.items()))
+        if mask_key not in masks:
+            strategy = MACDStrategy({**periods, **strategy_params})
+            entries = strategy.entry_mask(data, 'long')
+            masks[mask_key] = (entries, strategy.exit_mask(data, entries, 'long'))
+        entries, exits = masks[mask_key]
+
+        risk_params = RiskParameters(**{
+            **asdict(base_risk),
+            **{RISK_PARAMETERS[key]: params[key] for key in RISK_PARAMETERS if key in params}
+        })
+        engine.risk_manager = RiskManager(risk_params)
+
+        for window in windows:
+            for phase, start, end in (('train', window.train_start, window.train_end),
+                                      ('test', window.test_start, window.test_end)):
+                # Each window starts with a fresh portfolio peak
+                engine.risk_manager.peak_portfolio_value = 0.0
+                engine.simulate_masks(data.iloc[start:end], entries[start:end], exits[start:end])
+                rows.append({
+                    'trial': trial_id,
+                    'window': window.index,
+                    'phase': phase,
+                    **params,
+                    **_window_metrics(engine.equity_curve, engine.trades)
+                })
+
+    return rows
+
+
+# Per-process state of walk-forward workers
+_worker_state: Dict[str, Any] = {}
+
+
+def _init_walk_forward_worker(spec: Dict[str, Any], windows: List[WalkForwardWindow],
+                              base_risk: RiskParameters, initial_capital: float):
+    """Attach the shared price data and build one engine per worker process."""
+    _worker_state.update({
+        'data': SharedFrame.attach(spec),
+        'windows': windows,
+        'base_risk': base_risk,
+        'engine': VectorizedBacktestEngine(initial_capital, base_risk)
+    })
+
+
+def _run_trial_group(group: Tuple[Dict[str, int], List[Tuple[int, Dict[str, Any]]]]) -> List[Dict[str, Any]]:
+    """Score one MACD-period group in a worker process."""
+    periods, trials = group
+    return _evaluate_trial_group(_worker_state['engine'], _worker_state['data'], _worker_state['windows'],
+                                 periods, trials, _worker_state['base_risk'])
+
+
+class WalkForwardOptimizer:
+    """Rolling-window grid/random parameter search for the MACD backtesting strategy"""
+
+    def __init__(self,
+                 parameter_space: Optional[Dict[str, List[Any]]] = None,
+                 train_bars: int = 252,
+                 test_bars: int = 63,
+                 step_bars: Optional[int] = None,
+                 search: str = 'grid',
+                 n_trials: int = 50,
+                 objective: str = 'sharpe_ratio',
+                 max_workers: Optional[int] = None,
+                 results_dir: str = 'data/walk_forward',
+                 seed: Optional[int] = None,
+                 initial_capital: float = 100000.0,
+                 risk_params: Optional[RiskParameters] = None,
+                 engine: Optional[VectorizedBacktestEngine] = None):
+        """
+        Args:
+            parameter_space: Parameter name -> candidate values. Names are
+                INDICATOR_PARAMETERS, STRATEGY_PARAMETERS and RISK_PARAMETERS keys.
+            train_bars: Bars in each train window
+            test_bars: Bars in each test window
+            step_bars: Bars between window starts (default: test_bars)
+            search: 'grid' for every combination, 'random' for n_trials samples
+            n_trials: Trials sampled by random search
+            objective: Metric maximized on train windows (one of OBJECTIVES)
+            max_workers: Worker processes; 1 runs in this process
+            results_dir: Directory results are persisted to
+            seed: Random search seed
+            initial_capital: Capital of every simulated window
+            risk_params: Risk settings not under search
+            engine: Engine for in-process runs (default: a new VectorizedBacktestEngine)
+        """
+        if search not in ('grid', 'random'):
+            raise ValueError(f"Unknown search: {search}")
+        if objective not in OBJECTIVES:
+            raise ValueError(f"Unknown objective: {objective}")
+
+        self.parameter_space = parameter_space or DEFAULT_PARAMETER_SPACE
+        unknown = set(self.parameter_space) - set(INDICATOR_PARAMETERS) - set(STRATEGY_PARAMETERS) - set(RISK_PARAMETERS)
+        if unknown:
+            raise ValueError(f"Unknown parameters: {sorted(unknown)}")
+
+        self.train_bars = train_bars
+        self.test_bars = test_bars
+        self.step_bars = step_bars or test_bars
+        self.search = search
+        self.n_trials = n_trials
+        self.objective = objective
+        self.max_workers = max_workers
+        self.results_dir = results_dir
+        self.seed = seed
+        self.initial_capital = initial_capital
+        self.risk_params = risk_params or RiskParameters(
+            position_sizing_method=PositionSizingMethod.FIXED_PERCENTAGE,
+            stop_loss_type=StopLossType.TIME_BASED if 'max_hold_days' in self.parameter_space else StopLossType.FIXED_PERCENTAGE
+        )
+        self._engine = engine
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def engine(self) -> VectorizedBacktestEngine:
+        if self._engine is None:
+            self._engine = VectorizedBacktestEngine(self.initial_capital, self.risk_params)
+        return self._engine
+
+    def generate_windows(self, n_bars: int) -> List[WalkForwardWindow]:
+        """Rolling train/test windows over n_bars rows"""
+        windows = []
+        start = 0
+        while start + self.train_bars + self.test_bars <= n_bars:
+            train_end = start + self.train_bars
+            windows.append(WalkForwardWindow(len(windows), start, train_end, train_end, train_end + self.test_bars))
+            start += self.step_bars
+        return windows
+
+    def generate_trials(self) -> List[Dict[str, Any]]:
+        """Parameter sets to evaluate: the full grid, or a random sample of it"""
+        names = list(self.parameter_space)
+        trials = [dict(zip(names, values)) for values in itertools.product(*self.parameter_space.values())]
+        trials = [t for t in trials if t.get('fast_period', 12) < t.get('slow_period', 26)]
+
+        if self.search == 'random' and len(trials) > self.n_trials:
+            rng = np.random.default_rng(self.seed)
+            trials = [trials[i] for i in sorted(rng.choice(len(trials), self.n_trials, replace=False))]
+        return trials
+
+    def prepare_data(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Order price data by date and add the indicators shared by all trials.
+
+        Args:
+            data: OHLCV data, with a 'Date' column or a date index
+
+        Returns:
+            DataFrame with a 'Date' column and a RangeIndex
+        """
+        df = data.copy()
+        if 'Date' not in df.columns:
+            df = df.rename_axis('Date').reset_index()
+        df['Date'] = pd.to_datetime(df['Date'])
+        df = df.sort_values('Date').reset_index(drop=True)
+
+        if 'ema_20' not in df.columns:
+            df = EMAIndicator(20).calculate(df)
+        if 'rsi_14' not in df.columns:
+            df = RSIIndicator(14).calculate(df)
+        return df
+
+    def run(self, data: pd.DataFrame, symbol: str = 'UNKNOWN', persist: bool = True) -> Dict[str, Any]:
+        """
+        Run the walk-forward optimization on one symbol.
+
+        Args:
+            data: OHLCV data (indicators are added as needed)
+            symbol: Symbol name used in the persisted results
+            persist: Write results to results_dir
+
+        Returns:
+            Dict with per-window selections, all trial scores and a summary
+        """
+        start_time = time.time()
+        data = self.prepare_data(data)
+        windows = self.generate_windows(len(data))
+        if not windows:
+            raise ValueError(f"Need at least {self.train_bars + self.test_bars} bars, got {len(data)}")
+
+        trials = self.generate_trials()
+        groups = {}
+        for trial_id, params in enumerate(trials):
+            periods = {key: params.get(key, default) for key, default in zip(INDICATOR_PARAMETERS, (12, 26, 9))}
+            groups.setdefault(tuple(periods.values()), (periods, []))[1].append((trial_id, params))
+
+        self.logger.info(f"Walk-forward on {symbol}: {len(trials)} trials x {len(windows)} windows "
+                         f"in {len(groups)} indicator groups")
+
+        if self.max_workers == 1 or len(groups) == 1:
+            rows = []
+            for periods, group_trials in groups.values():
+                rows.extend(_evaluate_trial_group(self.engine, data, windows, periods, group_trials, self.risk_params))
+        else:
+            rows = self._run_parallel(data, windows, list(groups.values()))
+
+        scores = pd.DataFrame(rows).sort_values(['trial', 'window', 'phase']).reset_index(drop=True)
+        results = {
+            'symbol': symbol,
+            'objective': self.objective,
+            'search': self.search,
+            'windows': self._select_windows(scores, windows, data['Date']),
+            'trials': scores,
+            'execution_time': time.time() - start_time
+        }
+        results['summary'] = self._summarize(results['windows'], len(trials))
+
+        if persist:
+            results['results_path'] = self.save_results(results)
+        return results
+
+    def run_collection(self, collection_id: str, symbol: str, persist: bool = True) -> Dict[str, Any]:
+        """Run the walk-forward optimization on a symbol of a data collection."""
+        data = self.engine.data_manager.get_symbol_data(collection_id, symbol)
+        if data is None or data.empty:
+            raise ValueError(f"No data found for {symbol} in collection {collection_id}")
+        return self.run(data, symbol, persist)
+
+    def _run_parallel(self, data: pd.DataFrame, windows: List[WalkForwardWindow],
+                      groups: List[Tuple[Dict[str, int], List]]) -> List[Dict[str, Any]]:
+        """Score trial groups in a process pool sharing the price data."""
+        shared = SharedFrame(data)
+        rows = []
+        try:
+            with ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_walk_forward_worker,
+                                     initargs=(shared.spec(), windows, self.risk_params, self.initial_capital)) as pool:
+                futures = [pool.submit(_run_trial_group, group) for group in groups]
+                for future in as_completed(futures):
+                    rows.extend(future.result())
+        finally:
+            shared.release()
+        return rows
+
+    def _select_windows(self, scores: pd.DataFrame, windows: List[WalkForwardWindow],
+                        dates: pd.Series) -> List[Dict[str, Any]]:
+        """Best train trial of each window with its out-of-sample score"""
+        parameter_names = list(self.parameter_space)
+        train = scores[scores['phase'] == 'train'].set_index(['window', 'trial'])
+        test = scores[scores['phase'] == 'test'].set_index(['window', 'trial'])
+
+        selections = []
+        for window in windows:
+            candidates = train.loc[window.index].sort_index()
+            best_trial = int(candidates[self.objective].fillna(-np.inf).idxmax())
+            best_train = candidates.loc[best_trial]
+            best_test = test.loc[(window.index, best_trial)]
+            selections.append({
+                'window': window.index,
+                'train_start': str(dates.iloc[window.train_start].date()),
+                'train_end': str(dates.iloc[window.train_end - 1].date()),
+                'test_start': str(dates.iloc[window.test_start].date()),
+                'test_end': str(dates.iloc[window.test_end - 1].date()),
+                'best_trial': best_trial,
+                'best_params': {name: best_train[name].item() if hasattr(best_train[name], 'item') else best_train[name]
+                                for name in parameter_names},
+                'train_score': float(best_train[self.objective]),
+                'test_score': float(best_test[self.objective]),
+                'test_return': float(best_test['total_return']),
+                'test_trades': int(best_test['trades'])
+            })
+        return selections
+
+    def _summarize(self, windows: List[Dict[str, Any]], n_trials: int) -> Dict[str, Any]:
+        """Out-of-sample averages and how often each parameter set was chosen"""
+        chosen = pd.Series([json.dumps(w['best_params'], sort_keys=True) for w in windows]).value_counts()
+        return {
+            'windows': len(windows),
+            'trials': n_trials,
+            'mean_train_score': float(np.mean([w['train_score'] for w in windows])),
+            'mean_test_score': float(np.mean([w['test_score'] for w in windows])),
+            'compounded_test_return': float(np.prod([1 + w['test_return'] for w in windows]) - 1),
+            'most_selected_params': json.loads(chosen.index[0]),
+            'selection_stability': float(chosen.iloc[0] / len(windows))
+        }
+
+    def save_results(self, results: Dict[str, Any]) -> str:
+        """
+        Persist results as JSON, with all trial scores alongside as CSV.
+
+        Returns:
+            Path of the JSON file
+        """
+        os.makedirs(self.results_dir, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        base = os.path.join(self.results_dir, f"walk_forward_{results['symbol']}_{timestamp}")
+
+        results['trials'].to_csv(f"{base}_trials.csv", index=False)
+        with open(f"{base}.json", 'w') as f:
+            json.dump({
+                'symbol': results['symbol'],
+                'objective': results['objective'],
+                'search': results['search'],
+                'parameter_space': self.parameter_space,
+                'train_bars': self.train_bars,
+                'test_bars': self.test_bars,
+                'step_bars': self.step_bars,
+                'windows': results['windows'],
+                'summary': results['summary'],
+                'trials_file': f"{base}_trials.csv",
+                'execution_time': results['execution_time']
+            }, f, indent=2, default=str)
+
+        self.logger.info(f"Walk-forward results saved to {base}.json")
+        return f"{base}.json"
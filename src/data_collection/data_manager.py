@@ -108,6 +108,16 @@ class DataCollectionManager:
             # Migrate existing collections to add missing columns
             self._migrate_existing_collections()
             
+            # Covering indexes for data-version stamps (avoid reading the data blobs)
+            conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_collection_data_version
+                ON collection_data (collection_id, symbol, last_updated)
+            ''')
+            conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_technical_indicators_version
+                ON technical_indicators (collection_id, symbol, last_updated)
+            ''')
+            
             conn.commit()
     
     def _migrate_existing_collections(self):
@@ -738,6 +748,65 @@ class DataCollectionManager:
             symbols = [row[0] for row in cursor.fetchall()]
             return symbols
     
+    def get_data_version(self, collection_id: Optional[str] = None,
+                         symbols: Optional[List[str]] = None) -> str:
+        """
+        Get a stamp that changes whenever the stored bars or indicators change.
+        
+        Built from the row count and latest update time of the matching
+        collection_data and technical_indicators rows, read from covering
+        indexes.
+        
+        Args:
+            collection_id: Limit to one collection (None for the whole store)
+            symbols: Limit to these symbols
+        
+        Returns:
+            Version stamp string
+        """
+        conditions, params = [], []
+        if collection_id:
+            conditions.append('collection_id = ?')
+            params.append(collection_id)
+        if symbols:
+            conditions.append(f"symbol IN ({','.join('?' * len(symbols))})")
+            params.extend(symbols)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        
+        with sqlite3.connect(self.db_path) as conn:
+            parts = []
+            for table in ('collection_data', 'technical_indicators'):
+                count, latest = conn.execute(
+                    f'SELECT COUNT(*), MAX(last_updated) FROM {table} {where}', params
+                ).fetchone()
+                parts.append(f"{count}@{latest or ''}")
+        return '|'.join(parts)
+    
+    def get_symbol_versions(self, collection_id: str) -> Dict[str, str]:
+        """
+        Get a version stamp per symbol that changes whenever its bars or indicators change.
+        
+        Read in one pass over the covering indexes of collection_data and
+        technical_indicators.
+        
+        Args:
+            collection_id: Collection ID
+        
+        Returns:
+            Version stamp string by symbol
+        """
+        versions = {}
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute('''
+                SELECT symbol, last_updated, '' FROM collection_data WHERE collection_id = ?
+                UNION ALL
+                SELECT symbol, '', last_updated FROM technical_indicators WHERE collection_id = ?
+            ''', (collection_id, collection_id)).fetchall()
+        for symbol, data_updated, indicators_updated in rows:
+            data_part, indicators_part = versions.get(symbol, '|').split('|')
+            versions[symbol] = f"{data_updated or data_part}|{indicators_updated or indicators_part}"
+        return versions
+    
     def get_symbol_data(self, collection_id: str, symbol: str) -> Optional[pd.DataFrame]:
         """Get data for a specific symbol in a collection."""
         with sqlite3.connect(self.db_path) as conn:
@@ -6,7 +6,7 @@ infrastructure to provide intelligent stock ranking within the data collection c
 """
 
 import logging
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
 from datetime import datetime
 import pandas as pd
 
@@ -35,13 +35,15 @@ class DataCollectionAIIntegration:
         self.educational_ai = EducationalAI()
         self.logger = logging.getLogger(__name__)
         
-    def get_collection_ranking(self, collection_id: str, max_stocks: int = 50) -> Dict:
+    def get_collection_ranking(self, collection_id: str, max_stocks: int = 50,
+                               on_scores: Optional[Callable[[List], None]] = None) -> Dict:
         """
         Get AI-powered ranking for a specific collection.
         
         Args:
             collection_id: ID of the data collection
             max_stocks: Maximum number of stocks to rank
+            on_scores: Called with batches of StockScores as they are produced
             
         Returns:
             Dictionary with ranking results and educational content
@@ -50,7 +52,7 @@ class DataCollectionAIIntegration:
             self.logger.info(f"Generating AI ranking for collection: {collection_id}")
             
             # Get ranking results
-            ranking_result = self.ranking_engine.rank_collection(collection_id, max_stocks)
+            ranking_result = self.ranking_engine.rank_collection(collection_id, max_stocks, on_scores)
             self.logger.info(f"Ranking engine returned {len(ranking_result.ranked_stocks)} stocks")
             self.logger.info(f"Total stocks in result: {ranking_result.total_stocks}")
             self.logger.info(f"Max stocks requested: {max_stocks}")
@@ -73,17 +75,7 @@ class DataCollectionAIIntegration:
                 'total_stocks': ranking_result.total_stocks,
                 'ranking_summary': ranking_result.summary,
                 'top_stocks': [
-                    {
-                        'rank': score.rank,
-                        'symbol': score.symbol,
-                        'total_score': score.total_score,
-                        'technical_score': score.technical_score,
-                        'fundamental_score': score.fundamental_score,
-                        'risk_score': score.risk_score,
-                        'market_score': score.market_score,
-                        'explanation': score.explanation,
-                        'recommendations': score.recommendations
-                    }
+                    self.serialize_stock_score(score)
                     for score in ranking_result.ranked_stocks  # Return all ranked stocks
                 ],
                 'educational_content': educational_content,
@@ -108,6 +100,21 @@ class DataCollectionAIIntegration:
                 'message': 'Unable to generate ranking at this time'
             }
     
+    @staticmethod
+    def serialize_stock_score(score) -> Dict:
+        """JSON form of a StockScore, as listed in top_stocks."""
+        return {
+            'rank': score.rank,
+            'symbol': score.symbol,
+            'total_score': score.total_score,
+            'technical_score': score.technical_score,
+            'fundamental_score': score.fundamental_score,
+            'risk_score': score.risk_score,
+            'market_score': score.market_score,
+            'explanation': score.explanation,
+            'recommendations': score.recommendations
+        }
+    
     def get_stock_analysis(self, collection_id: str, symbol: str) -> Dict:
         """
         Get detailed AI analysis for a specific stock.
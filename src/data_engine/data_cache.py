@@ -14,24 +14,67 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
 import pickle
 import hashlib
+import atexit
+import threading
+import weakref
 from pathlib import Path
 
 from src.utils.logger import get_logger
 
+TRANSACTION_COLUMNS = ('backtest_id', 'date', 'symbol', 'action', 'shares', 'price', 'value',
+                       'reason', 'portfolio_value', 'strategy', 'profile')
+BACKTEST_RESULT_COLUMNS = ('backtest_id', 'strategy', 'profile', 'start_date', 'end_date', 'initial_capital',
+                           'final_portfolio_value', 'total_trades', 'total_return', 'max_drawdown',
+                           'sharpe_ratio', 'results_path')
+
+# Caches that may hold unflushed rows; flushed when the interpreter exits
+_open_caches = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_open_caches():
+    """Write buffered rows of every live cache before the process exits."""
+    for cache in list(_open_caches):
+        cache.flush()
+
+
 class DataCache:
-    """Local database for caching stock data and transaction logs."""
+    """Local database for caching stock data and transaction logs.
     
-    def __init__(self, cache_dir: str = "data/cache"):
+    Transactions and backtest results are buffered in memory and written with
+    executemany in a single SQLite transaction: when the buffer reaches
+    flush_threshold rows, when a backtest result is logged (end of a run),
+    before any read of the logs, on close() and at interpreter exit.
+    """
+    
+    def __init__(self, cache_dir: str = "data/cache", flush_threshold: int = 1000):
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         self.logger = get_logger(__name__)
         
+        # Write buffers for transaction_logs and backtest_results rows
+        self.flush_threshold = flush_threshold
+        self._transaction_buffer: List[tuple] = []
+        self._result_buffer: List[tuple] = []
+        self._buffer_lock = threading.Lock()
+        _open_caches.add(self)
+        
         # Initialize database
         self.db_path = self.cache_dir / "trading_cache.db"
         self._init_database()
         
         self.logger.info(f"Data cache initialized at {self.cache_dir}")
     
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def close(self):
+        """Flush buffered rows."""
+        self.flush()
+    
     def _init_database(self):
         """Initialize SQLite database with required tables."""
         conn = sqlite3.connect(self.db_path)
@@ -93,6 +136,7 @@ class DataCache:
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_transactions_backtest ON transaction_logs(backtest_id)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_transactions_symbol ON transaction_logs(symbol)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_transactions_date ON transaction_logs(date)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_transactions_backtest_symbol ON transaction_logs(backtest_id, symbol, date)')
         
         conn.commit()
         conn.close()
@@ -166,80 +210,92 @@ class DataCache:
             self.logger.error(f"Error caching data for {symbol}: {e}")
     
     def log_transaction(self, backtest_id: str, transaction: Dict[str, Any]):
-        """Log a single transaction."""
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT INTO transaction_logs 
-                (backtest_id, date, symbol, action, shares, price, value, reason, portfolio_value, strategy, profile)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                backtest_id,
-                transaction.get('date'),
-                transaction.get('symbol'),
-                transaction.get('action'),
-                transaction.get('shares'),
-                transaction.get('price'),
-                transaction.get('value'),
-                transaction.get('reason'),
-                transaction.get('portfolio_value'),
-                transaction.get('strategy'),
-                transaction.get('profile')
-            ))
-            
-            conn.commit()
-            conn.close()
-            
-        except Exception as e:
-            self.logger.error(f"Error logging transaction: {e}")
+        """Buffer a single transaction; written on the next flush."""
+        row = (backtest_id,) + tuple(transaction.get(column) for column in TRANSACTION_COLUMNS[1:])
+        with self._buffer_lock:
+            self._transaction_buffer.append(row)
+            full = len(self._transaction_buffer) >= self.flush_threshold
+        
+        if full:
+            self.flush()
+    
+    def log_transactions(self, backtest_id: str, transactions: List[Dict[str, Any]]):
+        """Buffer a batch of transactions; written on the next flush."""
+        rows = [(backtest_id,) + tuple(t.get(column) for column in TRANSACTION_COLUMNS[1:]) for t in transactions]
+        with self._buffer_lock:
+            self._transaction_buffer.extend(rows)
+            full = len(self._transaction_buffer) >= self.flush_threshold
+        
+        if full:
+            self.flush()
     
     def log_backtest_result(self, backtest_id: str, result: Dict[str, Any]):
-        """Log backtest results."""
+        """Log backtest results and flush the run's buffered transactions with them."""
         try:
             # Save detailed results to JSON file
             results_file = self.cache_dir / f"backtest_{backtest_id}.json"
             with open(results_file, 'w') as f:
                 json.dump(result, f, indent=2, default=str)
             
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT OR REPLACE INTO backtest_results 
-                (backtest_id, strategy, profile, start_date, end_date, initial_capital, 
-                 final_portfolio_value, total_trades, total_return, max_drawdown, sharpe_ratio, results_path)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                backtest_id,
-                result.get('strategy'),
-                result.get('profile'),
-                result.get('start_date'),
-                result.get('end_date'),
-                result.get('initial_capital'),
-                result.get('final_portfolio_value'),
-                result.get('total_trades'),
-                result.get('total_return'),
-                result.get('max_drawdown'),
-                result.get('sharpe_ratio'),
-                str(results_file)
-            ))
-            
-            conn.commit()
-            conn.close()
+            row = (backtest_id,) + tuple(result.get(column) for column in BACKTEST_RESULT_COLUMNS[1:-1]) + (str(results_file),)
+            with self._buffer_lock:
+                self._result_buffer.append(row)
             
-            self.logger.info(f"Logged backtest results for {backtest_id}")
+            if self.flush():
+                self.logger.info(f"Logged backtest results for {backtest_id}")
             
         except Exception as e:
             self.logger.error(f"Error logging backtest result: {e}")
     
+    def flush(self) -> bool:
+        """
+        Write buffered transactions and backtest results in one SQLite transaction.
+        
+        Rows are put back in the buffer if the write fails, so a later
+        flush can retry them.
+        
+        Returns:
+            True if the buffers were written (or empty)
+        """
+        with self._buffer_lock:
+            transactions, self._transaction_buffer = self._transaction_buffer, []
+            results, self._result_buffer = self._result_buffer, []
+        
+        if not transactions and not results:
+            return True
+        
+        try:
+            conn = sqlite3.connect(self.db_path)
+            try:
+                with conn:
+                    conn.executemany(f'''
+                        INSERT INTO transaction_logs ({', '.join(TRANSACTION_COLUMNS)})
+                        VALUES ({', '.join('?' * len(TRANSACTION_COLUMNS))})
+                    ''', transactions)
+                    conn.executemany(f'''
+                        INSERT OR REPLACE INTO backtest_results ({', '.join(BACKTEST_RESULT_COLUMNS)})
+                        VALUES ({', '.join('?' * len(BACKTEST_RESULT_COLUMNS))})
+                    ''', results)
+            finally:
+                conn.close()
+            
+            self.logger.debug(f"Flushed {len(transactions)} transactions and {len(results)} backtest results")
+            return True
+            
+        except Exception as e:
+            self.logger.error(f"Error flushing transaction logs: {e}")
+            with self._buffer_lock:
+                self._transaction_buffer[:0] = transactions
+                self._result_buffer[:0] = results
+            return False
+    
     def get_transaction_history(self, backtest_id: Optional[str] = None, 
                               symbol: Optional[str] = None, 
                               start_date: Optional[str] = None,
                               end_date: Optional[str] = None) -> pd.DataFrame:
         """Retrieve transaction history with optional filters."""
         try:
+            self.flush()
             conn = sqlite3.connect(self.db_path)
             
             query = "SELECT * FROM transaction_logs WHERE 1=1"
@@ -275,6 +331,7 @@ class DataCache:
     def get_backtest_history(self) -> pd.DataFrame:
         """Retrieve all backtest results."""
         try:
+            self.flush()
             conn = sqlite3.connect(self.db_path)
             df = pd.read_sql_query("SELECT * FROM backtest_results ORDER BY timestamp DESC", conn)
             conn.close()
@@ -324,6 +381,7 @@ class DataCache:
     def get_cache_stats(self) -> Dict[str, Any]:
         """Get cache statistics."""
         try:
+            self.flush()
             conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
             
@@ -373,6 +431,10 @@ class DataCache:
     def clear_all_data(self):
         """Clear all cached data, transactions, and backtest results."""
         try:
+            with self._buffer_lock:
+                self._transaction_buffer = []
+                self._result_buffer = []
+            
             conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
             
@@ -149,6 +149,18 @@ class PortfolioDatabase:
                     )
                 """)
                 
+                # Create streaming metrics state table (one row per portfolio)
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS performance_metrics_state (
+                        portfolio_id INTEGER PRIMARY KEY,
+                        state TEXT NOT NULL,
+                        pending_date DATE,
+                        pending_value REAL,
+                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        FOREIGN KEY (portfolio_id) REFERENCES portfolios (id)
+                    )
+                """)
+                
                 conn.commit()
                 self.logger.info("Portfolio database initialized successfully")
                 
@@ -498,6 +510,54 @@ class PortfolioDatabase:
             self.logger.error(f"Error getting performance history: {e}")
             raise
     
+    def get_metrics_state(self, portfolio_id: int) -> Optional[Dict]:
+        """Get the stored streaming metrics state of a portfolio."""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                
+                cursor.execute("""
+                    SELECT state, pending_date, pending_value
+                    FROM performance_metrics_state
+                    WHERE portfolio_id = ?
+                """, (portfolio_id,))
+                
+                row = cursor.fetchone()
+                if not row:
+                    return None
+                
+                return {
+                    'state': json.loads(row[0]),
+                    'pending_date': date.fromisoformat(row[1]) if row[1] else None,
+                    'pending_value': row[2]
+                }
+                
+        except Exception as e:
+            self.logger.error(f"Error getting metrics state: {e}")
+            raise
+    
+    def save_metrics_state(self, portfolio_id: int, state: Dict,
+                           pending_date: Optional[date] = None,
+                           pending_value: Optional[float] = None) -> None:
+        """Store the streaming metrics state of a portfolio."""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                
+                cursor.execute("""
+                    INSERT OR REPLACE INTO performance_metrics_state
+                    (portfolio_id, state, pending_date, pending_value, updated_at)
+                    VALUES (?, ?, ?, ?, ?)
+                """, (portfolio_id, json.dumps(state),
+                     pending_date.isoformat() if pending_date else None,
+                     pending_value, datetime.now().isoformat()))
+                
+                conn.commit()
+                
+        except Exception as e:
+            self.logger.error(f"Error saving metrics state: {e}")
+            raise
+    
     def record_algorithm_decision(self, portfolio_id: int, symbol: str, 
                                 decision: str, confidence: float, 
                                 factors: Dict) -> None:
@@ -19,6 +19,7 @@ from .portfolio_database import (
 )
 from ..data_collection.data_manager import DataCollectionManager as DataManager
 from ..ai_ranking.hybrid_ranking_engine import HybridRankingEngine
+from ..backtesting.streaming_metrics import StreamingMetrics
 
 class RiskLevel(Enum):
     CONSERVATIVE = "conservative"
@@ -562,6 +563,7 @@ class PortfolioManager:
                 cash=summary.cash,
                 positions_value=summary.positions_value
             )
+            self._update_streaming_metrics(portfolio_id, today, summary.total_value)
             
             self.logger.info(f"Recorded daily snapshot for portfolio {portfolio_id}")
             
@@ -569,6 +571,65 @@ class PortfolioManager:
             self.logger.error(f"Error recording daily snapshot: {e}")
             raise
     
+    def _load_streaming_metrics(self, portfolio_id: int) -> Tuple[StreamingMetrics, Optional[date], Optional[float]]:
+        """
+        Committed streaming metrics of a portfolio plus its pending (latest) day.
+        
+        The latest day's snapshot can still be replaced, so it is only folded
+        into the accumulator once a later day is recorded. Portfolios without
+        stored state are replayed once from their daily performance history.
+        """
+        record = self.db.get_metrics_state(portfolio_id)
+        if record:
+            return (StreamingMetrics.from_dict(record['state']),
+                    record['pending_date'], record['pending_value'])
+        
+        history = sorted(self.db.get_portfolio_performance_history(portfolio_id, days=-1),
+                         key=lambda p: p.date)
+        metrics = StreamingMetrics()
+        for performance in history[:-1]:
+            metrics.update(performance.total_value, performance.date)
+        if history:
+            return metrics, history[-1].date, history[-1].total_value
+        return metrics, None, None
+    
+    def _update_streaming_metrics(self, portfolio_id: int, day: date, total_value: float) -> None:
+        """Add a daily snapshot value to the portfolio's streaming metrics."""
+        metrics, pending_date, pending_value = self._load_streaming_metrics(portfolio_id)
+        if pending_date is not None and pending_date != day:
+            metrics.update(pending_value, pending_date)
+        self.db.save_metrics_state(portfolio_id, metrics.to_dict(), day, total_value)
+    
+    def get_performance_metrics(self, portfolio_id: Optional[int] = None) -> Dict:
+        """
+        Get streaming risk/return metrics of the daily snapshots.
+        
+        Args:
+            portfolio_id: Portfolio to report, or None for all portfolios
+            
+        Returns:
+            Metrics dict of the portfolio, or metrics keyed by portfolio name
+        """
+        try:
+            if portfolio_id is not None:
+                metrics, pending_date, pending_value = self._load_streaming_metrics(portfolio_id)
+                if pending_date is not None:
+                    metrics.update(pending_value, pending_date)
+                return metrics.summary()
+            
+            return {
+                portfolio.name: {
+                    'portfolio_id': portfolio.id,
+                    'portfolio_type': portfolio.portfolio_type.value,
+                    **self.get_performance_metrics(portfolio.id)
+                }
+                for portfolio in self.db.get_all_portfolios()
+            }
+            
+        except Exception as e:
+            self.logger.error(f"Error getting performance metrics: {e}")
+            raise
+    
     def manage_ai_portfolio(self, portfolio_id: int, 
                            collection_id: str = "ALL_20250803_160817") -> Dict:
         """Manage AI portfolio based on hybrid ranking results."""
@@ -577,8 +638,8 @@ class PortfolioManager:
                 self.logger.error("Hybrid ranking engine not available")
                 return {"success": False, "error": "Ranking engine not available"}
             
-            # Get hybrid ranking results
-            ranking_results = self.hybrid_ranking_engine.rank_collection_hybrid(
+            # Get hybrid ranking results, rescoring only symbols updated since the last tick
+            ranking_results = self.hybrid_ranking_engine.rank_collection_incremental(
                 collection_id=collection_id,
                 max_stocks=50  # Limit for AI portfolio
             )
@@ -760,7 +821,8 @@ class PortfolioManager:
             comparison = {
                 'user_portfolio': None,
                 'ai_portfolio': None,
-                'comparison': {}
+                'comparison': {},
+                'risk_metrics': {}
             }
             
             for portfolio in portfolios:
@@ -770,6 +832,8 @@ class PortfolioManager:
                         comparison['user_portfolio'] = summary
                     elif portfolio.portfolio_type == PortfolioType.AI_MANAGED:
                         comparison['ai_portfolio'] = summary
+                    comparison['risk_metrics'][portfolio.portfolio_type.value] = \
+                        self.get_performance_metrics(portfolio.id)
             
             # Calculate comparison metrics
             if comparison['user_portfolio'] and comparison['ai_portfolio']:
@@ -7,14 +7,17 @@ using the centralized trading system.
 
 import asyncio
 import logging
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional, Tuple
+import numpy as np
 import pandas as pd
 import pytz
 from enum import Enum
 
 from ..utils.config_loader import ConfigLoader
 from ..utils.logger import get_logger
+from ..utils.decision_trace import decision_tracer
 from ..data_engine.data_engine import DataEngine
 from ..strategies.base_strategy import BaseStrategy
 from ..strategies.macd_strategy import MACDStrategy
@@ -22,6 +25,7 @@ from ..strategies.macd_canonical_strategy import MACDCanonicalStrategy
 from .paper_trading import PaperTradingBroker
 from .position_manager import PositionManager
 from ..trading_system import get_trading_system
+from ..backtesting.checkpoint import Checkpoint, fingerprint, save_checkpoint, load_checkpoint, clear_checkpoint
 
 
 class TradingMode(Enum):
@@ -390,17 +394,99 @@ class AutomationEngine:
         return self.trading_system.get_performance_summary('automation')
 
 
+def _walk_positions(prices: np.ndarray, signals: np.ndarray, start: int, stop: int,
+                    shares_held: np.ndarray, entry_prices: np.ndarray, open_positions: int,
+                    capital: float, max_positions: int, max_position_size: float,
+                    keep_books: bool = False) -> Tuple:
+    """
+    Apply the signals of dates start..stop-1 to a book of open positions.
+    
+    Pure function of its inputs, so date segments can be walked in worker
+    processes and a walk can resume from a saved book.
+    
+    Args:
+        prices: (dates x symbols) close prices, NaN where a symbol has no bar
+        signals: (dates x symbols) 1 for BUY, -1 for SELL, 0 otherwise
+        start, stop: Date positions to walk
+        shares_held, entry_prices: Book at the start of date `start`
+        open_positions: Number of open positions in the book
+        capital, max_positions, max_position_size: Sizing settings
+        keep_books: Also return the book after every date
+        
+    Returns:
+        (values, events, shares_held, entry_prices, open_positions, books): values
+        is the portfolio value of each date; events are (t, s, action, shares,
+        price, entry_price) tuples with action 1 for BUY and -1 for SELL; books
+        is (dates x 2 x symbols) shares and entry prices, or None
+    """
+    shares_held = np.array(shares_held, dtype=float)
+    entry_prices = np.array(entry_prices, dtype=float)
+    values = np.empty(stop - start)
+    events = []
+    books = np.empty((stop - start, 2, len(shares_held))) if keep_books else None
+    
+    for t in range(start, stop):
+        values[t - start] = capital + np.nansum(shares_held * prices[t])
+        
+        # Symbols with a BUY signal and no position, or a SELL signal and a position
+        actionable = np.flatnonzero(((signals[t] == 1) & (shares_held == 0)) |
+                                    ((signals[t] == -1) & (shares_held > 0)))
+        
+        for s in actionable:
+            current_price = prices[t, s]
+            if signals[t, s] == 1:
+                # Check position limits
+                if open_positions >= max_positions:
+                    continue
+                shares = capital * max_position_size / current_price
+                shares_held[s] = shares
+                entry_prices[s] = current_price
+                open_positions += 1
+                events.append((t, int(s), 1, shares, current_price, current_price))
+            else:
+                events.append((t, int(s), -1, shares_held[s], current_price, entry_prices[s]))
+                shares_held[s] = 0.0
+                entry_prices[s] = 0.0
+                open_positions -= 1
+        
+        if keep_books:
+            books[t - start, 0] = shares_held
+            books[t - start, 1] = entry_prices
+    
+    return values, events, shares_held, entry_prices, open_positions, books
+
+
 class HistoricalBacktestEngine:
     """
     Engine for running automation strategies on historical data.
     Uses the centralized trading system for consistent behavior.
     """
     
-    def __init__(self, config: dict, start_date: str, end_date: str, benchmark: str = "SPY"):
+    STRATEGY_NAME = 'MACDStrategy'
+    
+    def __init__(self, config: dict, start_date: str, end_date: str, benchmark: str = "SPY",
+                 checkpoint_path: Optional[str] = None, checkpoint_every: int = 250,
+                 segments: int = 1, max_workers: Optional[int] = None):
+        """
+        Args:
+            config: Flat configuration dict ('automation.*' keys)
+            start_date, end_date: Backtest period
+            benchmark: Benchmark symbol
+            checkpoint_path: File to checkpoint the simulation to; a run over
+                the same inputs resumes from it and removes it when finished
+            checkpoint_every: Dates simulated between checkpoints
+            segments: Split the date range into this many segments walked in
+                parallel and stitched into the sequential result
+            max_workers: Worker processes for segments (default: CPU count)
+        """
         self.config = config
         self.start_date = start_date
         self.end_date = end_date
         self.benchmark = benchmark
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_every = max(1, int(checkpoint_every))
+        self.segments = max(1, int(segments))
+        self.max_workers = max_workers
         self.logger = logging.getLogger(__name__)
         
         # Get centralized trading system
@@ -459,132 +545,94 @@ class HistoricalBacktestEngine:
         """Run the historical simulation."""
         # Initialize tracking
         capital = self.config.get('automation.paper_trading.initial_capital', 100000)
-        positions = {}
+        max_positions = self.config.get('automation.max_positions', 10)
+        max_position_size = self.config.get('automation.max_position_size', 0.1)
         trades = []
-        portfolio_values = []
         benchmark_values = []
         
-        # Get all dates from the data
-        all_dates = set()
+        # Align all symbols on the union of their dates: row_index[t, s] is the
+        # row of date t in symbol s's data, or -1 if the symbol has no bar that day
+        symbols = list(stock_data.keys())
+        all_dates = pd.Index([])
         for data in stock_data.values():
-            all_dates.update(data.index)
-        all_dates = sorted(all_dates)
+            all_dates = all_dates.union(data.index)
+        all_dates = all_dates.unique().sort_values()
         
-        # Track benchmark
-        benchmark_shares = 0
-        if benchmark_data is not None:
-            # Use lowercase column names
-            close_col = 'close'
-            benchmark_shares = capital / benchmark_data[close_col].iloc[0]
+        row_index = np.column_stack([stock_data[symbol].index.get_indexer(all_dates) for symbol in symbols])
+        prices = np.column_stack([
+            np.where(row_index[:, s] >= 0, stock_data[symbol]['close'].to_numpy(dtype=float)[row_index[:, s]], np.nan)
+            for s, symbol in enumerate(symbols)
+        ])
+        signals, reasons = self._signal_matrix(stock_data, row_index)
         
         # Simulate trading day by day
-        for date in all_dates:
-            # Update portfolio value
-            portfolio_value = capital
-            for symbol, position in positions.items():
-                if symbol in stock_data and date in stock_data[symbol].index:
-                    # Use lowercase column names
-                    close_col = 'close'
-                    current_price = stock_data[symbol].loc[date, close_col]
-                    portfolio_value += position['shares'] * current_price
-            
-            portfolio_values.append({
-                'date': str(date),  # Convert to string for JSON serialization
-                'value': float(portfolio_value)  # Ensure float type
-            })
-            
-            # Update benchmark value
-            if benchmark_data is not None and date in benchmark_data.index:
-                # Use lowercase column names
-                close_col = 'close'
-                benchmark_price = benchmark_data.loc[date, close_col]
-                benchmark_value = benchmark_shares * benchmark_price
+        values, events = self._walk(symbols, all_dates, prices, signals,
+                                    (capital, max_positions, max_position_size))
+        portfolio_values = [{'date': str(date), 'value': float(value)} for date, value in zip(all_dates, values)]
+        
+        # Track benchmark
+        if benchmark_data is not None:
+            benchmark_shares = capital / benchmark_data['close'].iloc[0]
+            benchmark_rows = benchmark_data.index.get_indexer(all_dates)
+            benchmark_prices = np.where(benchmark_rows >= 0,
+                                        benchmark_data['close'].to_numpy(dtype=float)[benchmark_rows], np.nan)
+            for t in np.flatnonzero(~np.isnan(benchmark_prices)):
                 benchmark_values.append({
-                    'date': str(date),  # Convert to string for JSON serialization
-                    'value': float(benchmark_value)  # Ensure float type
+                    'date': str(all_dates[t]),
+                    'value': float(benchmark_shares * benchmark_prices[t])
+                })
+        
+        # Trade records, in the order the walk made them
+        for t, s, action, shares, current_price, entry_price in events:
+            date = all_dates[t]
+            symbol = symbols[s]
+            current_index = int(row_index[t, s])
+            
+            if action == 1:
+                reason = reasons.get((t, s)) or self._entry_reason(stock_data[symbol], current_index)
+                trades.append({
+                    'date': str(date),
+                    'symbol': symbol,
+                    'action': 'BUY',
+                    'shares': float(shares),
+                    'price': float(current_price),
+                    'value': float(shares * current_price),
+                    'reason': str(reason)
                 })
-            
-            # Check for trading signals for each stock
-            for symbol, data in stock_data.items():
-                if date not in data.index:
-                    continue
-                
-                current_index = data.index.get_loc(date)
                 
-                # Check if we have a position in this stock
-                has_position = symbol in positions
+                self.logger.debug("BUY [%s]: %.6f shares of %s at $%.2f - %s", date, shares, symbol,
+                                  current_price, trades[-1]['reason'])
+                if decision_tracer.enabled:
+                    decision_tracer.record('HistoricalBacktestEngine', 'trade', True, {'action': 'BUY'},
+                                           symbol=symbol, index=current_index, timestamp=date,
+                                           shares=float(shares), price=float(current_price))
+            
+            else:
+                # Close position and calculate PnL
+                entry_value = shares * entry_price
+                exit_value = shares * current_price
+                pnl = exit_value - entry_value
+                pnl_pct = (pnl / entry_value) * 100
                 
-                # Get signal from centralized system
-                signal_generated, signal_details = self.trading_system.run_strategy_signal(
-                    'MACDStrategy', data, current_index
-                )
+                trades.append({
+                    'date': str(date),
+                    'symbol': symbol,
+                    'action': 'SELL',
+                    'shares': float(shares),
+                    'price': float(current_price),
+                    'value': float(exit_value),
+                    'pnl': float(pnl),
+                    'pnl_pct': float(pnl_pct),
+                    'reason': str(reasons.get((t, s), 'Strategy Exit'))
+                })
                 
-                if signal_generated:
-                    if signal_details['action'] == 'BUY' and not has_position:
-                        # Check position limits
-                        if len(positions) >= self.config.get('automation.max_positions', 10):
-                            continue
-                        
-                        # Calculate position size
-                        # Use lowercase column names
-                        close_col = 'close'
-                        current_price = data.loc[date, close_col]
-                        max_position_value = capital * self.config.get('automation.max_position_size', 0.1)
-                        shares = max_position_value / current_price
-                        
-                        # Record position
-                        positions[symbol] = {
-                            'shares': float(shares),  # Ensure float type
-                            'entry_price': float(current_price),  # Ensure float type
-                            'entry_date': str(date),  # Convert to string
-                            'strategy': 'MACDStrategy'
-                        }
-                        
-                        trades.append({
-                            'date': str(date),  # Convert to string for JSON serialization
-                            'symbol': symbol,
-                            'action': 'BUY',
-                            'shares': float(shares),  # Ensure float type
-                            'price': float(current_price),  # Ensure float type
-                            'value': float(shares * current_price),  # Ensure float type
-                            'reason': str(signal_details.get('reason', {}).get('summary', 'Strategy Entry'))  # Ensure string
-                        })
-                        
-                        # Enhanced logging with date
-                        date_str = str(date)
-                        self.logger.info(f"BUY [{date_str}]: {shares:.6f} shares of {symbol} at ${current_price:.2f} - {signal_details.get('reason', {}).get('summary', 'Strategy Entry')}")
-                    
-                    elif signal_details['action'] == 'SELL' and has_position:
-                        # Close position
-                        position = positions[symbol]
-                        # Use lowercase column names
-                        close_col = 'close'
-                        current_price = data.loc[date, close_col]
-                        
-                        # Calculate PnL
-                        entry_value = position['shares'] * position['entry_price']
-                        exit_value = position['shares'] * current_price
-                        pnl = exit_value - entry_value
-                        pnl_pct = (pnl / entry_value) * 100
-                        
-                        trades.append({
-                            'date': str(date),  # Convert to string for JSON serialization
-                            'symbol': symbol,
-                            'action': 'SELL',
-                            'shares': float(position['shares']),  # Ensure float type
-                            'price': float(current_price),  # Ensure float type
-                            'value': float(exit_value),  # Ensure float type
-                            'pnl': float(pnl),  # Ensure float type
-                            'pnl_pct': float(pnl_pct),  # Ensure float type
-                            'reason': str(signal_details.get('reason', {}).get('summary', 'Strategy Exit'))  # Ensure string
-                        })
-                        
-                        # Enhanced logging with date
-                        date_str = str(date)
-                        self.logger.info(f"SELL [{date_str}]: {position['shares']:.6f} shares of {symbol} at ${current_price:.2f} - PnL: {pnl_pct:.2f}% - {signal_details.get('reason', {}).get('summary', 'Strategy Exit')}")
-                        
-                        # Remove position
-                        del positions[symbol]
+                self.logger.debug("SELL [%s]: %.6f shares of %s at $%.2f - PnL: %.2f%% - %s", date,
+                                  shares, symbol, current_price, pnl_pct, trades[-1]['reason'])
+                if decision_tracer.enabled:
+                    decision_tracer.record('HistoricalBacktestEngine', 'trade', True, {'action': 'SELL'},
+                                           symbol=symbol, index=current_index, timestamp=date,
+                                           shares=float(shares), price=float(current_price),
+                                           pnl=float(pnl), pnl_pct=float(pnl_pct))
         
         # Calculate final portfolio value
         final_value = portfolio_values[-1]['value'] if portfolio_values else capital
@@ -611,4 +659,184 @@ class HistoricalBacktestEngine:
             'losing_trades': int(losing_trades),  # Ensure int type
             'initial_capital': float(capital),  # Ensure float type
             'final_value': float(final_value)  # Ensure float type
-        } 
\ No newline at end of file
+        } 
+    
+    def _walk(self, symbols: List[str], all_dates: pd.Index, prices: np.ndarray,
+              signals: np.ndarray, sizing: Tuple[float, int, float]) -> Tuple[np.ndarray, List[Tuple]]:
+        """
+        Walk the book of positions over every date.
+        
+        With a checkpoint path the walk is saved after every chunk of dates and
+        resumes from a checkpoint taken over the same symbols, prices, signals
+        and sizing. With several segments, every segment after the first is
+        walked ahead in a worker process and stitched on in date order.
+        
+        Returns:
+            (values, events) as from _walk_positions over all dates
+        """
+        n_dates, n_symbols = prices.shape
+        values = np.empty(n_dates)
+        events = []
+        shares_held = np.zeros(n_symbols)
+        entry_prices = np.zeros(n_symbols)
+        open_positions = 0
+        cursor = 0
+        
+        key = None
+        if self.checkpoint_path:
+            key = fingerprint(symbols, [str(date) for date in all_dates], prices, signals, list(sizing))
+            checkpoint = load_checkpoint(self.checkpoint_path, key)
+            if checkpoint is not None:
+                cursor = checkpoint.cursor
+                values[:cursor] = checkpoint.arrays['values']
+                events = [(int(t), int(s), int(action), shares, price, entry)
+                          for t, s, action, shares, price, entry in checkpoint.arrays['events']]
+                shares_held = checkpoint.arrays['shares_held']
+                entry_prices = checkpoint.arrays['entry_prices']
+                open_positions = checkpoint.state['open_positions']
+                self.logger.info(f"Resuming historical backtest at {checkpoint.state['cursor_date']} "
+                                 f"({cursor}/{n_dates} dates done)")
+        
+        bounds = self._chunk_bounds(cursor, n_dates)
+        pool = None
+        speculative = {}
+        if self.segments > 1 and len(bounds) > 1:
+            self.logger.info(f"Walking {n_dates - cursor} dates in {len(bounds)} segments")
+            pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            flat = np.zeros(n_symbols)
+            speculative = {
+                start: pool.submit(_walk_positions, prices[start:stop], signals[start:stop], 0, stop - start,
+                                   flat, flat, 0, *sizing, True)
+                for start, stop in bounds[1:]
+            }
+        
+        try:
+            for start, stop in bounds:
+                if start in speculative:
+                    chunk = self._stitch_segment(prices, signals, start, stop, speculative[start].result(),
+                                                 shares_held, entry_prices, open_positions, sizing)
+                else:
+                    chunk = _walk_positions(prices, signals, start, stop, shares_held, entry_prices,
+                                            open_positions, *sizing)
+                chunk_values, chunk_events, shares_held, entry_prices, open_positions = chunk[:5]
+                values[start:stop] = chunk_values
+                events.extend(chunk_events)
+                
+                if key is not None and stop < n_dates:
+                    save_checkpoint(self.checkpoint_path, Checkpoint(
+                        fingerprint=key,
+                        cursor=stop,
+                        arrays={
+                            'values': values[:stop],
+                            'events': np.array(events, dtype=float).reshape(-1, 6),
+                            'shares_held': shares_held,
+                            'entry_prices': entry_prices
+                        },
+                        state={
+                            'cursor_date': str(all_dates[stop]),
+                            'open_positions': int(open_positions),
+                            'cash': float(sizing[0])
+                        }
+                    ))
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+        
+        clear_checkpoint(self.checkpoint_path)
+        return values, events
+    
+    def _chunk_bounds(self, start: int, stop: int) -> List[Tuple[int, int]]:
+        """Date ranges walked between checkpoints, or the parallel segments."""
+        if self.segments > 1:
+            edges = np.linspace(start, stop, self.segments + 1).round().astype(int)
+        elif self.checkpoint_path:
+            edges = np.append(np.arange(start, stop, self.checkpoint_every), stop)
+        else:
+            edges = np.array([start, stop])
+        edges = np.unique(edges)
+        return list(zip(edges[:-1].tolist(), edges[1:].tolist()))
+    
+    @staticmethod
+    def _stitch_segment(prices: np.ndarray, signals: np.ndarray, start: int, stop: int, speculative: Tuple,
+                        shares_held: np.ndarray, entry_prices: np.ndarray, open_positions: int,
+                        sizing: Tuple[float, int, float]) -> Tuple:
+        """
+        Join a segment walked from an empty book onto the book carried into it.
+        
+        Dates are re-walked from the carried book until it matches the
+        speculative book after the same date. The walk only depends on the
+        book and the date, so from there on the speculative segment is exact
+        and the stitched result equals a sequential walk.
+        """
+        spec_values, spec_events, spec_shares, spec_entries, spec_open, books = speculative
+        spec_events = [(event[0] + start,) + event[1:] for event in spec_events]
+        if not shares_held.any() and not entry_prices.any():
+            return spec_values, spec_events, spec_shares, spec_entries, spec_open
+        
+        values, events = [], []
+        t = start
+        while t < stop:
+            value, day_events, shares_held, entry_prices, open_positions, _ = _walk_positions(
+                prices, signals, t, t + 1, shares_held, entry_prices, open_positions, *sizing)
+            values.append(value[0])
+            events.extend(day_events)
+            t += 1
+            if np.array_equal(shares_held, books[t - 1 - start, 0]) and \
+                    np.array_equal(entry_prices, books[t - 1 - start, 1]):
+                values.extend(spec_values[t - start:])
+                events.extend(event for event in spec_events if event[0] >= t)
+                return np.array(values), events, spec_shares, spec_entries, spec_open
+        
+        return np.array(values), events, shares_held, entry_prices, open_positions
+    
+    def _signal_matrix(self, stock_data: Dict[str, pd.DataFrame],
+                       row_index: np.ndarray) -> Tuple[np.ndarray, Dict[Tuple[int, int], str]]:
+        """
+        Strategy signals for every date and symbol.
+        
+        Uses the strategy's vectorized entry mask when it has one; otherwise
+        asks the trading system for a signal on every bar.
+        
+        Args:
+            stock_data: Symbol -> data with indicators
+            row_index: (dates x symbols) row of each date in each symbol's data, -1 if missing
+            
+        Returns:
+            (signals, reasons): signals is 1 for BUY, -1 for SELL and 0 otherwise;
+            reasons holds the signal summaries known without re-evaluating the strategy
+        """
+        signals = np.zeros(row_index.shape, dtype=np.int8)
+        reasons = {}
+        strategy = self.trading_system.get_strategy(self.STRATEGY_NAME)
+        if strategy is None:
+            return signals, reasons
+        
+        for s, (symbol, data) in enumerate(stock_data.items()):
+            present = np.flatnonzero(row_index[:, s] >= 0)
+            
+            try:
+                entries = strategy.entry_mask(data)
+            except Exception as e:
+                self.logger.warning(f"Vectorized signals failed for {symbol}, evaluating per bar: {e}")
+                entries = None
+            
+            if entries is not None:
+                signals[present, s] = np.asarray(entries, dtype=bool)[row_index[present, s]]
+                continue
+            
+            for t in present:
+                signal_generated, signal_details = self.trading_system.run_strategy_signal(
+                    self.STRATEGY_NAME, data, int(row_index[t, s])
+                )
+                if signal_generated and signal_details['action'] in ('BUY', 'SELL'):
+                    signals[t, s] = 1 if signal_details['action'] == 'BUY' else -1
+                    default = 'Strategy Entry' if signals[t, s] == 1 else 'Strategy Exit'
+                    reasons[(t, s)] = signal_details.get('reason', {}).get('summary', default)
+        
+        return signals, reasons
+    
+    def _entry_reason(self, data: pd.DataFrame, current_index: int) -> str:
+        """Entry signal summary for a bar, evaluated only when a trade is made."""
+        strategy = self.trading_system.get_strategy(self.STRATEGY_NAME)
+        _, entry_reason = strategy.should_entry(data, current_index)
+        return entry_reason.get('summary', 'Strategy Entry')
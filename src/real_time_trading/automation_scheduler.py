@@ -5,12 +5,15 @@ Automation Scheduler for running automated trading cycles
 import logging
 import time
 import threading
+import json
+import os
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional, Callable
 from dataclasses import dataclass
 
 from .automation_engine import AutomationEngine, TradingMode
 from ..utils.config_loader import ConfigLoader
+from ..backtesting.streaming_metrics import StreamingMetrics
 
 logger = logging.getLogger(__name__)
 
@@ -51,6 +54,10 @@ class AutomationScheduler:
         self.total_trades = 0
         self.total_errors = 0
         
+        # Streaming risk/return metrics of the account value, one point per cycle
+        self.metrics_state_path = config.get('automation.metrics_state_path', 'data/automation_metrics.json')
+        self.equity_metrics = self._load_metrics_state()
+        
         logger.info(f"Automation Scheduler initialized in {mode.value} mode")
     
     def start(self) -> None:
@@ -144,7 +151,7 @@ class AutomationScheduler:
                 signals_generated=signals_generated,
                 trades_executed=trades_executed,
                 errors=[],
-                performance_metrics=self._calculate_performance_metrics()
+                performance_metrics=self._calculate_performance_metrics(record=True)
             )
             self.cycle_results.append(cycle_result)
             
@@ -215,9 +222,40 @@ class AutomationScheduler:
             
             return True
     
-    def _calculate_performance_metrics(self) -> Dict[str, Any]:
+    def _load_metrics_state(self) -> StreamingMetrics:
+        """
+        Resume the streaming metrics from the saved state, if any
+        """
+        if self.metrics_state_path and os.path.exists(self.metrics_state_path):
+            try:
+                with open(self.metrics_state_path) as f:
+                    return StreamingMetrics.from_dict(json.load(f))
+            except Exception as e:
+                logger.warning(f"Could not load metrics state, starting fresh: {e}")
+        return StreamingMetrics()
+    
+    def _save_metrics_state(self) -> None:
+        """
+        Persist the streaming metrics state so a restart resumes from it
+        """
+        if not self.metrics_state_path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.metrics_state_path) or '.', exist_ok=True)
+            tmp_path = f"{self.metrics_state_path}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(self.equity_metrics.to_dict(), f)
+            os.replace(tmp_path, self.metrics_state_path)
+        except Exception as e:
+            logger.error(f"Error saving metrics state: {e}")
+    
+    def _calculate_performance_metrics(self, record: bool = False) -> Dict[str, Any]:
         """
         Calculate performance metrics for the automation system
+        
+        Args:
+            record: Add the current account value to the streaming metrics
+                (once per cycle; status reads leave them unchanged)
         """
         try:
             # Get portfolio summary
@@ -229,6 +267,10 @@ class AutomationScheduler:
             total_pnl = positions['total_pnl']
             pnl_pct = (total_pnl / portfolio['initial_cash']) * 100 if portfolio['initial_cash'] > 0 else 0
             
+            if record:
+                self.equity_metrics.update(total_value, datetime.now())
+                self._save_metrics_state()
+            
             return {
                 'total_value': total_value,
                 'cash': portfolio['cash'],
@@ -240,7 +282,8 @@ class AutomationScheduler:
                 'cycle_count': self.cycle_count,
                 'total_signals': self.total_signals,
                 'total_trades': self.total_trades,
-                'total_errors': self.total_errors
+                'total_errors': self.total_errors,
+                'risk_metrics': self.equity_metrics.summary()
             }
             
         except Exception as e:
@@ -282,7 +325,7 @@ class AutomationScheduler:
             result = self.automation_engine.run_cycle()
             
             # Calculate performance metrics
-            performance_metrics = self._calculate_performance_metrics()
+            performance_metrics = self._calculate_performance_metrics(record=True)
             
             return {
                 'success': True,
@@ -3,6 +3,8 @@ Trading strategies for the SMART STOCK TRADING SYSTEM.
 """
 
 from .base_strategy import BaseStrategy
+from .position_state import PositionState
+from .profile_compiler import CompiledProfile, compile_profile, compile_profiles, evaluate_profiles
 from .macd_strategy import MACDStrategy
 from .macd_canonical_strategy import MACDCanonicalStrategy
 from .macd_aggressive_strategy import MACDAggressiveStrategy
@@ -10,6 +12,11 @@ from .macd_conservative_strategy import MACDConservativeStrategy
 
 __all__ = [
     'BaseStrategy', 
+    'PositionState',
+    'CompiledProfile',
+    'compile_profile',
+    'compile_profiles',
+    'evaluate_profiles',
     'MACDStrategy',
     'MACDCanonicalStrategy',
     'MACDAggressiveStrategy',
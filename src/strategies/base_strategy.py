@@ -3,10 +3,13 @@ Base Strategy class for the SMART STOCK TRADING SYSTEM.
 All trading strategies should inherit from this base class.
 """
 
+import numpy as np
 import pandas as pd
 from typing import Dict, Any, Tuple, List, Optional
 from abc import ABC, abstractmethod
 from src.utils.logger import logger
+from src.utils.decision_trace import decision_tracer
+from .position_state import PositionState
 
 
 class BaseStrategy(ABC):
@@ -20,6 +23,9 @@ class BaseStrategy(ABC):
         self.entry_price = 0.0
         self.entry_date = None
         
+        # Incremental state of open positions, keyed by (symbol, entry_date, entry_price)
+        self.position_states: Dict[Tuple[Optional[str], str, float], PositionState] = {}
+        
         # Default entry conditions
         self.entry_conditions = {
             'min_volume': 1000000,
@@ -95,6 +101,61 @@ class BaseStrategy(ABC):
         """
         pass
     
+    def get_position_state(self, data: pd.DataFrame, current_index: int, entry_price: float, entry_date: Any) -> PositionState:
+        """
+        Get the running state of a position, advanced to current_index.
+        
+        Consecutive calls for the same position update the state in O(1); the
+        state is rebuilt from the bars since entry when the caller jumps around
+        or passes another frame. Callers release the state when the position
+        closes.
+        
+        Args:
+            data: DataFrame with price and indicator data
+            current_index: Current index in the data
+            entry_price: Price when position was entered
+            entry_date: Date when position was entered
+            
+        Returns:
+            PositionState: State of the position at current_index
+        """
+        key = (self._row_symbol(data, current_index), str(entry_date), float(entry_price))
+        state = self.position_states.get(key)
+        
+        if state is None or not state.advance(data, current_index):
+            state = PositionState.from_history(data, current_index, entry_price, entry_date)
+            self.position_states[key] = state
+        
+        return state
+    
+    def release_position_state(self, entry_price: float, entry_date: Any, symbol: Optional[str] = None) -> None:
+        """Drop the running state of a closed position."""
+        self.position_states.pop((symbol, str(entry_date), float(entry_price)), None)
+    
+    def _trace_exit(self, data: pd.DataFrame, current_index: int, should_exit: bool,
+                    exit_reason: Dict[str, Any]) -> None:
+        """
+        Record an exit evaluation in the decision trace.
+        
+        The scalar fields of exit_reason (P&L, days held, technical flags, ...)
+        are the recorded conditions. Callers check decision_tracer.enabled first.
+        """
+        conditions = {key: value for key, value in exit_reason.items()
+                      if key not in ('summary', 'reason', 'exit_type') and np.isscalar(value)}
+        decision_tracer.record(self.name, 'exit', should_exit, conditions,
+                               symbol=self._row_symbol(data, current_index), index=current_index,
+                               timestamp=data.index[current_index],
+                               exit_type=exit_reason.get('exit_type'),
+                               summary=exit_reason.get('summary', exit_reason.get('reason')))
+    
+    @staticmethod
+    def _row_symbol(data: pd.DataFrame, index: int) -> Optional[str]:
+        """Symbol of a row when the data has a symbol column."""
+        if 'symbol' not in data.columns:
+            return None
+        symbol = data['symbol'].iat[index]
+        return None if pd.isna(symbol) else str(symbol)
+    
     def configure_profile(self, profile_name: str) -> None:
         """
         Configure strategy with a specific risk profile.
@@ -145,25 +206,20 @@ class BaseStrategy(ABC):
             signals['confidence'] = 0.0
             signals['reason'] = ''
             
-            # Generate signals for each data point
-            for i in range(len(signals)):
-                # Check for entry signal
-                should_entry, entry_reason = self.should_entry(signals, i)
-                
-                if should_entry:
-                    signals.iloc[i, signals.columns.get_loc('signal')] = 1
-                    signals.iloc[i, signals.columns.get_loc('strength')] = 0.8
-                    signals.iloc[i, signals.columns.get_loc('confidence')] = 0.7
-                    signals.iloc[i, signals.columns.get_loc('reason')] = entry_reason.get('summary', 'Entry signal')
-                
-                # Check for exit signal (simplified - in real implementation would track positions)
-                should_exit, exit_reason = self.should_exit(signals, i, 0, '')
-                
-                if should_exit:
-                    signals.iloc[i, signals.columns.get_loc('signal')] = -1
-                    signals.iloc[i, signals.columns.get_loc('strength')] = 0.8
-                    signals.iloc[i, signals.columns.get_loc('confidence')] = 0.7
-                    signals.iloc[i, signals.columns.get_loc('reason')] = exit_reason.get('summary', 'Exit signal')
+            # Use the vectorized contract when the strategy provides it
+            entries = self.entry_mask(signals)
+            exits = self.exit_mask(signals, entries) if entries is not None else None
+            
+            if entries is not None and exits is not None:
+                # Exit takes precedence over entry on the same bar, as in the row loop
+                signal = np.where(exits, -1, np.where(entries, 1, 0))
+                active = signal != 0
+                signals['signal'] = signal
+                signals['strength'] = np.where(active, 0.8, 0.0)
+                signals['confidence'] = np.where(active, 0.7, 0.0)
+                signals['reason'] = np.where(exits, 'Exit signal', np.where(entries, 'Entry signal', ''))
+            else:
+                self._generate_signals_iterative(signals)
             
             logger.info(f"Generated signals for {self.name}: {len(signals[signals['signal'] != 0])} signals")
             return signals
@@ -172,6 +228,122 @@ class BaseStrategy(ABC):
             logger.error(f"Error generating signals for {self.name}: {str(e)}")
             return pd.DataFrame()
     
+    def _generate_signals_iterative(self, signals: pd.DataFrame) -> None:
+        """Fill signal columns row by row using should_entry/should_exit."""
+        for i in range(len(signals)):
+            # Check for entry signal
+            should_entry, entry_reason = self.should_entry(signals, i)
+            
+            if should_entry:
+                signals.iloc[i, signals.columns.get_loc('signal')] = 1
+                signals.iloc[i, signals.columns.get_loc('strength')] = 0.8
+                signals.iloc[i, signals.columns.get_loc('confidence')] = 0.7
+                signals.iloc[i, signals.columns.get_loc('reason')] = entry_reason.get('summary', 'Entry signal')
+            
+            # Check for exit signal (simplified - in real implementation would track positions)
+            should_exit, exit_reason = self.should_exit(signals, i, 0, '')
+            
+            if should_exit:
+                signals.iloc[i, signals.columns.get_loc('signal')] = -1
+                signals.iloc[i, signals.columns.get_loc('strength')] = 0.8
+                signals.iloc[i, signals.columns.get_loc('confidence')] = 0.7
+                signals.iloc[i, signals.columns.get_loc('reason')] = exit_reason.get('summary', 'Exit signal')
+                self.release_position_state(0, '', self._row_symbol(signals, i))
+        
+        # The loop's positions end with the data
+        for symbol in {self._row_symbol(signals, i) for i in range(len(signals))}:
+            self.release_position_state(0, '', symbol)
+    
+    def entry_mask(self, data: pd.DataFrame) -> Optional[np.ndarray]:
+        """
+        Vectorized entry conditions over the whole dataset.
+        
+        Strategies that can express should_entry as whole-array operations
+        override this; generate_signals falls back to the row loop otherwise.
+        
+        Args:
+            data: DataFrame with price and indicator data
+            
+        Returns:
+            Optional[np.ndarray]: Boolean array (one value per row) or None if not supported
+        """
+        return None
+    
+    def exit_mask(self, data: pd.DataFrame, entries: np.ndarray) -> Optional[np.ndarray]:
+        """
+        Vectorized exit conditions over the whole dataset.
+        
+        Position-dependent exits (take profit, stop loss, hold time, drawdown)
+        are measured from the most recent entry at or before each row.
+        
+        Args:
+            data: DataFrame with price and indicator data
+            entries: Boolean entry array returned by entry_mask
+            
+        Returns:
+            Optional[np.ndarray]: Boolean array (one value per row) or None if not supported
+        """
+        return None
+    
+    @staticmethod
+    def _column_mask(data: pd.DataFrame, column: str) -> np.ndarray:
+        """Boolean column as an array, False where missing or NaN."""
+        if column not in data.columns:
+            return np.zeros(len(data), dtype=bool)
+        values = data[column].to_numpy()
+        return np.where(pd.isna(values), False, values).astype(bool)
+    
+    @staticmethod
+    def _column_values(data: pd.DataFrame, column: str, default: float = np.nan) -> np.ndarray:
+        """Numeric column as a float array, filled with default where missing."""
+        if column not in data.columns:
+            return np.full(len(data), default, dtype=float)
+        return pd.to_numeric(data[column], errors='coerce').to_numpy(dtype=float)
+    
+    @staticmethod
+    def _since_entry(data: pd.DataFrame, entries: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Position state measured from the most recent entry at or before each row.
+        
+        Args:
+            data: DataFrame with a 'close' column
+            entries: Boolean entry array
+            
+        Returns:
+            Dict with 'in_position', 'entry_price', 'bars_held', 'days_held' and 'peak_price' arrays
+        """
+        n = len(data)
+        entries = np.asarray(entries, dtype=bool)
+        close = data['close'].to_numpy(dtype=float)
+        positions = np.arange(n)
+        
+        # Index of the last entry at or before each row (-1 before the first entry)
+        entry_index = np.maximum.accumulate(np.where(entries, positions, -1))
+        in_position = entry_index >= 0
+        safe_index = np.where(in_position, entry_index, 0)
+        
+        entry_price = np.where(in_position, close[safe_index], np.nan)
+        bars_held = np.where(in_position, positions - safe_index, 0)
+        
+        # Calendar days when the index holds dates, trading bars otherwise
+        if isinstance(data.index, pd.DatetimeIndex):
+            dates = data.index.values
+            days_held = np.where(in_position, (dates - dates[safe_index]) // np.timedelta64(1, 'D'), 0)
+        else:
+            days_held = bars_held
+        
+        # Running peak of close within each position
+        peak_price = pd.Series(close).groupby(np.cumsum(entries)).cummax().to_numpy()
+        peak_price = np.where(in_position, peak_price, np.nan)
+        
+        return {
+            'in_position': in_position,
+            'entry_price': entry_price,
+            'bars_held': bars_held,
+            'days_held': days_held,
+            'peak_price': peak_price
+        }
+    
     def validate_data_requirements(self, data: pd.DataFrame) -> bool:
         """
         Validate that data has all required indicators for this strategy.
@@ -197,6 +369,7 @@ class BaseStrategy(ABC):
         self.current_position = 0
         self.entry_price = 0.0
         self.entry_date = None
+        self.position_states.clear()
         logger.info(f"Reset {self.name} state")
     
     def get_strategy_description(self) -> str:
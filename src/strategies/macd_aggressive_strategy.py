@@ -5,7 +5,10 @@ A high-frequency trading variant of the MACD strategy with more aggressive param
 for faster entry and exit signals.
 """
 
+import numpy as np
+
 from .macd_strategy import MACDStrategy
+from .profile_compiler import compile_profile
 
 
 class MACDAggressiveStrategy(MACDStrategy):
@@ -30,6 +33,7 @@ class MACDAggressiveStrategy(MACDStrategy):
         self.take_profit_pct = 3.0  # Faster profit taking
         self.stop_loss_pct = 2.0    # Tighter stop loss
         self.max_hold_days = 7      # Shorter holding period
+        self.rsi_exit_bounds = [25, 75]  # RSI extremes that force an exit
         
         # More aggressive entry weights
         self.entry_weights = {
@@ -114,11 +118,12 @@ class MACDAggressiveStrategy(MACDStrategy):
         current_price = current['close']
         current_date = data.index[i]
         
-        # Calculate PnL
-        pnl_pct = ((current_price - entry_price) / entry_price) * 100
+        # Running position state: P&L and hold time since entry
+        position = self.get_position_state(data, i, entry_price, entry_date)
+        pnl_pct = position.pnl_pct(current_price)
         
         # Time-based exit (shorter period)
-        days_held = (current_date - entry_date).days
+        days_held = position.days_held(current_date)
         
         # Aggressive exit conditions
         if pnl_pct >= self.take_profit_pct:
@@ -156,7 +161,7 @@ class MACDAggressiveStrategy(MACDStrategy):
         
         # RSI overbought/oversold (wider range)
         rsi = current.get('rsi', 50)
-        if rsi > 75 or rsi < 25:
+        if rsi > self.rsi_exit_bounds[1] or rsi < self.rsi_exit_bounds[0]:
             return {
                 'signal': True,
                 'reason': f'RSI extreme ({rsi:.1f})',
@@ -169,4 +174,57 @@ class MACDAggressiveStrategy(MACDStrategy):
             'reason': f'Holding (PnL: {pnl_pct:.2f}%, Days: {days_held})',
             'pnl_pct': pnl_pct,
             'days_held': days_held
-        } 
\ No newline at end of file
+        }
+    
+    def entry_mask(self, data):
+        """
+        Vectorized should_entry: weighted entry score compiled from the profile weights.
+        
+        Args:
+            data: DataFrame with price and indicator data
+            
+        Returns:
+            np.ndarray: Boolean entry array
+        """
+        profile = compile_profile(self.name, {
+            'entry_weights': self.entry_weights,
+            'entry_threshold': self.entry_threshold,
+            'rsi_range': self.rsi_range
+        })
+        
+        mask = profile.entry_mask(data)
+        mask[:50] = False
+        return mask
+    
+    def exit_mask(self, data, entries):
+        """
+        Vectorized should_exit, with P&L and hold time measured from the last entry.
+        
+        Args:
+            data: DataFrame with price and indicator data
+            entries: Boolean entry array
+            
+        Returns:
+            np.ndarray: Boolean exit array
+        """
+        close = data['close'].to_numpy(dtype=float)
+        rsi = self._column_values(data, 'rsi', 50.0)
+        state = self._since_entry(data, entries)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pnl_pct = (close - state['entry_price']) / state['entry_price'] * 100
+        
+        position_exit = state['in_position'] & (
+            (pnl_pct >= self.take_profit_pct) |
+            (pnl_pct <= -self.stop_loss_pct) |
+            (state['days_held'] >= self.max_hold_days)
+        )
+        
+        mask = (
+            position_exit |
+            self._column_mask(data, 'macd_crossover_down') |
+            (rsi > self.rsi_exit_bounds[1]) |
+            (rsi < self.rsi_exit_bounds[0])
+        )
+        mask[:50] = False
+        return mask
@@ -3,6 +3,7 @@ Canonical MACD Strategy implementation for the SMART STOCK TRADING SYSTEM.
 This is a pure MACD crossover strategy without additional filters.
 """
 
+import numpy as np
 import pandas as pd
 from typing import Dict, Any, Tuple
 from .base_strategy import BaseStrategy
@@ -69,6 +70,20 @@ class MACDCanonicalStrategy(BaseStrategy):
             logger.error(f"Error in MACDCanonicalStrategy.should_exit: {str(e)}")
             return False, {'summary': f'Error: {str(e)}'}
     
+    def entry_mask(self, data: pd.DataFrame) -> np.ndarray:
+        """
+        Vectorized should_entry: MACD line crosses above signal line
+        """
+        mask = self._column_mask(data, 'macd_crossover_up')
+        mask[:1] = False
+        return mask
+    
+    def exit_mask(self, data: pd.DataFrame, entries: np.ndarray) -> np.ndarray:
+        """
+        Vectorized should_exit: MACD line crosses below signal line
+        """
+        return self._column_mask(data, 'macd_crossover_down')
+    
     def get_strategy_description(self) -> str:
         """Get a description of the Canonical MACD strategy."""
         return """
@@ -5,7 +5,10 @@ A long-term trading variant of the MACD strategy with conservative parameters
 for stable, long-term positions with lower risk.
 """
 
+import numpy as np
+
 from .macd_strategy import MACDStrategy
+from .profile_compiler import compile_profile
 
 
 class MACDConservativeStrategy(MACDStrategy):
@@ -30,6 +33,7 @@ class MACDConservativeStrategy(MACDStrategy):
         self.take_profit_pct = 10.0  # Higher profit target
         self.stop_loss_pct = 5.0     # Wider stop loss
         self.max_hold_days = 60      # Longer holding period
+        self.rsi_exit_bounds = [30, 70]  # RSI extremes that force an exit
         
         # Balanced entry weights
         self.entry_weights = {
@@ -114,11 +118,12 @@ class MACDConservativeStrategy(MACDStrategy):
         current_price = current['close']
         current_date = data.index[i]
         
-        # Calculate PnL
-        pnl_pct = ((current_price - entry_price) / entry_price) * 100
+        # Running position state: P&L and hold time since entry
+        position = self.get_position_state(data, i, entry_price, entry_date)
+        pnl_pct = position.pnl_pct(current_price)
         
         # Time-based exit (longer period)
-        days_held = (current_date - entry_date).days
+        days_held = position.days_held(current_date)
         
         # Conservative exit conditions
         if pnl_pct >= self.take_profit_pct:
@@ -156,7 +161,7 @@ class MACDConservativeStrategy(MACDStrategy):
         
         # RSI overbought/oversold (narrower range)
         rsi = current.get('rsi', 50)
-        if rsi > 70 or rsi < 30:
+        if rsi > self.rsi_exit_bounds[1] or rsi < self.rsi_exit_bounds[0]:
             return {
                 'signal': True,
                 'reason': f'RSI extreme ({rsi:.1f})',
@@ -169,4 +174,57 @@ class MACDConservativeStrategy(MACDStrategy):
             'reason': f'Holding (PnL: {pnl_pct:.2f}%, Days: {days_held})',
             'pnl_pct': pnl_pct,
             'days_held': days_held
-        } 
\ No newline at end of file
+        }
+    
+    def entry_mask(self, data):
+        """
+        Vectorized should_entry: weighted entry score compiled from the profile weights.
+        
+        Args:
+            data: DataFrame with price and indicator data
+            
+        Returns:
+            np.ndarray: Boolean entry array
+        """
+        profile = compile_profile(self.name, {
+            'entry_weights': self.entry_weights,
+            'entry_threshold': self.entry_threshold,
+            'rsi_range': self.rsi_range
+        })
+        
+        mask = profile.entry_mask(data)
+        mask[:50] = False
+        return mask
+    
+    def exit_mask(self, data, entries):
+        """
+        Vectorized should_exit, with P&L and hold time measured from the last entry.
+        
+        Args:
+            data: DataFrame with price and indicator data
+            entries: Boolean entry array
+            
+        Returns:
+            np.ndarray: Boolean exit array
+        """
+        close = data['close'].to_numpy(dtype=float)
+        rsi = self._column_values(data, 'rsi', 50.0)
+        state = self._since_entry(data, entries)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pnl_pct = (close - state['entry_price']) / state['entry_price'] * 100
+        
+        position_exit = state['in_position'] & (
+            (pnl_pct >= self.take_profit_pct) |
+            (pnl_pct <= -self.stop_loss_pct) |
+            (state['days_held'] >= self.max_hold_days)
+        )
+        
+        mask = (
+            position_exit |
+            self._column_mask(data, 'macd_crossover_down') |
+            (rsi > self.rsi_exit_bounds[1]) |
+            (rsi < self.rsi_exit_bounds[0])
+        )
+        mask[:50] = False
+        return mask
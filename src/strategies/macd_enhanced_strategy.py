@@ -14,6 +14,7 @@ from typing import Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
 from src.strategies.base_strategy import BaseStrategy
 from src.utils.logger import get_logger
+from src.utils.decision_trace import decision_tracer
 
 
 class MACDEnhancedStrategy(BaseStrategy):
@@ -140,21 +141,22 @@ class MACDEnhancedStrategy(BaseStrategy):
                        volatility_adequate and
                        price_above_bb_middle)
         
-        # Detailed logging for debugging
-        self.logger.info(f"Enhanced MACD Strategy Entry Check:")
-        self.logger.info(f"  macd_crossover_up: {macd_crossover_up}")
-        self.logger.info(f"  price_above_ema_short: {price_above_ema_short}")
-        self.logger.info(f"  price_above_ema_long: {price_above_ema_long}")
-        self.logger.info(f"  ema_bullish: {ema_bullish}")
-        self.logger.info(f"  rsi_neutral: {rsi_neutral}")
-        self.logger.info(f"  volume_above_ma: {volume_above_ma}")
-        self.logger.info(f"  strong_trend: {strong_trend} (ADX: {adx_value:.1f})")
-        self.logger.info(f"  normal_volatility: {normal_volatility} (ATR: {atr_percent:.1f}%)")
-        self.logger.info(f"  volume_adequate: {volume_adequate} (Avg: {avg_volume:,.0f})")
-        self.logger.info(f"  volatility_adequate: {volatility_adequate}")
-        self.logger.info(f"  price_above_bb_middle: {price_above_bb_middle}")
-        self.logger.info(f"  conditions_met: {conditions_met}/8")
-        self.logger.info(f"  should_enter: {should_enter}")
+        # Decision trace (no-op unless tracing is enabled)
+        if decision_tracer.enabled:
+            decision_tracer.record(self.name, 'entry', should_enter, {
+                'macd_crossover_up': bool(macd_crossover_up),
+                'price_above_ema_short': bool(price_above_ema_short),
+                'price_above_ema_long': bool(price_above_ema_long),
+                'ema_bullish': bool(ema_bullish),
+                'rsi_neutral': bool(rsi_neutral),
+                'volume_above_ma': bool(volume_above_ma),
+                'strong_trend': strong_trend,
+                'normal_volatility': normal_volatility,
+                'volume_adequate': bool(volume_adequate),
+                'volatility_adequate': bool(volatility_adequate),
+                'price_above_bb_middle': bool(price_above_bb_middle)
+            }, symbol=current_data.get('symbol'), index=current_index,
+               timestamp=data.index[current_index], conditions_met=conditions_met, threshold=6)
         
         entry_reason = {
             'entry_reason': f'Enhanced MACD Strategy - {conditions_met}/8 conditions met (STRICT ENTRY)',
@@ -193,22 +195,27 @@ class MACDEnhancedStrategy(BaseStrategy):
         Returns:
             Tuple of (should_exit, exit_reason)
         """
+        should_exit, exit_reason = self._evaluate_exit(data, current_index, entry_price, entry_date)
+        
+        # Decision trace (no-op unless tracing is enabled)
+        if decision_tracer.enabled:
+            self._trace_exit(data, current_index, should_exit, exit_reason)
+        
+        return should_exit, exit_reason
+    
+    def _evaluate_exit(self, data: pd.DataFrame, current_index: int,
+                       entry_price: float, entry_date: str) -> Tuple[bool, Dict[str, Any]]:
+        """Exit decision and reason for should_exit."""
         if current_index < 50:
             return False, {'reason': 'Insufficient data'}
         
         current_data = data.iloc[current_index]
         current_price = current_data['close']
         
-        # Calculate P&L
-        pnl_pct = ((current_price - entry_price) / entry_price) * 100
-        
-        # Calculate days held
-        try:
-            entry_dt = datetime.strptime(entry_date, '%Y-%m-%d')
-            current_dt = datetime.strptime(str(current_data.name), '%Y-%m-%d')
-            days_held = (current_dt - entry_dt).days
-        except:
-            days_held = 0
+        # Running position state: P&L, hold time and peak since entry
+        position = self.get_position_state(data, current_index, entry_price, entry_date)
+        pnl_pct = position.pnl_pct(current_price)
+        days_held = position.days_held(data.index[current_index])
         
         # Get exit thresholds
         take_profit_pct = self.exit_conditions.get('take_profit_pct', 7.0)
@@ -304,23 +311,20 @@ class MACDEnhancedStrategy(BaseStrategy):
             }
         
         # 7. Trailing Stop Loss (if in profit)
-        if pnl_pct > 0:
+        if pnl_pct > 0 and position.bars_held > 0:
             # Calculate trailing stop based on highest price since entry
-            entry_index = data.index.get_loc(entry_date) if entry_date in data.index else current_index - days_held
-            if entry_index < current_index:
-                price_since_entry = data.iloc[entry_index:current_index + 1]['close']
-                highest_price = price_since_entry.max()
-                trailing_stop_price = highest_price * (1 - trailing_stop_pct / 100)
-                
-                if current_price <= trailing_stop_price:
-                    return True, {
-                        'summary': f'Trailing stop triggered (from ${highest_price:.2f} to ${current_price:.2f})',
-                        'exit_type': 'trailing_stop',
-                        'pnl_pct': pnl_pct,
-                        'days_held': days_held,
-                        'highest_price': highest_price,
-                        'trailing_stop_price': trailing_stop_price
-                    }
+            highest_price = position.peak_price
+            trailing_stop_price = highest_price * (1 - trailing_stop_pct / 100)
+            
+            if current_price <= trailing_stop_price:
+                return True, {
+                    'summary': f'Trailing stop triggered (from ${highest_price:.2f} to ${current_price:.2f})',
+                    'exit_type': 'trailing_stop',
+                    'pnl_pct': pnl_pct,
+                    'days_held': days_held,
+                    'highest_price': highest_price,
+                    'trailing_stop_price': trailing_stop_price
+                }
         
         return False, {
             'summary': f'Holding position (P&L: {pnl_pct:.2f}%, Days: {days_held})',
@@ -329,6 +333,91 @@ class MACDEnhancedStrategy(BaseStrategy):
             'days_held': days_held
         }
     
+    def entry_mask(self, data: pd.DataFrame) -> np.ndarray:
+        """
+        Vectorized entry signal matching should_entry.
+        
+        Args:
+            data: DataFrame with calculated indicators
+            
+        Returns:
+            Boolean entry array
+        """
+        # ADX and ATR filters are disabled in should_entry and always pass
+        strong_trend = True
+        normal_volatility = True
+        atr_percent = 2.0
+        
+        conditions_met = sum(
+            self._column_mask(data, column).astype(int)
+            for column in ('macd_crossover_up', 'price_above_ema_short', 'price_above_ema_long',
+                           'ema_bullish', 'rsi_neutral', 'volume_above_ma')
+        ) + int(strong_trend) + int(normal_volatility)
+        
+        avg_volume = data['volume'].rolling(window=20).mean().to_numpy()
+        volume_adequate = avg_volume >= self.volume_filters['min_volume']
+        volatility_adequate = (self.volume_filters['min_atr_percent'] <= atr_percent <= self.volume_filters['max_atr_percent'])
+        price_above_bb_middle = self._column_values(data, 'close', 0.0) > self._column_values(data, 'bb_middle', 0.0)
+        
+        mask = (conditions_met >= 6) & volume_adequate & volatility_adequate & price_above_bb_middle
+        mask[:50] = False
+        return mask
+    
+    def exit_mask(self, data: pd.DataFrame, entries: np.ndarray) -> np.ndarray:
+        """
+        Vectorized exit strategy, with P&L, hold time and trailing stop measured from the last entry.
+        
+        Args:
+            data: DataFrame with calculated indicators
+            entries: Boolean entry array
+            
+        Returns:
+            Boolean exit array
+        """
+        take_profit_pct = self.exit_conditions.get('take_profit_pct', 7.0)
+        stop_loss_pct = self.exit_conditions.get('stop_loss_pct', 3.0)
+        trailing_stop_pct = self.exit_conditions.get('trailing_stop_pct', 2.0)
+        max_hold_days = self.exit_conditions.get('max_hold_days', 45)
+        min_hold_days = self.exit_conditions.get('min_hold_days', 5)
+        rsi_exit_overbought = self.exit_conditions.get('rsi_exit_overbought', 75)
+        rsi_exit_oversold = self.exit_conditions.get('rsi_exit_oversold', 25)
+        
+        close = data['close'].to_numpy(dtype=float)
+        state = self._since_entry(data, entries)
+        in_position = state['in_position']
+        days_held = state['days_held']
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pnl_pct = (close - state['entry_price']) / state['entry_price'] * 100
+        
+        # Hard exits fire regardless of the minimum hold period
+        hard_exit = in_position & (
+            (pnl_pct >= take_profit_pct) |
+            (pnl_pct <= -stop_loss_pct) |
+            (days_held >= max_hold_days)
+        )
+        
+        technical_exit_conditions = sum(
+            self._column_mask(data, column).astype(int)
+            for column in ('macd_crossover_down', 'price_below_ema_short', 'price_below_ema_long',
+                           'ema_bearish', 'rsi_overbought', 'volume_below_ma')
+        )
+        rsi_value = self._column_values(data, 'rsi', 50.0)
+        trailing_stop = (pnl_pct > 0) & (state['bars_held'] > 0) & (
+            close <= state['peak_price'] * (1 - trailing_stop_pct / 100)
+        )
+        
+        soft_exit = (
+            (technical_exit_conditions >= 2) |
+            (rsi_value >= rsi_exit_overbought) |
+            (rsi_value <= rsi_exit_oversold) |
+            (in_position & trailing_stop)
+        ) & ~(in_position & (days_held < min_hold_days))
+        
+        mask = hard_exit | soft_exit
+        mask[:50] = False
+        return mask
+    
     def get_position_size(self, portfolio_value: float, current_price: float, 
                          risk_per_trade: float = 0.02) -> int:
         """
@@ -8,10 +8,12 @@ Now supports multiple profiles:
 - conservative: Conservative MACD Strategy for long-term positions
 """
 
+import numpy as np
 import pandas as pd
 from typing import Dict, Any, Tuple, List
 from .base_strategy import BaseStrategy
 from src.utils.logger import logger
+from src.utils.decision_trace import decision_tracer
 
 
 class MACDStrategy(BaseStrategy):
@@ -197,27 +199,25 @@ class MACDStrategy(BaseStrategy):
             conditions_met = sum(entry_conditions)
             should_enter = conditions_met >= 5
             
-            # Debug logging
-            logger.info(f"MACD Strategy Entry Check:")
-            logger.info(f"  macd_crossover_up: {macd_crossover_up}")
-            logger.info(f"  price_above_ema_short: {price_above_ema_short}")
-            logger.info(f"  price_above_ema_long: {price_above_ema_long}")
-            logger.info(f"  ema_bullish: {ema_bullish}")
-            logger.info(f"  rsi_neutral: {rsi_neutral}")
-            logger.info(f"  volume_above_ma: {volume_above_ma}")
-            logger.info(f"  conditions_met: {conditions_met}/6")
-            logger.info(f"  should_enter: {should_enter}")
+            conditions = {
+                'macd_crossover_up': macd_crossover_up,
+                'price_above_ema_short': price_above_ema_short,
+                'price_above_ema_long': price_above_ema_long,
+                'ema_bullish': ema_bullish,
+                'rsi_neutral': rsi_neutral,
+                'volume_above_ma': volume_above_ma
+            }
+            
+            # Decision trace (no-op unless tracing is enabled)
+            if decision_tracer.enabled:
+                decision_tracer.record(self.name, 'entry', should_enter, conditions,
+                                       symbol=current_row.get('symbol'), index=current_index,
+                                       timestamp=data.index[current_index],
+                                       conditions_met=conditions_met, threshold=5)
             
             entry_reason = {
                 'entry_reason': f'MACD Strategy - {conditions_met}/6 conditions met (STRICT ENTRY)',
-                'conditions': {
-                    'macd_crossover_up': macd_crossover_up,
-                    'price_above_ema_short': price_above_ema_short,
-                    'price_above_ema_long': price_above_ema_long,
-                    'ema_bullish': ema_bullish,
-                    'rsi_neutral': rsi_neutral,
-                    'volume_above_ma': volume_above_ma
-                },
+                'conditions': conditions,
                 'conditions_met': conditions_met,
                 'threshold': 5
             }
@@ -232,6 +232,16 @@ class MACDStrategy(BaseStrategy):
         """
         Exit signal: Check for exit conditions with P&L tracking
         """
+        should_exit, exit_reason = self._evaluate_exit(data, current_index, entry_price, entry_date)
+        
+        # Decision trace (no-op unless tracing is enabled)
+        if decision_tracer.enabled:
+            self._trace_exit(data, current_index, should_exit, exit_reason)
+        
+        return should_exit, exit_reason
+    
+    def _evaluate_exit(self, data: pd.DataFrame, current_index: int, entry_price: float, entry_date: str) -> Tuple[bool, Dict[str, Any]]:
+        """Exit decision and reason for should_exit."""
         if current_index < 1:
             return False, {'summary': 'Insufficient data'}
         
@@ -239,32 +249,10 @@ class MACDStrategy(BaseStrategy):
             current_row = data.iloc[current_index]
             current_price = current_row.get('close', 0)
             
-            # Calculate P&L
-            pnl_pct = ((current_price - entry_price) / entry_price) * 100 if entry_price > 0 else 0
-            
-            # Calculate days held
-            try:
-                from datetime import datetime
-                entry_dt = datetime.strptime(entry_date, '%Y-%m-%d')
-                
-                # Handle different index types (string, datetime, etc.)
-                current_date = data.index[current_index]
-                
-                if isinstance(current_date, str):
-                    current_dt = datetime.strptime(current_date, '%Y-%m-%d')
-                elif hasattr(current_date, 'strftime'):
-                    # It's already a datetime object
-                    current_dt = current_date
-                else:
-                    # Try to convert to string first
-                    current_dt = datetime.strptime(str(current_date), '%Y-%m-%d')
-                
-                days_held = (current_dt - entry_dt).days
-            except Exception as e:
-                # Log the error for debugging
-                print(f"Error calculating days_held: {e}")
-                print(f"entry_date: {entry_date}, current_date: {data.index[current_index]}")
-                days_held = 0
+            # Running position state: P&L, hold time and peak since entry
+            position = self.get_position_state(data, current_index, entry_price, entry_date)
+            pnl_pct = position.pnl_pct(current_price)
+            days_held = position.days_held(data.index[current_index])
             
             # Get exit thresholds - tight stop-loss, moderate take-profit
             take_profit_pct = self.exit_conditions.get('take_profit_pct', 7.0)   # Moderate profit-taking
@@ -299,21 +287,16 @@ class MACDStrategy(BaseStrategy):
                     'days_held': days_held
                 }
             
-            # Check drawdown from peak (if we have enough data)
-            if current_index > 0:
-                # Find the highest price since entry
-                prices_since_entry = data.iloc[:current_index + 1]['close']
-                highest_price = prices_since_entry.max()
-                drawdown_from_peak = ((current_price - highest_price) / highest_price) * 100
-                
-                if drawdown_from_peak <= -max_drawdown_pct:
-                    return True, {
-                        'summary': f'Max drawdown exceeded ({drawdown_from_peak:.2f}%)',
-                        'exit_type': 'drawdown',
-                        'pnl_pct': pnl_pct,
-                        'drawdown_from_peak': drawdown_from_peak,
-                        'days_held': days_held
-                    }
+            # Check drawdown from the highest close since entry
+            drawdown_from_peak = position.drawdown_pct(current_price)
+            if drawdown_from_peak <= -max_drawdown_pct:
+                return True, {
+                    'summary': f'Max drawdown exceeded ({drawdown_from_peak:.2f}%)',
+                    'exit_type': 'drawdown',
+                    'pnl_pct': pnl_pct,
+                    'drawdown_from_peak': drawdown_from_peak,
+                    'days_held': days_held
+                }
             
             # Technical exit conditions
             macd_crossover_down = bool(current_row.get('macd_crossover_down', False))
@@ -360,11 +343,59 @@ class MACDStrategy(BaseStrategy):
             logger.error(f"Error in should_exit: {str(e)}")
             return False, {'summary': f'Error: {str(e)}'}
     
+    def entry_mask(self, data: pd.DataFrame) -> np.ndarray:
+        """
+        Vectorized should_entry: at least 5 of the 6 entry conditions.
+        """
+        conditions_met = sum(
+            self._column_mask(data, column).astype(int)
+            for column in ('macd_crossover_up', 'price_above_ema_short', 'price_above_ema_long',
+                           'ema_bullish', 'rsi_neutral', 'volume_above_ma')
+        )
+        mask = conditions_met >= 5
+        mask[:1] = False
+        return mask
+    
+    def exit_mask(self, data: pd.DataFrame, entries: np.ndarray) -> np.ndarray:
+        """
+        Vectorized should_exit, with P&L, hold time and drawdown measured from the last entry.
+        """
+        take_profit_pct = self.exit_conditions.get('take_profit_pct', 7.0)
+        stop_loss_pct = self.exit_conditions.get('stop_loss_pct', 3.0)
+        max_hold_days = self.exit_conditions.get('max_hold_days', 45)
+        max_drawdown_pct = self.exit_conditions.get('max_drawdown_pct', 6.0)
+        
+        close = data['close'].to_numpy(dtype=float)
+        state = self._since_entry(data, entries)
+        in_position = state['in_position']
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pnl_pct = (close - state['entry_price']) / state['entry_price'] * 100
+            drawdown_from_peak = (close - state['peak_price']) / state['peak_price'] * 100
+        
+        position_exit = in_position & (
+            (pnl_pct >= take_profit_pct) |
+            (pnl_pct <= -stop_loss_pct) |
+            (state['days_held'] >= max_hold_days) |
+            (drawdown_from_peak <= -max_drawdown_pct)
+        )
+        
+        technical_exit_conditions = sum(
+            self._column_mask(data, column).astype(int)
+            for column in ('macd_crossover_down', 'price_below_ema_short', 'price_below_ema_long',
+                           'ema_bearish', 'rsi_overbought', 'volume_below_ma')
+        )
+        
+        mask = position_exit | (technical_exit_conditions >= 2)
+        mask[:1] = False
+        return mask
+    
     def reset(self):
         """Reset the strategy state."""
         self.current_position = 0
         self.entry_price = 0.0
         self.entry_date = None
+        self.position_states.clear()
         logger.info(f"Reset {self.name} state")
     
     def get_strategy_description(self) -> str:
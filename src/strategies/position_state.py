@@ -0,0 +1,137 @@
+"""
+Per-position state for incremental exit evaluation in the SMART STOCK TRADING SYSTEM.
+
+A PositionState is created when a position is first evaluated and then advanced
+one bar at a time, so take-profit, stop-loss, max-hold and drawdown checks cost
+O(1) per bar instead of re-parsing dates and rescanning price history.
+"""
+
+import weakref
+import pandas as pd
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Optional
+
+
+def to_datetime(value: Any) -> Optional[datetime]:
+    """Convert an index value or date string to a datetime, or None if not a date."""
+    if isinstance(value, datetime):
+        return value
+    if hasattr(value, 'to_pydatetime'):
+        return value.to_pydatetime()
+    if isinstance(value, str) and value:
+        try:
+            return datetime.strptime(value[:10], '%Y-%m-%d')
+        except ValueError:
+            return None
+    return None
+
+
+@dataclass
+class PositionState:
+    """Running state of one open position."""
+    entry_index: int
+    entry_price: float
+    entry_date: Optional[datetime]
+    peak_price: float
+    last_index: int
+    bars_held: int = 0
+    frame: Optional[weakref.ref] = field(default=None, compare=False, repr=False)  # Data the state was built from
+
+    @classmethod
+    def from_history(cls, data: pd.DataFrame, current_index: int, entry_price: float, entry_date: Any) -> 'PositionState':
+        """
+        Build the state for a position from the bars between entry and current_index.
+
+        Args:
+            data: DataFrame with a 'close' column
+            current_index: Current index in the data
+            entry_price: Price when position was entered
+            entry_date: Date when position was entered
+
+        Returns:
+            PositionState: State advanced to current_index
+        """
+        entry_dt = to_datetime(entry_date)
+        entry_index = cls._locate_entry(data, current_index, entry_dt)
+
+        closes = data['close'].iloc[entry_index:current_index + 1]
+        peak_price = float(closes.max()) if len(closes) else float(entry_price)
+
+        return cls(
+            entry_index=entry_index,
+            entry_price=float(entry_price),
+            entry_date=entry_dt,
+            peak_price=peak_price,
+            last_index=current_index,
+            bars_held=current_index - entry_index,
+            frame=weakref.ref(data)
+        )
+
+    @staticmethod
+    def _locate_entry(data: pd.DataFrame, current_index: int, entry_dt: Optional[datetime]) -> int:
+        """Index of the first bar on or after the entry date, capped at current_index."""
+        if entry_dt is None:
+            return current_index
+
+        try:
+            index = data.index
+            if isinstance(index, pd.DatetimeIndex):
+                timestamp = pd.Timestamp(entry_dt)
+                if index.tz is not None and timestamp.tz is None:
+                    timestamp = timestamp.tz_localize(index.tz)
+                position = int(index[:current_index + 1].searchsorted(timestamp))
+            else:
+                dates = [to_datetime(value) for value in index[:current_index + 1]]
+                position = next((i for i, dt in enumerate(dates) if dt is not None and dt >= entry_dt), current_index)
+        except (TypeError, ValueError):
+            return current_index
+
+        return min(position, current_index)
+
+    def advance(self, data: pd.DataFrame, current_index: int) -> bool:
+        """
+        Advance the state to current_index.
+
+        Args:
+            data: DataFrame with a 'close' column
+            current_index: Current index in the data
+
+        Returns:
+            bool: False if data is not the frame the state was built from, or
+            current_index is not the same or next bar, and the state must be rebuilt
+        """
+        if self.frame is None or self.frame() is not data:
+            return False
+        if current_index == self.last_index:
+            return True
+        if current_index != self.last_index + 1:
+            return False
+
+        price = float(data['close'].iat[current_index])
+        if price > self.peak_price:
+            self.peak_price = price
+        self.last_index = current_index
+        self.bars_held = current_index - self.entry_index
+        return True
+
+    def pnl_pct(self, current_price: float) -> float:
+        """Unrealized P&L in percent of the entry price."""
+        if self.entry_price <= 0:
+            return 0.0
+        return (current_price - self.entry_price) / self.entry_price * 100
+
+    def drawdown_pct(self, current_price: float) -> float:
+        """Drawdown from the highest close since entry, in percent (zero or negative)."""
+        if self.peak_price <= 0:
+            return 0.0
+        return (current_price - self.peak_price) / self.peak_price * 100
+
+    def days_held(self, current_date: Any) -> int:
+        """Calendar days since entry when dates are known, bars held otherwise."""
+        current_dt = to_datetime(current_date)
+        if self.entry_date is None or current_dt is None:
+            return self.bars_held
+        if (current_dt.tzinfo is None) != (self.entry_date.tzinfo is None):
+            current_dt = current_dt.replace(tzinfo=self.entry_date.tzinfo)
+        return (current_dt - self.entry_date).days
@@ -0,0 +1,190 @@
+"""
+Strategy profile compiler for the SMART STOCK TRADING SYSTEM.
+
+Turns a MACD profile from config/settings.yaml (entry_weights, entry_threshold,
+rsi_range and exit thresholds) into a weighted condition matrix so entry scores
+for a whole history - and for several profiles at once - are a single
+matrix product:
+
+    scores = conditions @ weights          # (bars x profiles)
+    entries = scores >= thresholds
+
+Each weight key names a boolean indicator column (macd_crossover_up,
+price_above_ema_short, volume_above_ma, ...). The one exception is
+'rsi_neutral', which is evaluated against the profile's own rsi_range from the
+'rsi' column. A new profile - or a new weighted condition backed by an
+existing indicator column - therefore needs no new code.
+"""
+
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Tuple
+
+from src.utils.config_loader import config
+
+# Condition evaluated against the profile's rsi_range instead of a boolean column
+RSI_CONDITION = 'rsi_neutral'
+
+# Tolerance for scores that equal the threshold up to float rounding
+SCORE_TOLERANCE = 1e-9
+
+
+@dataclass
+class CompiledProfile:
+    """A strategy profile compiled to a weight vector over named conditions."""
+    name: str
+    conditions: List[str]
+    weights: np.ndarray
+    threshold: float
+    rsi_range: Tuple[float, float] = (40.0, 60.0)
+    exit_conditions: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def condition_keys(self) -> List[Tuple[str, Optional[Tuple[float, float]]]]:
+        """Conditions keyed with their parameters (the RSI range for rsi_neutral)."""
+        return [_condition_key(condition, self.rsi_range) for condition in self.conditions]
+
+    def score(self, data: pd.DataFrame) -> np.ndarray:
+        """
+        Weighted entry score for every row.
+
+        Args:
+            data: DataFrame with indicator columns
+
+        Returns:
+            np.ndarray: Score per row
+        """
+        return condition_matrix(data, self.condition_keys) @ self.weights
+
+    def entry_mask(self, data: pd.DataFrame) -> np.ndarray:
+        """
+        Entry signal for every row: score at or above the threshold.
+
+        Args:
+            data: DataFrame with indicator columns
+
+        Returns:
+            np.ndarray: Boolean entry array
+        """
+        return self.score(data) >= self.threshold - SCORE_TOLERANCE
+
+
+def _condition_key(condition: str, rsi_range: Tuple[float, float]) -> Tuple[str, Optional[Tuple[float, float]]]:
+    """Key a condition by name, plus the RSI range for rsi_neutral."""
+    return (condition, tuple(rsi_range) if condition == RSI_CONDITION else None)
+
+
+def compile_profile(name: str, profile_config: Dict[str, Any]) -> CompiledProfile:
+    """
+    Compile one profile configuration.
+
+    Args:
+        name: Profile name
+        profile_config: Profile section from settings.yaml
+
+    Returns:
+        CompiledProfile: Compiled profile
+    """
+    entry_weights = profile_config.get('entry_weights', {})
+    rsi_range = profile_config.get('rsi_range', [40, 60])
+
+    exit_conditions = {
+        key: profile_config[key]
+        for key in ('take_profit_pct', 'stop_loss_pct', 'max_hold_days', 'max_drawdown_pct')
+        if key in profile_config
+    }
+
+    return CompiledProfile(
+        name=name,
+        conditions=list(entry_weights.keys()),
+        weights=np.array([float(weight) for weight in entry_weights.values()], dtype=float),
+        threshold=float(profile_config.get('entry_threshold', 1.0)),
+        rsi_range=(float(rsi_range[0]), float(rsi_range[1])),
+        exit_conditions=exit_conditions
+    )
+
+
+def compile_profiles(profiles_config: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, CompiledProfile]:
+    """
+    Compile every profile of a strategy.
+
+    Args:
+        profiles_config: Mapping of profile name to configuration.
+            Defaults to strategies.MACD.profiles from settings.yaml.
+
+    Returns:
+        Dict[str, CompiledProfile]: Compiled profiles by name
+    """
+    if profiles_config is None:
+        profiles_config = config.get('strategies.MACD.profiles', {})
+
+    return {name: compile_profile(name, profile_config) for name, profile_config in profiles_config.items()}
+
+
+def condition_matrix(data: pd.DataFrame, condition_keys: List[Tuple[str, Optional[Tuple[float, float]]]]) -> np.ndarray:
+    """
+    Evaluate conditions over all rows.
+
+    Missing boolean columns evaluate to False; a missing 'rsi' column evaluates
+    as RSI 50, matching the row-by-row strategies.
+
+    Args:
+        data: DataFrame with indicator columns
+        condition_keys: (condition, rsi_range) keys
+
+    Returns:
+        np.ndarray: (rows x conditions) float matrix of 0/1
+    """
+    matrix = np.zeros((len(data), len(condition_keys)), dtype=float)
+
+    rsi = None
+    for j, (condition, rsi_range) in enumerate(condition_keys):
+        if condition == RSI_CONDITION:
+            if rsi is None:
+                rsi = (pd.to_numeric(data['rsi'], errors='coerce').to_numpy(dtype=float)
+                       if 'rsi' in data.columns else np.full(len(data), 50.0))
+            matrix[:, j] = (rsi >= rsi_range[0]) & (rsi <= rsi_range[1])
+        elif condition in data.columns:
+            values = data[condition].to_numpy()
+            matrix[:, j] = np.where(pd.isna(values), False, values).astype(bool)
+
+    return matrix
+
+
+def evaluate_profiles(data: pd.DataFrame, profiles: Dict[str, CompiledProfile]) -> Dict[str, pd.DataFrame]:
+    """
+    Score several profiles over a whole history in one pass.
+
+    The union of all profiles' conditions is evaluated once and multiplied by a
+    (conditions x profiles) weight matrix.
+
+    Args:
+        data: DataFrame with indicator columns
+        profiles: Compiled profiles by name
+
+    Returns:
+        Dict with 'scores' and 'entries' DataFrames (one column per profile, indexed like data)
+    """
+    names = list(profiles.keys())
+
+    keys: List[Tuple[str, Optional[Tuple[float, float]]]] = []
+    for profile in profiles.values():
+        for key in profile.condition_keys:
+            if key not in keys:
+                keys.append(key)
+
+    weights = np.zeros((len(keys), len(names)), dtype=float)
+    for p, name in enumerate(names):
+        for key, weight in zip(profiles[name].condition_keys, profiles[name].weights):
+            weights[keys.index(key), p] = weight
+
+    thresholds = np.array([profiles[name].threshold for name in names], dtype=float)
+
+    scores = condition_matrix(data, keys) @ weights
+    entries = scores >= thresholds - SCORE_TOLERANCE
+
+    return {
+        'scores': pd.DataFrame(scores, index=data.index, columns=names),
+        'entries': pd.DataFrame(entries, index=data.index, columns=names)
+    }
@@ -0,0 +1,166 @@
+"""
+Decision tracing for the SMART STOCK TRADING SYSTEM.
+
+Strategies and backtest engines record the condition vector behind each
+entry/exit evaluation here instead of logging it line by line. Recording is
+off by default; hot paths check `decision_tracer.enabled` before building a
+record, so a disabled tracer costs one attribute lookup per evaluation.
+"""
+
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+import pandas as pd
+
+from src.utils.config_loader import config
+
+
+class DecisionTracer:
+    """In-memory ring buffer of strategy and engine decisions."""
+
+    def __init__(self, enabled: bool = False, capacity: int = 10000):
+        self.enabled = enabled
+        self.capacity = capacity
+        self._buffer = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._total_recorded = 0
+
+    def configure(self, enabled: Optional[bool] = None, capacity: Optional[int] = None) -> None:
+        """
+        Enable/disable tracing and resize the buffer.
+
+        Args:
+            enabled: Whether decisions are recorded
+            capacity: Maximum number of records kept (oldest are dropped first)
+        """
+        with self._lock:
+            if capacity is not None and capacity != self.capacity:
+                self.capacity = int(capacity)
+                self._buffer = deque(self._buffer, maxlen=self.capacity)
+            if enabled is not None:
+                self.enabled = bool(enabled)
+
+    def record(self, source: str, event: str, decision: bool, conditions: Dict[str, Any],
+               symbol: Optional[str] = None, index: Optional[int] = None,
+               timestamp: Any = None, **details) -> None:
+        """
+        Record one decision. Callers should check `enabled` first.
+
+        Args:
+            source: Strategy or engine name
+            event: Kind of evaluation ('entry', 'exit', 'trade', ...)
+            decision: Outcome of the evaluation
+            conditions: Condition name -> value used for the decision
+            symbol: Symbol being evaluated, if known
+            index: Bar index in the evaluated data
+            timestamp: Bar timestamp in the evaluated data
+            **details: Additional scalar fields (threshold, price, pnl, ...)
+        """
+        if not self.enabled:
+            return
+
+        entry = {
+            'source': source,
+            'event': event,
+            'symbol': symbol,
+            'index': index,
+            'timestamp': timestamp,
+            'decision': bool(decision),
+            'conditions': conditions,
+            'recorded_at': datetime.now()
+        }
+        entry.update(details)
+
+        with self._lock:
+            self._buffer.append(entry)
+            self._total_recorded += 1
+
+    def get_records(self, limit: Optional[int] = None, source: Optional[str] = None,
+                    symbol: Optional[str] = None, event: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Get recorded decisions, newest last.
+
+        Args:
+            limit: Return at most this many of the most recent matching records
+            source: Filter by strategy or engine name
+            symbol: Filter by symbol
+            event: Filter by event kind
+
+        Returns:
+            List of decision records
+        """
+        with self._lock:
+            records = list(self._buffer)
+
+        if source:
+            records = [r for r in records if r['source'] == source]
+        if symbol:
+            records = [r for r in records if r['symbol'] == symbol]
+        if event:
+            records = [r for r in records if r['event'] == event]
+        if limit:
+            records = records[-limit:]
+
+        return records
+
+    def to_dataframe(self, **filters) -> pd.DataFrame:
+        """
+        Get recorded decisions as a columnar DataFrame, one column per condition.
+
+        Args:
+            **filters: Same filters as get_records
+
+        Returns:
+            DataFrame of decisions
+        """
+        records = self.get_records(**filters)
+        if not records:
+            return pd.DataFrame()
+
+        rows = []
+        for record in records:
+            row = {key: value for key, value in record.items() if key != 'conditions'}
+            row.update(record['conditions'])
+            rows.append(row)
+
+        return pd.DataFrame(rows)
+
+    def export(self, file_path: str, **filters) -> int:
+        """
+        Write recorded decisions to a CSV file.
+
+        Args:
+            file_path: Destination file
+            **filters: Same filters as get_records
+
+        Returns:
+            int: Number of records written
+        """
+        df = self.to_dataframe(**filters)
+        df.to_csv(file_path, index=False)
+        return len(df)
+
+    def clear(self) -> None:
+        """Drop all recorded decisions."""
+        with self._lock:
+            self._buffer.clear()
+            self._total_recorded = 0
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get tracer status."""
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'capacity': self.capacity,
+                'buffered': len(self._buffer),
+                'total_recorded': self._total_recorded
+            }
+
+
+# Global decision tracer instance
+decision_tracer = DecisionTracer(
+    enabled=config.get('logging.decision_trace.enabled', False),
+    capacity=config.get('logging.decision_trace.capacity', 10000)
+)
@@ -8,6 +8,7 @@ Completely separate from existing portfolio functionality.
 from flask import Blueprint, request, jsonify
 import logging
 import json
+import threading
 from datetime import datetime
 from typing import Dict, Any, Optional
 
@@ -41,9 +42,11 @@ logger = logging.getLogger(__name__)
 def get_status():
     """Get current backtesting engine status."""
     try:
+        progress = backtesting_engine.get_progress()
         status = {
             'success': True,
-            'engine_status': 'ready',
+            'engine_status': 'running' if progress['state'] == 'running' else 'ready',
+            'progress': progress,
             'parameters': {
                 'available_cash': backtesting_engine.parameters.available_cash,
                 'transaction_limit_pct': backtesting_engine.parameters.transaction_limit_pct,
@@ -221,8 +224,36 @@ def run_backtest():
                 'error': f'No historical data found for collection {collection_id}'
             }), 404
         
+        # Execution mode
+        parallel = bool(data.get('parallel', False))
+        max_workers = data.get('max_workers')
+        max_workers = int(max_workers) if max_workers else None
+        
+        # One run at a time: results and progress are shared by every request
+        if not backtesting_engine.try_start():
+            return jsonify({
+                'success': False,
+                'error': 'A backtest is already running'
+            }), 409
+        
+        if data.get('background', False):
+            # Results stream into /results and progress into /status while the run continues
+            thread = threading.Thread(
+                target=_run_backtest_in_background,
+                args=(historical_data, strategy_combinations, parallel, max_workers),
+                daemon=True
+            )
+            thread.start()
+            
+            return jsonify({
+                'success': True,
+                'message': 'Backtesting started',
+                'progress': backtesting_engine.get_progress()
+            }), 202
+        
         # Run backtesting
-        summary = backtesting_engine.run_backtest(historical_data, strategy_combinations)
+        summary = backtesting_engine.run_backtest(historical_data, strategy_combinations,
+                                                  parallel=parallel, max_workers=max_workers)
         
         return jsonify({
             'success': True,
@@ -388,6 +419,15 @@ def export_results():
         }), 500
 
 
+def _run_backtest_in_background(historical_data, strategy_combinations, parallel: bool, max_workers: Optional[int]):
+    """Run a backtest outside the request thread."""
+    try:
+        backtesting_engine.run_backtest(historical_data, strategy_combinations,
+                                        parallel=parallel, max_workers=max_workers)
+    except Exception as e:
+        logger.error(f"Error running background backtest: {e}")
+
+
 def _get_historical_data(collection_id: str):
     """
     Get historical data from a data collection.
@@ -1,7 +1,9 @@
 from flask import Blueprint, request, jsonify
 from src.utils.config_loader import config as global_config
+from src.utils.decision_trace import decision_tracer
 
 scheduler_api = Blueprint('scheduler_api', __name__)
+decision_trace_api = Blueprint('decision_trace_api', __name__)
 
 @scheduler_api.route('/data-collection/scheduler/window', methods=['GET', 'PUT'])
 def scheduler_window():
@@ -38,4 +40,47 @@ def scheduler_window():
             # No file write to keep simple; takes effect next scheduler instantiation
             return jsonify({'success': True, 'window': window})
         except Exception as e:
-            return jsonify({'success': False, 'error': str(e)}), 500
\ No newline at end of file
+            return jsonify({'success': False, 'error': str(e)}), 500
+
+
+def _json_safe(value):
+    """Convert timestamps and numpy scalars in a trace record to JSON types."""
+    if isinstance(value, dict):
+        return {key: _json_safe(item) for key, item in value.items()}
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    if hasattr(value, 'item'):
+        return value.item()
+    return value
+
+
+@decision_trace_api.route('/decision-trace', methods=['GET'])
+def get_decision_trace():
+    try:
+        records = decision_tracer.get_records(
+            limit=request.args.get('limit', 500, type=int),
+            source=request.args.get('source'),
+            symbol=request.args.get('symbol'),
+            event=request.args.get('event')
+        )
+        return jsonify({
+            'success': True,
+            'status': decision_tracer.get_status(),
+            'records': [_json_safe(record) for record in records]
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@decision_trace_api.route('/decision-trace/config', methods=['GET', 'PUT'])
+def decision_trace_config():
+    if request.method == 'GET':
+        return jsonify({'success': True, 'status': decision_tracer.get_status()})
+    try:
+        data = request.get_json() or {}
+        decision_tracer.configure(enabled=data.get('enabled'), capacity=data.get('capacity'))
+        if data.get('clear'):
+            decision_tracer.clear()
+        return jsonify({'success': True, 'status': decision_tracer.get_status()})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
@@ -13,7 +13,7 @@ from datetime import datetime, timedelta
 from typing import Dict, Any, Optional
 from pathlib import Path
 
-from flask import Flask, render_template, jsonify, request, redirect
+from flask import Flask, render_template, jsonify, request, redirect, Response
 from flask_socketio import SocketIO
 import pandas as pd
 import numpy as np
@@ -30,11 +30,24 @@ from ..utils.timezone_utils import (
 )
 from ..data_engine.data_engine import DataEngine
 from ..backtesting.backtest_engine import BacktestEngine
+from ..backtesting.monte_carlo import BLOCK_BOOTSTRAP, METHODS as MONTE_CARLO_METHODS
+from ..backtesting.serialization import dumps_results
+from ..backtesting.result_cache import BacktestResultCache, canonical_key, cache_scope
+from ..backtesting.strategies import MACDStrategy, RSIStrategy, BollingerBandsStrategy, MovingAverageStrategy
 from ..real_time_trading.trading_engine import TradingEngine
 from ..portfolio_management.portfolio_manager import PortfolioManager
 from .chart_generator import ChartGenerator
 
 
+# Backtesting strategies selectable by name in /api/backtest ('MACD', 'MACDStrategy', 'bollinger_bands', ...)
+BACKTEST_STRATEGIES = {
+    'MACD': MACDStrategy,
+    'RSI': RSIStrategy,
+    'BOLLINGERBANDS': BollingerBandsStrategy,
+    'MOVINGAVERAGE': MovingAverageStrategy
+}
+
+
 class NumpyEncoder(json.JSONEncoder):
     """Custom JSON encoder to handle numpy types."""
     def default(self, obj):
@@ -70,6 +83,9 @@ class DashboardApp:
         from ..data_collection.data_manager import DataCollectionManager, DataCollectionConfig, Exchange
         self.data_collection_manager = DataCollectionManager()
         
+        # Memoized backtest responses, keyed by request and data version
+        self.backtest_result_cache = BacktestResultCache()
+        
         # Flask app
         self.app = Flask(__name__, static_folder='static')
         self.app.config['SECRET_KEY'] = 'your-secret-key-here'
@@ -96,8 +112,9 @@ class DashboardApp:
         from .portfolio_api import portfolio_api
         self.app.register_blueprint(portfolio_api, url_prefix='/api')
         # Register scheduler config API
-        from .api_routes import scheduler_api
+        from .api_routes import scheduler_api, decision_trace_api
         self.app.register_blueprint(scheduler_api, url_prefix='/api')
+        self.app.register_blueprint(decision_trace_api, url_prefix='/api')
         # Register AI backtesting API blueprint
         try:
             from .ai_backtesting_api import ai_backtesting_api
@@ -413,49 +430,65 @@ class DashboardApp:
                 data = request.get_json()
                 symbol = data.get('symbol', 'AAPL')
                 strategy = data.get('strategy', 'MACD')
-                profile = data.get('profile', 'balanced')
                 start_date = data.get('start_date')
                 end_date = data.get('end_date')
                 custom_parameters = data.get('parameters', {})
-                benchmark = data.get('benchmark', symbol)  # Use selected symbol as benchmark by default
+                collection_id = data.get('collection_id')
+                monte_carlo_seed = data.get('monte_carlo_seed')
+                monte_carlo_method = data.get('monte_carlo_method', BLOCK_BOOTSTRAP)
+                try:
+                    monte_carlo_simulations = int(data.get('monte_carlo_simulations', 0))
+                    if monte_carlo_seed is not None:
+                        monte_carlo_seed = int(monte_carlo_seed)
+                except (TypeError, ValueError):
+                    return jsonify({'error': 'monte_carlo_simulations and monte_carlo_seed must be integers'}), 400
+                if monte_carlo_method not in MONTE_CARLO_METHODS:
+                    return jsonify({'error': f"Unknown Monte Carlo method: {monte_carlo_method}"}), 400
+                if not collection_id:
+                    return jsonify({'error': 'collection_id is required'}), 400
+                strategy_name = ''.join(c for c in str(strategy).upper() if c.isalnum())
+                if strategy_name.endswith('STRATEGY'):
+                    strategy_name = strategy_name[:-len('STRATEGY')]
+                strategy_class = BACKTEST_STRATEGIES.get(strategy_name)
+                if strategy_class is None:
+                    return jsonify({'error': f"Unknown strategy: {strategy}"}), 400
+                
+                # Identical requests on unchanged data return the memoized response
+                # (unseeded Monte Carlo runs are random and never cached)
+                cacheable = monte_carlo_simulations == 0 or monte_carlo_seed is not None
+                data_version = self.data_collection_manager.get_data_version(collection_id, [symbol])
+                cache_key = canonical_key(
+                    strategy_class.__name__, {'parameters': custom_parameters},
+                    [symbol], start_date, end_date, data_version,
+                    endpoint='backtest', collection_id=collection_id,
+                    monte_carlo=[monte_carlo_simulations, monte_carlo_seed, monte_carlo_method]
+                )
+                if cacheable:
+                    cached = self.backtest_result_cache.get(cache_key)
+                    if cached is not None:
+                        return self.app.response_class(cached, mimetype='application/json')
                 
-                # Run backtest with strategy+profile
+                # Run backtest, with the optional Monte Carlo robustness analysis
                 results = self.backtest_engine.run_backtest(
-                    symbol=symbol,
-                    strategy=strategy,
-                    profile=profile,
+                    strategy_class(custom_parameters),
+                    collection_id,
+                    symbol,
                     start_date=start_date,
                     end_date=end_date,
-                    custom_parameters=custom_parameters,
-                    benchmark=benchmark
+                    monte_carlo_simulations=min(monte_carlo_simulations, 100000),
+                    monte_carlo_seed=monte_carlo_seed,
+                    monte_carlo_method=monte_carlo_method
                 )
                 
                 if 'error' in results:
                     return jsonify(results), 400
+
+                # Arrays, timestamps and trades encoded once, then kept for repeat requests
+                body = dumps_results(results)
+                if cacheable:
+                    self.backtest_result_cache.put(cache_key, body, cache_scope(collection_id, [symbol]), data_version)
                 
-                # Convert any remaining numpy types to Python native types
-                def convert_numpy_types(obj):
-                    if isinstance(obj, dict):
-                        return {key: convert_numpy_types(value) for key, value in obj.items()}
-                    elif isinstance(obj, list):
-                        return [convert_numpy_types(item) for item in obj]
-                    elif isinstance(obj, np.integer):
-                        return int(obj)
-                    elif isinstance(obj, np.floating):
-                        return float(obj)
-                    elif isinstance(obj, np.ndarray):
-                        return obj.tolist()
-                    elif isinstance(obj, pd.Timestamp):
-                        return obj.isoformat()
-                    elif isinstance(obj, datetime):
-                        return obj.isoformat()
-                    else:
-                        return obj
-                
-                # Convert results to ensure JSON serialization
-                serializable_results = convert_numpy_types(results)
-                
-                return jsonify(serializable_results)
+                return self.app.response_class(body, mimetype='application/json')
                 
             except Exception as e:
                 self.logger.error(f"Error in backtest API: {str(e)}")
@@ -850,6 +883,15 @@ class DashboardApp:
                 if not end_date:
                     end_date = end_dt.strftime('%Y-%m-%d')
                 
+                # Repeat runs on unchanged data return the memoized response
+                data_version = self.data_collection_manager.get_data_version()
+                cache_key = canonical_key(strategy, {'profile': profile}, [benchmark], start_date, end_date,
+                                          data_version, endpoint='historical-backtest')
+                cached = self.backtest_result_cache.get(cache_key)
+                if cached is not None:
+                    body, self.current_historical_trades_data = cached
+                    return self.app.response_class(body, mimetype='application/json')
+                
                 # Debug: Print the actual date range being used
                 print(f"🔍 DEBUG: Using date range: {start_date} to {end_date}")
                 print(f"🔍 DEBUG: Period requested: {period}")
@@ -939,7 +981,9 @@ class DashboardApp:
                     print(f"🔍 First trade: {self.current_historical_trades_data[0]}")
                     print(f"🔍 Last trade: {self.current_historical_trades_data[-1]}")
                 
-                return jsonify(results)
+                body = dumps_results(results)
+                self.backtest_result_cache.put(cache_key, (body, self.current_historical_trades_data), '*', data_version)
+                return self.app.response_class(body, mimetype='application/json')
                 
             except Exception as e:
                 import traceback
@@ -1993,6 +2037,15 @@ class DashboardApp:
                         self.logger.info(f"Returning cached ranking for collection {collection_id}")
                         return jsonify(cached_ranking)
                 
+                # Streaming mode: push scores as Server-Sent Events as each batch is scored
+                if request.args.get('stream', 'false').lower() == 'true':
+                    from ..ai_ranking.ranking_stream import RankingStream
+                    stream = RankingStream(key=lambda score: score.total_score,
+                                           to_dict=self._ai_integration.serialize_stock_score,
+                                           top_n=request.args.get('top_n', 10, type=int))
+                    return self._stream_ranking(stream, lambda: self._ai_integration.get_collection_ranking(
+                        collection_id, min(max_stocks, 50), on_scores=stream.push_many))
+                
                 # If background processing requested, start async calculation
                 if background:
                     # Start background calculation
@@ -2060,37 +2113,18 @@ class DashboardApp:
                         self.logger.info(f"Returning cached hybrid ranking for collection {collection_id}")
                         return jsonify(cached_ranking)
                 
-                # Perform hybrid ranking
+                # Streaming mode: push each DualScore as a Server-Sent Event as it is produced
+                if request.args.get('stream', 'false').lower() == 'true':
+                    from ..ai_ranking.ranking_stream import RankingStream
+                    stream = RankingStream(key=lambda score: (score.openai_score + score.local_score) / 2,
+                                           to_dict=self._serialize_dual_score,
+                                           top_n=request.args.get('top_n', 10, type=int))
+                    return self._stream_ranking(stream, lambda: self._rank_hybrid_collection(
+                        collection_id, max_stocks, on_score=stream.push))
+                
+                # Rank from the index; only symbols whose data changed are rescored
                 try:
-                    hybrid_result = self._hybrid_ai_integration.rank_collection_hybrid(collection_id, max_stocks)
-                    
-                    # Convert to JSON-serializable format
-                    response = {
-                        'success': True,
-                        'collection_id': collection_id,
-                        'timestamp': hybrid_result.timestamp.isoformat(),
-                        'total_stocks': hybrid_result.total_stocks,
-                        'dual_scores': [
-                            {
-                                'symbol': score.symbol,
-                                'openai_score': round(score.openai_score, 2),
-                                'local_score': round(score.local_score, 2),
-                                'score_difference': round(score.score_difference, 2),
-                                'confidence_level': score.confidence_level,
-                                'explanation': score.explanation,
-                                'recommendations': score.recommendations,
-                                'combined_score': round((score.openai_score + score.local_score) / 2, 2)
-                            }
-                            for score in hybrid_result.dual_scores
-                        ],
-                        'algorithm_performance': hybrid_result.algorithm_performance,
-                        'improvement_insights': hybrid_result.improvement_insights
-                    }
-                    
-                    # Store in cache
-                    self._hybrid_ai_integration.store_hybrid_ranking_cache(collection_id, response)
-                    
-                    return jsonify(response)
+                    return jsonify(self._rank_hybrid_collection(collection_id, max_stocks))
                     
                 except Exception as calc_error:
                     self.logger.warning(f"Hybrid ranking calculation error for collection {collection_id}: {calc_error}")
@@ -2171,6 +2205,16 @@ class DashboardApp:
                 self.logger.error(f"Error getting collection ranking: {e}")
                 return jsonify({'success': False, 'error': str(e)}), 500
 
+        @self.app.route('/api/ai-ranking/llm-cache', methods=['GET'])
+        def get_llm_cache_stats():
+            """Get hit rates and cost avoided by the shared LLM response cache."""
+            try:
+                from ..ai_ranking.llm_response_cache import shared_response_cache
+                return jsonify({'success': True, 'cache': shared_response_cache.stats()})
+            except Exception as e:
+                self.logger.error(f"Error getting LLM cache stats: {e}")
+                return jsonify({'success': False, 'error': str(e)}), 500
+
         @self.app.route('/api/ai-ranking/collection/<collection_id>/stock/<symbol>', methods=['GET'])
         def get_stock_analysis(collection_id, symbol):
             """Get detailed AI analysis for a specific stock."""
@@ -2695,6 +2739,57 @@ class DashboardApp:
         except Exception as e:
             self.logger.error(f"Error in trading session: {e}")
     
+    def _rank_hybrid_collection(self, collection_id: str, max_stocks: int, on_score=None) -> Dict[str, Any]:
+        """Run an incremental hybrid ranking and build the hybrid-rank response."""
+        hybrid_result = self._hybrid_ai_integration.rank_collection_incremental(collection_id, max_stocks,
+                                                                                on_score=on_score)
+        
+        # Convert to JSON-serializable format
+        response = {
+            'success': True,
+            'collection_id': collection_id,
+            'timestamp': hybrid_result.timestamp.isoformat(),
+            'total_stocks': hybrid_result.total_stocks,
+            'dual_scores': [self._serialize_dual_score(score) for score in hybrid_result.dual_scores],
+            'algorithm_performance': hybrid_result.algorithm_performance,
+            'improvement_insights': hybrid_result.improvement_insights,
+            'partial': hybrid_result.partial,
+            'skipped_symbols': hybrid_result.skipped_symbols,
+            'rescored_symbols': hybrid_result.rescored_symbols
+        }
+        
+        # Store in cache (partial rankings are recomputed next time)
+        if not hybrid_result.partial:
+            self._hybrid_ai_integration.store_hybrid_ranking_cache(collection_id, response)
+        
+        return response
+    
+    @staticmethod
+    def _serialize_dual_score(score) -> Dict[str, Any]:
+        """JSON form of a DualScore, as listed in dual_scores."""
+        return {
+            'symbol': score.symbol,
+            'openai_score': round(score.openai_score, 2),
+            'local_score': round(score.local_score, 2),
+            'score_difference': round(score.score_difference, 2),
+            'confidence_level': score.confidence_level,
+            'explanation': score.explanation,
+            'recommendations': score.recommendations,
+            'combined_score': round((score.openai_score + score.local_score) / 2, 2)
+        }
+    
+    def _stream_ranking(self, stream, ranking) -> Response:
+        """Run ranking in the background and send its stream's events as Server-Sent Events."""
+        from ..ai_ranking.ranking_stream import format_sse
+        stream.run(ranking)
+        
+        def generate():
+            for event, data in stream.events():
+                yield format_sse(event, data)
+        
+        return Response(generate(), mimetype='text/event-stream',
+                        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+    
     def _update_dashboard_data(self):
         """Update dashboard data periodically."""
         while self.is_running:
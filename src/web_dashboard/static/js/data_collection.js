@@ -2391,7 +2391,12 @@ class DataCollectionManager {
                 return;
             }
 
-            // If no cached data, load fresh data
+            // If no cached data, stream fresh scores as they are produced
+            if (window.EventSource) {
+                this.streamHybridAIRanking(collectionId);
+                return;
+            }
+
             response = await fetch(`/api/ai-ranking/collection/${collectionId}/hybrid-rank?max_stocks=20`);
             data = await response.json();
             
@@ -2406,6 +2411,34 @@ class DataCollectionManager {
         }
     }
 
+    streamHybridAIRanking(collectionId) {
+        // Show the running top scores while the ranking runs, then the full result
+        const source = new EventSource(`/api/ai-ranking/collection/${collectionId}/hybrid-rank?max_stocks=20&stream=true&top_n=20`);
+
+        source.addEventListener('score', (event) => {
+            const update = JSON.parse(event.data);
+            document.getElementById('hybrid-ai-ranking-loading').style.display = 'none';
+            document.getElementById('hybrid-ai-ranking-content').style.display = 'block';
+            this.displayDualScoringTable(update.top);
+        });
+
+        source.addEventListener('done', (event) => {
+            source.close();
+            const data = JSON.parse(event.data);
+            if (data.success) {
+                this.displayHybridAIRankingResults(data);
+            } else {
+                this.showHybridError(data.error || 'Failed to load hybrid ranking data');
+            }
+        });
+
+        source.addEventListener('error', (event) => {
+            source.close();
+            const data = event.data ? JSON.parse(event.data) : {};
+            this.showHybridError(data.error || 'Network error while loading hybrid ranking data');
+        });
+    }
+
     displayHybridAIRankingResults(data) {
         try {
             // Hide loading, show content
@@ -0,0 +1,119 @@
+"""
+Shared fixtures for the test modules: synthetic price data, backtest engines
+and stub data managers.
+"""
+
+import tempfile
+import pandas as pd
+import numpy as np
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.backtesting.risk_management import RiskParameters, PositionSizingMethod, StopLossType
+
+
+def make_price_data(n: int = 400, seed: int = 7) -> pd.DataFrame:
+    """Synthetic daily OHLCV data."""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0005, 0.02, n)))
+    index = pd.bdate_range('2020-01-01', periods=n)
+    return pd.DataFrame({
+        'open': close,
+        'high': close * 1.01,
+        'low': close * 0.99,
+        'close': close,
+        'volume': rng.integers(500000, 3000000, n).astype(float)
+    }, index=index)
+
+
+def add_backtest_indicators(data: pd.DataFrame) -> pd.DataFrame:
+    """Indicator columns in the naming used by the backtesting strategies."""
+    df = data.copy()
+    close = df['close']
+    delta = close.diff()
+    gains = delta.clip(lower=0).rolling(14).mean()
+    losses = (-delta.clip(upper=0)).rolling(14).mean()
+    df['rsi_14'] = 100 - 100 / (1 + gains / losses)
+    df['sma_10'] = close.rolling(10).mean()
+    df['sma_20'] = close.rolling(20).mean()
+    df['ema_20'] = close.ewm(span=20).mean()
+    std = close.rolling(20).std()
+    df['bb_middle_20_2.0'] = df['sma_20']
+    df['bb_upper_20_2.0'] = df['sma_20'] + 2 * std
+    df['bb_lower_20_2.0'] = df['sma_20'] - 2 * std
+    macd_line = close.ewm(span=12).mean() - close.ewm(span=26).mean()
+    df['macd_line_12_26'] = macd_line
+    df['macd_signal_12_26_9'] = macd_line.ewm(span=9).mean()
+    return df
+
+
+def make_backtest_data(n: int = 200) -> pd.DataFrame:
+    """Daily OHLCV rows in the layout used by the AI backtesting API."""
+    rng = np.random.default_rng(11)
+    close = 150 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    return pd.DataFrame({
+        'date': pd.date_range('2024-01-01', periods=n, freq='D'),
+        'symbol': 'AAPL',
+        'open': close,
+        'high': close * 1.01,
+        'low': close * 0.99,
+        'close': close,
+        'volume': rng.integers(1000000, 10000000, n)
+    })
+
+
+def make_engine(engine_class, stop_loss_type=StopLossType.FIXED_PERCENTAGE):
+    """Create an engine whose collection database lives in a temporary directory."""
+    cwd = os.getcwd()
+    workdir = tempfile.mkdtemp()
+    os.makedirs(os.path.join(workdir, 'data'))
+    os.chdir(workdir)
+    try:
+        return engine_class(risk_params=RiskParameters(
+            position_sizing_method=PositionSizingMethod.FIXED_PERCENTAGE,
+            stop_loss_type=stop_loss_type
+        ))
+    finally:
+        os.chdir(cwd)
+
+
+class StubDataManager:
+    """Collection of symbols with a short indicator history each."""
+
+    def __init__(self, symbols):
+        self.symbols = symbols
+        rng = np.random.default_rng(2)
+        close = 100 + np.cumsum(rng.normal(0, 1, 60))
+        self.indicators = pd.DataFrame({'close': close, 'rsi': 55.0, 'macd': 0.5, 'macd_signal': 0.2,
+                                        'sma_20': close - 1, 'sma_50': close - 2, 'volume': 1e6})
+        self.loads = []
+
+    def get_collection_symbols(self, collection_id):
+        return list(self.symbols)
+
+    def get_symbol_indicators(self, collection_id, symbol):
+        self.loads.append(symbol)
+        return self.indicators
+
+
+class VersionedDataManager(StubDataManager):
+    """Stub collection whose symbols can be updated one at a time."""
+
+    def __init__(self, symbols):
+        super().__init__(symbols)
+        self.frames = {symbol: self.indicators.copy() for symbol in symbols}
+        self.versions = {symbol: '1' for symbol in symbols}
+
+    def get_symbol_indicators(self, collection_id, symbol):
+        self.loads.append(symbol)
+        return self.frames.get(symbol)
+
+    def get_symbol_versions(self, collection_id):
+        return {symbol: self.versions[symbol] for symbol in self.frames}
+
+    def update(self, symbol, rsi):
+        self.frames[symbol] = self.frames[symbol].assign(rsi=rsi)
+        self.versions[symbol] = str(int(self.versions[symbol]) + 1)
@@ -0,0 +1,80 @@
+"""
+Tests for the run endpoint of the AI backtesting API.
+"""
+
+import unittest
+import threading
+from unittest import mock
+from flask import Flask
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.web_dashboard import ai_backtesting_api as api
+from tests.helpers import make_backtest_data
+
+
+class TestAIBacktestingRun(unittest.TestCase):
+    """Only one run uses the shared engine at a time."""
+
+    def setUp(self):
+        app = Flask(__name__)
+        app.register_blueprint(api.ai_backtesting_api)
+        self.client = app.test_client()
+        self.engine = api.backtesting_engine
+        self.engine._finish_progress('idle')
+        patcher = mock.patch.object(api, '_get_historical_data', return_value=make_backtest_data(60))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def run_request(self, **options):
+        return self.client.post('/api/ai-backtesting/run',
+                                json={'collection_id': 'col', 'strategy_combinations': [['macd']], **options})
+
+    def test_01_second_run_rejected_until_first_finishes(self):
+        """A background run is reserved before its thread starts; other runs get 409 meanwhile."""
+        release, finished = threading.Event(), threading.Event()
+
+        def blocked_run(*args):
+            release.wait(10)
+            self.engine._finish_progress('completed')
+            finished.set()
+
+        with mock.patch.object(api, '_run_backtest_in_background', side_effect=blocked_run):
+            first = self.run_request(background=True)
+            second = self.run_request(background=True)
+            synchronous = self.run_request()
+            release.set()
+
+        self.assertEqual(first.status_code, 202)
+        self.assertEqual(second.status_code, 409)
+        self.assertEqual(synchronous.status_code, 409)
+
+        self.assertTrue(finished.wait(10))
+        self.assertEqual(self.run_request().status_code, 200)
+        self.assertEqual(self.engine.get_progress()['state'], 'completed')
+
+    def test_02_try_start_is_exclusive(self):
+        """Concurrent reservations admit exactly one caller."""
+        barrier = threading.Barrier(8)
+        granted = []
+
+        def reserve():
+            barrier.wait()
+            granted.append(self.engine.try_start())
+
+        threads = [threading.Thread(target=reserve) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(10)
+
+        self.assertEqual(sorted(granted), [False] * 7 + [True])
+        self.engine._finish_progress('failed')
+        self.assertTrue(self.engine.try_start())
+
+
+if __name__ == '__main__':
+    unittest.main()
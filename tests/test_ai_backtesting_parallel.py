@@ -0,0 +1,56 @@
+"""
+Tests for the process-pool mode of AIBacktestingEngine.
+"""
+
+import unittest
+import pandas as pd
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.backtesting.ai_backtesting_engine import AIBacktestingEngine, SharedFrame
+from tests.helpers import make_backtest_data
+
+
+class TestParallelAIBacktesting(unittest.TestCase):
+    """Shared-memory transport and streamed parallel results."""
+
+    def test_01_shared_frame_round_trip(self):
+        """A DataFrame rebuilt from shared memory equals the original."""
+        data = make_backtest_data(50)
+        data['signal'] = data['close'] > data['close'].mean()
+        data.loc[3, 'symbol'] = None
+        data = data.set_index('date')
+
+        shared = SharedFrame(data)
+        try:
+            rebuilt = SharedFrame.attach(shared.spec())
+        finally:
+            shared.release()
+
+        pd.testing.assert_frame_equal(rebuilt, data, check_freq=False)
+
+    def test_02_parallel_streams_all_results(self):
+        """Parallel mode returns one result per combination, streamed as each completes."""
+        engine = AIBacktestingEngine()
+        combinations = [['macd'], ['rsi'], ['macd', 'rsi'], ['bollinger_bands', 'momentum']]
+        streamed = []
+
+        summary = engine.run_backtest(make_backtest_data(), combinations, parallel=True,
+                                      max_workers=2, on_result=streamed.append)
+
+        self.assertEqual(summary.total_strategies_tested, len(combinations))
+        self.assertEqual(sorted(r.strategy_name for r in streamed),
+                         sorted(' + '.join(combo) for combo in combinations))
+
+        progress = engine.get_progress()
+        self.assertEqual(progress['state'], 'completed')
+        self.assertEqual(progress['mode'], 'parallel')
+        self.assertEqual(progress['completed'], len(combinations))
+        self.assertEqual(progress['percent_complete'], 100.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+"""
+Tests for indicator-driven signals and equity-curve metrics in AIBacktestingEngine.
+"""
+
+import unittest
+import numpy as np
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.backtesting.ai_backtesting_engine import AIBacktestingEngine, INDICATOR_COLUMNS, WARMUP_PERIODS
+from tests.helpers import make_backtest_data
+
+
+class TestAIBacktestingSignals(unittest.TestCase):
+    """Signals come from indicator columns; metrics from the equity curve."""
+
+    def setUp(self):
+        self.engine = AIBacktestingEngine()
+        self.data = self.engine.prepare_indicators(make_backtest_data(400))
+
+    def test_01_prepare_indicators(self):
+        """Indicators are added once and prepared data is passed through."""
+        for column in INDICATOR_COLUMNS:
+            self.assertIn(column, self.data.columns)
+        self.assertIs(self.engine.prepare_indicators(self.data), self.data)
+
+        shuffled = make_backtest_data(400).sample(frac=1, random_state=0)
+        np.testing.assert_allclose(self.engine.prepare_indicators(shuffled)['rsi'], self.data['rsi'])
+
+    def test_02_signals_follow_indicators(self):
+        """A single-strategy signal is the strategy's vote after the warm-up."""
+        signals = self.engine._generate_signal(self.data, ['macd'])
+        expected = np.sign(self.data['macd_line'] - self.data['macd_signal']).to_numpy()
+
+        self.assertTrue((signals[:WARMUP_PERIODS] == 0).all())
+        np.testing.assert_array_equal(signals[WARMUP_PERIODS:], expected[WARMUP_PERIODS:])
+        with self.assertRaises(ValueError):
+            self.engine._generate_signal(self.data, ['unknown'])
+
+    def test_03_metrics_from_equity_curve(self):
+        """Results are deterministic and drawdown is measured from the running peak."""
+        first = self.engine._test_strategy_combination(self.data, ['macd', 'momentum'])
+        second = self.engine._test_strategy_combination(self.data, ['macd', 'momentum'])
+
+        self.assertGreater(first.total_trades, 0)
+        self.assertEqual(first.final_portfolio_value, second.final_portfolio_value)
+        self.assertAlmostEqual(first.final_portfolio_value,
+                               self.engine.parameters.available_cash + first.total_return)
+
+        max_drawdown, max_drawdown_pct = self.engine._calculate_max_drawdown(np.array([100.0, 120.0, 90.0, 130.0, 117.0]))
+        self.assertEqual(max_drawdown, 30.0)
+        self.assertAlmostEqual(max_drawdown_pct, 25.0)
+        np.testing.assert_allclose(self.engine._calculate_returns(np.array([100.0, 110.0, 99.0])), [0.1, -0.1])
+
+
+if __name__ == '__main__':
+    unittest.main()
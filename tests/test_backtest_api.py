@@ -0,0 +1,77 @@
+"""
+Tests for the dashboard backtest endpoint.
+"""
+
+import unittest
+import tempfile
+import shutil
+from unittest import mock
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.web_dashboard.dashboard_app import DashboardApp
+from tests.helpers import make_price_data, add_backtest_indicators
+
+CONFIG_DIR = os.path.join(os.path.dirname(__file__), '..', 'config')
+
+
+class TestBacktestAPI(unittest.TestCase):
+    """/api/backtest runs the named strategy on a collection symbol."""
+
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.tmp = tempfile.TemporaryDirectory()
+        os.chdir(self.tmp.name)
+        os.makedirs('data')
+        shutil.copytree(CONFIG_DIR, 'config')
+        self.dashboard = DashboardApp()
+        self.client = self.dashboard.app.test_client()
+        self.data = add_backtest_indicators(make_price_data(300, seed=2)).reset_index().rename(columns={'index': 'Date'})
+        patcher = mock.patch.object(self.dashboard.backtest_engine, 'load_data', return_value=self.data)
+        self.load_data = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def test_01_backtest_with_monte_carlo(self):
+        """The strategy runs on the collection data and the response carries the Monte Carlo summary."""
+        response = self.client.post('/api/backtest', json={
+            'symbol': 'TEST', 'strategy': 'MACDStrategy', 'collection_id': 'col',
+            'monte_carlo_simulations': 200, 'monte_carlo_seed': 4
+        })
+
+        self.assertEqual(response.status_code, 200)
+        results = response.get_json()
+        self.assertEqual(results['monte_carlo']['n_simulations'], 200)
+        self.assertIn('equity_curve', results)
+        self.load_data.assert_called_once_with('col', 'TEST')
+
+    def test_02_invalid_requests(self):
+        """Missing collections and unknown strategies or methods are rejected before running."""
+        for body in ({'symbol': 'TEST'},
+                     {'symbol': 'TEST', 'collection_id': 'col', 'strategy': 'unknown'},
+                     {'symbol': 'TEST', 'collection_id': 'col', 'monte_carlo_method': 'unknown'}):
+            self.assertEqual(self.client.post('/api/backtest', json=body).status_code, 400)
+        self.load_data.assert_not_called()
+
+    def test_03_cached_per_symbol(self):
+        """Repeat requests are served from the cache; another symbol's version does not evict them."""
+        versions = {'AAA': '10@t|0@', 'BBB': '12@t|0@'}
+        with mock.patch.object(self.dashboard.data_collection_manager, 'get_data_version',
+                               side_effect=lambda collection_id, symbols: versions[symbols[0]]):
+            responses = [self.client.post('/api/backtest', json={'symbol': symbol, 'collection_id': 'col'})
+                         for symbol in ('AAA', 'BBB', 'AAA', 'BBB')]
+
+        self.assertEqual([response.status_code for response in responses], [200] * 4)
+        self.assertEqual(responses[2].get_data(), responses[0].get_data())
+        self.assertEqual(self.load_data.call_count, 2)
+        self.assertEqual(self.dashboard.backtest_result_cache.stats()['entries'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
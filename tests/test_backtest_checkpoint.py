@@ -0,0 +1,143 @@
+"""
+Tests for checkpointed, resumable and segmented backtests.
+"""
+
+import unittest
+import tempfile
+import logging
+from unittest import mock
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.backtesting.checkpoint import Checkpoint, fingerprint, save_checkpoint, load_checkpoint, clear_checkpoint
+from src.backtesting.ai_backtesting_engine import AIBacktestingEngine
+from src.real_time_trading import automation_engine
+from src.real_time_trading.automation_engine import HistoricalBacktestEngine
+from tests.helpers import make_backtest_data
+
+
+def make_book_inputs(n_dates: int = 600, n_symbols: int = 8, seed: int = 3):
+    """Prices with gaps and frequent BUY/SELL signals so the position limit binds."""
+    rng = np.random.default_rng(seed)
+    prices = 50 * np.exp(np.cumsum(rng.normal(0, 0.02, (n_dates, n_symbols)), axis=0))
+    prices[rng.random(prices.shape) < 0.05] = np.nan
+    signals = rng.choice(np.array([-1, 0, 1], dtype=np.int8), size=prices.shape, p=[0.1, 0.75, 0.15])
+    signals[np.isnan(prices)] = 0
+    symbols = [f"S{s}" for s in range(n_symbols)]
+    dates = pd.date_range('2015-01-01', periods=n_dates, freq='B')
+    return symbols, dates, prices, signals
+
+
+def walk(checkpoint_path=None, checkpoint_every=250, segments=1, max_workers=None):
+    """Walk the book inputs on an engine built without a trading system."""
+    engine = HistoricalBacktestEngine.__new__(HistoricalBacktestEngine)
+    engine.checkpoint_path = checkpoint_path
+    engine.checkpoint_every = checkpoint_every
+    engine.segments = segments
+    engine.max_workers = max_workers
+    engine.logger = logging.getLogger(__name__)
+    return engine._walk(*make_book_inputs(), (100000, 3, 0.1))
+
+
+class TestBacktestCheckpoint(unittest.TestCase):
+    """Checkpoints round-trip, resumed and segmented walks equal a single pass."""
+
+    def test_01_checkpoint_round_trip(self):
+        """Arrays and state survive; other inputs or a cleared file give no checkpoint."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'run', 'state.npz')
+            key = fingerprint(['AAA'], np.arange(5.0))
+            save_checkpoint(path, Checkpoint(key, 3, {'values': np.arange(3.0)}, {'open_positions': 2}))
+
+            loaded = load_checkpoint(path, key)
+            self.assertEqual(loaded.cursor, 3)
+            np.testing.assert_array_equal(loaded.arrays['values'], np.arange(3.0))
+            self.assertEqual(loaded.state, {'open_positions': 2})
+            self.assertIsNone(load_checkpoint(path, fingerprint(['AAA'], np.arange(6.0))))
+
+            clear_checkpoint(path)
+            self.assertIsNone(load_checkpoint(path, key))
+
+    def test_02_resume_after_interruption(self):
+        """A walk stopped after a checkpoint resumes to the uninterrupted result."""
+        expected_values, expected_events = walk()
+        self.assertGreater(sum(1 for event in expected_events if event[2] == -1), 20)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'walk.npz')
+            saves = []
+
+            def crash_on_third(path, checkpoint):
+                save_checkpoint(path, checkpoint)
+                saves.append(checkpoint.cursor)
+                if len(saves) == 3:
+                    raise KeyboardInterrupt
+
+            with mock.patch.object(automation_engine, 'save_checkpoint', side_effect=crash_on_third):
+                with self.assertRaises(KeyboardInterrupt):
+                    walk(path, checkpoint_every=100)
+            self.assertEqual(load_checkpoint(path).cursor, 300)
+
+            values, events = walk(path, checkpoint_every=100)
+            self.assertFalse(os.path.exists(path))
+
+        np.testing.assert_array_equal(values, expected_values)
+        self.assertEqual(events, expected_events)
+
+    def test_03_segments_match_sequential(self):
+        """Segments walked in parallel and stitched equal the sequential walk."""
+        expected_values, expected_events = walk()
+        values, events = walk(segments=4, max_workers=2)
+
+        np.testing.assert_array_equal(values, expected_values)
+        self.assertEqual(events, expected_events)
+
+    def test_04_ai_backtest_resumes_finished_combinations(self):
+        """Combinations checkpointed before an interruption are not tested again."""
+        data = make_backtest_data()
+        combinations = [['macd'], ['rsi'], ['macd', 'rsi'], ['bollinger_bands', 'momentum']]
+        reference = AIBacktestingEngine()
+        reference.run_backtest(data, combinations)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'ai.npz')
+
+            def interrupt(result):
+                if result.strategy_combination == ['rsi']:
+                    raise KeyboardInterrupt
+
+            with self.assertRaises(KeyboardInterrupt):
+                AIBacktestingEngine().run_backtest(data, combinations, on_result=interrupt,
+                                                   checkpoint_path=path, checkpoint_every=1)
+
+            engine = AIBacktestingEngine()
+            tested = []
+            original = engine._test_strategy_combination
+            engine._test_strategy_combination = lambda d, combo: tested.append(combo) or original(d, combo)
+            summary = engine.run_backtest(data, combinations, checkpoint_path=path)
+            self.assertFalse(os.path.exists(path))
+
+        self.assertEqual(tested, [['macd', 'rsi'], ['bollinger_bands', 'momentum']])
+        self.assertEqual(engine.get_progress()['completed'], len(combinations))
+        self.assertEqual(summary.best_strategy.strategy_name, reference.summary.best_strategy.strategy_name)
+        self.assertEqual([r.total_return for r in engine.results], [r.total_return for r in reference.results])
+
+    def test_05_ai_backtest_checkpoints_every_n(self):
+        """Checkpoints are written every checkpoint_every combinations, not after each one."""
+        data = make_backtest_data()
+        combinations = [['macd'], ['rsi'], ['macd', 'rsi'], ['bollinger_bands', 'momentum'], ['momentum']]
+        with tempfile.TemporaryDirectory() as tmp, \
+                mock.patch('src.backtesting.ai_backtesting_engine.save_checkpoint') as save:
+            AIBacktestingEngine().run_backtest(data, combinations, checkpoint_path=os.path.join(tmp, 'ai.npz'),
+                                               checkpoint_every=2)
+
+        self.assertEqual([call.args[1].cursor for call in save.call_args_list], [2, 4])
+
+
+if __name__ == '__main__':
+    unittest.main()
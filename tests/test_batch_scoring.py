@@ -0,0 +1,118 @@
+"""
+Tests for cross-sectional batch scoring against the per-symbol scorers.
+"""
+
+import unittest
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.ai_ranking.scoring_models import MultiFactorScorer
+from src.ai_ranking.ranking_engine import LightweightStockRankingEngine
+
+FACTORS = ('total_score', 'technical_score', 'fundamental_score', 'risk_score', 'market_score')
+
+
+def make_indicator_frame(n: int, seed: int, drop=()) -> pd.DataFrame:
+    """Indicator rows under both the database and the lightweight column names."""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01 + 0.02 * rng.random(), n)))
+    data = pd.DataFrame({
+        'close': close,
+        'volume': rng.integers(100000, 10000000, n),
+        'macd_line_12_26': rng.normal(0, 1, n),
+        'ema_20': close * rng.normal(1, 0.02, n),
+        'rsi_14': rng.uniform(10, 90, n),
+        'stoch_k_14': rng.uniform(0, 100, n),
+        'atr_14': rng.uniform(1, 3, n),
+        'bb_upper_20_2.0': close * 1.05,
+        'bb_lower_20_2.0': close * rng.uniform(0.9, 1.04, n),
+        'rsi': rng.uniform(10, 90, n),
+        'macd': rng.normal(0, 1, n),
+        'macd_signal': rng.normal(0, 1, n),
+        'sma_20': close * rng.normal(1, 0.02, n),
+        'sma_50': close * rng.normal(1, 0.02, n)
+    })
+    data['Close'] = data['close']
+    return data.drop(columns=list(drop))
+
+
+def make_universe(count: int = 40, rows: int = 120):
+    """Symbols with varied history lengths, missing columns and gaps."""
+    drops = [('stoch_k_14', 'Close'), ('atr_14', 'macd_line_12_26', 'rsi'), (), ('sma_50',)]
+    universe = {}
+    for i in range(count):
+        data = make_indicator_frame(rows + (i % 7) * 13, i, drops[i % 4])
+        if i % 5 == 0:
+            data.loc[data.index[-1], ['rsi_14', 'rsi']] = np.nan
+        if i % 6 == 0:
+            data.loc[data.index[10], 'close'] = np.nan
+        universe[f"S{i:03d}"] = data
+    return universe
+
+
+class TestBatchScoring(unittest.TestCase):
+    """Array-based scores equal the per-symbol scores and come back ranked."""
+
+    def assert_same_scores(self, batch, expected):
+        for score in batch:
+            for factor in FACTORS:
+                self.assertEqual(getattr(score, factor), getattr(expected[score.symbol], factor),
+                                 f"{score.symbol} {factor}")
+
+    def test_01_multi_factor_batch_matches_score_stock(self):
+        """Every factor score matches score_stock and ranks follow the total score."""
+        scorer = MultiFactorScorer()
+        universe = make_universe()
+        expected = {symbol: scorer.score_stock(symbol, data) for symbol, data in universe.items()}
+
+        batch = scorer.score_batch(universe, explain=False)
+
+        self.assertEqual(len(batch), len(universe))
+        self.assert_same_scores(batch, expected)
+        self.assertEqual([s.rank for s in batch], list(range(1, len(batch) + 1)))
+        totals = [s.total_score for s in batch]
+        self.assertEqual(totals, sorted(totals, reverse=True))
+
+    def test_02_short_histories_and_lookback(self):
+        """Technical and risk scores match for tiny histories; lookback scores the latest rows."""
+        scorer = MultiFactorScorer()
+        universe = {f"L{n}": make_indicator_frame(n, n) for n in (1, 2, 3, 5)}
+        universe['EMPTY'] = make_indicator_frame(0, 1)
+
+        for score in scorer.score_batch(universe, explain=False):
+            expected = scorer.score_stock(score.symbol, universe[score.symbol])
+            self.assertEqual(score.technical_score, expected.technical_score)
+            self.assertEqual(score.risk_score, expected.risk_score)
+
+        universe = make_universe(8)
+        latest = {symbol: scorer.score_stock(symbol, data.iloc[-60:]) for symbol, data in universe.items()}
+        self.assert_same_scores(scorer.score_batch(universe, lookback=60, explain=False), latest)
+
+    def test_03_lightweight_engine_batch(self):
+        """The lightweight engine's one-pass scores equal its per-symbol methods.
+
+        Volatility is summed in a different order than pandas, so the
+        continuous risk score agrees to rounding rather than bit for bit.
+        """
+        engine = LightweightStockRankingEngine(data_manager=None)
+        universe = make_universe()
+        universe['SHORT'] = make_indicator_frame(2, 99)
+
+        batch = engine._score_stocks(universe)
+
+        self.assertEqual([s.symbol for s in batch], list(universe))
+        for score in batch:
+            data = universe[score.symbol]
+            self.assertEqual(score.technical_score, engine._calculate_technical_score(data))
+            self.assertAlmostEqual(score.risk_score, engine._calculate_risk_score(data), places=9)
+            self.assertAlmostEqual(score.total_score, engine._calculate_technical_score(data) * 0.4 + 60.0 * 0.3 +
+                                   engine._calculate_risk_score(data) * 0.2 + 70.0 * 0.1, places=9)
+
+
+if __name__ == '__main__':
+    unittest.main()
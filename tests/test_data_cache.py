@@ -0,0 +1,71 @@
+"""
+Tests for buffered transaction logging in DataCache.
+"""
+
+import unittest
+import tempfile
+import sqlite3
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.data_engine.data_cache import DataCache, _flush_open_caches
+
+
+def make_transaction(i: int, symbol: str = 'AAPL'):
+    return {'date': f'2024-01-{i % 28 + 1:02d}', 'symbol': symbol, 'action': 'BUY', 'shares': 10,
+            'price': 100.0 + i, 'value': 1000.0 + i, 'reason': 'signal', 'portfolio_value': 100000.0}
+
+
+class TestDataCacheBuffering(unittest.TestCase):
+    """Rows are buffered, flushed in batches and never lost on reads or exit."""
+
+    def setUp(self):
+        self.cache = DataCache(tempfile.mkdtemp(), flush_threshold=50)
+
+    def stored_transactions(self) -> int:
+        conn = sqlite3.connect(self.cache.db_path)
+        try:
+            return conn.execute('SELECT COUNT(*) FROM transaction_logs').fetchone()[0]
+        finally:
+            conn.close()
+
+    def test_01_threshold_flush(self):
+        """Rows reach the database only when the threshold is hit."""
+        for i in range(49):
+            self.cache.log_transaction('bt1', make_transaction(i))
+        self.assertEqual(self.stored_transactions(), 0)
+
+        self.cache.log_transaction('bt1', make_transaction(49))
+        self.assertEqual(self.stored_transactions(), 50)
+
+    def test_02_reads_and_run_end_flush(self):
+        """Reads see buffered rows and logging a result flushes the run."""
+        self.cache.log_transactions('bt1', [make_transaction(i, 'MSFT' if i % 2 else 'AAPL') for i in range(10)])
+        history = self.cache.get_transaction_history(backtest_id='bt1', symbol='MSFT')
+        self.assertEqual(len(history), 5)
+
+        self.cache.log_transaction('bt2', make_transaction(0))
+        self.cache.log_backtest_result('bt2', {'strategy': 'MACD', 'total_trades': 1})
+        self.assertEqual(self.stored_transactions(), 11)
+        self.assertEqual(self.cache.get_backtest_history()['backtest_id'].tolist(), ['bt2'])
+
+    def test_03_exit_hook_and_indexes(self):
+        """The exit hook flushes live caches; lookup indexes exist."""
+        self.cache.log_transaction('bt1', make_transaction(0))
+        _flush_open_caches()
+        self.assertEqual(self.stored_transactions(), 1)
+
+        conn = sqlite3.connect(self.cache.db_path)
+        try:
+            indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        finally:
+            conn.close()
+        self.assertTrue({'idx_transactions_backtest', 'idx_transactions_symbol',
+                         'idx_transactions_backtest_symbol'} <= indexes)
+
+
+if __name__ == '__main__':
+    unittest.main()
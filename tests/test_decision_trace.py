@@ -0,0 +1,84 @@
+"""
+Tests for the decision trace ring buffer.
+"""
+
+import unittest
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.decision_trace import DecisionTracer, decision_tracer
+from src.strategies import MACDStrategy
+from tests.helpers import make_price_data
+from src.indicators import TechnicalIndicators
+
+
+class TestDecisionTrace(unittest.TestCase):
+    """Test suite for DecisionTracer."""
+
+    def test_01_disabled_by_default(self):
+        """A disabled tracer records nothing."""
+        tracer = DecisionTracer()
+        tracer.record('Test', 'entry', True, {'a': True})
+        self.assertEqual(tracer.get_status()['buffered'], 0)
+
+    def test_02_ring_buffer(self):
+        """Only the most recent records are kept."""
+        tracer = DecisionTracer(enabled=True, capacity=3)
+        for i in range(5):
+            tracer.record('Test', 'entry', i % 2 == 0, {'flag': i}, symbol='AAPL', index=i)
+
+        records = tracer.get_records()
+        self.assertEqual([r['index'] for r in records], [2, 3, 4])
+        self.assertEqual(tracer.get_status()['total_recorded'], 5)
+
+        df = tracer.to_dataframe(symbol='AAPL')
+        self.assertIn('flag', df.columns)
+        self.assertEqual(len(df), 3)
+
+    def test_03_strategy_records_entry_conditions(self):
+        """MACDStrategy.should_entry records its condition vector when tracing is on."""
+        data = TechnicalIndicators().calculate_all_indicators(make_price_data(120))
+        strategy = MACDStrategy()
+
+        decision_tracer.clear()
+        decision_tracer.configure(enabled=True)
+        try:
+            for i in range(len(data)):
+                strategy.should_entry(data, i)
+        finally:
+            decision_tracer.configure(enabled=False)
+
+        records = decision_tracer.get_records(source=strategy.name, event='entry')
+        self.assertEqual(len(records), len(data) - 1)
+        self.assertIn('macd_crossover_up', records[-1]['conditions'])
+        decision_tracer.clear()
+
+    def test_04_strategy_records_exit_decisions(self):
+        """should_exit records why a position is held or closed when tracing is on."""
+        data = TechnicalIndicators().calculate_all_indicators(make_price_data(120))
+        data['symbol'] = 'TEST'
+        strategy = MACDStrategy()
+        entry_price = float(data['close'].iloc[60])
+
+        decision_tracer.clear()
+        decision_tracer.configure(enabled=True)
+        try:
+            decisions = [strategy.should_exit(data, i, entry_price, str(data.index[60].date()))[0]
+                         for i in range(60, len(data))]
+        finally:
+            decision_tracer.configure(enabled=False)
+
+        records = decision_tracer.get_records(source=strategy.name, event='exit', symbol='TEST')
+        self.assertEqual([r['decision'] for r in records], decisions)
+        self.assertIn(True, decisions)
+        closed = next(r for r in records if r['decision'])
+        self.assertIsNotNone(closed['exit_type'])
+        self.assertIn('pnl_pct', closed['conditions'])
+        decision_tracer.clear()
+
+
+if __name__ == '__main__':
+    unittest.main()
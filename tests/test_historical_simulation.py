@@ -0,0 +1,86 @@
+"""
+Tests for the aligned date x symbol simulation in HistoricalBacktestEngine.
+"""
+
+import unittest
+import logging
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.indicators import TechnicalIndicators
+from src.strategies import MACDStrategy
+from src.trading_system import TradingSystem
+from src.real_time_trading.automation_engine import HistoricalBacktestEngine
+from tests.helpers import make_price_data
+
+
+class PerBarMACDStrategy(MACDStrategy):
+    """MACD strategy without a vectorized entry mask."""
+
+    def entry_mask(self, data):
+        return None
+
+
+class StrategyHost:
+    """Trading system holding a single strategy under the engine's strategy name."""
+
+    def __init__(self, strategy):
+        self.strategies = {HistoricalBacktestEngine.STRATEGY_NAME: strategy}
+        self.logger = logging.getLogger(__name__)
+
+    def get_strategy(self, strategy_name):
+        return self.strategies.get(strategy_name)
+
+    def run_strategy_signal(self, strategy_name, data, index):
+        return TradingSystem.run_strategy_signal(self, strategy_name, data, index)
+
+
+class TestHistoricalSimulation(unittest.TestCase):
+    """Vectorized and per-bar signal paths give the same simulation."""
+
+    @classmethod
+    def setUpClass(cls):
+        indicators = TechnicalIndicators()
+        cls.stock_data = {}
+        for seed, symbol in enumerate(['AAA', 'BBB', 'CCC', 'DDD']):
+            data = make_price_data(300, seed=seed)
+            if seed == 1:
+                data = data.iloc[40:]
+            if seed == 2:
+                data = data.drop(data.index[100:120])
+            cls.stock_data[symbol] = indicators.calculate_all_indicators(data)
+        cls.benchmark_data = indicators.calculate_all_indicators(make_price_data(300, seed=9))
+
+    def run_simulation(self, strategy):
+        engine = HistoricalBacktestEngine({'automation.max_positions': 3}, '2020-01-01', '2021-03-01')
+        engine.trading_system = StrategyHost(strategy)
+        return engine._run_simulation(self.stock_data, self.benchmark_data)
+
+    def test_01_matches_per_bar_signals(self):
+        """Trades and portfolio values match per-bar signal evaluation."""
+        vectorized = self.run_simulation(MACDStrategy())
+        per_bar = self.run_simulation(PerBarMACDStrategy())
+
+        self.assertGreater(vectorized['total_trades'], 0)
+        self.assertEqual(vectorized['trades'], per_bar['trades'])
+        self.assertEqual(vectorized['portfolio_values'], per_bar['portfolio_values'])
+        self.assertEqual(vectorized['final_value'], per_bar['final_value'])
+
+    def test_02_output_format(self):
+        """Every date of every symbol is valued and limits are respected."""
+        results = self.run_simulation(MACDStrategy())
+
+        all_dates = set()
+        for data in self.stock_data.values():
+            all_dates.update(str(date) for date in data.index)
+        self.assertEqual([v['date'] for v in results['portfolio_values']], sorted(all_dates))
+        self.assertEqual(len(results['benchmark_values']), len(self.benchmark_data))
+        self.assertLessEqual(len([t for t in results['trades'] if t['action'] == 'BUY']), 3)
+        self.assertEqual(set(results['trades'][0]), {'date', 'symbol', 'action', 'shares', 'price', 'value', 'reason'})
+
+
+if __name__ == '__main__':
+    unittest.main()
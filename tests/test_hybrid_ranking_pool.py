@@ -0,0 +1,136 @@
+"""
+Tests for the bounded, cancellable scoring pool of HybridRankingEngine.
+"""
+
+import unittest
+import tempfile
+import threading
+import time
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.ai_ranking.hybrid_ranking_engine import HybridRankingEngine
+from tests.helpers import StubDataManager
+
+
+class TestHybridRankingPool(unittest.TestCase):
+    """Concurrency is bounded and slow or cancelled runs return partial results."""
+
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.tmp = tempfile.TemporaryDirectory()
+        os.chdir(self.tmp.name)
+        os.makedirs('data')
+        self.release = threading.Event()
+
+    def tearDown(self):
+        # Let abandoned workers finish before their database goes away
+        self.release.set()
+        for thread in threading.enumerate():
+            if thread.name.startswith('hybrid-rank'):
+                thread.join(10)
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def make_engine(self, symbols, blocked=(), **kwargs):
+        """Engine whose OpenAI score blocks for the given symbols until released."""
+        engine = HybridRankingEngine(StubDataManager(symbols), **kwargs)
+        score = engine._calculate_simplified_openai_score
+
+        def openai_score(symbol, stock_data, *args):
+            if symbol in blocked:
+                self.release.wait(10)
+            return score(symbol, stock_data)
+
+        engine._calculate_openai_score = openai_score
+        return engine
+
+    def test_01_bounded_concurrency(self):
+        """No more than max_workers symbols run at once and every symbol is scored."""
+        symbols = [f"S{i:02d}" for i in range(12)]
+        engine = self.make_engine(symbols, max_workers=3)
+        running, peak, lock = [0], [0], threading.Lock()
+        local_score = engine._calculate_local_score
+
+        def tracked(stock_data):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.02)
+            with lock:
+                running[0] -= 1
+            return local_score(stock_data)
+
+        engine._calculate_local_score = tracked
+        result = engine.rank_collection_hybrid('col', max_stocks=12)
+
+        self.assertEqual(sorted(s.symbol for s in result.dual_scores), symbols)
+        self.assertFalse(result.partial)
+        self.assertLessEqual(peak[0], 3)
+        self.assertGreater(peak[0], 1)
+
+    def test_02_symbol_deadline(self):
+        """A stuck symbol is skipped at its deadline while the others are returned."""
+        engine = self.make_engine(['AAA', 'STUCK', 'BBB', 'CCC'], blocked={'STUCK'},
+                                  max_workers=2, symbol_timeout=0.3)
+        start = time.monotonic()
+        result = engine.rank_collection_hybrid('col')
+
+        self.assertLess(time.monotonic() - start, 3)
+        self.assertTrue(result.partial)
+        self.assertEqual(result.skipped_symbols, ['STUCK'])
+        self.assertEqual(sorted(s.symbol for s in result.dual_scores), ['AAA', 'BBB', 'CCC'])
+
+    def test_03_cancel_and_ranking_deadline(self):
+        """Cancelling, or the overall deadline, returns the symbols scored so far."""
+        engine = self.make_engine(['AAA', 'BBB', 'SLOW1', 'SLOW2', 'CCC'], blocked={'SLOW1', 'SLOW2'},
+                                  max_workers=4)
+        threading.Timer(0.3, engine.cancel).start()
+        result = engine.rank_collection_hybrid('col')
+
+        self.assertTrue(result.partial)
+        self.assertEqual(set(result.skipped_symbols), {'SLOW1', 'SLOW2'})
+        self.assertEqual(len(result.dual_scores), 3)
+
+        start = time.monotonic()
+        result = engine.rank_collection_hybrid('col', timeout=0.3)
+        self.assertLess(time.monotonic() - start, 3)
+        self.assertEqual(set(result.skipped_symbols), {'SLOW1', 'SLOW2'})
+
+    def test_04_indicators_loaded_once(self):
+        """Each symbol's indicators are read once per run, fresh or cached analysis."""
+        symbols = ['AAA', 'BBB', 'CCC']
+        engine = self.make_engine(symbols)
+        market_contexts = []
+        get_market_context = engine._get_market_context
+        engine._get_market_context = lambda: market_contexts.append(1) or get_market_context()
+
+        for _ in range(2):
+            engine.data_manager.loads.clear()
+            market_contexts.clear()
+            result = engine.rank_collection_hybrid('col')
+            self.assertEqual(len(result.dual_scores), 3)
+            self.assertEqual(sorted(engine.data_manager.loads), symbols)
+            self.assertEqual(len(market_contexts), 1)
+
+    def test_05_cancel_before_run_starts(self):
+        """A cancel issued before the run starts stops it; the run after that is not cancelled."""
+        symbols = ['AAA', 'BBB', 'CCC']
+        engine = self.make_engine(symbols)
+        engine.cancel()
+        result = engine.rank_collection_hybrid('col')
+
+        self.assertTrue(result.partial)
+        self.assertEqual(result.skipped_symbols, symbols)
+        self.assertEqual(engine.data_manager.loads, [])
+
+        result = engine.rank_collection_hybrid('col')
+        self.assertFalse(result.partial)
+        self.assertEqual(len(result.dual_scores), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+"""
+Tests for the prompt-keyed LLM response cache and its single-flight calls.
+"""
+
+import unittest
+import threading
+import time
+from unittest import mock
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.ai_ranking.llm_response_cache import LLMResponseCache, prompt_key
+from src.ai_ranking.openai_batch_client import AsyncOpenAIBatchClient, ChatRequest
+from src.ai_ranking.openai_integration import OpenAIStockAnalyzer
+from src.ai_ranking.openai_stub_server import StubOpenAIServer
+
+MESSAGES = [{'role': 'user', 'content': 'Analyze AAA'}]
+
+
+def run_together(count, target):
+    """Start count threads on target at once and return their results."""
+    results = [None] * count
+    barrier = threading.Barrier(count)
+
+    def run(i):
+        barrier.wait()
+        try:
+            results[i] = target()
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+    return results
+
+
+class TestLLMResponseCache(unittest.TestCase):
+    """Responses are cached by prompt, expire, and concurrent misses share one call."""
+
+    def test_01_key_and_ttl(self):
+        """The key covers model, prompt and parameters; entries expire after the TTL."""
+        key = prompt_key('gpt-4o-mini', MESSAGES, max_tokens=500, temperature=0.3)
+        self.assertEqual(key, prompt_key('gpt-4o-mini', MESSAGES, temperature=0.3, max_tokens=500))
+        self.assertNotEqual(key, prompt_key('gpt-4o', MESSAGES, max_tokens=500, temperature=0.3))
+        self.assertNotEqual(key, prompt_key('gpt-4o-mini', MESSAGES, max_tokens=500, temperature=0.7))
+
+        cache = LLMResponseCache(ttl_seconds=60)
+        cache.put(key, 'Score: 70', 'gpt-4o-mini', 1000, 1000)
+        self.assertEqual(cache.get(key).value, 'Score: 70')
+        with mock.patch('src.ai_ranking.llm_response_cache.time.time', return_value=time.time() + 61):
+            self.assertIsNone(cache.get(key))
+
+        stats = cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['entries']), (1, 1, 0))
+        self.assertAlmostEqual(stats['cost_avoided_usd'], 0.00075)
+        self.assertEqual(stats['tokens_saved'], 2000)
+
+    def test_02_single_flight_across_threads(self):
+        """Identical concurrent requests make one call and all get its value."""
+        cache = LLMResponseCache()
+        calls = []
+
+        def call():
+            calls.append(1)
+            time.sleep(0.2)
+            return 'Score: 70', 100, 50
+
+        results = run_together(8, lambda: cache.get_or_call('k', call, 'gpt-4o-mini'))
+        self.assertEqual(results, ['Score: 70'] * 8)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(cache.get_or_call('k', call), 'Score: 70')
+
+        stats = cache.stats()
+        self.assertEqual((stats['misses'], stats['shared_in_flight'], stats['hits']), (1, 7, 1))
+        self.assertAlmostEqual(stats['hit_rate'], 8 / 9)
+
+    def test_03_failures_shared_not_cached(self):
+        """Waiters get the leader's error; the next request calls again."""
+        cache = LLMResponseCache()
+        calls = []
+
+        def failing():
+            calls.append(1)
+            time.sleep(0.2)
+            raise RuntimeError('HTTP 500')
+
+        results = run_together(4, lambda: cache.get_or_call('k', failing))
+        self.assertTrue(all(isinstance(result, RuntimeError) for result in results))
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(cache.get_or_call('k', lambda: ('ok', 1, 1)), 'ok')
+
+    def test_04_batch_clients_share_calls_and_cache(self):
+        """Two clients batching the same prompts at once, then again, reach the API once per prompt."""
+        cache = LLMResponseCache()
+        requests = [ChatRequest(messages=[{'role': 'user', 'content': f"Analyze S{i}"}]) for i in range(6)]
+
+        with StubOpenAIServer(latency=0.2) as server:
+            clients = [AsyncOpenAIBatchClient(api_key='stub', base_url=server.base_url, cache=cache)
+                       for _ in range(2)]
+            dashboard, scheduler = run_together(2, lambda: clients.pop().run_batch(requests))
+            again = AsyncOpenAIBatchClient(api_key='stub', base_url=server.base_url, cache=cache).run_batch(requests)
+
+        self.assertEqual(server.stats['requests'], 6)
+        self.assertEqual([r.content for r in dashboard], [r.content for r in scheduler])
+        self.assertEqual([r.content for r in again], [r.content for r in dashboard])
+        stats = cache.stats()
+        self.assertEqual((stats['misses'], stats['shared_in_flight'], stats['hits']), (6, 6, 6))
+        self.assertGreater(stats['cost_avoided_usd'], 0)
+
+    def test_05_analyzers_share_across_collections(self):
+        """The same prompt analysed for two collections is sent once."""
+        cache = LLMResponseCache()
+        technical_data = {'current_price': 101.5, 'rsi': 55.0, 'macd': 0.4, 'macd_signal': 0.2,
+                          'sma_20': 100.0, 'sma_50': 98.0, 'volume': 1e6}
+        market_context = {'market_regime': 'bullish', 'volatility_level': 'low'}
+
+        with StubOpenAIServer(latency=0.05) as server:
+            with mock.patch.dict(os.environ, {'OPENAI_API_KEY': 'stub', 'OPENAI_BASE_URL': server.base_url}):
+                first = OpenAIStockAnalyzer(response_cache=cache)
+                second = OpenAIStockAnalyzer(response_cache=cache)
+                a = first.analyze_stock_comprehensive('AAA', technical_data, market_context)
+                b = second.analyze_stock_comprehensive('AAA', technical_data, market_context)
+                batched = second.analyze_stocks_comprehensive({'AAA': (technical_data, market_context)})
+
+        self.assertEqual(server.stats['requests'], 1)
+        self.assertEqual(a, b)
+        self.assertEqual(batched['AAA'], a)
+        self.assertEqual(cache.stats()['hits'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
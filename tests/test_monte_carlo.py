@@ -0,0 +1,81 @@
+"""
+Tests for the Monte Carlo robustness analysis.
+"""
+
+import unittest
+from unittest import mock
+import numpy as np
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.backtesting.monte_carlo import MonteCarloAnalyzer, TRADE_BOOTSTRAP, BLOCK_BOOTSTRAP
+from src.backtesting.vectorized_engine import VectorizedBacktestEngine
+from src.backtesting.strategies import MACDStrategy
+from tests.helpers import make_price_data, add_backtest_indicators, make_engine
+
+
+class TestMonteCarloAnalyzer(unittest.TestCase):
+    """Resampled distributions are reproducible and consistent with their paths."""
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.equity = 100000 * np.cumprod(np.r_[1.0, 1 + rng.normal(0.0005, 0.01, 500)])
+
+    def test_01_block_bootstrap(self):
+        """Seeded runs repeat, batches do not change results and metrics are in range."""
+        first = MonteCarloAnalyzer(2000, seed=3).analyze(self.equity, method=BLOCK_BOOTSTRAP)
+        second = MonteCarloAnalyzer(2000, seed=3).analyze(self.equity, method=BLOCK_BOOTSTRAP)
+        np.testing.assert_array_equal(first.final_equity, second.final_equity)
+
+        self.assertEqual(first.final_equity.shape, (2000,))
+        self.assertTrue((first.max_drawdown <= 0).all())
+        self.assertTrue(0 <= first.risk_of_ruin <= 1)
+
+        # A block as long as the series reproduces the original path exactly
+        whole = MonteCarloAnalyzer(5, seed=1, block_size=len(self.equity)).analyze(self.equity)
+        np.testing.assert_allclose(whole.final_equity, self.equity[-1])
+
+    def test_02_trade_bootstrap_ruin(self):
+        """With only losing trades a path is ruined exactly when it ends below the ruin level."""
+        results = MonteCarloAnalyzer(500, seed=0, ruin_threshold=0.25).bootstrap_trades(
+            np.array([-20000.0, -5000.0, -1000.0]), 100000.0)
+        self.assertTrue(0 < results.risk_of_ruin < 1)
+        np.testing.assert_array_equal(results.ruined, results.final_equity <= 75000.0)
+        self.assertEqual(results.probability_of_loss, 1.0)
+
+        summary = results.to_dict()
+        self.assertEqual(summary['method'], TRADE_BOOTSTRAP)
+        self.assertLessEqual(summary['final_equity']['p5'], summary['final_equity']['p95'])
+
+    def test_03_backtest_engine_results(self):
+        """BacktestEngine exposes the analysis for its own results."""
+        engine = make_engine(VectorizedBacktestEngine)
+        data = add_backtest_indicators(make_price_data(600, seed=2)).reset_index().rename(columns={'index': 'Date'})
+        strategy = MACDStrategy()
+        engine._simulate(strategy, data)
+        results = engine._build_results(strategy, 'TEST')
+
+        summary = engine.run_monte_carlo(results, n_simulations=300, seed=5, method=TRADE_BOOTSTRAP)
+        self.assertEqual(summary['n_simulations'], 300)
+        self.assertEqual(summary, engine.run_monte_carlo(results, n_simulations=300, seed=5, method=TRADE_BOOTSTRAP))
+
+    def test_04_failed_analysis_keeps_backtest(self):
+        """A Monte Carlo analysis that cannot run reports its error next to the backtest results."""
+        engine = make_engine(VectorizedBacktestEngine)
+        data = add_backtest_indicators(make_price_data(300, seed=2)).reset_index().rename(columns={'index': 'Date'})
+        with mock.patch.object(engine, 'load_data', return_value=data):
+            results = engine.run_backtest(MACDStrategy(), 'col', 'TEST', monte_carlo_simulations=100,
+                                          monte_carlo_method='unknown')
+
+        self.assertNotIn('error', results)
+        self.assertIn('equity_curve', results)
+        self.assertEqual(results['monte_carlo'], {'error': 'Unknown Monte Carlo method: unknown'})
+        with self.assertRaises(ValueError):
+            MonteCarloAnalyzer(10).bootstrap_trades(np.array([]), 100000.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
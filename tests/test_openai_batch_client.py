@@ -0,0 +1,160 @@
+"""
+Tests for the async batched OpenAI client against the local stub server.
+"""
+
+import unittest
+import tempfile
+import time
+from unittest import mock
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.ai_ranking.openai_batch_client import AsyncOpenAIBatchClient, ChatRequest, RateLimiter
+from src.ai_ranking.openai_stub_server import StubOpenAIServer
+from src.ai_ranking.hybrid_ranking_engine import HybridRankingEngine
+from tests.helpers import StubDataManager, VersionedDataManager
+
+
+def make_requests(count: int, distinct: int = None):
+    distinct = distinct or count
+    return [ChatRequest(messages=[{'role': 'user', 'content': f"Analyze SYM{i % distinct:03d}"}])
+            for i in range(count)]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestOpenAIBatchClient(unittest.TestCase):
+    """Requests run concurrently under the cap, retry transient errors and coalesce."""
+
+    def test_01_concurrency_cap_and_throughput(self):
+        """A batch overlaps requests, never more than max_concurrency at once."""
+        with StubOpenAIServer(latency=0.1) as server:
+            client = AsyncOpenAIBatchClient(api_key='stub', base_url=server.base_url, max_concurrency=4)
+            start = time.monotonic()
+            results = client.run_batch(make_requests(16))
+            elapsed = time.monotonic() - start
+
+        self.assertTrue(all(result.ok for result in results))
+        self.assertIn('Score:', results[0].content)
+        self.assertEqual(server.stats['max_in_flight'], 4)
+        self.assertLess(elapsed, 16 * 0.1 / 2)
+        self.assertEqual(client.stats.api_calls, 16)
+
+    def test_02_retries_rate_limits_and_errors(self):
+        """429s and 500s are retried until every request succeeds."""
+        with StubOpenAIServer(latency=0.01, error_rate=0.15, rate_limit_rate=0.15,
+                              retry_after=0.05, seed=7) as server:
+            client = AsyncOpenAIBatchClient(api_key='stub', base_url=server.base_url, max_concurrency=8,
+                                            max_retries=8)
+            with mock.patch('src.ai_ranking.openai_batch_client.BACKOFF_BASE', 0.01):
+                results = client.run_batch(make_requests(30))
+
+        self.assertTrue(all(result.ok for result in results))
+        self.assertGreater(client.stats.retries, 0)
+        self.assertEqual(client.stats.rate_limited, server.stats['rate_limited'])
+        self.assertEqual(client.stats.api_calls, server.stats['requests'])
+        self.assertEqual(client.stats.failures, 0)
+
+    def test_03_identical_requests_coalesced(self):
+        """Duplicate requests in a batch share one API call and its result."""
+        with StubOpenAIServer(latency=0.05) as server:
+            client = AsyncOpenAIBatchClient(api_key='stub', base_url=server.base_url)
+            results = client.run_batch(make_requests(12, distinct=3))
+
+        self.assertEqual(server.stats['requests'], 3)
+        self.assertEqual(client.stats.coalesced, 9)
+        self.assertEqual(results[0].content, results[3].content)
+        self.assertNotEqual(results[0].content, results[1].content)
+
+    def test_04_rate_limiter_budgets(self):
+        """Requests and tokens beyond a minute's budget wait for the buckets to refill."""
+        clock = FakeClock()
+        limiter = RateLimiter(requests_per_minute=60, tokens_per_minute=1000, clock=clock)
+
+        for _ in range(60):
+            self.assertEqual(limiter.try_acquire(10), 0.0)
+        self.assertAlmostEqual(limiter.try_acquire(10), 1.0)
+        clock.now = 1.0
+        self.assertEqual(limiter.try_acquire(10), 0.0)
+
+        # Tokens: 390 left; 500 more need 110 tokens refilled at 1000/min
+        clock.now = 120.0
+        self.assertEqual(limiter.try_acquire(600), 0.0)
+        limiter.settle(600, 610)
+        self.assertAlmostEqual(limiter.try_acquire(500), 110 * 60 / 1000)
+
+        limiter.pause(5)
+        clock.now = 300.0
+        self.assertEqual(limiter.try_acquire(1), 0.0)
+
+    def test_05_timeout_leaves_unfinished_out(self):
+        """Requests still running at the batch timeout come back as None."""
+        with StubOpenAIServer(latency=0.5) as server:
+            client = AsyncOpenAIBatchClient(api_key='stub', base_url=server.base_url, max_concurrency=2)
+            start = time.monotonic()
+            results = client.run_batch(make_requests(6), timeout=0.8)
+
+        self.assertLess(time.monotonic() - start, 2)
+        self.assertEqual(sum(1 for result in results if result is not None), 2)
+
+    def test_06_hybrid_ranking_prefetches_in_one_batch(self):
+        """A hybrid ranking sends its fresh analyses through the batch client."""
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as tmp, StubOpenAIServer(latency=0.05) as server:
+            os.chdir(tmp)
+            os.makedirs('data')
+            try:
+                with mock.patch.dict(os.environ, {'OPENAI_API_KEY': 'stub', 'OPENAI_BASE_URL': server.base_url}):
+                    engine = HybridRankingEngine(StubDataManager(['AAA', 'BBB', 'CCC', 'DDD']))
+                    single = engine.openai_analyzer.client.chat.completions
+                    with mock.patch.object(single, 'create', side_effect=AssertionError('per-symbol call')):
+                        result = engine.rank_collection_hybrid('col')
+            finally:
+                os.chdir(cwd)
+
+        self.assertEqual(len(result.dual_scores), 4)
+        self.assertEqual(server.stats['completions'], 4)
+        self.assertTrue(all(30 <= score.openai_score <= 90 for score in result.dual_scores))
+        self.assertEqual(engine.openai_analyzer.batch_client.stats.api_calls, 4)
+
+    def test_07_slow_prefetch_leaves_time_to_score(self):
+        """A prefetch that runs to its timeout does not leave the ranking without scores."""
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as tmp:
+            os.chdir(tmp)
+            os.makedirs('data')
+            try:
+                data_manager = VersionedDataManager(['AAA', 'BBB', 'CCC'])
+                engine = HybridRankingEngine(data_manager)
+                engine._calculate_openai_score = lambda symbol, *args: 70.0
+                engine.rank_collection_hybrid('col')
+
+                def stalled(items, timeout, cancel_event):
+                    time.sleep(timeout)
+                    return {}
+
+                data_manager.update('AAA', 80.0)
+                with mock.patch.object(engine.openai_analyzer, 'is_available', return_value=True), \
+                        mock.patch.object(engine.openai_analyzer, 'analyze_stocks_comprehensive',
+                                          side_effect=stalled) as prefetch:
+                    result = engine.rank_collection_hybrid('col', timeout=1.0)
+            finally:
+                os.chdir(cwd)
+
+        self.assertEqual(list(prefetch.call_args.args[0]), ['AAA'])
+        self.assertLessEqual(prefetch.call_args.kwargs['timeout'], 0.5)
+        self.assertFalse(result.partial)
+        self.assertEqual(sorted(score.symbol for score in result.dual_scores), ['AAA', 'BBB', 'CCC'])
+
+
+if __name__ == '__main__':
+    unittest.main()
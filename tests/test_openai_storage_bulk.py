@@ -0,0 +1,109 @@
+"""
+Tests for the bulk freshness check of OpenAIAnalysisStorage.
+"""
+
+import unittest
+import tempfile
+import sqlite3
+from unittest import mock
+import numpy as np
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.ai_ranking import openai_storage
+from src.ai_ranking.openai_storage import OpenAIAnalysisStorage, canonical_bytes
+from src.ai_ranking.hybrid_ranking_engine import HybridRankingEngine
+from tests.helpers import StubDataManager
+
+MARKET_CONTEXT = {'market_regime': 'bullish', 'volatility_level': 'moderate', 'sector_performance': 'mixed'}
+
+
+def technical_data(i: int) -> dict:
+    return {'current_price': np.float64(100 + i), 'rsi': np.float64(50 + i % 30), 'macd': np.float64(0.1 * i),
+            'macd_signal': np.float64(0.2), 'sma_20': np.float64(99.0), 'sma_50': np.float64(98.0),
+            'volume': np.int64(1000000 + i)}
+
+
+class TestOpenAIStorageBulk(unittest.TestCase):
+    """One query answers freshness for all symbols, the same as the per-symbol checks."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.storage = OpenAIAnalysisStorage(os.path.join(self.tmp.name, 'analysis.db'))
+        self.symbols = [f"S{i:02d}" for i in range(12)]
+        for i, symbol in enumerate(self.symbols[:9]):
+            self.storage.store_analysis_result(symbol, 'col', {'score': 60 + i}, technical_data(i), MARKET_CONTEXT)
+
+        # Older rows must not win, nor rows from another collection
+        with sqlite3.connect(self.storage.db_path) as conn:
+            conn.execute("INSERT INTO openai_analysis (symbol, collection_id, analysis_date, data_hash, openai_score) "
+                         "VALUES ('S00', 'col', '2000-01-01', 'old', 1.0)")
+            conn.execute("INSERT INTO openai_analysis (symbol, collection_id, analysis_date, data_hash, openai_score) "
+                         "VALUES ('S09', 'other', '2999-01-01', 'other', 1.0)")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_01_canonical_bytes(self):
+        """Key order and NumPy scalar types do not change the encoding; values and types do."""
+        data = technical_data(3)
+        plain = {key: value.item() for key, value in reversed(list(data.items()))}
+        self.assertEqual(canonical_bytes(data), canonical_bytes(plain))
+        self.assertNotEqual(canonical_bytes(data), canonical_bytes(technical_data(4)))
+        self.assertNotEqual(canonical_bytes({'a': 1}), canonical_bytes({'a': 1.0}))
+        self.assertNotEqual(canonical_bytes({'a': 'b', 'c': None}), canonical_bytes({'a': 'bc', 'c': None}))
+        self.assertEqual(canonical_bytes({'x': [1, 'a', {'k': 2.5}]}), canonical_bytes({'x': (1, 'a', {'k': 2.5})}))
+
+    def test_02_latest_analyses_match_per_symbol(self):
+        """Bulk reads equal get_latest_analysis, across query chunks."""
+        with mock.patch.object(openai_storage, 'BULK_QUERY_CHUNK', 4):
+            latest = self.storage.get_latest_analyses('col', self.symbols)
+
+        self.assertEqual(sorted(latest), self.symbols[:9])
+        for symbol in self.symbols:
+            self.assertEqual(latest.get(symbol), self.storage.get_latest_analysis(symbol, 'col'))
+
+    def test_03_needing_analysis_in_one_query(self):
+        """Changed and never analysed symbols are found with one connection."""
+        data = {symbol: technical_data(i) for i, symbol in enumerate(self.symbols)}
+        data['S02'] = technical_data(50)
+        expected = [symbol for symbol in self.symbols
+                    if self.storage.check_data_changed(symbol, 'col', data[symbol], MARKET_CONTEXT)]
+
+        with mock.patch.object(openai_storage.sqlite3, 'connect', wraps=sqlite3.connect) as connect:
+            needing = self.storage.get_symbols_needing_analysis('col', self.symbols, data, MARKET_CONTEXT)
+
+        self.assertEqual(needing, expected)
+        self.assertEqual(needing, ['S02', 'S09', 'S10', 'S11'])
+        self.assertEqual(connect.call_count, 1)
+
+        changed_context = dict(MARKET_CONTEXT, market_regime='bearish')
+        self.assertEqual(self.storage.get_symbols_needing_analysis('col', self.symbols, data, changed_context),
+                         self.symbols)
+
+    def test_04_hybrid_ranking_reads_stored_analyses_in_bulk(self):
+        """A ranking with unchanged data takes stored scores without per-symbol reads."""
+        cwd = os.getcwd()
+        os.chdir(self.tmp.name)
+        os.makedirs('data')
+        try:
+            engine = HybridRankingEngine(StubDataManager(['AAA', 'BBB', 'CCC']))
+            engine._calculate_openai_score = lambda symbol, *args: 71.0
+            first = engine.rank_collection_hybrid('col')
+
+            with mock.patch.object(engine.openai_storage, 'get_latest_analysis',
+                                   side_effect=AssertionError('per-symbol read')):
+                engine._calculate_openai_score = lambda symbol, *args: 10.0
+                second = engine.rank_collection_hybrid('col')
+        finally:
+            os.chdir(cwd)
+
+        self.assertEqual(len(first.dual_scores), 3)
+        self.assertEqual([score.openai_score for score in second.dual_scores], [71.0] * 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+"""
+Tests for batch performance metrics over a matrix of equity curves.
+"""
+
+import unittest
+import warnings
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.backtesting import performance_analytics
+from src.backtesting.performance_analytics import PerformanceAnalytics
+
+
+class TestPerformanceMetricsBatch(unittest.TestCase):
+    """Column-wise metrics equal the per-curve calculation."""
+
+    def setUp(self):
+        rng = np.random.default_rng(2)
+        index = pd.date_range('2021-01-01', periods=300, freq='B')
+        self.equity = pd.DataFrame(100000 * np.cumprod(1 + rng.normal(0.0003, 0.012, (300, 12)), axis=0),
+                                   index=index, columns=[f'curve_{i}' for i in range(12)])
+        self.benchmark = rng.normal(0.0003, 0.01, 299)
+        self.analytics = PerformanceAnalytics()
+
+    def test_01_matches_single_curve_metrics(self):
+        """Every batch column equals calculate_performance_metrics for that curve."""
+        batch = self.analytics.calculate_performance_metrics_batch(self.equity, benchmark_returns=self.benchmark)
+        self.assertEqual(list(batch.index), list(self.equity.columns))
+        self.assertIn('best_month', batch.columns)
+
+        benchmark = pd.Series(self.benchmark, index=self.equity.index[1:])
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', FutureWarning)
+            for name in self.equity.columns:
+                expected = self.analytics.calculate_performance_metrics(self.equity[name], [], benchmark)
+                for metric in batch.columns:
+                    self.assertAlmostEqual(batch.loc[name, metric], getattr(expected, metric), places=9,
+                                           msg=f"{name} {metric}")
+
+    def test_02_batches_and_arrays(self):
+        """Splitting columns into batches and passing a bare array give the same values."""
+        full = self.analytics.calculate_performance_metrics_batch(self.equity.to_numpy())
+        self.assertEqual(list(full.index), list(range(12)))
+        self.assertNotIn('best_month', full.columns)
+
+        original = performance_analytics.MAX_BATCH_CELLS
+        performance_analytics.MAX_BATCH_CELLS = 300 * 5
+        try:
+            batched = self.analytics.calculate_performance_metrics_batch(self.equity.to_numpy())
+        finally:
+            performance_analytics.MAX_BATCH_CELLS = original
+        pd.testing.assert_frame_equal(batched, full)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+"""
+Tests for incremental position state used by strategy exit evaluation.
+"""
+
+import unittest
+import pandas as pd
+import numpy as np
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.strategies import MACDStrategy, PositionState
+
+
+class TestPositionState(unittest.TestCase):
+    """Test suite for PositionState and its use in MACDStrategy.should_exit."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        index = pd.bdate_range('2023-01-02', periods=10)
+        # Peak of 200 before the entry on 2023-01-06 (index 4) must not count as drawdown
+        self.data = pd.DataFrame({
+            'close': [200.0, 180.0, 150.0, 120.0, 100.0, 101.0, 102.0, 103.0, 102.5, 103.5]
+        }, index=index)
+        self.strategy = MACDStrategy()
+        self.strategy.exit_conditions.update({
+            'take_profit_pct': 50.0,
+            'stop_loss_pct': 50.0,
+            'max_hold_days': 100,
+            'max_drawdown_pct': 6.0
+        })
+
+    def test_01_from_history(self):
+        """State built from history covers only the bars since entry."""
+        state = PositionState.from_history(self.data, 7, 100.0, '2023-01-06')
+
+        self.assertEqual(state.entry_index, 4)
+        self.assertEqual(state.bars_held, 3)
+        self.assertEqual(state.peak_price, 103.0)
+        self.assertEqual(state.days_held(self.data.index[7]), 5)
+        self.assertAlmostEqual(state.pnl_pct(103.0), 3.0)
+
+    def test_02_incremental_matches_rebuild(self):
+        """Advancing bar by bar gives the same state as rebuilding from history."""
+        state = PositionState.from_history(self.data, 4, 100.0, '2023-01-06')
+        for i in range(5, len(self.data)):
+            self.assertTrue(state.advance(self.data, i))
+            rebuilt = PositionState.from_history(self.data, i, 100.0, '2023-01-06')
+            self.assertEqual(state, rebuilt)
+
+        # Jumping backwards requires a rebuild
+        self.assertFalse(state.advance(self.data, 5))
+
+    def test_03_drawdown_measured_since_entry(self):
+        """should_exit does not treat pre-entry highs as drawdown."""
+        for i in range(4, len(self.data)):
+            should_exit, reason = self.strategy.should_exit(self.data, i, 100.0, '2023-01-06')
+            self.assertNotEqual(reason.get('exit_type'), 'drawdown')
+
+        self.assertEqual(len(self.strategy.position_states), 1)
+        self.strategy.reset()
+        self.assertEqual(len(self.strategy.position_states), 0)
+
+    def test_04_state_tied_to_its_frame(self):
+        """A position with the same entry on another frame or symbol does not reuse the state."""
+        self.strategy.should_exit(self.data, 7, 100.0, '2023-01-06')
+        other = self.data.copy()
+        other['close'] = other['close'] * 2
+        state = self.strategy.get_position_state(other, 7, 100.0, '2023-01-06')
+        self.assertEqual(state.peak_price, 206.0)
+
+        first, second = self.data.assign(symbol='AAA'), self.data.assign(symbol='BBB')
+        self.strategy.reset()
+        self.strategy.get_position_state(first, 7, 100.0, '2023-01-06')
+        self.strategy.get_position_state(second, 7, 100.0, '2023-01-06')
+        self.assertEqual(sorted(key[0] for key in self.strategy.position_states), ['AAA', 'BBB'])
+
+        self.strategy.release_position_state(100.0, '2023-01-06', 'AAA')
+        self.assertEqual([key[0] for key in self.strategy.position_states], ['BBB'])
+
+    def test_05_released_by_signal_loop(self):
+        """The row-by-row signal loop leaves no position state behind."""
+        self.strategy.exit_conditions['max_hold_days'] = 2
+        signals = self.data.assign(signal=0, strength=0.0, confidence=0.0, reason='')
+        self.strategy._generate_signals_iterative(signals)
+
+        self.assertIn(-1, signals['signal'].tolist())
+        self.assertEqual(self.strategy.position_states, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+"""
+Tests for compiled strategy profiles.
+"""
+
+import unittest
+import numpy as np
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.indicators import TechnicalIndicators
+from src.strategies import compile_profile, compile_profiles, evaluate_profiles
+from tests.helpers import make_price_data
+
+
+def weighted_score(row, profile_config):
+    """Row-by-row weighted score as computed by the MACD profile strategies."""
+    score = 0.0
+    for condition, weight in profile_config['entry_weights'].items():
+        if condition == 'rsi_neutral':
+            low, high = profile_config['rsi_range']
+            if low <= row.get('rsi', 50) <= high:
+                score += weight
+        elif row.get(condition, False):
+            score += weight
+    return score
+
+
+class TestProfileCompiler(unittest.TestCase):
+    """Compiled profiles must score like the row-by-row weighted sum."""
+
+    def setUp(self):
+        self.data = TechnicalIndicators().calculate_all_indicators(make_price_data())
+        self.profiles_config = {
+            'balanced': {
+                'entry_weights': {'macd_crossover_up': 0.5, 'rsi_neutral': 0.3,
+                                  'price_above_ema_short': 0.1, 'price_above_ema_long': 0.1},
+                'entry_threshold': 0.3, 'rsi_range': [40, 60], 'take_profit_pct': 5.0
+            },
+            'conservative': {
+                'entry_weights': {'macd_crossover_up': 0.4, 'rsi_neutral': 0.4,
+                                  'price_above_ema_short': 0.1, 'price_above_ema_long': 0.1},
+                'entry_threshold': 0.6, 'rsi_range': [45, 55]
+            },
+            'volume': {
+                'entry_weights': {'volume_above_ma': 0.5, 'macd_bullish': 0.5},
+                'entry_threshold': 1.0
+            }
+        }
+
+    def test_01_compiled_score_matches_row_score(self):
+        """A compiled profile scores every row like the weighted sum."""
+        for name, profile_config in self.profiles_config.items():
+            profile = compile_profile(name, profile_config)
+            expected = np.array([weighted_score(row, profile_config) for _, row in self.data.iterrows()])
+            np.testing.assert_allclose(profile.score(self.data), expected, err_msg=name)
+            np.testing.assert_array_equal(profile.entry_mask(self.data),
+                                          expected >= profile_config['entry_threshold'] - 1e-9, err_msg=name)
+
+        self.assertEqual(compile_profile('balanced', self.profiles_config['balanced']).exit_conditions,
+                         {'take_profit_pct': 5.0})
+
+    def test_02_evaluate_profiles_in_one_pass(self):
+        """evaluate_profiles returns the same scores as each profile on its own."""
+        profiles = compile_profiles(self.profiles_config)
+        result = evaluate_profiles(self.data, profiles)
+
+        self.assertEqual(list(result['scores'].columns), list(self.profiles_config))
+        for name, profile in profiles.items():
+            np.testing.assert_allclose(result['scores'][name].to_numpy(), profile.score(self.data))
+            np.testing.assert_array_equal(result['entries'][name].to_numpy(), profile.entry_mask(self.data))
+
+    def test_03_compile_configured_profiles(self):
+        """Profiles are compiled from settings.yaml by default."""
+        profiles = compile_profiles()
+        self.assertIn('balanced', profiles)
+        self.assertAlmostEqual(profiles['aggressive'].threshold, 0.2)
+        self.assertEqual(profiles['conservative'].rsi_range, (45.0, 55.0))
+
+
+if __name__ == '__main__':
+    unittest.main()
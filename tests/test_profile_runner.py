@@ -0,0 +1,84 @@
+"""
+Tests for the multi-profile comparison runner.
+"""
+
+import unittest
+import numpy as np
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.backtesting.profile_runner import ProfileComparisonRunner
+from src.strategies import MACDCanonicalStrategy, compile_profiles
+from tests.helpers import make_price_data
+
+
+class CollectionStore:
+    """In-memory stand-in for DataCollectionManager."""
+
+    def __init__(self, symbol_data):
+        self.symbol_data = symbol_data
+        self.loads = []
+
+    def get_collection_symbols(self, collection_id):
+        return list(self.symbol_data)
+
+    def get_symbol_data(self, collection_id, symbol):
+        self.loads.append(symbol)
+        return self.symbol_data[symbol].reset_index().rename(columns={'index': 'Date'})
+
+
+class TestProfileComparisonRunner(unittest.TestCase):
+    """The runner evaluates every variant against shared per-symbol data."""
+
+    def setUp(self):
+        self.profiles = compile_profiles()
+        self.symbol_data = {symbol: make_price_data(300, seed=seed) for seed, symbol in enumerate(['AAA', 'BBB', 'CCC'])}
+
+    def test_01_profile_trades_match_bar_loop(self):
+        """Jumping from entry to exit gives the same trades as a bar-by-bar loop."""
+        runner = ProfileComparisonRunner(self.profiles)
+        data = runner.prepare_data(self.symbol_data['AAA'])
+        profile = self.profiles['balanced']
+        entries = profile.entry_mask(data)
+        trades = runner._simulate_profile(data, entries, profile)
+
+        close = data['close'].to_numpy()
+        expected = []
+        entry = None
+        for i in range(len(data)):
+            if entry is None:
+                if entries[i] and i < len(data) - 1:
+                    entry, peak = i, close[i]
+                continue
+            peak = max(peak, close[i])
+            pnl = (close[i] - close[entry]) / close[entry] * 100
+            held = (data.index[i] - data.index[entry]).days
+            if (pnl >= profile.exit_conditions['take_profit_pct'] or pnl <= -profile.exit_conditions['stop_loss_pct']
+                    or held >= profile.exit_conditions['max_hold_days']
+                    or (close[i] - peak) / peak * 100 <= -profile.exit_conditions['max_drawdown_pct']
+                    or data['macd_crossover_down'].iloc[i] or i == len(data) - 1):
+                expected.append((entry, i))
+                entry = None
+
+        self.assertGreater(len(trades), 0)
+        self.assertEqual([(t['entry_index'], t['exit_index']) for t in trades], expected)
+
+    def test_02_run_collection_loads_each_symbol_once(self):
+        """Each symbol is loaded once for all variants and the table has one row per variant."""
+        variants = dict(self.profiles)
+        variants['canonical_strategy'] = MACDCanonicalStrategy()
+        store = CollectionStore(self.symbol_data)
+
+        result = ProfileComparisonRunner(variants, data_manager=store).run_collection('test')
+
+        self.assertEqual(sorted(store.loads), sorted(self.symbol_data))
+        self.assertEqual(len(result['details']), len(variants) * len(self.symbol_data))
+        self.assertEqual(set(result['comparison'].index), set(variants))
+        self.assertTrue((result['comparison']['symbols'] == len(self.symbol_data)).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+"""
+Tests for the persistent ranking index and incremental hybrid rankings.
+"""
+
+import unittest
+import tempfile
+from unittest import mock
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.ai_ranking.ranking_index import RankingIndex, IndexedScore
+from src.ai_ranking.hybrid_ranking_engine import HybridRankingEngine
+from tests.helpers import VersionedDataManager
+
+
+class TestRankingIndex(unittest.TestCase):
+    """Scores stay ranked as they are patched, and persist between instances."""
+
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.tmp = tempfile.TemporaryDirectory()
+        os.chdir(self.tmp.name)
+        os.makedirs('data')
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def test_01_patch_order_and_persist(self):
+        """Updates move symbols to their place; another instance sees the writes."""
+        index = RankingIndex()
+        index.update('col', [IndexedScore(s, score, 'v1', {'symbol': s})
+                             for s, score in [('AAA', 50), ('BBB', 70), ('CCC', 60), ('DDD', 60)]])
+        self.assertEqual([e.symbol for e in index.ranked('col')], ['BBB', 'CCC', 'DDD', 'AAA'])
+
+        index.update('col', [IndexedScore('AAA', 80, 'v2', {'symbol': 'AAA'}),
+                             IndexedScore('BBB', 10, 'v2', {'symbol': 'BBB'})])
+        self.assertEqual([e.symbol for e in index.top('col', 2)], ['AAA', 'CCC'])
+        self.assertEqual(index.stale_symbols('col', {'AAA': 'v2', 'BBB': 'v1', 'EEE': 'v1'}), ['BBB', 'EEE'])
+
+        other = RankingIndex()
+        self.assertEqual([e.symbol for e in other.ranked('col')], ['AAA', 'CCC', 'DDD', 'BBB'])
+        self.assertEqual(other.retain('col', ['AAA', 'BBB', 'DDD']), ['CCC'])
+        self.assertEqual([e.symbol for e in index.ranked('col', ['DDD', 'BBB', 'CCC'])], ['DDD', 'BBB'])
+        self.assertEqual(index.ranked('other'), [])
+
+    def test_02_incremental_rescores_changed_symbols(self):
+        """Only updated symbols are rescored and the ranking equals a full one."""
+        symbols = [f"S{i:02d}" for i in range(8)]
+        data_manager = VersionedDataManager(symbols)
+        engine = HybridRankingEngine(data_manager)
+        engine._calculate_openai_score = lambda symbol, stock_data, *args: float(stock_data['rsi'].iloc[-1])
+
+        first = engine.rank_collection_incremental('col')
+        self.assertEqual(sorted(first.rescored_symbols), symbols)
+
+        with mock.patch.object(engine, '_score_collection', side_effect=AssertionError('rescored')):
+            unchanged = engine.rank_collection_incremental('col')
+        self.assertEqual(unchanged.rescored_symbols, [])
+        self.assertEqual(unchanged.dual_scores, first.dual_scores)
+
+        data_manager.update('S03', 90.0)
+        data_manager.update('S05', 10.0)
+        data_manager.loads.clear()
+        patched = engine.rank_collection_incremental('col')
+        self.assertEqual(sorted(patched.rescored_symbols), ['S03', 'S05'])
+        self.assertEqual(sorted(data_manager.loads), ['S03', 'S05'])
+        self.assertEqual(patched.dual_scores[0].symbol, 'S03')
+        self.assertEqual(patched.dual_scores[-1].symbol, 'S05')
+
+        full = engine.rank_collection_hybrid('col')
+        self.assertEqual([(s.symbol, s.openai_score, s.local_score) for s in patched.dual_scores],
+                         [(s.symbol, s.openai_score, s.local_score) for s in full.dual_scores])
+
+        # A new engine ranks from the persisted index without rescoring
+        fresh = HybridRankingEngine(data_manager)
+        with mock.patch.object(fresh, '_score_collection', side_effect=AssertionError('rescored')):
+            restored = fresh.rank_collection_incremental('col', max_stocks=4)
+        self.assertEqual([s.symbol for s in restored.dual_scores],
+                         [s.symbol for s in patched.dual_scores if s.symbol in symbols[:4]])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+"""
+Tests for progressive ranking streams.
+"""
+
+import unittest
+import tempfile
+import threading
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.ai_ranking.ranking_stream import RankingStream, RunningTopN, format_sse
+from src.ai_ranking.ranking_engine import StockRankingEngine
+from src.ai_ranking.hybrid_ranking_engine import HybridRankingEngine
+from src.data_collection.integration import DataCollectionAIIntegration
+from tests.helpers import VersionedDataManager
+
+
+class TestRankingStream(unittest.TestCase):
+    """Scores reach the stream as they are produced, with the running top-N."""
+
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.tmp = tempfile.TemporaryDirectory()
+        os.chdir(self.tmp.name)
+        os.makedirs('data')
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def test_01_running_top_n(self):
+        """The top-N keeps the best items in order; ties keep arrival order."""
+        top = RunningTopN(3, key=lambda item: item[1])
+        positions = [top.add(item) for item in [('A', 5), ('B', 9), ('C', 5), ('D', 1), ('E', 7)]]
+        self.assertEqual(positions, [1, 1, 3, None, 2])
+        self.assertEqual([name for name, _ in top.items()], ['B', 'E', 'A'])
+
+    def test_02_events_until_done(self):
+        """Each push is one score event; the stream ends with the ranking's result."""
+        stream = RankingStream(key=lambda item: item['score'], to_dict=dict, top_n=2, total=3)
+
+        def ranking():
+            for score in (40, 80, 60):
+                stream.push({'symbol': f"S{score}", 'score': score})
+            return {'success': True}
+
+        stream.run(ranking)
+        events = list(stream.events(heartbeat=5))
+        self.assertEqual([event for event, _ in events], ['score'] * 3 + ['done'])
+        last = events[2][1]
+        self.assertEqual((last['scored'], last['total'], last['top_position']), (3, 3, 2))
+        self.assertEqual([item['symbol'] for item in last['top']], ['S80', 'S60'])
+        self.assertEqual([item['rank'] for item in last['top']], [1, 2])
+        self.assertEqual(last['score']['rank'], 2)
+
+        failing = RankingStream(key=lambda item: 0, to_dict=dict)
+        failing.run(lambda: 1 / 0)
+        self.assertEqual([event for event, _ in failing.events(heartbeat=5)], ['error'])
+
+        text = format_sse('done', {'success': True})
+        self.assertEqual(text, 'event: done\ndata: {"success": true}\n\n')
+
+    def test_03_hybrid_scores_stream_before_slow_symbols(self):
+        """Scored symbols are reported while a slow one is still running."""
+        symbols = [f"S{i:02d}" for i in range(6)]
+        engine = HybridRankingEngine(VersionedDataManager(symbols), max_workers=3)
+        release, reported = threading.Event(), []
+
+        def openai_score(symbol, stock_data, *args):
+            if symbol == 'S05':
+                release.wait(10)
+            return 50.0 + int(symbol[1:])
+
+        def on_score(score):
+            reported.append(score.symbol)
+            if len(reported) == 5:
+                release.set()
+
+        engine._calculate_openai_score = openai_score
+        result = engine.rank_collection_incremental('col', on_score=on_score)
+
+        self.assertEqual(sorted(reported[:5]), symbols[:5])
+        self.assertEqual(reported[5], 'S05')
+        self.assertEqual(sorted(result.rescored_symbols), symbols)
+
+        # Indexed scores are reported first, before any rescoring
+        engine.data_manager.update('S00', 90.0)
+        reported.clear()
+        engine.rank_collection_incremental('col', on_score=on_score)
+        self.assertEqual(reported, ['S05', 'S04', 'S03', 'S02', 'S01', 'S00'])
+
+    def test_04_lightweight_batches_match_full_ranking(self):
+        """Streaming by batch gives the same ranking as scoring all at once."""
+        symbols = [f"S{i:02d}" for i in range(25)]
+        data_manager = VersionedDataManager(symbols)
+        for i, symbol in enumerate(symbols):
+            data_manager.update(symbol, 20.0 + 2 * i)
+            data_manager.frames[symbol]['Close'] = data_manager.frames[symbol]['close'] * (1 + i / 50)
+        engine = StockRankingEngine(data_manager)
+
+        batches = []
+        streamed = engine.rank_collection('col', on_scores=lambda scores: batches.append(len(scores)))
+        full = engine.rank_collection('col')
+
+        self.assertEqual(batches, [10, 10, 5])
+        self.assertEqual([(s.symbol, s.total_score, s.rank) for s in streamed.ranked_stocks],
+                         [(s.symbol, s.total_score, s.rank) for s in full.ranked_stocks])
+
+        # Streamed StockScores are sent with their running rank, not the unassigned 0
+        stream = RankingStream(key=lambda score: score.total_score,
+                               to_dict=DataCollectionAIIntegration.serialize_stock_score, top_n=5)
+        engine.rank_collection('col', on_scores=stream.push_many)
+        stream.finish({'success': True})
+        last = [data for event, data in stream.events(heartbeat=5) if event == 'score'][-1]
+        self.assertEqual([item['rank'] for item in last['top']], [1, 2, 3, 4, 5])
+        self.assertEqual([item['symbol'] for item in last['top']],
+                         [s.symbol for s in full.ranked_stocks[:5]])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+"""
+Tests for memoized backtest results and collection data-version stamps.
+"""
+
+import unittest
+import tempfile
+import pandas as pd
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.backtesting.result_cache import BacktestResultCache, canonical_key, cache_scope
+from src.data_collection.data_manager import DataCollectionManager
+
+
+class TestBacktestResultCache(unittest.TestCase):
+    """Keys are canonical, entries follow the data version and the LRU bound."""
+
+    def test_01_canonical_key(self):
+        """Ordering and case do not change the key; data version and inputs do."""
+        key = canonical_key('macd', {'profile': 'balanced', 'parameters': {'a': 1, 'b': 2}},
+                            ['msft', 'AAPL'], '2024-01-01', '2024-12-31', 'v1')
+        same = canonical_key('MACD', {'parameters': {'b': 2, 'a': 1}, 'profile': 'balanced'},
+                             ['AAPL', 'MSFT', 'aapl'], '2024-01-01', '2024-12-31', 'v1')
+        self.assertEqual(key, same)
+        self.assertNotEqual(key, canonical_key('MACD', {'profile': 'balanced', 'parameters': {'a': 1, 'b': 2}},
+                                               ['AAPL', 'MSFT'], '2024-01-01', '2024-12-31', 'v2'))
+        self.assertNotEqual(key, canonical_key('MACD', {'profile': 'aggressive', 'parameters': {'a': 1, 'b': 2}},
+                                               ['AAPL', 'MSFT'], '2024-01-01', '2024-12-31', 'v1'))
+
+    def test_02_versions_and_eviction(self):
+        """A new data version drops its scope's old entries; the LRU bound holds."""
+        cache = BacktestResultCache(max_entries=3)
+        cache.put('a', 'A', 'col1', 'v1')
+        cache.put('b', 'B', 'col2', 'v1')
+        self.assertEqual(cache.get('a'), 'A')
+
+        cache.put('c', 'C', 'col1', 'v2')
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.get('b'), 'B')
+
+        computed = []
+        value = cache.get_or_compute('d', lambda: computed.append(1) or 'D', 'col2', 'v1')
+        self.assertEqual(cache.get_or_compute('d', lambda: computed.append(1) or 'D', 'col2', 'v1'), value)
+        self.assertEqual(len(computed), 1)
+
+        cache.put('e', 'E', 'col2', 'v1')
+        self.assertEqual(cache.stats()['entries'], 3)
+        self.assertIsNone(cache.get('c'))  # least recently used
+
+        cache.invalidate('col2')
+        self.assertEqual(cache.stats()['entries'], 0)
+        self.assertGreater(cache.stats()['hit_rate'], 0)
+
+    def test_03_symbol_scopes(self):
+        """Symbols of one collection have their own versions and do not evict each other."""
+        cache = BacktestResultCache()
+        self.assertEqual(cache_scope('col1', ['msft', 'AAPL', 'aapl']), cache_scope('col1', ['AAPL', 'MSFT']))
+        cache.put('a', 'A', cache_scope('col1', ['AAPL']), '10@t|0@')
+        cache.put('b', 'B', cache_scope('col1', ['MSFT']), '12@t|0@')
+        self.assertEqual(cache.get('a'), 'A')
+
+        cache.put('c', 'C', cache_scope('col1', ['AAPL']), '11@t|0@')
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.get('b'), 'B')
+
+    def test_04_data_version_tracks_updates(self):
+        """Writing bars or indicators changes the stamp of the affected collection only."""
+        with tempfile.TemporaryDirectory() as tmp:
+            manager = DataCollectionManager(os.path.join(tmp, 'collections.db'))
+            bars = pd.DataFrame({'Close': [1.0, 2.0]}, index=pd.date_range('2024-01-01', periods=2))
+            manager._save_collection_data_to_db('col1', {'AAPL': bars, 'MSFT': bars})
+            manager._save_collection_data_to_db('col2', {'AAPL': bars})
+
+            before = manager.get_data_version('col1')
+            other = manager.get_data_version('col2')
+            msft = manager.get_data_version('col1', ['MSFT'])
+            self.assertEqual(before, manager.get_data_version('col1'))
+
+            manager._update_symbol_data('col1', 'AAPL', bars * 2)
+            self.assertNotEqual(manager.get_data_version('col1'), before)
+            self.assertEqual(manager.get_data_version('col2'), other)
+            self.assertEqual(manager.get_data_version('col1', ['MSFT']), msft)
+
+            after_bars = manager.get_data_version('col1')
+            manager.store_symbol_indicators('col1', 'AAPL', bars)
+            self.assertNotEqual(manager.get_data_version('col1'), after_bars)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+"""
+Tests for compact backtest results and their JSON serialization.
+"""
+
+import unittest
+import json
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.backtesting.backtest_engine import BacktestEngine
+from src.backtesting.strategies import MACDStrategy
+from src.backtesting.serialization import trades_to_array, serialize_results, dumps_results
+from tests.helpers import make_price_data, add_backtest_indicators, make_engine
+
+
+class TestResultsSerialization(unittest.TestCase):
+    """Engines keep NumPy series and results serialize without losing values."""
+
+    @classmethod
+    def setUpClass(cls):
+        data = add_backtest_indicators(make_price_data(750, seed=5)).reset_index().rename(columns={'index': 'Date'})
+        data['symbol'] = 'TEST'
+        cls.data = data
+        cls.engine = make_engine(BacktestEngine)
+        cls.engine._simulate(MACDStrategy({'enable_short': True}), data)
+        cls.results = cls.engine._build_results(MACDStrategy(), 'TEST')
+
+    def test_01_preallocated_series(self):
+        """Equity and timestamps are filled arrays of one point per bar plus the start."""
+        engine = self.engine
+        self.assertIsInstance(engine.equity_curve, np.ndarray)
+        self.assertEqual(len(engine.equity_curve), len(self.data) + 1)
+        self.assertEqual(engine._equity_length, len(engine.equity_curve))
+        self.assertEqual(engine.timestamps.dtype, np.dtype('datetime64[ns]'))
+        self.assertEqual(engine.timestamps[0], engine.timestamps[1])
+        self.assertGreater(len(engine.trades), 0)
+        self.assertFalse(hasattr(engine.trades[0], '__dict__'))
+
+    def test_02_json_round_trip(self):
+        """Serialized results keep the equity curve, timestamps and every trade field."""
+        decoded = json.loads(dumps_results(self.results))
+
+        np.testing.assert_array_equal(decoded['equity_curve'], self.engine.equity_curve)
+        self.assertEqual(pd.to_datetime(decoded['timestamps']).tolist(),
+                         pd.to_datetime(self.engine.timestamps).tolist())
+        self.assertEqual(len(decoded['trades']), len(self.engine.trades))
+
+        first, trade = decoded['trades'][0], self.engine.trades[0]
+        self.assertEqual(first['pnl'], trade.pnl)
+        self.assertEqual(first['exit_reason'], trade.exit_reason)
+        self.assertEqual(pd.Timestamp(first['entry_time']), pd.Timestamp(trade.entry_time))
+
+        # A structured trade array serializes to the same records
+        as_array = serialize_results({'trades': trades_to_array(self.engine.trades)})
+        self.assertEqual(as_array['trades'], decoded['trades'])
+
+
+if __name__ == '__main__':
+    unittest.main()
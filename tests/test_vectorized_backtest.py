@@ -0,0 +1,86 @@
+"""
+Tests for the vectorized backtest engine against the event loop.
+"""
+
+import unittest
+import numpy as np
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.backtesting.backtest_engine import BacktestEngine, Strategy
+from src.backtesting.vectorized_engine import VectorizedBacktestEngine
+from src.backtesting.risk_management import StopLossType
+from src.backtesting.strategies import BollingerBandsStrategy, MACDStrategy
+from tests.helpers import make_price_data, add_backtest_indicators, make_engine
+
+
+class BuyOnlyStrategy(Strategy):
+    """Strategy without vectorized masks."""
+
+    def __init__(self):
+        super().__init__("Buy Only", {})
+
+    def should_enter_long(self, data, index):
+        return index % 50 == 0
+
+    def should_exit_long(self, data, index):
+        return False
+
+    def should_enter_short(self, data, index):
+        return False
+
+    def should_exit_short(self, data, index):
+        return False
+
+
+class TestVectorizedBacktestEngine(unittest.TestCase):
+    """The vectorized simulation must reproduce the event loop."""
+
+    def setUp(self):
+        self.data = add_backtest_indicators(make_price_data(2520, seed=3)).reset_index().rename(columns={'index': 'Date'})
+        self.data['symbol'] = 'TEST'
+
+    def assert_same_simulation(self, event_engine, vectorized_engine):
+        self.assertEqual(len(event_engine.trades), len(vectorized_engine.trades))
+        for expected, actual in zip(event_engine.trades, vectorized_engine.trades):
+            self.assertEqual(expected.entry_time, actual.entry_time)
+            self.assertEqual(expected.exit_time, actual.exit_time)
+            self.assertEqual(expected.position_type, actual.position_type)
+            self.assertEqual(expected.exit_reason, actual.exit_reason)
+            self.assertAlmostEqual(expected.pnl, actual.pnl, places=6)
+            self.assertAlmostEqual(expected.stop_loss, actual.stop_loss, places=6)
+        np.testing.assert_allclose(vectorized_engine.equity_curve, event_engine.equity_curve)
+        np.testing.assert_array_equal(vectorized_engine.timestamps, event_engine.timestamps)
+        self.assertAlmostEqual(vectorized_engine.capital, event_engine.capital, places=6)
+
+    def test_01_matches_event_loop(self):
+        """Long/short trades, equity curve and final capital match the event loop."""
+        for stop_loss_type in (StopLossType.FIXED_PERCENTAGE, StopLossType.TIME_BASED):
+            for strategy in (BollingerBandsStrategy(), MACDStrategy({'enable_short': True})):
+                event_engine = make_engine(BacktestEngine, stop_loss_type)
+                vectorized_engine = make_engine(VectorizedBacktestEngine, stop_loss_type)
+
+                event_engine._simulate(strategy, self.data)
+                vectorized_engine._simulate(strategy, self.data)
+
+                self.assertTrue(vectorized_engine.last_run_vectorized)
+                self.assertGreater(len(vectorized_engine.trades), 0)
+                self.assert_same_simulation(event_engine, vectorized_engine)
+
+    def test_02_falls_back_without_masks(self):
+        """Strategies without masks run through the event loop."""
+        event_engine = make_engine(BacktestEngine)
+        vectorized_engine = make_engine(VectorizedBacktestEngine)
+
+        event_engine._simulate(BuyOnlyStrategy(), self.data)
+        vectorized_engine._simulate(BuyOnlyStrategy(), self.data)
+
+        self.assertFalse(vectorized_engine.last_run_vectorized)
+        self.assert_same_simulation(event_engine, vectorized_engine)
+
+
+if __name__ == '__main__':
+    unittest.main()
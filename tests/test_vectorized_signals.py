@@ -0,0 +1,87 @@
+"""
+Tests for vectorized entry/exit masks against the row-by-row strategy methods.
+"""
+
+import unittest
+import pandas as pd
+import numpy as np
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.indicators import TechnicalIndicators
+from src.strategies import MACDStrategy, MACDCanonicalStrategy, MACDAggressiveStrategy, MACDConservativeStrategy
+from src.backtesting.strategies import RSIStrategy, BollingerBandsStrategy, MovingAverageStrategy
+from src.backtesting.strategies import MACDStrategy as BacktestMACDStrategy
+from tests.helpers import make_price_data, add_backtest_indicators
+
+
+class TestVectorizedSignals(unittest.TestCase):
+    """Vectorized masks must agree with the per-row strategy methods."""
+
+    def setUp(self):
+        self.data = make_price_data()
+        self.strategy_data = TechnicalIndicators().calculate_all_indicators(self.data)
+        self.strategy_data['macd'] = self.strategy_data['macd_line']
+        self.backtest_data = add_backtest_indicators(self.data)
+
+    def test_01_macd_family_entry_masks(self):
+        """Entry masks match should_entry for the MACD family."""
+        for strategy in [MACDStrategy(), MACDCanonicalStrategy(), MACDAggressiveStrategy(), MACDConservativeStrategy()]:
+            mask = strategy.entry_mask(self.strategy_data)
+            expected = []
+            for i in range(len(self.strategy_data)):
+                result = strategy.should_entry(self.strategy_data, i)
+                expected.append(bool(result['signal']) if isinstance(result, dict) else bool(result[0]))
+            np.testing.assert_array_equal(mask, np.array(expected), err_msg=type(strategy).__name__)
+
+    def test_02_backtesting_strategy_masks(self):
+        """Entry/exit masks match should_enter_*/should_exit_* for backtesting strategies."""
+        strategies = [
+            RSIStrategy({'enable_short': True}),
+            BollingerBandsStrategy(),
+            MovingAverageStrategy(),
+            BacktestMACDStrategy({'enable_short': True})
+        ]
+        n = len(self.backtest_data)
+        for strategy in strategies:
+            for side in ('long', 'short'):
+                entries = strategy.entry_mask(self.backtest_data, side)
+                exits = strategy.exit_mask(self.backtest_data, entries, side)
+                should_enter = getattr(strategy, f'should_enter_{side}')
+                should_exit = getattr(strategy, f'should_exit_{side}')
+                np.testing.assert_array_equal(
+                    entries, [bool(should_enter(self.backtest_data, i)) for i in range(n)],
+                    err_msg=f"{strategy.name} {side} entry")
+                np.testing.assert_array_equal(
+                    exits, [bool(should_exit(self.backtest_data, i)) for i in range(n)],
+                    err_msg=f"{strategy.name} {side} exit")
+
+    def test_03_generate_signals_uses_masks(self):
+        """generate_signals produces signals from the masks, exits taking precedence."""
+        strategy = MACDStrategy()
+        signals = strategy.generate_signals(self.strategy_data)
+
+        entries = strategy.entry_mask(self.strategy_data)
+        exits = strategy.exit_mask(self.strategy_data, entries)
+
+        self.assertEqual(len(signals), len(self.strategy_data))
+        np.testing.assert_array_equal(signals['signal'].to_numpy() == -1, exits)
+        np.testing.assert_array_equal(signals['signal'].to_numpy() == 1, entries & ~exits)
+
+    def test_04_exit_mask_uses_position_since_entry(self):
+        """Stop loss in exit_mask is measured from the most recent entry price."""
+        strategy = MACDCanonicalStrategy()
+        data = pd.DataFrame({'close': [100.0, 101.0, 95.0, 90.0]})
+        state = strategy._since_entry(data, np.array([False, True, False, False]))
+
+        np.testing.assert_array_equal(state['in_position'], [False, True, True, True])
+        np.testing.assert_array_equal(state['bars_held'], [0, 0, 1, 2])
+        self.assertEqual(state['entry_price'][3], 101.0)
+        self.assertEqual(state['peak_price'][3], 101.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+"""
+Tests for the walk-forward optimizer.
+"""
+
+import unittest
+import tempfile
+import json
+import numpy as np
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.backtesting.walk_forward import WalkForwardOptimizer
+from src.backtesting.vectorized_engine import VectorizedBacktestEngine
+from src.backtesting.strategies import MACDStrategy
+from src.indicators import MACDIndicator
+from tests.helpers import make_price_data, add_backtest_indicators, make_engine
+
+PARAMETER_SPACE = {
+    'fast_period': [8, 12, 30],
+    'slow_period': [26],
+    'entry_threshold': [0.0],
+    'take_profit_pct': [0.04, 0.08],
+    'stop_loss_pct': [0.02, 0.04],
+    'max_hold_days': [20]
+}
+
+
+class TestWalkForwardOptimizer(unittest.TestCase):
+    """Window/trial generation, persisted results and parallel equivalence."""
+
+    def setUp(self):
+        self.data = make_price_data(700, seed=5)
+        self.workdir = tempfile.mkdtemp()
+
+    def make_optimizer(self, **kwargs):
+        return WalkForwardOptimizer(PARAMETER_SPACE, train_bars=200, test_bars=100,
+                                    results_dir=os.path.join(self.workdir, 'walk_forward'),
+                                    engine=make_engine(VectorizedBacktestEngine), **kwargs)
+
+    def test_01_windows_and_trials(self):
+        """Windows roll by the test length; invalid and sampled trials are handled."""
+        optimizer = self.make_optimizer()
+        windows = optimizer.generate_windows(700)
+        self.assertEqual([(w.train_start, w.test_start, w.test_end) for w in windows],
+                         [(0, 200, 300), (100, 300, 400), (200, 400, 500), (300, 500, 600), (400, 600, 700)])
+        self.assertEqual(len(optimizer.generate_trials()), 8)
+
+        sampled = self.make_optimizer(search='random', n_trials=3, seed=1).generate_trials()
+        self.assertEqual(sampled, self.make_optimizer(search='random', n_trials=3, seed=1).generate_trials())
+        self.assertEqual(len(sampled), 3)
+
+    def test_02_entry_threshold_and_periods(self):
+        """The MACD strategy reads its own period columns and filters weak crossovers."""
+        data = MACDIndicator(8, 21, 5).calculate(add_backtest_indicators(self.data))
+        default = MACDStrategy({'fast_period': 8, 'slow_period': 21, 'signal_period': 5})
+        strict = MACDStrategy({'fast_period': 8, 'slow_period': 21, 'signal_period': 5, 'entry_threshold': 0.2})
+
+        entries = default.entry_mask(data)
+        self.assertGreater(entries.sum(), 0)
+        self.assertLess(strict.entry_mask(data).sum(), entries.sum())
+        self.assertTrue((strict.entry_mask(data) <= entries).all())
+        self.assertEqual(entries[60], default.should_enter_long(data, 60))
+
+    def test_03_run_persists_and_matches_parallel(self):
+        """Best train trials are scored out of sample, persisted, and parallel agrees."""
+        results = self.make_optimizer(max_workers=1).run(self.data, 'TEST')
+
+        self.assertEqual(len(results['windows']), 5)
+        self.assertEqual(len(results['trials']), 8 * 5 * 2)
+        for window in results['windows']:
+            train = results['trials'].query(f"window == {window['window']} and phase == 'train'")
+            self.assertAlmostEqual(window['train_score'], train['sharpe_ratio'].max())
+
+        with open(results['results_path']) as f:
+            saved = json.load(f)
+        self.assertEqual(saved['windows'], results['windows'])
+        self.assertTrue(os.path.exists(saved['trials_file']))
+
+        cwd = os.getcwd()
+        os.makedirs(os.path.join(self.workdir, 'data'))
+        os.chdir(self.workdir)
+        try:
+            parallel = self.make_optimizer(max_workers=2).run(self.data, 'TEST', persist=False)
+        finally:
+            os.chdir(cwd)
+        self.assertEqual(parallel['windows'], results['windows'])
+        np.testing.assert_allclose(parallel['trials']['total_return'], results['trials']['total_return'])
+
+    def test_04_signal_period_on_existing_macd_line(self):
+        """Data carrying the 12/26 line still gets the signal line of the trial's period."""
+        space = {'fast_period': [12], 'slow_period': [26], 'signal_period': [5],
+                 'take_profit_pct': [0.04], 'stop_loss_pct': [0.02], 'max_hold_days': [20]}
+        with_line = add_backtest_indicators(self.data)
+        without_line = with_line.drop(columns=['macd_line_12_26', 'macd_signal_12_26_9'])
+
+        results = [WalkForwardOptimizer(space, train_bars=200, test_bars=100, max_workers=1,
+                                        results_dir=os.path.join(self.workdir, 'walk_forward'),
+                                        engine=make_engine(VectorizedBacktestEngine)).run(data, 'TEST', persist=False)
+                   for data in (with_line, without_line)]
+
+        self.assertGreater(results[0]['trials']['trades'].sum(), 0)
+        np.testing.assert_allclose(results[0]['trials']['total_return'], results[1]['trials']['total_return'])
+
+
+if __name__ == '__main__':
+    unittest.main()